@@ -31,37 +31,9 @@ AVAIL_SIZE_METRIC_OLD = 'node_filesystem_avail'
 
 class IcsSpaceAmplificationTest(LongevityTest):
 
-    def _get_used_capacity_gb(self, node):  # pylint: disable=too-many-locals
-        #  example: node_filesystem_size_bytes{mountpoint="/var/lib/scylla",
-        #  instance=~".*?10.0.79.46.*?"}-node_filesystem_avail_bytes{mountpoint="/var/lib/scylla",
-        #  instance=~".*?10.0.79.46.*?"}
-        node_capacity_query_postfix = generate_node_capacity_query_postfix(node)
-        filesystem_capacity_query = f'{FS_SIZE_METRIC}{node_capacity_query_postfix}'
-        used_capacity_query = f'{filesystem_capacity_query}-{AVAIL_SIZE_METRIC}{node_capacity_query_postfix}'
-        self.log.debug("filesystem_capacity_query: %s", filesystem_capacity_query)
-
-        fs_size_res = self.prometheus_db.query(query=filesystem_capacity_query, start=int(time.time()) - 5,
-                                               end=int(time.time()))
-        if not fs_size_res:
-            self.log.warning("No results from Prometheus query: %s", filesystem_capacity_query)
-            return 0
-            # assert fs_size_res, "No results from Prometheus"
-        if not fs_size_res[0]:  # if no returned values - try the old metric names.
-            filesystem_capacity_query = f'{FS_SIZE_METRIC_OLD}{node_capacity_query_postfix}'
-            used_capacity_query = f'{filesystem_capacity_query}-{AVAIL_SIZE_METRIC_OLD}{node_capacity_query_postfix}'
-            self.log.debug("filesystem_capacity_query: %s", filesystem_capacity_query)
-            fs_size_res = self.prometheus_db.query(query=filesystem_capacity_query, start=int(time.time()) - 5,
-                                                   end=int(time.time()))
-
-        assert fs_size_res[0], "Could not resolve capacity query result."
-        self.log.debug("used_capacity_query: %s", used_capacity_query)
-        used_cap_res = self.prometheus_db.query(query=used_capacity_query, start=int(time.time()) - 5,
-                                                end=int(time.time()))
-        assert used_cap_res, "No results from Prometheus"
-        used_size_mb = float(used_cap_res[0]["values"][0][1]) / float(MB_SIZE)
-        used_size_gb = round(float(used_size_mb / 1024), 2)
-        self.log.debug("The used filesystem capacity on node %s is: %s MB/ %s GB",
-                       node.public_ip_address,  used_size_mb, used_size_gb)
+    def _get_used_capacity_gb(self, node):
+        used_size_gb = round(self.db_cluster.capacity_sampler.used_capacity()[node] / float(GB_SIZE), 2)
+        self.log.debug("The used filesystem capacity on node %s is: %s GB", node.public_ip_address, used_size_gb)
         return used_size_gb
 
     def _get_filesystem_available_size_list(self, node, start_time):
@@ -15,16 +15,17 @@
 
 import os
 import re
-import time
 import string
 import tempfile
 import itertools
+from functools import partial, cached_property
 
 import yaml
-from cassandra import AlreadyExists, InvalidRequest
 
 
 from sdcm.tester import ClusterTester
+from sdcm.stress_scheduler import StressLaunchScheduler
+from sdcm.utils.schema_provisioner import SchemaProvisioner
 
 
 class LongevityTest(ClusterTester):
@@ -32,7 +33,12 @@ class LongevityTest(ClusterTester):
     Test a Scylla cluster stability over a time period.
     """
 
-    def _run_all_stress_cmds(self, stress_queue, params):
+    @cached_property
+    def stress_launch_scheduler(self):
+        return StressLaunchScheduler()
+
+    def _run_all_stress_cmds(self, stress_queue, params, scheduler=None):
+        scheduler = scheduler or self.stress_launch_scheduler
         stress_cmds = params['stress_cmd']
         if not isinstance(stress_cmds, list):
             stress_cmds = [stress_cmds]
@@ -48,13 +54,12 @@ class LongevityTest(ClusterTester):
             # Run all stress commands
             self.log.debug('stress cmd: {}'.format(stress_cmd))
             if stress_cmd.startswith('scylla-bench'):
-                stress_queue.append(self.run_stress_thread(stress_cmd=stress_cmd,
-                                                           stats_aggregate_cmds=False,
-                                                           round_robin=self.params.get('round_robin')))
+                start = partial(self.run_stress_thread, stress_cmd=stress_cmd, stats_aggregate_cmds=False,
+                                round_robin=self.params.get('round_robin'))
             else:
-                stress_queue.append(self.run_stress_thread(**params))
-
-            time.sleep(10)
+                start = partial(self.run_stress_thread, **params)
+            # Start the next command once this one is ready instead of sleeping for a fixed time
+            stress_queue.append(scheduler.launch(name=stress_cmd, start=start))
 
             # Remove "user profile" param for the next command
             if 'profile' in params:
@@ -91,6 +96,8 @@ class LongevityTest(ClusterTester):
             fullscan = fullscan.split(',')
             params['ks.cf'] = fullscan[0].strip()
             params['interval'] = int(fullscan[1].strip())
+            params['parallelism'] = int(fullscan[2].strip()) if len(fullscan) > 2 else 0
+            params['verify_counts'] = bool(self.params.get('run_fullscan_verify_counts'))
             self.log.info('Fullscan target: {} Fullscan interval: {}'.format(params['ks.cf'],
                                                                              params['interval']))
         return params
@@ -244,7 +251,8 @@ class LongevityTest(ClusterTester):
         if fullscan:
             self.log.info('Fullscan target: {} Fullscan interval: {}'.format(fullscan['ks.cf'],
                                                                              fullscan['interval']))
-            self.run_fullscan_thread(ks_cf=fullscan['ks.cf'], interval=fullscan['interval'])
+            self.run_fullscan_thread(ks_cf=fullscan['ks.cf'], interval=fullscan['interval'],
+                                     parallelism=fullscan['parallelism'], verify_counts=fullscan['verify_counts'])
 
         # Check if we shall wait for total_used_space or if nemesis wasn't started
         if not prepare_write_cmd or not self.params.get('nemesis_during_prepare'):
@@ -271,8 +279,9 @@ class LongevityTest(ClusterTester):
     def test_batch_custom_time(self):
         """
         The test runs like test_custom_time but designed for running multiple stress commands in batches.
-        It take the keyspace_num and calculates the number of batches to run based on batch_size.
-        For every batch, it runs the stress and verify them and only then moves to the next batch.
+        It take the keyspace_num and stresses the keyspaces in a sliding window of batch_size keyspaces:
+        batches overlap, a stress command of the next keyspace starts as soon as any of the running ones finishes,
+        and every stress command is verified when it finishes.
 
         Test assumes:
         - pre_create_schema (The test pre-creating the schema for all batches)
@@ -399,14 +408,19 @@ class LongevityTest(ClusterTester):
             self._pre_create_schema(keyspace_num=total_stress,
                                     scylla_encryption_options=self.params.get('scylla_encryption_options'))
 
+        # Keep up to `batch_size' keyspaces loaded at any moment: start a new stress command as soon as any of
+        # the running ones finishes, instead of waiting for the whole batch.
+        cmds_per_keyspace = (len(stress_cmd) if isinstance(stress_cmd, list) else 1) * self.params.get('stress_multiplier')
+        scheduler = StressLaunchScheduler(max_in_flight=batch_size * cmds_per_keyspace,
+                                          on_finish=lambda stress: self.verify_stress_thread(cs_thread_pool=stress))
         num_of_batches = int(total_stress / batch_size)
-        for batch in range(0, num_of_batches):
-            for i in range(1 + batch * batch_size, (batch + 1) * batch_size + 1):
-                keyspace_name = self._get_keyspace_name(i)
-                self._run_all_stress_cmds(stress_queue, params={'stress_cmd': stress_cmd,
-                                                                'keyspace_name': keyspace_name, 'round_robin': True})
-            for stress in stress_queue:
-                self.verify_stress_thread(cs_thread_pool=stress)
+        for i in range(1, num_of_batches * batch_size + 1):
+            keyspace_name = self._get_keyspace_name(i)
+            self._run_all_stress_cmds(stress_queue, params={'stress_cmd': stress_cmd,
+                                                            'keyspace_name': keyspace_name, 'round_robin': True},
+                                      scheduler=scheduler)
+        scheduler.wait_all()
+        scheduler.log_timeline()
 
     def _create_counter_table(self):
         """
@@ -477,19 +491,21 @@ class LongevityTest(ClusterTester):
         self.log.debug('Pre Creating Schema for c-s with {} keyspaces'.format(keyspace_num))
         compaction_strategy = self.params.get('compaction_strategy')
         sstable_size = self.params.get('sstable_size')
+        col_num = self._get_prepare_write_cmd_columns_num() or 5
+        columns = {}
+        for col_idx in range(col_num):
+            cs_key = '"C'+str(col_idx)+'"'
+            columns[cs_key] = 'blob'
+        statements = []
         for i in range(1, keyspace_num+1):
             keyspace_name = 'keyspace{}'.format(i)
-            self.create_keyspace(keyspace_name=keyspace_name, replication_factor=3)
-            self.log.debug('{} Created'.format(keyspace_name))
-            col_num = self._get_prepare_write_cmd_columns_num() or 5
-            columns = {}
-            for col_idx in range(col_num):
-                cs_key = '"C'+str(col_idx)+'"'
-                columns[cs_key] = 'blob'
-            self.create_table(name='standard1', keyspace_name=keyspace_name, key_type='blob', read_repair=0.0, compact_storage=True,
-                              columns=columns,
-                              in_memory=in_memory, scylla_encryption_options=scylla_encryption_options,
-                              compaction=compaction_strategy, sstable_size=sstable_size)
+            statements.append(self.create_keyspace_query(keyspace_name=keyspace_name, replication_factor=3))
+            statements.append(self.create_table_query(
+                name=f'{keyspace_name}.standard1', key_type='blob', read_repair=0.0, compact_storage=True,
+                columns=columns, in_memory=in_memory, scylla_encryption_options=scylla_encryption_options,
+                compaction=compaction_strategy, sstable_size=sstable_size))
+        with self.db_cluster.cql_connection_patient(node=self.db_cluster.nodes[0], pooled=False) as session:
+            SchemaProvisioner(session).provision(statements)
 
     def _pre_create_templated_user_schema(self, batch_start=None, batch_end=None):
         # pylint: disable=too-many-locals
@@ -499,36 +515,23 @@ class LongevityTest(ClusterTester):
         # read user-profile
         for profile_file in cs_user_profiles:
             profile_yaml = yaml.safe_load(open(profile_file))
-            keyspace_definition = profile_yaml['keyspace_definition']
-            keyspace_name = profile_yaml['keyspace']
             table_template = string.Template(profile_yaml['table_definition'])
 
-            with self.db_cluster.cql_connection_patient(node=self.db_cluster.nodes[0]) as session:
-                try:
-                    session.execute(keyspace_definition)
-                except AlreadyExists:
-                    self.log.debug("keyspace [{}] exists".format(keyspace_name))
-
-                if batch_start is not None and batch_end is not None:
-                    table_range = range(batch_start, batch_end)
-                else:
-                    table_range = range(user_profile_table_count)
-                self.log.debug('Pre Creating Schema for c-s with {} user tables'.format(user_profile_table_count))
-                for i in table_range:
-                    table_name = 'table{}'.format(i)
-                    query = table_template.substitute(table_name=table_name)
-                    try:
-                        session.execute(query)
-                    except AlreadyExists:
-                        self.log.debug('table [{}] exists'.format(table_name))
-                    self.log.debug('{} Created'.format(table_name))
-
-                    for definition in profile_yaml.get('extra_definitions', []):
-                        query = string.Template(definition).substitute(table_name=table_name)
-                        try:
-                            session.execute(query)
-                        except (AlreadyExists, InvalidRequest) as exc:
-                            self.log.debug('extra definition for [{}] exists [{}]'.format(table_name, str(exc)))
+            if batch_start is not None and batch_end is not None:
+                table_range = range(batch_start, batch_end)
+            else:
+                table_range = range(user_profile_table_count)
+            self.log.debug('Pre Creating Schema for c-s with {} user tables'.format(len(table_range)))
+
+            statements = [profile_yaml['keyspace_definition']]
+            for i in table_range:
+                table_name = 'table{}'.format(i)
+                statements.append(table_template.substitute(table_name=table_name))
+                for definition in profile_yaml.get('extra_definitions', []):
+                    statements.append(string.Template(definition).substitute(table_name=table_name))
+
+            with self.db_cluster.cql_connection_patient(node=self.db_cluster.nodes[0], pooled=False) as session:
+                SchemaProvisioner(session).provision(statements)
 
     def _pre_create_keyspace(self):
         cmds = self.params.get('pre_create_keyspace')
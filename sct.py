@@ -36,7 +36,7 @@ from prettytable import PrettyTable
 from sdcm.remote import LOCALRUNNER
 from sdcm.results_analyze import PerformanceResultsAnalyzer
 from sdcm.sct_config import SCTConfiguration
-from sdcm.sct_runner import AwsSctRunner, GceSctRunner
+from sdcm.sct_runner import AwsSctRunner, GceSctRunner, SctRunnerImagePipeline
 from sdcm.utils.cloud_monitor import cloud_report, cloud_qa_report
 from sdcm.utils.common import (
     all_aws_regions,
@@ -69,6 +69,7 @@ from sdcm.monitorstack import (restore_monitoring_stack, get_monitoring_stack_se
                                kill_running_monitoring_stack_services)
 from sdcm.cluster import TestConfig
 from sdcm.utils.log import setup_stdout_logger
+from sdcm.utils.events_log_tail import EventsLogTail, EventsFilter, SEVERITIES
 from sdcm.utils.prepare_region import AwsRegion
 from sdcm.utils.get_username import get_username
 from sdcm.send_email import get_running_instances_for_email_report, read_email_data_from_file, build_reporter
@@ -511,9 +512,9 @@ def _run_yaml_test(backend, full_path, env):
     os.environ['SCT_CONFIG_FILES'] = full_path
     logging.getLogger().handlers = []
     logging.getLogger().disabled = True
-    config = SCTConfiguration()
     try:
-        config.verify_configuration()
+        config = SCTConfiguration.load_cached()
+        config.verify_configuration_cached()
         config.check_required_files()
     except Exception as exc:  # pylint: disable=broad-except
         output.append(''.join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
@@ -717,9 +718,19 @@ def search_builder(test_id):
 @click.argument('test-id')
 @click.option("--follow", type=bool, required=False, is_flag=True, default=False,
               help="Follow job events log file (similar tail -f <file>)")
-@click.option("--last-n", type=int, required=False, help="return last n lines from events.log file")
+@click.option("--last-n", type=int, required=False, help="return last n (matching) events from events.log file")
 @click.option("--save-to", type=str, required=False, help="Download events.log file and save to provided dir")
-def show_events(test_id: str, follow: bool = False, last_n: int = None, save_to: str = None):
+@click.option("--severity", type=click.Choice(SEVERITIES), required=False,
+              help="Show only events with this severity or higher")
+@click.option("--event-type", type=str, multiple=True,
+              help="Show only events of this type, i.e. DatabaseLogEvent or DatabaseLogEvent.BACKTRACE")
+@click.option("--node", type=str, required=False, help="Show only events with node name containing this string")
+@click.option("--since", type=str, required=False, help="Show only events since 'YYYY-MM-DD HH:MM:SS' (UTC)")
+@click.option("--until", type=str, required=False, help="Show only events until 'YYYY-MM-DD HH:MM:SS' (UTC)")
+@click.option("--cursor", type=int, default=0, help="Start reading events.log from this byte offset")
+def show_events(test_id: str, follow: bool = False, last_n: int = None, save_to: str = None,  # pylint: disable=too-many-arguments
+                severity: str = None, event_type: tuple = (), node: str = None, since: str = None, until: str = None,
+                cursor: int = 0):
     logging.getLogger("paramiko").setLevel(logging.CRITICAL)
     add_file_logger()
     builders = get_builder_by_test_id(test_id)
@@ -727,23 +738,26 @@ def show_events(test_id: str, follow: bool = False, last_n: int = None, save_to:
     if not builders:
         LOGGER.info("Builder was not found for provided test-id %s", test_id)
 
+    events_filter = EventsFilter(min_severity=severity, event_types=event_type, node=node, since=since, until=until)
     for builder in builders:
         LOGGER.info(
             "Applying action for events.log on builder %s:%s...", builder['builder']['name'], builder['builder']['public_ip'])
         remoter = builder["builder"]["remoter"]
 
-        if follow or last_n:
-            options = "-f " if follow else ""
-            options += f"-n {last_n} " if last_n else ""
-            try:
-                remoter.run("tail %s %s/events_log/events.log", options, builder['path'])
-            except KeyboardInterrupt:
-                LOGGER.info('Monitoring events.log for test-id %s stopped!', test_id)
-        elif save_to:
+        if save_to:
             remoter.receive_files(f"{builder['path']}/events_log/events.log", save_to)
             LOGGER.info("Events saved to %s", save_to)
-        else:
-            remoter.run(f"cat {builder['path']}/events_log/events.log")
+            continue
+
+        # filtering is done on the builder, only the matched events are sent back
+        events_log_tail = EventsLogTail(remoter=remoter, path=f"{builder['path']}/events_log/events.log",
+                                        events_filter=events_filter, cursor=cursor)
+        try:
+            for events in (events_log_tail.follow if follow else events_log_tail.fetch)(last_n=last_n):
+                click.echo(events, nl=False)
+        except KeyboardInterrupt:
+            LOGGER.info('Monitoring events.log for test-id %s stopped!', test_id)
+        LOGGER.info("To continue from the same place use `--cursor %s'", events_log_tail.cursor)
     click.echo("Show events done.")
 
 
@@ -1084,15 +1098,16 @@ def prepare_aws_region(region):
     aws_region.configure()
 
 
-@cli.command("create-runner-image", help="Create an SCT runner image in selected AWS or GCE region. "
-                                         f"If the requested region is not a source region "
+@cli.command("create-runner-image", help="Create an SCT runner image in selected AWS or GCE regions. "
+                                         f"The image is built once in the source region "
                                          f"(aws: {AwsSctRunner.SOURCE_IMAGE_REGION}, gce: {GceSctRunner.SOURCE_IMAGE_REGION})"
-                                         f" the image will be first created in the"
-                                         f" source region and then copied to the chosen one.")
+                                         f" and then copied to the chosen ones concurrently."
+                                         f" Nothing is done if the image with the same content exists already.")
 @click.option("-c", "--cloud-provider", required=True, type=click.Choice(['aws', 'gce']), default="aws",
               help="Cloud provider, currently only AWS and GCE are supported")
-@click.option("-r", "--region", required=True, type=click.Choice(all_aws_regions(cached=True) + get_all_gce_regions()),
-              help="Name of the region")
+@click.option("-r", "--region", required=True, multiple=True,
+              type=click.Choice(all_aws_regions(cached=True) + get_all_gce_regions()),
+              help="Name of the region, can be given a few times")
 @click.option("-z", "--availability-zone", required=False, default="", type=str,
               help="Name of availability zone, ex. 'a'")
 def create_runner_image(cloud_provider, region, availability_zone):
@@ -1101,13 +1116,14 @@ def create_runner_image(cloud_provider, region, availability_zone):
         assert len(availability_zone) == 1, f"Invalid AZ: {availability_zone}, availability-zone is one-letter a-z."
     add_file_logger()
     if cloud_provider == 'aws':
-        sct_runner = AwsSctRunner(region_name=region,
-                                  availability_zone=availability_zone)
+        sct_runners = [AwsSctRunner(region_name=region_name, availability_zone=availability_zone)
+                       for region_name in region]
     elif cloud_provider == 'gce':
-        sct_runner = GceSctRunner(datacenter=region, availability_zone=availability_zone)
+        sct_runners = [GceSctRunner(datacenter=region_name, availability_zone=availability_zone)
+                       for region_name in region]
     else:
         raise Exception('Unsupported Cloud provider')
-    sct_runner.create_image()
+    SctRunnerImagePipeline(sct_runners).run()
 
 
 @cli.command("create-runner-instance", help="Create an SCT runner instance in selected AWS or GCE region")
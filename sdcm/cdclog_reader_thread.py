@@ -19,7 +19,7 @@ from typing import List, Dict
 
 from sdcm.sct_events.loaders import CDCReaderStressEvent
 from sdcm.utils.common import get_docker_stress_image_name
-from sdcm.utils.docker_remote import RemoteDocker
+from sdcm.utils.docker_remote import get_docker_pool
 from sdcm.stress_thread import format_stress_cmd_error, DockerBasedStressThread
 from sdcm.utils.cdc.options import CDC_LOGTABLE_SUFFIX
 
@@ -46,7 +46,17 @@ class CDCLogReaderThread(DockerBasedStressThread):
                             -nodes {node_ips} -group-size {shards_per_node} \
                             -worker-id {worker_id} -worker-count {worker_count}"
 
-    def _run_stress(self, loader, loader_idx, cpu_idx):  # pylint: disable=unused-argument
+    def docker_images(self):
+        return [CDCLOG_READER_IMAGE]
+
+    def _run_stress(self, loader, loader_idx, cpu_idx):
+        pool = get_docker_pool(loader)
+        with pool.container(CDCLOG_READER_IMAGE, extra_docker_opts='--network=host', owner=self.shell_marker) as docker:
+            if (result := self._run_stress_in_container(docker, loader, loader_idx, cpu_idx)) is None:
+                pool.discard(docker)  # the command failed and might still be running in the container
+            return result
+
+    def _run_stress_in_container(self, docker, loader, loader_idx, cpu_idx):
         loader_node_logdir = Path(loader.logdir)
         if not loader_node_logdir.exists():
             loader_node_logdir.mkdir()
@@ -59,9 +69,6 @@ class CDCLogReaderThread(DockerBasedStressThread):
         self.build_stress_command(worker_id, worker_count)
 
         LOGGER.info(self.stress_cmd)
-        docker = RemoteDocker(loader, CDCLOG_READER_IMAGE,
-                              extra_docker_opts=f'--network=host --label shell_marker={self.shell_marker}')
-
         node_cmd = f'STRESS_TEST_MARKER={self.shell_marker}; {self.stress_cmd}'
 
         CDCReaderStressEvent.start(node=loader, stress_cmd=self.stress_cmd).publish()
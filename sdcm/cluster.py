@@ -27,7 +27,7 @@ import uuid
 import itertools
 import json
 import ipaddress
-from typing import List, Optional, Dict, Union, Set, Iterable
+from typing import List, Optional, Dict, Union, Set, Iterable, Tuple
 from datetime import datetime
 from textwrap import dedent
 from functools import cached_property, wraps
@@ -101,6 +101,9 @@ from sdcm.utils.ldap import LDAP_SSH_TUNNEL_LOCAL_PORT, LDAP_BASE_OBJECT, LDAP_P
 from sdcm.utils.remote_logger import get_system_logging_thread
 from sdcm.utils.scylla_args import ScyllaArgParser
 from sdcm.utils.file import File
+from sdcm.utils.cql_session_pool import CQLSessionPool
+from sdcm.utils.capacity_sampler import CapacitySampler, CFSTATS_SPACE_USED
+from sdcm.utils.backtrace_decoder import BacktraceDecoder
 from sdcm.utils import cdc
 from sdcm.coredump import CoredumpExportSystemdThread
 from sdcm.keystore import KeyStore
@@ -122,6 +125,8 @@ TEST_USER = 'scylla-test'
 INSTALL_DIR = f"/home/{TEST_USER}/scylladb"
 
 SPOT_TERMINATION_CHECK_DELAY = 5
+DECODE_BATCH_SIZE = 1000  # backtraces decoded at once on the monitor node
+DB_INIT_COMPLETED_MESSAGE = "initialization completed"  # e.g., `init - Scylla version 4.4.0 initialization completed.'
 
 LOGGER = logging.getLogger(__name__)
 
@@ -242,6 +247,7 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
             ' !INFO    | dhclient['
         ]
         self.termination_event = threading.Event()
+        self.db_up_wake_event = threading.Event()  # set when Scylla reports in the log that it has been initialized
         self.lock = threading.Lock()
 
         self._running_nemesis = None
@@ -1036,7 +1042,7 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         text = None
         if verbose:
             text = '%s: Waiting for SSH to be up' % self
-        wait.wait_for(func=self.remoter.is_up, step=10, text=text, timeout=timeout, throw_exc=True)
+        wait.wait_for(func=self.remoter.is_up, step=2, max_step=10, text=text, timeout=timeout, throw_exc=True)
 
     def is_port_used(self, port: int, service_name: str) -> bool:
         # Check that "ss" is present and install if absent
@@ -1187,7 +1193,11 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         text = None
         if verbose:
             text = '%s: Waiting for DB services to be up' % self
-        wait.wait_for(func=self.db_up, step=60, text=text, timeout=timeout, throw_exc=True)
+        wait.wait_for(func=self.db_up, step=5, max_step=60, text=text, timeout=timeout, throw_exc=True,
+                      wake_event=self.db_up_wake_event)
+        self.mark_db_init_finished()
+
+    def mark_db_init_finished(self):
         self.db_init_finished = True
         try:
             self._report_housekeeping_uuid()
@@ -1345,6 +1355,10 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
                             LOGGER.debug(line)
                 if json_log:
                     continue
+                if DB_INIT_COMPLETED_MESSAGE in line:
+                    self.db_up_wake_event.set()
+                    if (cluster_wake_event := getattr(self.parent_cluster, "db_up_wake_event", None)) is not None:
+                        cluster_wake_event.set()
                 match = BACKTRACE_RE.search(line)
                 one_line_backtrace = []
                 if match and backtraces:
@@ -1420,11 +1434,11 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
 
         for backtrace in backtraces:
             if self.test_config.BACKTRACE_DECODING and backtrace["event"].raw_backtrace:
-                scylla_debug_info = self.get_scylla_debuginfo_file()
-                self.log.debug("Debug info file %s", scylla_debug_info)
+                scylla_debug_info, scylla_build_id = self.scylla_debuginfo
                 self.test_config.DECODING_QUEUE.put({
                     "node": self,
                     "debug_file": scylla_debug_info,
+                    "build_id": scylla_build_id,
                     "event": backtrace["event"],
                 })
             else:
@@ -1437,31 +1451,37 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         self._decoding_backtraces_thread.start()
 
     def decode_backtrace(self):
-        scylla_debug_file = None
-        while True:
-            event = None
-            obj = None
+        decoder = BacktraceDecoder(
+            copy_debug_file=self.copy_scylla_debug_info,
+            addr2line=lambda debug_file, addresses: self.decode_raw_backtrace(debug_file, addresses).stdout)
+        stop = False
+        while not stop:
+            items = []
             try:
-                obj = self.test_config.DECODING_QUEUE.get(timeout=5)
-                if obj is None:
-                    self.test_config.DECODING_QUEUE.task_done()
-                    break
-                event = obj["event"]
-                if not scylla_debug_file:
-                    scylla_debug_file = self.copy_scylla_debug_info(obj["node"], obj["debug_file"])
-                output = self.decode_raw_backtrace(scylla_debug_file, " ".join(event.raw_backtrace.split('\n')))
-                event.backtrace = output.stdout
-                self.test_config.DECODING_QUEUE.task_done()
+                items.append(self.test_config.DECODING_QUEUE.get(timeout=5))
+                # decode all backtraces queued so far at once, they share most of their addresses during stall storms
+                while len(items) < DECODE_BATCH_SIZE:
+                    items.append(self.test_config.DECODING_QUEUE.get_nowait())
             except queue.Empty:
                 pass
+            if None in items:
+                stop = True
+                items.remove(None)
+            try:
+                decoder.decode(items)
             except Exception as details:  # pylint: disable=broad-except
                 self.log.error("failed to decode backtrace %s", details)
             finally:
-                if event:
-                    event.publish()
+                for item in items:
+                    item["event"].publish()
+                for _ in range(len(items) + stop):
+                    self.test_config.DECODING_QUEUE.task_done()
+            if items:
+                self.log.debug("Decoded %s backtraces: %s", len(items), dict(decoder.stats))
 
             if self.termination_event.isSet() and self.test_config.DECODING_QUEUE.empty():
                 break
+        decoder.shutdown()
 
     def copy_scylla_debug_info(self, node, debug_file):
         """Copy scylla debug file from db-node to monitor-node
@@ -1511,6 +1531,13 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
                 return build_id_result.stdout.strip()
         return None
 
+    @cached_property
+    def scylla_debuginfo(self) -> Tuple[str, Optional[str]]:
+        """Path to the scylla debug information and the build id of scylla (None, if it's unknown)."""
+        scylla_debug_info = self.get_scylla_debuginfo_file()
+        self.log.debug("Debug info file %s", scylla_debug_info)
+        return scylla_debug_info, self.get_scylla_build_id()
+
     def get_scylla_debuginfo_file(self):
         """
         Lookup the scylla debug information, in various places it can be.
@@ -2288,6 +2315,7 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
     def forget_scylla_version(self) -> None:
         self.__dict__.pop("scylla_version_detailed", None)
         self.__dict__.pop("scylla_version", None)
+        self.__dict__.pop("scylla_debuginfo", None)
 
     @log_run_info("Detecting disks")
     def detect_disks(self, nvme=True):
@@ -3285,6 +3313,7 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
 
     def destroy(self):
         self.log.info('Destroy nodes')
+        self.cql_session_pool.close()
         for node in self.nodes:
             node.destroy()
 
@@ -3342,11 +3371,24 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
                 return node
         return None
 
+    @cached_property
+    def cql_session_pool(self) -> CQLSessionPool:
+        return CQLSessionPool()
+
+    @staticmethod
+    def _setup_session(session):
+        # temporarily increase client-side timeout to 1m to determine
+        # if the cluster is simply responding slowly to requests
+        session.default_timeout = 60.0
+
+        # override driver default consistency level of LOCAL_QUORUM
+        session.default_consistency_level = ConsistencyLevel.ONE
+
     def _create_session(self, node, keyspace, user, password, compression,
                         # pylint: disable=too-many-arguments, too-many-locals
                         protocol_version, load_balancing_policy=None,
                         port=None, ssl_opts=None, node_ips=None, connect_timeout=None,
-                        verbose=True):
+                        verbose=True, pooled=True):
         if not port:
             port = node.CQL_PORT
 
@@ -3364,54 +3406,60 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
         if ssl_opts is None and self.params.get('client_encrypt'):
             ssl_opts = {'ca_certs': './data_dir/ssl_conf/client/catest.pem'}
         self.log.debug(str(ssl_opts))
-        cluster_driver = ClusterDriver(node_ips, auth_provider=auth_provider,
-                                       compression=compression,
-                                       protocol_version=protocol_version,
-                                       load_balancing_policy=load_balancing_policy,
-                                       default_retry_policy=FlakyRetryPolicy(),
-                                       port=port, ssl_options=ssl_opts,
-                                       connect_timeout=connect_timeout)
-        session = cluster_driver.connect()
 
-        # temporarily increase client-side timeout to 1m to determine
-        # if the cluster is simply responding slowly to requests
-        session.default_timeout = 60.0
+        def create_cluster_driver():
+            return ClusterDriver(node_ips, auth_provider=auth_provider,
+                                 compression=compression,
+                                 protocol_version=protocol_version,
+                                 load_balancing_policy=load_balancing_policy,
+                                 default_retry_policy=FlakyRetryPolicy(),
+                                 port=port, ssl_options=ssl_opts,
+                                 connect_timeout=connect_timeout)
+
+        if pooled:
+            key = (tuple(node_ips), credentials, compression, protocol_version, port,
+                   tuple(sorted(ssl_opts.items())) if ssl_opts else None, connect_timeout)
+            return self.cql_session_pool.acquire(key=key, topology=frozenset(self.get_node_external_ips()),
+                                                 create_cluster=create_cluster_driver,
+                                                 setup_session=self._setup_session,
+                                                 keyspace=keyspace, verbose=verbose)
+
+        cluster_driver = create_cluster_driver()
+        session = cluster_driver.connect()
+        self._setup_session(session)
 
         if keyspace is not None:
             session.set_keyspace(keyspace)
 
-        # override driver default consistency level of LOCAL_QUORUM
-        session.default_consistency_level = ConsistencyLevel.ONE
-
         return ScyllaCQLSession(session, cluster_driver, verbose)
 
     def cql_connection(self, node, keyspace=None, user=None,  # pylint: disable=too-many-arguments
                        password=None, compression=True, protocol_version=None,
-                       port=None, ssl_opts=None, connect_timeout=100, verbose=True):
+                       port=None, ssl_opts=None, connect_timeout=100, verbose=True, pooled=True):
         node_ips = self.get_node_external_ips()
         wlrr = WhiteListRoundRobinPolicy(node_ips)
         return self._create_session(node=node, keyspace=keyspace, user=user, password=password,
                                     compression=compression, protocol_version=protocol_version,
                                     load_balancing_policy=wlrr, port=port, ssl_opts=ssl_opts, node_ips=node_ips,
-                                    connect_timeout=connect_timeout, verbose=verbose)
+                                    connect_timeout=connect_timeout, verbose=verbose, pooled=pooled)
 
     def cql_connection_exclusive(self, node, keyspace=None, user=None,  # pylint: disable=too-many-arguments
                                  password=None, compression=True,
                                  protocol_version=None, port=None,
-                                 ssl_opts=None, connect_timeout=100, verbose=True):
+                                 ssl_opts=None, connect_timeout=100, verbose=True, pooled=True):
         node_ips = [node.external_address]
         wlrr = WhiteListRoundRobinPolicy(node_ips)
         return self._create_session(node=node, keyspace=keyspace, user=user, password=password,
                                     compression=compression, protocol_version=protocol_version,
                                     load_balancing_policy=wlrr, port=port, ssl_opts=ssl_opts, node_ips=node_ips,
-                                    connect_timeout=connect_timeout, verbose=verbose)
+                                    connect_timeout=connect_timeout, verbose=verbose, pooled=pooled)
 
     @retrying(n=8, sleep_time=15, allowed_exceptions=(NoHostAvailable,))
     def cql_connection_patient(self, node, keyspace=None,
                                # pylint: disable=too-many-arguments,unused-argument
                                user=None, password=None,
                                compression=True, protocol_version=None,
-                               port=None, ssl_opts=None, connect_timeout=100, verbose=True):
+                               port=None, ssl_opts=None, connect_timeout=100, verbose=True, pooled=True):
         """
         Returns a connection after it stops throwing NoHostAvailables.
 
@@ -3427,7 +3475,7 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
                                          user=None, password=None,
                                          compression=True,
                                          protocol_version=None,
-                                         port=None, ssl_opts=None, connect_timeout=100, verbose=True):
+                                         port=None, ssl_opts=None, connect_timeout=100, verbose=True, pooled=True):
         """
         Returns a connection after it stops throwing NoHostAvailables.
 
@@ -3642,6 +3690,7 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
 
     def __init__(self, *args, **kwargs):
         self.nemesis_termination_event = threading.Event()
+        self.db_up_wake_event = threading.Event()  # set when Scylla reports in the log of any node that it has been initialized
         self.nemesis = []
         self.nemesis_threads = []
         self.nemesis_count = 0
@@ -4079,6 +4128,15 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
                 break
         return node_status
 
+    def wait_for_db_up(self, nodes=None, timeout=3600):
+        """Wait for DB services to be up on all nodes in one loop."""
+        nodes = nodes or self.nodes
+        wait.wait_for_all({node: node.db_up for node in nodes}, step=5, max_step=60, timeout=timeout,
+                          text=f"{self}: Waiting for DB services to be up on {len(nodes)} nodes",
+                          wake_event=self.db_up_wake_event)
+        for node in nodes:
+            node.mark_db_init_finished()
+
     @retrying(n=60, sleep_time=3, allowed_exceptions=NETWORK_EXCEPTIONS + (ClusterNodesNotReady,),
               message="Waiting for nodes to join the cluster")
     def wait_for_nodes_up_and_normal(self, nodes=None, verification_node=None):
@@ -4099,6 +4157,10 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         ks_names_index = [i for i, ks in enumerate(out) if '--------' in ks][0]
         return [ks.strip() for ks in out[ks_names_index + 1:-3] if 'system' not in ks]
 
+    @cached_property
+    def capacity_sampler(self) -> CapacitySampler:
+        return CapacitySampler(cluster=self, scylla_dir=SCYLLA_DIR)
+
     def cfstat_reached_threshold(self, key, threshold, keyspaces=None):
         """
         Find whether a certain cfstat key in all nodes reached a certain value.
@@ -4114,13 +4176,16 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
 
         self.log.debug("Waiting for threshold: %s" % (threshold))
         node = self.nodes[0]
-        node_space = 0
         # Calculate space on the disk of all test keyspaces on the one node.
         # It's decided to check the threshold on one node only
-        for keyspace_name in keyspaces:
-            self.log.debug("Get cfstats on the node %s for %s keyspace" %
-                           (node.name, keyspace_name))
-            node_space += node.get_cfstats(keyspace_name)[key]
+        if key == CFSTATS_SPACE_USED:
+            node_space = self.capacity_sampler.space_used(keyspaces, nodes=[node])[node]
+        else:
+            node_space = 0
+            for keyspace_name in keyspaces:
+                self.log.debug("Get cfstats on the node %s for %s keyspace" %
+                               (node.name, keyspace_name))
+                node_space += node.get_cfstats(keyspace_name)[key]
         self.log.debug("Current cfstats on the node %s for %s keyspaces: %s" %
                        (node.name, keyspaces, node_space))
         reached_threshold = True
@@ -4136,10 +4201,12 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         if size:
             if keyspace and not isinstance(keyspace, list):
                 keyspace = [keyspace]
-            key = 'Space used (total)'
-            wait.wait_for(func=self.cfstat_reached_threshold, step=10, timeout=300,
-                          text="Waiting until cfstat '%s' reaches value '%s'" % (key, size),
-                          key=key, threshold=size, keyspaces=keyspace, throw_exc=False)
+            # It's decided to check the threshold on one node only
+            node = self.nodes[0]
+            self.capacity_sampler.wait_for(
+                sample=lambda: self.capacity_sampler.space_used(keyspace or self.get_test_keyspaces(), nodes=[node]),
+                condition=lambda space_used: space_used[node] >= size, timeout=300,
+                text="Waiting until cfstat '%s' reaches value '%s'" % (CFSTATS_SPACE_USED, size))
 
     def add_nemesis(self, nemesis, tester_obj):
         for nem in nemesis:
@@ -4725,9 +4792,12 @@ class BaseLoaderSet():
                                  str(loader), str(ex))
 
     def kill_docker_loaders(self):
+        from sdcm.utils.docker_remote import get_docker_pool  # pylint: disable=import-outside-toplevel
+
         for loader in self.nodes:
             try:
                 loader.remoter.run(cmd='docker ps -a -q | docker rm -f', verbose=False, ignore_status=True)
+                get_docker_pool(loader).clear()
             except Exception as ex:  # pylint: disable=broad-except
                 self.log.warning("failed to kill docker stress command on [%s]: [%s]",
                                  str(loader), str(ex))
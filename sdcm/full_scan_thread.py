@@ -9,6 +9,7 @@ from cassandra.query import SimpleStatement  # pylint: disable=no-name-in-module
 from sdcm.cluster import BaseNode, BaseScyllaCluster, BaseCluster
 from sdcm.sct_events import Severity
 from sdcm.sct_events.database import FullScanEvent
+from sdcm.utils.token_range_scan import DEFAULT_PAGE_SIZE, TokenRangeScanner
 
 
 # pylint: disable=too-many-instance-attributes
@@ -20,13 +21,18 @@ class FullScanThread:
 
     # pylint: disable=too-many-arguments
     def __init__(self, db_cluster: [BaseScyllaCluster, BaseCluster], ks_cf: str, duration: int, interval: int,
-                 termination_event: threading.Event, page_size: int = 100000):
+                 termination_event: threading.Event, page_size: int = 100000, parallelism: int = 0,
+                 verify_counts: bool = False):
         self.ks_cf = ks_cf
         self.db_cluster = db_cluster
         self.page_size = page_size
         self.duration = duration
         self.interval = interval
         self.termination_event = termination_event
+        # Scan by token ranges in parallel if `parallelism' is set, otherwise run one `SELECT *' per scan.
+        # Pages are smaller in this case, because `parallelism' pages are kept in memory at once.
+        self.scanner = TokenRangeScanner(parallelism=parallelism, page_size=min(page_size, DEFAULT_PAGE_SIZE),
+                                         verify_counts=verify_counts) if parallelism else None
         self.log = logging.getLogger(self.__class__.__name__)
         self._thread = threading.Thread(daemon=True, name=self.__class__.__name__, target=self.run)
 
@@ -65,7 +71,39 @@ class FullScanThread:
         username, password = credentials if credentials else (None, None)
         return self.db_cluster.cql_connection_patient(db_node, user=username, password=password)
 
+    def run_token_range_fullscan(self, db_node: BaseNode):
+        ks_cf = self.get_ks_cs(db_node)
+        self.scanner.bypass_cache = random.choice([True, False])
+        FullScanEvent.start(db_node_ip=db_node.ip_address, ks_cf=ks_cf).publish()
+        stop_event_severity = None
+        stop_event_message = 'finished successfully'
+        try:
+            with self.create_session(db_node) as session:
+                stats = self.scanner.scan(session, ks_cf, splits=db_node.scylla_shards,
+                                          stop_event=self.termination_event)
+            if stats.terminated:
+                stop_event_message = 'terminated'
+            elif stats.failed:
+                stop_event_message = f"{stats.summary()}, first error: {stats.failed[0].error}"
+                stop_event_severity = self.get_error_severity_from_exception(str(stats.failed[0].error), db_node)
+            elif stats.count_mismatches:
+                stop_event_message = stats.summary()
+                stop_event_severity = Severity.WARNING
+            else:
+                stop_event_message = stats.summary()
+        except Exception as exc:  # pylint: disable=broad-except
+            stop_event_message = str(exc)
+            stop_event_severity = self.get_error_severity_from_exception(stop_event_message, db_node)
+        finally:
+            FullScanEvent.finish(
+                db_node_ip=db_node.ip_address, ks_cf=ks_cf,
+                message=stop_event_message, **{'severity': stop_event_severity} if stop_event_severity else {}
+            ).publish()
+
     def run_fullscan(self, db_node: BaseNode):  # pylint: disable=too-many-locals
+        if self.scanner:
+            self.run_token_range_fullscan(db_node)
+            return
         ks_cf = self.get_ks_cs(db_node)
         read_pages = random.choice([100, 1000, 0])
         FullScanEvent.start(db_node_ip=db_node.ip_address, ks_cf=ks_cf).publish()
@@ -20,6 +20,7 @@ import json
 import time
 
 from sdcm.sct_events import Severity
+from sdcm.remote.base import OutputTailWatcher
 from sdcm.utils.common import FileFollowerThread
 from sdcm.sct_events.loaders import GeminiStressEvent, GeminiStressLogEvent
 
@@ -122,7 +123,8 @@ class GeminiStressThread:  # pylint: disable=too-many-instance-attributes
                 result = node.remoter.run(cmd=gemini_cmd,
                                           timeout=self.timeout,
                                           ignore_status=False,
-                                          log_file=log_file_name)
+                                          log_file=log_file_name,
+                                          watchers=[OutputTailWatcher()])
                 # sleep to gather all latest log messages
                 time.sleep(5)
             except Exception as details:  # pylint: disable=broad-except
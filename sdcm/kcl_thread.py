@@ -22,7 +22,7 @@ from functools import cached_property
 from typing import Dict
 
 from sdcm.stress_thread import format_stress_cmd_error, DockerBasedStressThread
-from sdcm.utils.docker_remote import RemoteDocker
+from sdcm.utils.docker_remote import get_docker_pool
 from sdcm.sct_events.system import InfoEvent
 from sdcm.sct_events.loaders import KclStressEvent
 from sdcm.cluster import BaseNode
@@ -32,6 +32,7 @@ LOGGER = logging.getLogger(__name__)
 
 
 class KclStressThread(DockerBasedStressThread):  # pylint: disable=too-many-instance-attributes
+    DOCKER_IMAGE = "scylladb/hydra-loaders:kcl-jdk8-20210526-ShardSyncStrategyType-PERIODIC"
 
     def run(self):
         _self = super().run()
@@ -48,9 +49,20 @@ class KclStressThread(DockerBasedStressThread):  # pylint: disable=too-many-inst
                      f"-e http://{target_address}:{self.params.get('alternator_port')} \'"
         return stress_cmd
 
+    def docker_images(self):
+        return [self.DOCKER_IMAGE]
+
+    @staticmethod
+    def warmup(docker):
+        """Start the Gradle daemon and compile the tool once per container, runs in the container reuse it."""
+        docker.run(cmd="cd /hydra-kcl && ./gradlew classes", ignore_status=True, verbose=False)
+
     def _run_stress(self, loader, loader_idx, cpu_idx):
-        docker = RemoteDocker(loader, "scylladb/hydra-loaders:kcl-jdk8-20210526-ShardSyncStrategyType-PERIODIC",
-                              extra_docker_opts=f'--label shell_marker={self.shell_marker}')
+        with get_docker_pool(loader).container(self.DOCKER_IMAGE, owner=self.shell_marker,
+                                               setup=self.warmup, setup_key="warmup") as docker:
+            return self._run_stress_in_container(docker, loader, loader_idx, cpu_idx)
+
+    def _run_stress_in_container(self, docker, loader, loader_idx, cpu_idx):
         stress_cmd = self.build_stress_cmd()
 
         if not os.path.exists(loader.logdir):
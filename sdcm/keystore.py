@@ -13,25 +13,132 @@
 
 import os
 import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
 
 import boto3
 import paramiko
-from mypy_boto3_s3.service_resource import S3ServiceResource
+from botocore.exceptions import BotoCoreError, ClientError
+from cryptography.fernet import Fernet, InvalidToken
+from mypy_boto3_s3.client import S3Client
 
 
+LOGGER = logging.getLogger(__name__)
+
 KEYSTORE_S3_BUCKET = "scylla-qa-keystore"
+KEYSTORE_CACHE_TTL = 3600  # seconds
+KEYSTORE_CACHE_DIR = os.path.expanduser("~/.sct/keystore-cache")
+KEYSTORE_CACHE_KEY_ENV = "SCT_KEYSTORE_CACHE_KEY"  # a Fernet key, see `Fernet.generate_key()'
+PREFETCH_FILES = ("es.json", "email_config.json", )
 
 SSHKey = namedtuple("SSHKey", ["name", "public_key", "private_key"])
 
 
+class EncryptedDiskCache:
+    """Copies of keystore files encrypted by a Fernet key, to run when S3 is not available (e.g., offline.)"""
+
+    def __init__(self, key: bytes, cache_dir: str = KEYSTORE_CACHE_DIR):
+        self.fernet = Fernet(key)
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def from_environ(cls) -> Optional["EncryptedDiskCache"]:
+        if key := os.environ.get(KEYSTORE_CACHE_KEY_ENV):
+            return cls(key=key.encode())
+        return None
+
+    def _entry_path(self, file_name: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(file_name.encode()).hexdigest())
+
+    def get(self, file_name: str) -> Optional[bytes]:
+        try:
+            with open(self._entry_path(file_name), "rb") as entry:
+                return self.fernet.decrypt(entry.read())
+        except (OSError, InvalidToken):
+            return None
+
+    def put(self, file_name: str, contents: bytes) -> None:
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # write to a temporary file first, so other processes never read a partial entry
+            with tempfile.NamedTemporaryFile("wb", dir=self.cache_dir, delete=False, suffix=".tmp") as tmp_file:
+                tmp_file.write(self.fernet.encrypt(contents))
+            os.replace(tmp_file.name, self._entry_path(file_name))
+        except OSError as exc:
+            LOGGER.debug("Failed to write keystore cache entry of %s: %s", file_name, exc)
+
+
 class KeyStore:
+    """Access to the QA keystore bucket.
+
+    All instances share one S3 client and an in-memory cache of the files, which are kept for `cache_ttl' seconds.
+    If `SCT_KEYSTORE_CACHE_KEY' environment variable is set, files are also stored on disk encrypted by this key
+    and are used when S3 is not available.
+
+    Usage:
+        >>> KeyStore().prefetch()  # download files used on hot paths in parallel
+        >>> KeyStore().get_elasticsearch_credentials()  # no S3 round trip after the prefetch
+    """
+
+    cache_ttl = KEYSTORE_CACHE_TTL
+    _s3_client: Optional[S3Client] = None
+    _lock = threading.Lock()
+    _file_locks: Dict[str, threading.Lock] = {}
+    _cache: Dict[str, Tuple[float, bytes]] = {}
+
     def __init__(self):
-        self.s3: S3ServiceResource = boto3.resource("s3")
+        self.disk_cache = EncryptedDiskCache.from_environ()
+
+    @property
+    def s3(self) -> S3Client:
+        with self._lock:
+            if KeyStore._s3_client is None:
+                KeyStore._s3_client = boto3.client("s3")
+            return KeyStore._s3_client
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
 
     def get_file_contents(self, file_name):
-        obj = self.s3.Object(KEYSTORE_S3_BUCKET, file_name)
-        return obj.get()["Body"].read()
+        with self._lock:
+            file_lock = self._file_locks.setdefault(file_name, threading.Lock())
+        with file_lock:
+            timestamp, contents = self._cache.get(file_name, (0, None))
+            if contents is None or time.time() - timestamp > self.cache_ttl:
+                contents = self._download(file_name)
+                self._cache[file_name] = (time.time(), contents)
+            return contents
+
+    def _download(self, file_name):
+        try:
+            contents = self.s3.get_object(Bucket=KEYSTORE_S3_BUCKET, Key=file_name)["Body"].read()
+        except (BotoCoreError, ClientError) as exc:
+            if self.disk_cache is None or (contents := self.disk_cache.get(file_name)) is None:
+                raise
+            LOGGER.warning("Failed to download %s from the keystore, use the cached copy: %s", file_name, exc)
+            return contents
+        if self.disk_cache is not None:
+            self.disk_cache.put(file_name, contents)
+        return contents
+
+    def prefetch(self, file_names: Iterable[str] = PREFETCH_FILES):
+        """Download files concurrently to the cache, failures are ignored (and raised on the first actual use.)"""
+        def fetch(file_name):
+            try:
+                self.get_file_contents(file_name)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.debug("Failed to prefetch %s from the keystore: %s", file_name, exc)
+        file_names = list(file_names)
+        with ThreadPoolExecutor(max_workers=max(len(file_names), 1)) as executor:
+            list(executor.map(fetch, file_names))
 
     def get_json(self, json_file):
         # deepcode ignore replace~read~decode~json.loads: is done automatically
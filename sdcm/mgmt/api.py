@@ -0,0 +1,189 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Scylla Manager REST API client
+
+The Manager server listens on the localhost of the manager node only, so requests go through an SSH tunnel
+(auto_ssh container), or, if the node has no SSH login info (e.g., Docker backend), by `curl' on the node itself.
+States of all tasks of a cluster are fetched by one request and cached for `snapshot_ttl' seconds, so all
+`ManagerTask' objects of the cluster which poll their status within the same interval share one round trip.
+"""
+
+import json
+import time
+import shlex
+import logging
+import weakref
+import threading
+import datetime
+from functools import cached_property
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from invoke.exceptions import UnexpectedExit, Failure
+
+from sdcm.mgmt.common import ScyllaManagerError
+from sdcm.utils.common import get_free_port, wait_for_port
+from sdcm.utils.docker_utils import ContainerManager
+
+LOGGER = logging.getLogger(__name__)
+
+MANAGER_API_CONTAINER = "auto_ssh:manager_api"
+MANAGER_API_PORTS = (5080, 56080, )  # the old port goes last
+SNAPSHOT_TTL = 5  # seconds
+REQUEST_TIMEOUT = 30  # seconds
+
+_CLIENTS = weakref.WeakKeyDictionary()
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_manager_api_client(manager_node) -> "ManagerApiClient":
+    """Return the client shared by all Manager objects of the node."""
+    with _CLIENTS_LOCK:
+        if manager_node not in _CLIENTS:
+            _CLIENTS[manager_node] = ManagerApiClient(manager_node=manager_node)
+        return _CLIENTS[manager_node]
+
+
+def parse_api_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse the RFC 3339 time of Manager API responses, e.g., `2021-03-26T19:40:21.123Z'."""
+    if not value or value.startswith("0001-01-01"):  # zero value of Go's time.Time
+        return None
+    return datetime.datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+
+
+def progress_percentage(task_type: str, progress: dict) -> Optional[float]:
+    """Calculate the progress of a run the same way sctool does (as a percentage.)"""
+    if task_type == "repair":
+        total, done = progress.get("token_ranges", 0), progress.get("success", 0)
+    elif task_type == "backup":
+        total, done = progress.get("size", 0), progress.get("uploaded", 0) + progress.get("skipped", 0)
+    else:
+        return None
+    return done * 100 / total if total else 0.0
+
+
+class ManagerApiClient:
+    """JSON client of Scylla Manager REST API with a shared snapshot of task states.
+
+    Usage:
+        >>> client = get_manager_api_client(manager_node)
+        >>> client.task(cluster_id, task_id)["status"]  # from the snapshot of all tasks of the cluster
+        >>> client.progress(cluster_id, task_id)  # e.g., 42.5
+        >>> client.get(f"cluster/{cluster_id}/tasks", params={"type": "repair"})
+    """
+
+    def __init__(self, manager_node, snapshot_ttl: float = SNAPSHOT_TTL):
+        self.manager_node = manager_node
+        self.snapshot_ttl = snapshot_ttl
+        self._lock = threading.Lock()
+        self._snapshot_locks: Dict[Any, threading.Lock] = {}
+        self._snapshots: Dict[Any, Tuple[float, Any]] = {}
+
+    @cached_property
+    def use_tunnel(self) -> bool:
+        return bool(self.manager_node.ssh_login_info)
+
+    @cached_property
+    def port(self) -> int:
+        for port in MANAGER_API_PORTS:
+            result = self.manager_node.remoter.run(
+                f'curl --write-out "%{{http_code}}\\n" --silent --output /dev/null "http://127.0.0.1:{port}/ping"',
+                ignore_status=True, verbose=False)
+            if result.stdout.strip() == "204":
+                return port
+        raise ScyllaManagerError(f"Scylla Manager server on {self.manager_node} doesn't answer on {MANAGER_API_PORTS}")
+
+    @cached_property
+    def base_url(self) -> str:
+        if not self.use_tunnel:
+            return f"http://127.0.0.1:{self.port}/api/v1/"
+        LOGGER.debug("Start auto_ssh for Scylla Manager API on %s", self.manager_node)
+        ContainerManager.run_container(self.manager_node, MANAGER_API_CONTAINER,
+                                       local_port=self.port,
+                                       remote_port=get_free_port(),
+                                       ssh_mode="-L")
+        port = int(ContainerManager.get_environ(self.manager_node, MANAGER_API_CONTAINER)["SSH_TUNNEL_REMOTE"])
+        wait_for_port("127.0.0.1", port)
+        return f"http://127.0.0.1:{port}/api/v1/"
+
+    def get(self, path: str, params: Optional[dict] = None) -> Any:
+        url = self.base_url + path
+        if params:
+            url += "?" + urlencode(params)
+        LOGGER.debug("Scylla Manager API request: GET %s", url)
+        if self.use_tunnel:
+            try:
+                response = requests.get(url, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+                return response.json()
+            except (requests.RequestException, ValueError) as exc:
+                raise ScyllaManagerError(f"Scylla Manager API request GET {url} failed: {exc}") from exc
+        try:
+            return json.loads(self.manager_node.remoter.run(f"curl --silent --show-error --fail {shlex.quote(url)}",
+                                                            verbose=False).stdout)
+        except (UnexpectedExit, Failure, ValueError) as exc:
+            raise ScyllaManagerError(f"Scylla Manager API request GET {url} failed: {exc}") from exc
+
+    def _cached(self, key, fetch):
+        with self._lock:
+            snapshot_lock = self._snapshot_locks.setdefault(key, threading.Lock())
+        with snapshot_lock:
+            timestamp, value = self._snapshots.get(key, (0, None))
+            if value is None or time.time() - timestamp > self.snapshot_ttl:
+                value = fetch()
+                self._snapshots[key] = (time.time(), value)
+            return value
+
+    def invalidate(self, cluster_id: Optional[str] = None) -> None:
+        """Drop cached snapshots (of the cluster), e.g., after the task was started or stopped."""
+        with self._lock:
+            for key in list(self._snapshots):
+                if cluster_id is None or key[1] == cluster_id:
+                    self._snapshots.pop(key, None)
+
+    def tasks(self, cluster_id: str) -> Dict[str, dict]:
+        """Return a snapshot of states of all tasks of the cluster by task id."""
+        return self._cached(("tasks", cluster_id), lambda: {
+            task["id"]: task for task in self.get(f"cluster/{cluster_id}/tasks", params={"all": "true"}) or []})
+
+    def task(self, cluster_id: str, task_id: str) -> dict:
+        """Return the state of the task, `task_id' can be in sctool format too, e.g., `repair/<uuid>'."""
+        uuid = task_id.rpartition("/")[2]
+        task = self.tasks(cluster_id).get(uuid)
+        if task is None:
+            self.invalidate(cluster_id)  # the task might have been created after the snapshot was taken
+            task = self.tasks(cluster_id).get(uuid)
+        if task is None:
+            raise ScyllaManagerError(f"Task {task_id} not found in cluster {cluster_id}")
+        return task
+
+    def _task_path(self, cluster_id: str, task_id: str) -> str:
+        task = self.task(cluster_id, task_id)
+        return f"cluster/{cluster_id}/task/{task['type']}/{task['id']}"
+
+    def run_progress(self, cluster_id: str, task_id: str, run_id: str = "latest") -> dict:
+        return self._cached(("progress", cluster_id, task_id, run_id),
+                            lambda: self.get(f"{self._task_path(cluster_id, task_id)}/{run_id}"))
+
+    def progress(self, cluster_id: str, task_id: str) -> Optional[float]:
+        """Return the progress of the latest run as a percentage, or None if it's not known."""
+        task_type = self.task(cluster_id, task_id)["type"]
+        return progress_percentage(task_type, self.run_progress(cluster_id, task_id).get("progress") or {})
+
+    def history(self, cluster_id: str, task_id: str, limit: int = 0) -> list:
+        """Return runs of the task, the latest one first."""
+        params = {"limit": limit} if limit else None
+        return self.get(f"{self._task_path(cluster_id, task_id)}/history", params=params) or []
@@ -25,6 +25,7 @@ import requests
 from invoke.exceptions import UnexpectedExit, Failure
 
 from sdcm import wait
+from sdcm.mgmt.api import get_manager_api_client, parse_api_time
 from sdcm.mgmt.common import \
     TaskStatus, ScyllaManagerError, HostStatus, HostSsl, HostRestStatus, duration_to_timedelta, DEFAULT_TASK_TIMEOUT
 from sdcm.utils.distro import Distro
@@ -59,6 +60,7 @@ class ManagerTask:
     def __init__(self, task_id, cluster_id, manager_node):
         self.manager_node = manager_node
         self.sctool = SCTool(manager_node=manager_node)
+        self.api = get_manager_api_client(manager_node)
         self.id = task_id  # pylint: disable=invalid-name
         self.cluster_id = cluster_id
 
@@ -68,6 +70,7 @@ class ManagerTask:
     def stop(self):
         cmd = "task stop {} -c {}".format(self.id, self.cluster_id)
         self.sctool.run(cmd=cmd, is_verify_errorless_result=True)
+        self.api.invalidate(self.cluster_id)
         return self.wait_and_get_final_status(timeout=30, step=3)
 
     def start(self, continue_task=True):
@@ -75,6 +78,7 @@ class ManagerTask:
         if not continue_task:
             cmd += " --no-continue"
         self.sctool.run(cmd=cmd, is_verify_errorless_result=True)
+        self.api.invalidate(self.cluster_id)
 
     @staticmethod
     def _add_kwargs_to_cmd(cmd, **kwargs):
@@ -103,26 +107,19 @@ class ManagerTask:
     @property
     def next_run(self):
         """
-        Gets the task's next run value
+        Gets the task's next run value, e.g., `19 Nov 18 00:00:00 UTC' (or an empty string if none)
         """
-        # ╭──────────────────────────────────────────────────┬───────────────────────────────┬──────┬────────────┬────────╮
-        # │ task                                             │ next run                      │ ret. │ properties │ status │
-        # ├──────────────────────────────────────────────────┼───────────────────────────────┼──────┼────────────┼────────┤
-        # │ healthcheck/7fb6f1a7-aafc-4950-90eb-dc64729e8ecb │ 18 Nov 18 20:32:08 UTC (+15s) │ 0    │            │ NEW    │
-        # │ repair/22b68423-4332-443d-b8b4-713005ea6049      │ 19 Nov 18 00:00:00 UTC (+7d)  │ 3    │            │ NEW    │
-        # ╰──────────────────────────────────────────────────┴───────────────────────────────┴──────┴────────────┴────────╯
-        cmd = "task list -c {}".format(self.cluster_id)
-        res = self.sctool.run(cmd=cmd, is_verify_errorless_result=True)
-        return self.get_property(parsed_table=res, column_name='next run')
+        next_activation = parse_api_time(self.api.task(self.cluster_id, self.id).get("next_activation"))
+        if next_activation is None:
+            return ""
+        return f"{next_activation.strftime('%d %b %y %H:%M:%S')} UTC"
 
     @property
     def latest_run_id(self):
-        history = self.history
-        all_dates = self.sctool.get_all_column_values_from_table(history, "start time")
-        latest_run_date = self.get_max_date(all_dates)
-        latest_run_id = self.sctool.get_table_value(parsed_table=history, column_name="id",
-                                                    identifier=latest_run_date)
-        return latest_run_id
+        history = self.api.history(self.cluster_id, self.id, limit=1)
+        if not history:
+            raise ScyllaManagerError(f"Task {self.id} has no runs")
+        return history[0]["id"]
 
     @staticmethod
     def get_max_date(date_list):
@@ -143,22 +140,16 @@ class ManagerTask:
         """
         Gets the task's status
         """
-        cmd = "task list -c {}".format(self.cluster_id)
-        # expecting output of:
-        # ╭─────────────────────────────────────────────┬───────────────────────────────┬──────┬────────────┬────────╮
-        # │ task                                        │ next run                      │ ret. │ properties │ status │
-        # ├─────────────────────────────────────────────┼───────────────────────────────┼──────┼────────────┼────────┤
-        # │ repair/2a4125d6-5d5a-45b9-9d8d-dec038b3732d │ 05 Nov 18 00:00 UTC (+7 days) │ 3    │            │ DONE   │
-        # │ repair/dd98f6ae-bcf4-4c98-8949-573d533bb789 │                               │ 3    │            │ DONE   │
-        # ╰─────────────────────────────────────────────┴───────────────────────────────┴──────┴────────────┴────────╯
-        res = self.sctool.run(cmd=cmd)
-        str_status = self.get_property(parsed_table=res, column_name='status')
+        # read from the snapshot of all tasks of the cluster, which is shared by all task objects, e.g.:
+        # {"id": "2a4125d6-5d5a-45b9-9d8d-dec038b3732d", "type": "repair", "status": "DONE", "failures": 0, ...}
+        task = self.api.task(self.cluster_id, self.id)
+        status = TaskStatus.from_str(task.get("status") or TaskStatus.NEW)
         # The manager will sometimes retry a task a few times if it's defined this way, and so in the case of
-        # a failure in the task the manager can present the task's status as 'ERROR (#/4)'
-        tmp = str_status.split()
-        if ' '.join(tmp[0:1]) == 'ERROR (4/4)':
+        # a failure in the task the status is final only when there are no retries left, i.e., `sctool' shows
+        # `ERROR (<failures>/<num_retries + 1>)' with both numbers equal
+        if status == TaskStatus.ERROR and task.get("failures", 0) > (task.get("schedule") or {}).get("num_retries", 0):
             return TaskStatus.ERROR_FINAL
-        return TaskStatus.from_str(tmp[0])
+        return status
 
     @property
     def arguments(self) -> str:
@@ -177,28 +168,11 @@ class ManagerTask:
         """
         if self.status in [TaskStatus.NEW, TaskStatus.STARTING]:
             return " 0%"
-        cmd = "task progress {} -c {}".format(self.id, self.cluster_id)
-        res = self.sctool.run(cmd=cmd)
-        # expecting output of:
-        #  Status:           RUNNING
-        #  Start time:       26 Mar 19 19:40:21 UTC
-        #  Duration: 6s
-        #  Progress: 0.12%
-        #  Datacenters:
-        #    - us-eastscylla_node_east
-        #  ╭────────────────────┬───────╮
-        #  │ system_auth        │ 0.47% │
-        #  │ system_distributed │ 0.00% │
-        #  │ system_traces      │ 0.00% │
-        #  │ keyspace1          │ 0.00% │
-        #  ╰────────────────────┴───────╯
-        # [['Status: RUNNING'], ['Start time: 26 Mar 19 19:40:21 UTC'], ['Duration: 6s'], ['Progress: 0.12%'], ... ]
-        progress = "N/A"
-        for task_property in res:
-            if task_property[0].startswith("Progress"):
-                progress = task_property[0].split(':')[1]
-                break
-        return progress
+        # calculated from the progress of the latest run, e.g., {"token_ranges": 1536, "success": 2, ...} is 0.13%
+        percentage = self.api.progress(self.cluster_id, self.id)
+        if percentage is None:
+            return "N/A"
+        return f" {round(percentage, 2):g}%"
 
     @property
     def detailed_progress(self):
@@ -264,9 +238,9 @@ class ManagerTask:
 
     def wait_for_status(self, list_status, check_task_progress=True, timeout=3600, step=120):
         text = "Waiting until task: {} reaches status of: {}".format(self.id, list_status)
-        is_status_reached = wait.wait_for(func=self.is_status_in_list, step=step, throw_exc=True,
-                                          text=text, list_status=list_status, check_task_progress=check_task_progress,
-                                          timeout=timeout)
+        is_status_reached = wait.wait_for(func=self.is_status_in_list, step=min(step, 5), max_step=step,
+                                          throw_exc=True, text=text, list_status=list_status,
+                                          check_task_progress=check_task_progress, timeout=timeout)
         return is_status_reached
 
     def wait_for_percentage(self, minimum_percentage, timeout=3600, step=10):
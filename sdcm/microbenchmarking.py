@@ -9,10 +9,12 @@ import argparse
 import socket
 import tempfile
 from collections import defaultdict
+from functools import partial
 import contextlib
 
 # disable InsecureRequestWarning
 import urllib3
+from elasticsearch.helpers import bulk
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from sdcm.results_analyze import BaseResultsAnalyzer  # pylint: disable=wrong-import-position
@@ -24,6 +26,10 @@ setup_stdout_logger()
 LOGGER = logging.getLogger("microbenchmarking")
 LOGGER.setLevel(logging.DEBUG)
 
+MSEARCH_BATCH_SIZE = 200  # searches per multi-search request
+REGRESSION_THRESHOLD = -5  # [%]
+IMPROVEMENT_THRESHOLD = 50  # [%]
+
 
 @contextlib.contextmanager
 def chdir(dirname=None):
@@ -36,7 +42,7 @@ def chdir(dirname=None):
         os.chdir(curdir)
 
 
-class LargeNumberOfDatasetsException(Exception):
+class EmptyResultFolder(Exception):
     def __init__(self, msg, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.message = msg
@@ -45,13 +51,46 @@ class LargeNumberOfDatasetsException(Exception):
         return "MBM: {0.message}".format(self)
 
 
-class EmptyResultFolder(Exception):
-    def __init__(self, msg, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.message = msg
+def make_test_type(test_set, test_args, dataset_name=None):
+    """Name results of a test, the dataset is a part of the name only if the test set has more than one dataset."""
+    if dataset_name is None:
+        return f"{test_set}_{test_args}"
+    return f"{test_set}_{dataset_name}_{test_args}"
 
-    def __str__(self):
-        return "MBM: {0.message}".format(self)
+
+def quote_query_string(value):
+    return '"{}"'.format(str(value).replace("\\", "\\\\").replace('"', '\\"'))
+
+
+class MicroBenchmarkingFrame:  # pylint: disable=too-few-public-methods
+    """Results of a run and their baselines as columns, one row per test type.
+
+    Prior results are sorted once per test type, and then every metric is a few columns (current value, last and
+    best baselines), so deltas and regression flags are computed column by column and not in nested loops per test.
+
+    Usage:
+        >>> frame = MicroBenchmarkingFrame(current_results, prior_results, metrics=("frag/s", "avg aio"))
+        >>> frame.column("frag/s", "Diff last [%]")  # a value per test type in `frame.test_types' order
+    """
+
+    def __init__(self, current_results, prior_results, metrics, run_date_pattern):
+        self.test_types = [test_type for test_type in current_results if prior_results.get(test_type)]
+        self.current = [current_results[test_type] for test_type in self.test_types]
+        self.prior = [sorted(prior_results[test_type],
+                             key=lambda doc: datetime.datetime.strptime(doc["_source"]["test_run_date"],
+                                                                        run_date_pattern))
+                      for test_type in self.test_types]
+        self.metrics = metrics
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.test_types)
+
+    def column(self, metric, name):
+        return self._columns[(metric, name)]
+
+    def set_column(self, metric, name, values):
+        self._columns[(metric, name)] = list(values)
 
 
 class MicroBenchmarkingResultsAnalyzer(BaseResultsAnalyzer):  # pylint: disable=too-many-instance-attributes
@@ -59,6 +98,23 @@ class MicroBenchmarkingResultsAnalyzer(BaseResultsAnalyzer):  # pylint: disable=
     higher_better = ('frag/s',)
     lower_better = ('avg aio',)
     submetrics = {'frag/s': ['mad f/s', 'max f/s', 'min f/s']}
+    prior_tests_start_date = datetime.datetime(2019, 1, 1)
+    prior_tests_filter_path = (
+        "hits.hits._id",  # '2018-04-02_18:36:47_large-partition-skips_[64-32.1)'
+        "hits.hits._source.test_args",  # [64-32.1)
+        "hits.hits.test_group_properties.name",  # large-partition-skips
+        "hits.hits._source.hostname",  # 'godzilla.cloudius-systems.com'
+        "hits.hits._source.test_run_date",
+        "hits.hits._source.test_group_properties.name",  # large-partition-skips
+        "hits.hits._source.results.stats.aio",
+        "hits.hits._source.results.stats.avg aio",
+        "hits.hits._source.results.stats.cpu",
+        "hits.hits._source.results.stats.time (s)",
+        "hits.hits._source.results.stats.frag/s",
+        "hits.hits._source.versions",
+        "hits.hits._source.excluded"
+    )
+    prior_tests_additional_filter = '((-_exists_:excluded) OR (excluded:false))'
 
     def __init__(self, email_recipients, db_version=None):
         super().__init__(
@@ -78,59 +134,139 @@ class MicroBenchmarkingResultsAnalyzer(BaseResultsAnalyzer):  # pylint: disable=
         self.cur_version_info = None
         self.metrics = self.higher_better + self.lower_better
 
-    def _get_prior_tests(self, filter_path, additional_filter=''):
+    def _prior_tests_query(self, additional_filter=''):
         query = f"hostname:'{self.hostname}' AND versions.scylla-server.version:{self.db_version[:3]}*"
         if additional_filter:
             query += " AND " + additional_filter
+        return query
+
+    def _get_prior_tests(self, filter_path, additional_filter=''):
         output = self._es.search(
             index=self._es_index,
             filter_path=filter_path,
             size=self._limit,  # pylint: disable=unexpected-keyword-arg
-            q=query)
+            q=self._prior_tests_query(additional_filter))
         return output
 
-    def check_regression(self, current_results):  # pylint: disable=arguments-differ
-        # pylint: disable=too-many-locals, too-many-statements
+    def group_prior_tests(self, docs):
+        """Group prior results by test type, results of runs before `prior_tests_start_date' are skipped."""
+        grouped = defaultdict(list)
+        for doc in docs:
+            source = doc['_source']
+            doc_date = datetime.datetime.strptime(source['versions']['scylla-server']['run_date_time'],
+                                                  "%Y-%m-%d %H:%M:%S")
+            if doc_date <= self.prior_tests_start_date:
+                continue
+            test_set = source["test_group_properties"]["name"]
+            grouped[make_test_type(test_set, source["test_args"])].append(doc)
+            if source.get("dataset_name"):
+                grouped[make_test_type(test_set, source["test_args"], source["dataset_name"])].append(doc)
+        return grouped
 
+    def _get_prior_tests_by_type(self, current_results, filter_path, additional_filter=''):
+        """Fetch prior results of every test type, one search per test type in a few multi-search requests.
+
+        Unlike one big search, this doesn't hit the size limit of a search when there are thousands of test types.
+        """
+        base_query = self._prior_tests_query(additional_filter)
+        # keep `status' of every response, otherwise responses without hits are filtered out of the list
+        filter_path = ["responses.status", "responses.hits.hits._source.dataset_name"] + \
+            ["responses." + path for path in filter_path]
+        test_types = list(current_results)
+        prior_results = {}
+        for idx in range(0, len(test_types), MSEARCH_BATCH_SIZE):
+            batch = test_types[idx:idx + MSEARCH_BATCH_SIZE]
+            body = []
+            for test_type in batch:
+                current_result = current_results[test_type]
+                query = " AND ".join((
+                    base_query,
+                    f"test_group_properties.name:{quote_query_string(current_result['test_group_properties']['name'])}",
+                    f"test_args:{quote_query_string(current_result['test_args'])}",
+                ))
+                body.extend(({"index": self._es_index}, {"size": self._limit, "query": {"query_string": {"query": query}}}))
+            self.log.info("Fetch prior results of %s test types", len(batch))
+            responses = self._es.msearch(body=body, filter_path=filter_path)["responses"]  # pylint: disable=unexpected-keyword-arg
+            for test_type, response in zip(batch, responses):
+                prior_results[test_type] = self.group_prior_tests(response.get("hits", {}).get("hits", []))[test_type]
+        return prior_results
+
+    @staticmethod
+    def _metric_value(stats, metric):
+        value = stats.get(metric, None)
+        return float(value) if value else None
+
+    def _count_diff(self, metric, cur_val, dif_val):
+        if not cur_val or dif_val is None:
+            return None
+
+        ret_dif = ((cur_val - dif_val) / dif_val) * 100 if dif_val > 0 else cur_val * 100
+
+        if metric in self.higher_better:
+            ret_dif = -ret_dif
+
+        return -ret_dif if ret_dif != 0 else 0
+
+    def _best_prior_result(self, prior, metric):
+        # results where the metric is 0 are included, if there are no results with the metric (which could happen
+        # for a new metric), then the first one is returned, because its value is None
+        with_metric = [doc for doc in prior
+                       if self._metric_value(doc["_source"]["results"]["stats"], metric) is not None]
+        if not with_metric or metric not in self.higher_better + self.lower_better:
+            return prior[0]
+        choose = max if metric in self.higher_better else min
+        return choose(with_metric, key=lambda doc: self._metric_value(doc["_source"]["results"]["stats"], metric))
+
+    def _last_prior_result(self, prior):
+        if len(prior) > 1 and prior[-1]["_source"]['versions']['scylla-server']['commit_id'] == \
+                self.cur_version_info["commit_id"]:
+            return prior[-2]
+        return prior[-1]  # when current results are on disk but db is not updated
+
+    def compute_regressions(self, frame):
+        """Fill `Current', baselines, diffs and regression flags columns of every metric of the frame."""
+        last_results = [self._last_prior_result(prior) for prior in frame.prior]
+        for metric in frame.metrics:
+            self.log.info("Analyzing %s for %s test types", metric, len(frame))
+            best_results = [self._best_prior_result(prior, metric) for prior in frame.prior]
+            current = [result["results"]["stats"].get(metric, None) for result in frame.current]
+            current = [float(value) if value else value for value in current]
+            last = [self._metric_value(doc["_source"]["results"]["stats"], metric) for doc in last_results]
+            best = [self._metric_value(doc["_source"]["results"]["stats"], metric) for doc in best_results]
+            diff_last = list(map(partial(self._count_diff, metric), current, last))
+            diff_best = list(map(partial(self._count_diff, metric), current, best))
+            frame.set_column(metric, "Current", current)
+            frame.set_column(metric, "Last, commit, date", zip(last, *self._commits_and_dates(last_results)))
+            frame.set_column(metric, "Best, commit, date", zip(best, *self._commits_and_dates(best_results)))
+            frame.set_column(metric, "Diff last [%]", diff_last)
+            frame.set_column(metric, "Diff best [%]", diff_best)
+            frame.set_column(metric, "has_regression", (
+                bool((d_last and d_last < REGRESSION_THRESHOLD) or (d_best and d_best < REGRESSION_THRESHOLD))
+                for d_last, d_best in zip(diff_last, diff_best)))
+            frame.set_column(metric, "has_improvement", (
+                bool((d_last and d_last > IMPROVEMENT_THRESHOLD) or (d_best and d_best > IMPROVEMENT_THRESHOLD))
+                for d_last, d_best in zip(diff_last, diff_best)))
+
+    @staticmethod
+    def _commits_and_dates(docs):
+        versions = [doc["_source"]['versions']['scylla-server'] for doc in docs]
+        return ([version['commit_id'] for version in versions],
+                [datetime.datetime.strptime(version['date'], "%Y%m%d").date() for version in versions])
+
+    def check_regression(self, current_results):  # pylint: disable=arguments-differ
         if not current_results:
             return {}
 
-        start_date = datetime.datetime.strptime("2019-01-01", "%Y-%m-%d")
-        filter_path = (
-            "hits.hits._id",  # '2018-04-02_18:36:47_large-partition-skips_[64-32.1)'
-            "hits.hits._source.test_args",  # [64-32.1)
-            "hits.hits.test_group_properties.name",  # large-partition-skips
-            "hits.hits._source.hostname",  # 'godzilla.cloudius-systems.com'
-            "hits.hits._source.test_run_date",
-            "hits.hits._source.test_group_properties.name",  # large-partition-skips
-            "hits.hits._source.results.stats.aio",
-            "hits.hits._source.results.stats.avg aio",
-            "hits.hits._source.results.stats.cpu",
-            "hits.hits._source.results.stats.time (s)",
-            "hits.hits._source.results.stats.frag/s",
-            "hits.hits._source.versions",
-            "hits.hits._source.excluded"
-        )
-
         self.db_version = self.cur_version_info["version"]
-        tests_filtered = self._get_prior_tests(
-            filter_path,
-            additional_filter='((-_exists_:excluded) OR (excluded:false))'
-        )
-        assert tests_filtered, "No results from DB"
-
-        results = []
-        for doc in tests_filtered['hits']['hits']:
-            doc_date = datetime.datetime.strptime(
-                doc['_source']['versions']['scylla-server']['run_date_time'], "%Y-%m-%d %H:%M:%S")
-            if doc_date > start_date:
-                results.append(doc)
+        prior_results = self._get_prior_tests_by_type(current_results,
+                                                      self.prior_tests_filter_path,
+                                                      additional_filter=self.prior_tests_additional_filter)
+        for test_type in current_results:
+            if not prior_results.get(test_type):
+                self.log.warning("No results for '%s' in DB. Skipping", test_type)
 
-        sorted_by_type = defaultdict(list)
-        for res in results:
-            test_type = "%s_%s" % (res["_source"]["test_group_properties"]["name"],
-                                   res["_source"]["test_args"])
-            sorted_by_type[test_type].append(res)
+        frame = MicroBenchmarkingFrame(current_results, prior_results, self.metrics, self._run_date_pattern)
+        self.compute_regressions(frame)
 
         report_results = defaultdict(dict)
         # report_results = {
@@ -151,127 +287,20 @@ class MicroBenchmarkingResultsAnalyzer(BaseResultsAnalyzer):  # pylint: disable=
         #               "Diff best [%]":
         #           },
         # }
-
-        def set_results_for(current_result, metrica):
-            list_of_results_from_db.sort(key=lambda x: datetime.datetime.strptime(x["_source"]["test_run_date"],
-                                                                                  self._run_date_pattern))
-
-            def get_metrica_val(val):
-                metrica_val = val["_source"]["results"]["stats"].get(metrica, None)
-                return float(metrica_val) if metrica_val else None
-
-            def get_commit_id(val):
-                return val["_source"]['versions']['scylla-server']['commit_id']
-
-            def get_commit_date(val):
-                return datetime.datetime.strptime(val["_source"]['versions']['scylla-server']['date'],
-                                                  "%Y%m%d").date()
-
-            def get_best_result_for_metrica():
-                # build new list with results where analyzing metrica is not None
-                # metrica s with result 0, will be included
-
-                list_for_searching = [el for el in list_of_results_from_db if get_metrica_val(el) is not None]
-
-                # if list is empty ( which could be happened for new metric),
-                # then return first element in list, because result will be None
-                if not list_for_searching:
-                    return list_of_results_from_db[0]
-                if metrica in self.higher_better:
-                    return max(list_for_searching, key=get_metrica_val)
-                elif metrica in self.lower_better:
-                    return min(list_for_searching, key=get_metrica_val)
-                else:
-                    return list_of_results_from_db[0]
-
-            def count_diff(cur_val, dif_val):
-                try:
-                    cur_val = float(cur_val) if cur_val else None
-                except ValueError:
-                    cur_val = None
-
-                if not cur_val:
-                    return None
-
-                if dif_val is None:
-                    return None
-
-                ret_dif = ((cur_val - dif_val) / dif_val) * 100 if dif_val > 0 else cur_val * 100
-
-                if metrica in self.higher_better:
-                    ret_dif = -ret_dif
-
-                ret_dif = -ret_dif if ret_dif != 0 else 0
-
-                return ret_dif
-
-            def get_diffs(cur_val, best_result_val, last_val):
-                # if last result doesn't contain the metric
-                # assign 0 to last value to count formula of changes
-
-                diff_best = count_diff(cur_val, best_result_val)
-                diff_last = count_diff(cur_val, last_val)
-
-                return (diff_last, diff_best)
-
-            if len(list_of_results_from_db) > 1 and get_commit_id(list_of_results_from_db[-1]) == self.cur_version_info["commit_id"]:
-                last_idx = -2
-            else:  # when current results are on disk but db is not updated
-                last_idx = -1
-
-            cur_val = current_result["results"]["stats"].get(metrica, None)
-            if cur_val:
-                cur_val = float(cur_val)
-
-            last_val = get_metrica_val(list_of_results_from_db[last_idx])
-            last_commit = get_commit_id(list_of_results_from_db[last_idx])
-            last_commit_date = get_commit_date(list_of_results_from_db[last_idx])
-
-            best_result = get_best_result_for_metrica()
-            best_result_val = get_metrica_val(best_result)
-            best_result_commit = get_commit_id(best_result)
-            best_commit_date = get_commit_date(best_result)
-
-            diff_last, diff_best = get_diffs(cur_val, best_result_val, last_val)
-
-            stats = {
-                "Current": cur_val,
-                "Last, commit, date": (last_val, last_commit, last_commit_date),
-                "Best, commit, date": (best_result_val, best_result_commit, best_commit_date),
-                "Diff last [%]": diff_last,  # diff in percents
-                "Diff best [%]": diff_best,
-                "has_regression": False,
-                "has_improvement": False,
-
-            }
-
-            if ((diff_last and diff_last < -5) or (diff_best and diff_best < -5)):
-                report_results[test_type]["has_diff"] = True
-                stats["has_regression"] = True
-
-            if ((diff_last and diff_last > 50) or (diff_best and diff_best > 50)):
-                report_results[test_type]['has_improve'] = True
-                stats['has_improvement'] = True
-
+        stats_names = ("Current", "Last, commit, date", "Best, commit, date", "Diff last [%]", "Diff best [%]",
+                       "has_regression", "has_improvement", )
+        for row, (test_type, current_result) in enumerate(zip(frame.test_types, frame.current)):
             report_results[test_type]["dataset_name"] = current_result['dataset_name']
-            report_results[test_type][metrica] = stats
-
-        def set_results_for_sub(current_result, metrica):
-            report_results[test_type][metrica].update({'Stats': {}})
-            for submetrica in self.submetrics.get(metrica):
-                submetrica_cur_val = float(current_result["results"]["stats"][submetrica])
-                report_results[test_type][metrica]['Stats'].update({submetrica: submetrica_cur_val})
-
-        for test_type, current_result in current_results.items():
-            list_of_results_from_db = sorted_by_type[test_type]
-            if not list_of_results_from_db:
-                self.log.warning("No results for '%s' in DB. Skipping", test_type)
-                continue
-            for metrica in self.metrics:
-                self.log.info("Analyzing %s:%s", test_type, metrica)
-                set_results_for(current_result, metrica)
-                if metrica in list(self.submetrics.keys()):
-                    set_results_for_sub(current_result, metrica)
+            for metric in frame.metrics:
+                stats = report_results[test_type][metric] = {name: frame.column(metric, name)[row]
+                                                             for name in stats_names}
+                if stats["has_regression"]:
+                    report_results[test_type]["has_diff"] = True
+                if stats["has_improvement"]:
+                    report_results[test_type]["has_improve"] = True
+                if metric in self.submetrics:
+                    stats["Stats"] = {submetric: float(current_result["results"]["stats"][submetric])
+                                      for submetric in self.submetrics[metric]}
 
         return report_results
 
@@ -311,13 +340,13 @@ class MicroBenchmarkingResultsAnalyzer(BaseResultsAnalyzer):  # pylint: disable=
         bad_chars = " "
         with chdir(os.path.join(results_path, "perf_fast_forward_output")):
             results = {}
+            multiple_datasets = set()
             for (fullpath, subdirs, files) in os.walk(os.getcwd()):
                 self.log.info(fullpath)
                 if (os.path.dirname(fullpath).endswith('perf_fast_forward_output') and
                         len(subdirs) > 1):
-                    raise LargeNumberOfDatasetsException('Test set {} has more than one datasets: {}'.format(
-                        os.path.basename(fullpath),
-                        subdirs))
+                    self.log.info('Test set %s has more than one dataset: %s', os.path.basename(fullpath), subdirs)
+                    multiple_datasets.add(os.path.basename(fullpath))
 
                 if not subdirs:
                     dataset_name = os.path.basename(fullpath)
@@ -329,7 +358,8 @@ class MicroBenchmarkingResultsAnalyzer(BaseResultsAnalyzer):  # pylint: disable=
                             continue
                         new_filename = "".join(c for c in filename if c not in bad_chars)
                         test_args = os.path.splitext(new_filename)[0]
-                        test_type = dirname + "_" + test_args
+                        test_type = make_test_type(dirname, test_args,
+                                                   dataset_name if dirname in multiple_datasets else None)
                         json_path = os.path.join(dirname, dataset_name, filename)
                         with open(json_path, 'r') as json_file:
                             self.log.info("Reading: %s", json_path)
@@ -340,16 +370,26 @@ class MicroBenchmarkingResultsAnalyzer(BaseResultsAnalyzer):  # pylint: disable=
                                           'dataset_name': dataset_name,
                                           'excluded': False
                                           })
-                        if update_db:
-                            self._es.create_doc(index=self._es_index, doc_type=self._es_doc_type,
-                                                doc_id="%s_%s" % (self.test_run_date, test_type), body=datastore)
                         results[test_type] = datastore
             if not results:
                 raise EmptyResultFolder("perf_fast_forward_output folder is empty")
+            if update_db:
+                self.upload_results(results)
 
             self.cur_version_info = results[list(results.keys())[0]]['versions']['scylla-server']
             return results
 
+    def upload_results(self, results):
+        """Upload results of all test types by bulk requests."""
+        self.log.info("Upload %s results to %s", len(results), self._es_index)
+        self._es._create_index(self._es_index)  # pylint: disable=protected-access
+        bulk(self._es, ({"_op_type": "update",
+                         "_index": self._es_index,
+                         "_type": self._es_doc_type,
+                         "_id": "%s_%s" % (self.test_run_date, test_type),
+                         "doc": datastore,
+                         "doc_as_upsert": True} for test_type, datastore in results.items()))
+
     def exclude_test_run(self, testrun_id=''):
         """Exclude test results by testrun id
 
@@ -1,17 +1,21 @@
 import logging
 import os
+import shutil
 import tarfile
 import zipfile
-import tempfile
 import json
 import datetime
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
 from textwrap import dedent
 
 import requests
+from boto3.s3.transfer import TransferConfig
 
 from sdcm.remote import LocalCmdRunner
-from sdcm.utils.common import list_logs_by_test_id, S3Storage, remove_files, get_free_port
+from sdcm.utils.common import list_logs_by_test_id, S3Storage, get_free_port
 from sdcm.utils.decorators import retrying
 
 
@@ -26,6 +30,16 @@ ALERT_DOCKER_PORT = get_free_port(ports_to_try=(9093, 0, ))
 PROMETHEUS_DOCKER_PORT = get_free_port(ports_to_try=(9090, 0, ))
 COMMAND_TIMEOUT = 1800
 
+MONITORING_STACK_CACHE_DIR = os.path.expanduser("~/.sct/monitoring-stacks")
+MONITORING_STACK_CACHE_SIZE = 3  # number of test runs
+MONITORING_DATA_ARCHIVE_PATTERN = "prometheus_data"
+MONITORING_STACK_ARCHIVE_PATTERN = "monitoring_data_stack"
+DOWNLOAD_TRANSFER_CONFIG = TransferConfig(multipart_threshold=64 * 1024 * 1024,
+                                          multipart_chunksize=64 * 1024 * 1024,
+                                          max_concurrency=16,
+                                          num_download_attempts=5)
+UPLOAD_WORKERS = 8
+
 
 class ErrorUploadSCTDashboard(Exception):
     pass
@@ -51,33 +65,26 @@ def restore_monitoring_stack(test_id, date_time=None):  # pylint: disable=too-ma
     #     }
 
     LOGGER.info('Restoring monitoring stack from archive %s', arch['file_path'])
-    monitoring_stack_base_dir = tempfile.mkdtemp()
-    LOGGER.info('Download file {} to directory {}'.format(arch['link'], monitoring_stack_base_dir))
-    downloaded_monitoring_archive = S3Storage().download_file(arch['link'],
-                                                              dst_dir=monitoring_stack_base_dir)
-    monitoring_data_arch = extract_monitoring_data_archive(downloaded_monitoring_archive,
-                                                           monitoring_stack_base_dir)
-    monitoring_stack_arch = extract_monitoring_stack_archive(downloaded_monitoring_archive,
-                                                             monitoring_stack_base_dir)
-
-    if not monitoring_data_arch:
-        LOGGER.error("No prometheus snapshot were found in arch %s", arch['file_path'])
-        return False
-    if not monitoring_stack_arch:
+    cache = MonitoringStackCache()
+    pipeline = MonitoringStackRestorePipeline(test_id=test_id, arch=arch, cache=cache)
+    pipeline.start()
+
+    # the monitoring stack is much smaller than Prometheus data and is ready first
+    monitoring_stack_dir = pipeline.monitoring_stack_dir.result()
+    if not monitoring_stack_dir:
         LOGGER.error("No monitoring stack archive were found in arch %s", arch['file_path'])
         return False
-
-    monitoring_data_dir = create_monitoring_data_dir(monitoring_stack_base_dir, monitoring_data_arch)
-    monitoring_stack_dir = create_monitoring_stack_dir(monitoring_stack_base_dir, monitoring_stack_arch)
-
-    if not monitoring_stack_dir or not monitoring_data_dir:
-        LOGGER.error('Creating monitoring stack directories failed:\ndata_dir: %s; stack_dir: %s',
-                     monitoring_data_dir, monitoring_stack_dir)
     _, scylla_version = get_monitoring_stack_scylla_version(monitoring_stack_dir)
 
+    monitoring_data_dir = pipeline.monitoring_data_dir.result()
+    if not monitoring_data_dir:
+        LOGGER.error("No prometheus snapshot were found in arch %s", arch['file_path'])
+        return False
+
     status = run_monitoring_stack_containers(monitoring_stack_dir, monitoring_data_dir, scylla_version)
     if not status:
         return False
+    cache.put(test_id, arch, monitoring_stack_dir, monitoring_data_dir)
 
     status = restore_grafana_dashboards_and_annotations(monitoring_stack_dir, scylla_version)
     if not status:
@@ -85,13 +92,182 @@ def restore_monitoring_stack(test_id, date_time=None):  # pylint: disable=too-ma
 
     status = verify_monitoring_stack(scylla_version)
     if not status:
-        remove_files(monitoring_stack_base_dir)
+        cache.remove(test_id, arch)
         return False
 
     LOGGER.info("Monitoring stack is running")
     return True
 
 
+class MonitoringStackCache:
+    """Extracted monitoring stacks of recently restored test runs, the least recently used ones are removed.
+
+    Usage:
+        >>> cache = MonitoringStackCache()
+        >>> cache.get(test_id, arch)  # (monitoring_stack_dir, monitoring_data_dir) or None
+        >>> base_dir = cache.prepare(test_id, arch)  # an empty directory to extract the archive to
+        >>> cache.put(test_id, arch, monitoring_stack_dir, monitoring_data_dir)
+    """
+
+    RESTORED_MARKER = ".restored.json"
+
+    def __init__(self, cache_dir=MONITORING_STACK_CACHE_DIR, size=MONITORING_STACK_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.size = size
+
+    def entry_dir(self, test_id, arch):
+        return os.path.join(self.cache_dir, test_id, os.path.basename(arch['file_path']))
+
+    def get(self, test_id, arch):
+        try:
+            with open(os.path.join(self.entry_dir(test_id, arch), self.RESTORED_MARKER)) as marker:
+                dirs = json.load(marker)
+        except (OSError, ValueError):
+            return None
+        if not all(os.path.isdir(dirs.get(key) or "") for key in ("monitoring_stack_dir", "monitoring_data_dir")):
+            return None
+        os.utime(os.path.join(self.cache_dir, test_id))
+        return dirs["monitoring_stack_dir"], dirs["monitoring_data_dir"]
+
+    def prepare(self, test_id, arch):
+        entry_dir = self.entry_dir(test_id, arch)
+        shutil.rmtree(entry_dir, ignore_errors=True)  # leftovers of an interrupted restore
+        os.makedirs(entry_dir)
+        return entry_dir
+
+    def put(self, test_id, arch, monitoring_stack_dir, monitoring_data_dir):
+        with open(os.path.join(self.entry_dir(test_id, arch), self.RESTORED_MARKER), "w") as marker:
+            json.dump({"monitoring_stack_dir": monitoring_stack_dir, "monitoring_data_dir": monitoring_data_dir}, marker)
+        os.utime(os.path.join(self.cache_dir, test_id))
+        self.evict()
+
+    def remove(self, test_id, arch):
+        shutil.rmtree(self.entry_dir(test_id, arch), ignore_errors=True)
+
+    def evict(self):
+        test_dirs = sorted((entry.path for entry in os.scandir(self.cache_dir) if entry.is_dir()),
+                           key=os.path.getmtime, reverse=True)
+        for test_dir in test_dirs[self.size:]:
+            LOGGER.info("Remove cached monitoring stack %s", test_dir)
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def extract_tar_stream(fileobj, extract_dir):
+    """Extract a (compressed) tar archive reading it sequentially, i.e., while it's downloading."""
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tar_file:
+        for member in tar_file:
+            if is_path_outside_of_dir(os.path.join(extract_dir, member.name), extract_dir):
+                LOGGER.warning('Skipping %s file it leads to outside of the target dir', member.name)
+                continue
+            tar_file.extract(member, extract_dir)
+
+
+class MonitoringStackRestorePipeline:
+    """Download a monitor-set archive and extract Prometheus data and the monitoring stack from it.
+
+    A tar archive is extracted while it's streaming from S3, a zip archive is downloaded by ranged GETs in parallel
+    (it can't be read before its central directory at the end is available) and both inner archives are extracted
+    from it concurrently.  Inner archives are never written to disk.  The results are futures, so the caller can go
+    on with the monitoring stack while Prometheus data is still extracting.
+
+    Usage:
+        >>> pipeline = MonitoringStackRestorePipeline(test_id=test_id, arch=arch)
+        >>> pipeline.start()
+        >>> pipeline.monitoring_stack_dir.result()  # a path or False
+        >>> pipeline.monitoring_data_dir.result()
+        >>> pipeline.cache.put(test_id, arch, monitoring_stack_dir, monitoring_data_dir)  # when both are ready
+    """
+
+    def __init__(self, test_id, arch, cache=None):
+        self.test_id = test_id
+        self.arch = arch
+        self.cache = cache or MonitoringStackCache()
+        self.base_dir = None
+        self.monitoring_stack_dir = Future()
+        self.monitoring_data_dir = Future()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="MonitoringStackRestore")
+
+    def start(self):
+        if cached := self.cache.get(self.test_id, self.arch):
+            LOGGER.info("Use monitoring stack restored before from %s", self.arch['file_path'])
+            self.monitoring_stack_dir.set_result(cached[0])
+            self.monitoring_data_dir.set_result(cached[1])
+            return
+        self.base_dir = self.cache.prepare(self.test_id, self.arch)
+        LOGGER.info('Download file %s to directory %s', self.arch['link'], self.base_dir)
+        self._executor.submit(self._fetch)
+        self._executor.shutdown(wait=False)
+
+    @property
+    def inner_archives(self):
+        return ((MONITORING_STACK_ARCHIVE_PATTERN, self.monitoring_stack_dir, self._extract_monitoring_stack),
+                (MONITORING_DATA_ARCHIVE_PATTERN, self.monitoring_data_dir, self._extract_monitoring_data), )
+
+    def _fetch(self):
+        try:
+            if self.arch['link'].endswith('.zip'):
+                self._fetch_zip()
+            elif self.arch['link'].endswith('.tar.gz'):
+                self._fetch_tar()
+            else:
+                LOGGER.error("Not supported archive type %s", self.arch['link'].split('.')[-1])
+        except Exception as details:  # pylint: disable=broad-except
+            LOGGER.error("Error during restoring monitoring stack archive %s: %s", self.arch['link'], details)
+        finally:
+            for _, future, _ in self.inner_archives:
+                if not future.done():
+                    future.set_result(False)
+
+    @staticmethod
+    def _resolve(future, extract, fileobj):
+        try:
+            future.set_result(extract(fileobj))
+        except Exception as details:  # pylint: disable=broad-except
+            LOGGER.error("Error during extracting %s: %s", getattr(fileobj, "name", fileobj), details)
+            future.set_result(False)
+
+    def _fetch_tar(self):
+        with closing(S3Storage().open_stream(self.arch['link'])) as stream, \
+                tarfile.open(fileobj=stream, mode="r|*") as tar_file:
+            for member in tar_file:
+                for pattern, future, extract in self.inner_archives:
+                    if member.isfile() and pattern in member.name and not future.done():
+                        self._resolve(future, extract, tar_file.extractfile(member))
+
+    def _fetch_zip(self):
+        archive = S3Storage().download_file(self.arch['link'], dst_dir=self.base_dir,
+                                            transfer_config=DOWNLOAD_TRANSFER_CONFIG)
+        if not archive:
+            return
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="MonitoringStackExtract") as executor:
+            for pattern, future, extract in self.inner_archives:
+                executor.submit(self._extract_from_zip, archive, pattern, future, extract)
+        os.remove(archive)
+
+    def _extract_from_zip(self, archive, pattern, future, extract):
+        with zipfile.ZipFile(archive) as zfile:
+            names = [name for name in zfile.namelist() if pattern in name]
+            if not names:
+                future.set_result(False)
+                return
+            with zfile.open(names[0]) as fileobj:
+                self._resolve(future, extract, fileobj)
+
+    def _extract_monitoring_stack(self, fileobj):
+        extract_tar_stream(fileobj, self.base_dir)
+        if not (monitoring_stack_dir := get_monitoring_stack_dir(self.base_dir)):
+            return False
+        LocalCmdRunner().run(f"chmod -R 777 {monitoring_stack_dir}", timeout=COMMAND_TIMEOUT, ignore_status=True)
+        return monitoring_stack_dir
+
+    def _extract_monitoring_data(self, fileobj):
+        monitoring_data_base_dir = os.path.join(self.base_dir, 'monitoring_data_dir')
+        os.makedirs(monitoring_data_base_dir, exist_ok=True)
+        extract_tar_stream(fileobj, monitoring_data_base_dir)
+        LocalCmdRunner().run(f"chmod -R 777 {monitoring_data_base_dir}", timeout=COMMAND_TIMEOUT, ignore_status=True)
+        return get_monitoring_data_dir(monitoring_data_base_dir)
+
+
 def get_monitoring_stack_archive(test_id, date_time):
     """Return monitor_set archive file info
 
@@ -135,99 +311,11 @@ def get_monitoring_stack_archive(test_id, date_time):
     return arch
 
 
-def create_monitoring_data_dir(base_dir, archive):
-    monitoring_data_base_dir = os.path.join(base_dir, 'monitoring_data_dir')
-    cmd = dedent("""
-        mkdir -p {data_dir}
-        cd {data_dir}
-        cp {archive} ./
-        tar -xvf {archive_name}
-        chmod -R 777 {data_dir}
-        """.format(data_dir=monitoring_data_base_dir,
-                   archive=archive,
-                   archive_name=os.path.basename(archive)))
-    result = LocalCmdRunner().run(cmd, timeout=COMMAND_TIMEOUT, ignore_status=True)
-    if result.exited > 0:
-        LOGGER.error("Error during extracting prometheus snapshot. Switch to next archive")
-        return False
-    return get_monitoring_data_dir(monitoring_data_base_dir)
-
-
-def create_monitoring_stack_dir(base_dir, archive):
-    cmd = dedent("""
-        cd {data_dir}
-        cp {archive} ./
-        tar -xvf {archive_name}
-        chmod -R 777 {data_dir}
-        """.format(data_dir=base_dir,
-                   archive_name=os.path.basename(archive),
-                   archive=archive))
-
-    result = LocalCmdRunner().run(cmd, timeout=COMMAND_TIMEOUT, ignore_status=True)
-    if result.exited > 0:
-        LOGGER.error("Error during extracting monitoring stack")
-        return False
-
-    return get_monitoring_stack_dir(base_dir)
-
-
-def extract_monitoring_stack_archive(downloaded_monitor_set_archive, monitoring_stack_base_dir):
-
-    return extract_file_from_archive('monitoring_data_stack',
-                                     downloaded_monitor_set_archive,
-                                     monitoring_stack_base_dir)
-
-
-def extract_monitoring_data_archive(downloaded_monitor_set_archive, monitoring_stack_base_dir):
-
-    return extract_file_from_archive('prometheus_data',
-                                     downloaded_monitor_set_archive,
-                                     monitoring_stack_base_dir)
-
-
-def extract_file_from_archive(pattern, archive, extract_dir):
-    if archive.endswith('.zip'):
-        return extract_file_from_zip_archive(pattern, archive, extract_dir)
-    if archive.endswith('.tar.gz'):
-        return extract_file_from_tar_archive(pattern, archive, extract_dir)
-    raise ValueError(f"Not supported archive type{archive.split('.')[-1]}")
-
-
-def extract_file_from_zip_archive(pattern, archive, extract_dir):
-    found_file = None
-    with zipfile.ZipFile(archive) as zfile:
-        for name in zfile.namelist():
-            if pattern in name:
-                target_dir = os.path.join(extract_dir, name)
-                if is_path_outside_of_dir(target_dir, extract_dir):
-                    LOGGER.warning('Skipping %s file it leads to outside of the target dir', name)
-                    continue
-                zfile.extract(name, extract_dir)
-                found_file = target_dir
-                break
-    return found_file
-
-
 def is_path_outside_of_dir(path, base) -> bool:
     real_base = os.path.realpath(base)
     return os.path.commonpath((os.path.realpath(path), real_base)) != real_base
 
 
-def extract_file_from_tar_archive(pattern, archive, extract_dir):
-    found_file = None
-    with tarfile.open(archive) as tar_file:
-        for name in tar_file.getnames():
-            if pattern in name:
-                target_dir = os.path.join(extract_dir, name)
-                if is_path_outside_of_dir(target_dir, extract_dir):
-                    LOGGER.warning('Skipping %s file it leads to outside of the target dir', name)
-                    continue
-                tar_file.extract(name, extract_dir)
-                found_file = target_dir
-                break
-    return found_file
-
-
 def get_monitoring_data_dir(base_dir):
     monitoring_data_dirs = [d for d in os.listdir(base_dir)
                             if os.path.isdir(os.path.join(base_dir, d))]
@@ -257,12 +345,15 @@ def get_monitoring_stack_scylla_version(monitoring_stack_dir):
 
 def restore_grafana_dashboards_and_annotations(monitoring_dockers_dir, scylla_version):
     status = []
-    try:
-        status.append(restore_sct_dashboards(monitoring_dockers_dir, scylla_version))
-        status.append(restore_annotations_data(monitoring_dockers_dir))
-    except Exception as details:  # pylint: disable=broad-except
-        LOGGER.error("Error during uploading sct monitoring data %s", details)
-        status.append(False)
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="GrafanaRestore") as executor:
+        uploads = (executor.submit(restore_sct_dashboards, monitoring_dockers_dir, scylla_version),
+                   executor.submit(restore_annotations_data, monitoring_dockers_dir))
+        for upload in uploads:
+            try:
+                status.append(upload.result())
+            except Exception as details:  # pylint: disable=broad-except
+                LOGGER.error("Error during uploading sct monitoring data %s", details)
+                status.append(False)
 
     return all(status)
 
@@ -325,13 +416,19 @@ def restore_annotations_data(monitoring_stack_dir):
             annotations = json.load(f)
 
         annotations_url = f"http://localhost:{GRAFANA_DOCKER_PORT}/api/annotations"
-        for an in annotations:  # pylint: disable=invalid-name
-            res = requests.post(annotations_url, data=json.dumps(an), headers={'Content-Type': 'application/json'})
+        # Grafana has no bulk API for annotations, so post them concurrently over keep-alive connections
+        with requests.Session() as session, \
+                ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="AnnotationsUpload") as executor:
+            session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=UPLOAD_WORKERS))
+            results = list(executor.map(partial(session.post, annotations_url,
+                                                headers={'Content-Type': 'application/json'}),
+                                        (json.dumps(an) for an in annotations)))  # pylint: disable=invalid-name
+        for an, res in zip(annotations, results):  # pylint: disable=invalid-name
             if res.status_code != 200:
                 LOGGER.info('Error during uploading annotation %s. Error message %s', an, res.text)
                 raise ErrorUploadAnnotations('Error during uploading annotation {}. Error message {}'.format(an,
                                                                                                              res.text))
-        LOGGER.info('Annotations loaded successfully')
+        LOGGER.info('%s annotations loaded successfully', len(annotations))
         return True
     except Exception as details:  # pylint: disable=broad-except
         LOGGER.error("Error during annotations data upload %s", details)
@@ -21,7 +21,7 @@ from typing import Any
 from sdcm.prometheus import nemesis_metrics_obj
 from sdcm.sct_events.loaders import NdBenchStressEvent, NDBENCH_ERROR_EVENTS_PATTERNS
 from sdcm.utils.common import FileFollowerThread
-from sdcm.utils.docker_remote import RemoteDocker
+from sdcm.utils.docker_remote import get_docker_pool
 from sdcm.stress_thread import format_stress_cmd_error, DockerBasedStressThread
 
 
@@ -111,6 +111,7 @@ class NdBenchStatsPublisher(FileFollowerThread):
 
 
 class NdBenchStressThread(DockerBasedStressThread):  # pylint: disable=too-many-instance-attributes
+    DOCKER_IMAGE = 'scylladb/hydra-loaders:ndbench-jdk8-20210720'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -121,7 +122,23 @@ class NdBenchStressThread(DockerBasedStressThread):  # pylint: disable=too-many-
         self.stress_cmd = f'./gradlew {timeout}' \
                           f' -Dndbench.config.cass.host={self.node_list[0].external_address} {self.stress_cmd} run'
 
+    def docker_images(self):
+        return [self.DOCKER_IMAGE]
+
+    @staticmethod
+    def warmup(docker):
+        """Start the Gradle daemon and compile the tool once per container, runs in the container reuse it."""
+        docker.run(cmd="./gradlew classes", ignore_status=True, verbose=False)
+
     def _run_stress(self, loader, loader_idx, cpu_idx):
+        pool = get_docker_pool(loader)
+        with pool.container(self.DOCKER_IMAGE, extra_docker_opts='--network=host', owner=self.shell_marker,
+                            setup=self.warmup, setup_key="warmup") as docker:
+            if (result := self._run_stress_in_container(docker, loader, loader_idx, cpu_idx)) is None:
+                pool.discard(docker)  # the command failed and might still be running in the container
+            return result
+
+    def _run_stress_in_container(self, docker, loader, loader_idx, cpu_idx):
         if not os.path.exists(loader.logdir):
             os.makedirs(loader.logdir, exist_ok=True)
         log_file_name = os.path.join(loader.logdir, f'ndbench-l{loader_idx}-c{cpu_idx}-{uuid.uuid4()}.log')
@@ -134,9 +151,6 @@ class NdBenchStressThread(DockerBasedStressThread):  # pylint: disable=too-many-
         else:
             node_cmd = self.stress_cmd
 
-        docker = RemoteDocker(loader, 'scylladb/hydra-loaders:ndbench-jdk8-20210720',
-                              extra_docker_opts=f'--network=host --label shell_marker={self.shell_marker}')
-
         node_cmd = f'STRESS_TEST_MARKER={self.shell_marker}; {node_cmd}'
 
         NdBenchStressEvent.start(node=loader, stress_cmd=self.stress_cmd).publish()
@@ -16,7 +16,6 @@
 """
 Classes that introduce disruption in clusters.
 """
-import copy
 import inspect
 import logging
 import random
@@ -68,6 +67,7 @@ from sdcm.utils.toppartition_util import NewApiTopPartitionCmd, OldApiTopPartiti
 from sdcm.remote.libssh2_client.exceptions import UnexpectedExit as Libssh2UnexpectedExit
 from sdcm.cluster_k8s import PodCluster, ScyllaPodCluster
 from sdcm.nemesis_publisher import NemesisElasticSearchPublisher
+from sdcm.nemesis_timeline import NemesisTimeline
 from test_lib.compaction import CompactionStrategy, get_compaction_strategy, get_compaction_random_additional_params
 from test_lib.cql_types import CQLTypeBuilder
 
@@ -145,13 +145,14 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         logger = logging.getLogger(__name__)
         self.log = SDCMAdapter(logger, extra={'prefix': str(self)})
         self.termination_event = termination_event
-        self.operation_log = []
+        self.timeline = getattr(tester_obj, "nemesis_timeline", None)
+        if self.timeline is None:
+            self.timeline = NemesisTimeline()
+        self.timeline_owner = f"{self}-{id(self):x}"  # a few threads of the same nemesis class may share the timeline
         self.current_disruption = None
-        self.duration_list = []
         self.error_list = []
         self.interval = 60 * self.tester.params.get('nemesis_interval')  # convert from min to sec
         self.start_time = time.time()
-        self.stats = {}
         self.metrics_srv = nemesis_metrics_obj()
         self.task_used_streaming = None
         self.filter_seed = self.cluster.params.get('nemesis_filter_seeds')
@@ -200,17 +201,26 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         setattr(cls, func.__name__, wrapper)  # bind it to Nemesis class
         return func  # returning func means func can still be used normally
 
+    @property
+    def stats(self):
+        """Runs and failures by disruption names, built from the records of this nemesis in the timeline."""
+        stats = {}
+        for record in self.timeline.records(owner=self.timeline_owner):
+            disrupt = record.pop('operation').split()[0]
+            del record['owner']
+            key = 'failures' if record.pop('outcome') == 'failure' else 'runs'
+            disrupt_stats = stats.setdefault(disrupt, {'runs': [], 'failures': [], 'cnt': 0})
+            disrupt_stats[key].append(record)
+            disrupt_stats['cnt'] += 1
+        return stats
+
     def update_stats(self, disrupt, status=True, data=None):
         if not data:
             data = {}
-        key = {True: 'runs', False: 'failures'}
-        if disrupt not in self.stats:
-            self.stats[disrupt] = {'runs': [], 'failures': [], 'cnt': 0}
-        self.stats[disrupt][key[status]].append(data)
-        self.stats[disrupt]['cnt'] += 1
         self.log.debug('Update nemesis info with: %s', data)
+        # the disruption is in the timeline already, the test document is updated by the publisher's thread
         if self.tester.create_stats:
-            self.tester.update({'nemesis': self.stats})
+            self.es_publisher.update_test_stats(lambda: {'nemesis': self.stats})
         if self.es_publisher:
             self.es_publisher.publish(disrupt_name=disrupt, status=status, data=data)
 
@@ -283,25 +293,37 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.log.info('Current Target: %s with running nemesis: %s',
                       self.target_node, self.target_node.running_nemesis)
 
+    @property
+    def operation_log(self):
+        return self.timeline.records(owner=self.timeline_owner)
+
+    @property
+    def duration_list(self):
+        return self.timeline.durations(owner=self.timeline_owner)
+
     @raise_event_on_failure
     def run(self, interval=None):
         self.es_publisher.create_es_connection()
         if interval:
             self.interval = interval * 60
         self.log.info('Interval: %s s', self.interval)
-        while not self.termination_event.is_set():
-            cur_interval = self.interval
-            try:
-                self.disrupt()
-            except UnsupportedNemesis:
-                cur_interval = 0
-            finally:
-                self.unset_current_running_nemesis(self.target_node)
-                self.termination_event.wait(timeout=cur_interval)
+        try:
+            while not self.termination_event.is_set():
+                cur_interval = self.interval
+                try:
+                    self.disrupt()
+                except UnsupportedNemesis:
+                    cur_interval = 0
+                finally:
+                    self.unset_current_running_nemesis(self.target_node)
+                    self.termination_event.wait(timeout=cur_interval)
+        finally:
+            self.es_publisher.stop()
 
     def report(self):
-        if self.duration_list:
-            avg_duration = sum(self.duration_list) / len(self.duration_list)
+        duration_list = self.duration_list
+        if duration_list:
+            avg_duration = sum(duration_list) / len(duration_list)
         else:
             avg_duration = 0
 
@@ -310,7 +332,7 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.log.info('Interval: %s s', self.interval)
         self.log.info('Average duration: %s s', avg_duration)
         self.log.info('Total execution time: %s s', int(time.time() - self.start_time))
-        self.log.info('Times executed: %s', len(self.duration_list))
+        self.log.info('Times executed: %s', len(duration_list))
         self.log.info('Unexpected errors: %s', len(self.error_list))
         self.log.info('Operation log:')
         for operation in self.operation_log:
@@ -959,11 +981,13 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         if result is not None and result.exit_status == 0:
             map_files_to_node = SstableLoadUtils.distribute_test_files_to_cluster_nodes(nodes=self.cluster.nodes,
                                                                                         test_data=test_data)
-            for sstables_info, load_on_node in map_files_to_node:
-                SstableLoadUtils.upload_sstables(load_on_node, test_data=sstables_info)
+
+            def load_and_stream(load_on_node, _):
                 system_log_follower = SstableLoadUtils.run_load_and_stream(load_on_node)
                 SstableLoadUtils.validate_load_and_stream_status(load_on_node, system_log_follower)
 
+            SstableLoadUtils.upload_and_load_sstables(map_files_to_node, load=load_and_stream)
+
     # pylint: disable=too-many-statements
     def disrupt_nodetool_refresh(self, big_sstable: bool = False):
         # Checking the columns number of keyspace1.standard1
@@ -993,12 +1017,13 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             else:
                 self.log.debug('Key %s already exists before refresh', key)
 
-            # Executing rolling refresh one by one
-            for node in self.cluster.nodes:
-                SstableLoadUtils.upload_sstables(node, test_data=test_data[0])
-                system_log_follower = SstableLoadUtils.run_refresh(node, test_data=test_data[0])
+            def refresh(node, sstables_info):
+                system_log_follower = SstableLoadUtils.run_refresh(node, test_data=sstables_info)
                 SstableLoadUtils.validate_resharding_after_refresh(node=node, system_log_follower=system_log_follower)
 
+            # Executing rolling refresh one by one, sstables are uploaded to all nodes in parallel meanwhile
+            SstableLoadUtils.upload_and_load_sstables([(test_data[0], node) for node in self.cluster.nodes], load=refresh)
+
             # Verify that the special key is loaded by SELECT query
             result = self.target_node.run_cqlsh(query_verify)
             assert '(1 rows)' in result.stdout, f'The key {key} is not loaded by `nodetool refresh`'
@@ -1752,7 +1777,7 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         status = mgr_task.wait_and_get_final_status(timeout=54000, step=5, only_final=True)
         if status == TaskStatus.DONE:
             self.log.info("Task: %s is done.", mgr_task.id)
-        elif status == TaskStatus.ERROR:
+        elif status in (TaskStatus.ERROR, TaskStatus.ERROR_FINAL):
             assert False, f'Backup task {mgr_task.id} failed'
         else:
             mgr_task.stop()
@@ -2860,8 +2885,9 @@ def disrupt_method_wrapper(method):  # pylint: disable=too-many-statements
                     'end': int(end_time),
                     'duration': time_elapsed,
                 })
-                args[0].duration_list.append(time_elapsed)
-                args[0].operation_log.append(copy.deepcopy(log_info))
+                args[0].timeline.append(owner=args[0].timeline_owner, start=start_time, end=end_time,
+                                        **{key: value for key, value in log_info.items()
+                                           if key not in ('start', 'end', 'duration')})
                 args[0].log.debug('%s duration -> %s s', args[0].current_disruption, time_elapsed)
 
                 if class_name.find('Chaos') < 0:
@@ -11,12 +11,15 @@
 #
 # Copyright (c) 2020 ScyllaDB
 
+import sys
+import queue
 import logging
+import threading
 from datetime import datetime
 from functools import cached_property
-import sys
 
 from elasticsearch import Elasticsearch
+from elasticsearch.helpers import bulk
 
 from sdcm.keystore import KeyStore
 
@@ -24,12 +27,28 @@ LOGGER = logging.getLogger(__name__)
 
 
 class NemesisElasticSearchPublisher:
+    """Publish nemesis documents to ES in bulks by a background thread, so the nemesis thread never waits for ES.
+
+    Usage:
+        >>> publisher = NemesisElasticSearchPublisher(tester)
+        >>> publisher.create_es_connection()
+        >>> publisher.publish(disrupt_name="disrupt_stop_start_scylla_server", status=True, data=log_info)
+        >>> publisher.update_test_stats(lambda: {"nemesis": nemesis.stats})  # the test document, once per bulk
+        >>> publisher.stop()  # send the queued documents and stop the thread
+    """
     index_name = 'nemesis_data'
     es: Elasticsearch
     error_message_size_limit_mb = 100
+    bulk_size = 500
+    flush_interval = 5  # seconds
+    stop_timeout = 60  # seconds
 
     def __init__(self, tester):
         self.tester = tester
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._get_test_stats = None
 
     def create_es_connection(self):
         ks = KeyStore()
@@ -99,5 +118,61 @@ class NemesisElasticSearchPublisher:
                 failure_message=data['error']
             ))
 
-        res = self.es.index(index=self.index_name, doc_type='nemesis', body=new_nemesis_data)
-        LOGGER.debug(res)
+        self._ensure_thread_started()
+        self._queue.put(new_nemesis_data)
+
+    def update_test_stats(self, get_test_stats):
+        """Update the test document by the background thread with the latest `get_test_stats()' after the next bulk.
+
+        A few calls between two bulks result in one update of the document.
+        """
+        with self._lock:
+            self._get_test_stats = get_test_stats
+        self._ensure_thread_started()
+
+    def _update_test_stats(self):
+        with self._lock:
+            get_test_stats, self._get_test_stats = self._get_test_stats, None
+        if get_test_stats is not None:
+            try:
+                self.tester.update(get_test_stats())
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to update nemesis stats of the test: %s", exc)
+
+    def _ensure_thread_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            docs = []
+            try:
+                docs.append(self._queue.get(timeout=self.flush_interval))
+                while len(docs) < self.bulk_size:
+                    docs.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if None in docs:
+                docs.remove(None)
+                stopped = True
+            if docs:
+                self._send(docs)
+            self._update_test_stats()
+
+    def _send(self, docs):
+        actions = [{'_index': self.index_name, '_type': 'nemesis', '_source': doc} for doc in docs]
+        try:
+            success, errors = bulk(self.es, actions, raise_on_error=False, stats_only=True)
+            LOGGER.debug("Published %s nemesis documents to ES, %s failed", success, errors)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to publish %s nemesis documents to ES: %s", len(docs), exc)
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=self.stop_timeout)
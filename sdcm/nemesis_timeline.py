@@ -0,0 +1,147 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Columnar store of disruption records
+
+Times are kept in typed arrays ordered by the end time and names of nemeses, operations and nodes are interned,
+so thousands of records of a parallel-nemesis run take a few hundred kilobytes and a query like "disruptions
+overlapping time T" is a binary search followed by a scan of the records which ended after T only.
+Full records (including tracebacks) go to an append-only JSON lines file, which can be loaded back after the run.
+"""
+
+import json
+import logging
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+OUTCOMES = ("passed", "skipped", "failure", )
+DETAILS_IN_MEMORY = ("skip_reason", "error", )  # the rest of the details (e.g., `full_traceback') is in the file only
+
+
+class NemesisTimeline:
+    """Append-only timeline of disruptions shared by all nemesis threads of a test.
+
+    Usage:
+        >>> timeline = NemesisTimeline(path=os.path.join(logdir, "nemesis_timeline.jsonl"))
+        >>> timeline.append(owner="SisyphusMonkey", operation="StopStartService", node="node-1",
+        ...                 start=1620000000, end=1620000100, subtype="end")
+        >>> timeline.overlapping(1620000050)  # records of disruptions which were running at this time
+        >>> timeline.overlapping(1620000050, 1620000600)  # ... or at any time within this interval
+        >>> NemesisTimeline.load(path)  # restore the timeline from the file, e.g., for an offline analysis
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._start = array("d")
+        self._end = array("d")
+        self._owner = array("I")
+        self._operation = array("I")
+        self._node = array("I")
+        self._outcome = array("B")
+        self._seq_no = array("L")
+        self._details: Dict[int, dict] = {}  # sparse: only skipped and failed disruptions have details
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+    def _intern(self, value: str) -> int:
+        if (string_id := self._string_ids.get(value)) is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def __len__(self) -> int:
+        return len(self._end)
+
+    def append(self, owner: str, operation: str, node: str,  # pylint: disable=too-many-arguments
+               start: float, end: float, subtype: str = "end", **details) -> dict:
+        """Add a record of a finished disruption and return it in the `operation_log' format."""
+        if "error" in details:
+            outcome = OUTCOMES.index("failure")
+        elif subtype == "skipped":
+            outcome = OUTCOMES.index("skipped")
+        else:
+            outcome = OUTCOMES.index("passed")
+        record = dict(owner=owner, operation=operation, start=int(start), end=int(end), duration=int(end - start),
+                      node=node, subtype=subtype, outcome=OUTCOMES[outcome], **details)
+        with self._lock:
+            # disruptions are added when they end, so it's an append almost always (a few nemesis threads may race)
+            idx = bisect_right(self._end, end)
+            self._start.insert(idx, start)
+            self._end.insert(idx, end)
+            self._owner.insert(idx, self._intern(owner))
+            self._operation.insert(idx, self._intern(operation))
+            self._node.insert(idx, self._intern(node))
+            self._outcome.insert(idx, outcome)
+            self._seq_no.insert(idx, seq_no := len(self._seq_no))
+            if in_memory := {key: value for key, value in details.items() if key in DETAILS_IN_MEMORY}:
+                self._details[seq_no] = in_memory
+            if self.path:
+                self._write(record)
+        return record
+
+    def _write(self, record: dict) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as timeline_file:
+                timeline_file.write(json.dumps(record) + "\n")
+        except OSError as exc:
+            LOGGER.warning("Failed to write the nemesis timeline to %s: %s", self.path, exc)
+
+    @classmethod
+    def load(cls, path: str) -> "NemesisTimeline":
+        timeline = cls()
+        with open(path, encoding="utf-8") as timeline_file:
+            for line in timeline_file:
+                record = json.loads(line)
+                for key in ("duration", "outcome", ):
+                    record.pop(key, None)
+                timeline.append(**record)
+        timeline.path = path
+        return timeline
+
+    def _record(self, idx: int) -> dict:
+        start, end = self._start[idx], self._end[idx]
+        record = dict(owner=self._strings[self._owner[idx]], operation=self._strings[self._operation[idx]],
+                      start=int(start), end=int(end), duration=int(end - start),
+                      node=self._strings[self._node[idx]], outcome=OUTCOMES[self._outcome[idx]])
+        record["subtype"] = "skipped" if record["outcome"] == "skipped" else "end"
+        record.update(self._details.get(self._seq_no[idx], {}))
+        return record
+
+    def _indexes(self, owner: Optional[str] = None, first: int = 0) -> Iterator[int]:
+        if owner is None:
+            yield from range(first, len(self._end))
+            return
+        if (owner_id := self._string_ids.get(owner)) is not None:
+            yield from (idx for idx in range(first, len(self._end)) if self._owner[idx] == owner_id)
+
+    def records(self, owner: Optional[str] = None) -> List[dict]:
+        """Return records ordered by the end time."""
+        with self._lock:
+            return [self._record(idx) for idx in self._indexes(owner)]
+
+    def durations(self, owner: Optional[str] = None) -> List[int]:
+        with self._lock:
+            return [int(self._end[idx] - self._start[idx]) for idx in self._indexes(owner)]
+
+    def overlapping(self, start: float, end: Optional[float] = None, owner: Optional[str] = None) -> List[dict]:
+        """Return records of disruptions which were running at the time `start' (or within [start, end])."""
+        end = start if end is None else end
+        with self._lock:
+            return [self._record(idx) for idx in self._indexes(owner, first=bisect_left(self._end, start))
+                    if self._start[idx] <= end]
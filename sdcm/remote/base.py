@@ -18,6 +18,7 @@ import logging
 import re
 import os
 import subprocess
+from collections import deque
 from textwrap import dedent
 
 from invoke.watchers import StreamWatcher, Responder
@@ -248,6 +249,69 @@ class LogWriteWatcher(StreamWatcher):  # pylint: disable=too-few-public-methods
             log_file.write(line)
 
 
+class OutputTail:
+    """Bounded replacement of StringIO for the command output which keeps only the last `max_lines` lines."""
+
+    def __init__(self, max_lines: int):
+        self._lines = deque(maxlen=max_lines)
+        self._partial = ""
+
+    def write(self, data: str) -> List[str]:
+        """Add a chunk of the output and return the lines completed by it."""
+        lines = (self._partial + data).splitlines(keepends=True)
+        self._partial = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        self._lines.extend(lines)
+        return lines
+
+    def flush(self) -> List[str]:
+        """Complete the last line if the output doesn't end with a newline."""
+        if not self._partial:
+            return []
+        line, self._partial = self._partial, ""
+        self._lines.append(line)
+        return [line]
+
+    def getvalue(self) -> str:
+        return "".join(self._lines) + self._partial
+
+
+class OutputTailWatcher:
+    """Collect lines which match the registered patterns and switch the remoter to the bounded output mode.
+
+    When this watcher is passed to `run()', the remoter doesn't keep the whole output of the command in memory:
+    `stdout' and `stderr' of the result contain only the last `tail_lines' lines of every stream, so use it together
+    with `log_file' to have the full output on disk.  Supported by `fabric' and `libssh2' SSH transports, other
+    remoters return the full output as usual.
+
+    It's not derived from `StreamWatcher' on purpose: that one is thread-local and the matches collected by the
+    output reading threads wouldn't be visible to the caller.
+    """
+
+    def __init__(self, tail_lines: int = 1000, patterns: tuple = (), max_matches: int = 1000):
+        self.len = 0
+        self.tail_lines = tail_lines
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+        self.matches = deque(maxlen=max_matches)
+
+    def submit(self, stream: str) -> list:
+        stream_buffer = stream[self.len:]
+
+        while '\n' in stream_buffer:
+            line, stream_buffer = stream_buffer.split('\n', 1)
+            self.submit_line(line)
+        self.len = len(stream) - len(stream_buffer)
+        return []
+
+    def submit_line(self, line: str):
+        line = line.rstrip('\n')
+        if any(pattern.search(line) for pattern in self.patterns):
+            self.matches.append(line)
+
+    @classmethod
+    def find(cls, watchers: Optional[List[StreamWatcher]]) -> Optional["OutputTailWatcher"]:
+        return next((watcher for watcher in watchers or () if isinstance(watcher, cls)), None)
+
+
 class FailuresWatcher(Responder):
     def __init__(self, sentinel, callback=None, raise_exception=True):
         super().__init__(None, None)
@@ -27,6 +27,8 @@ from ssh2.channel import Channel  # pylint: disable=no-name-in-module
 from ssh2.exceptions import AuthenticationError  # pylint: disable=no-name-in-module
 from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN  # pylint: disable=no-name-in-module
 
+from sdcm.remote.base import OutputTail, OutputTailWatcher
+
 from .exceptions import AuthenticationException, UnknownHostException, ConnectError, PKeyFileError, UnexpectedExit, \
     CommandTimedOut, FailedToReadCommandOutput, ConnectTimeout, FailedToRunCommand, OpenChannelTimeout
 from .result import Result
@@ -557,6 +559,7 @@ class Client:  # pylint: disable=too-many-instance-attributes
         """Run command, wait till it ends and return result in Result class.
         If `watchers` are defined it runs `SSHReaderThread` that reads data from the socket and forwards it to Queue.
         If `hide` is True it does not collect stdout and stderr.
+        If `watchers` has `OutputTailWatcher` only the tail of stdout and stderr is collected.
         if `env` is set it loads variables from the dict to the session environment.
         Returns: instance of `Result`
         """
@@ -564,8 +567,13 @@ class Client:  # pylint: disable=too-many-instance-attributes
             timeout = self.timings.read_command_output_timeout
         exception = None
         timeout_reached = False
-        stdout = StringIO()
-        stderr = StringIO()
+        tail_watcher = OutputTailWatcher.find(watchers)
+        if tail_watcher is None:
+            stdout = StringIO()
+            stderr = StringIO()
+        else:
+            stdout = OutputTail(max_lines=tail_watcher.tail_lines)
+            stderr = OutputTail(max_lines=tail_watcher.tail_lines)
         # TODO: Implement replace_env
         if env is None:
             shell = '/bin/bash'
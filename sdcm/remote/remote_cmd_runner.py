@@ -16,15 +16,42 @@ import os
 import threading
 
 from fabric import Connection, Config
+from fabric.runners import Remote
 from paramiko import SSHException, RSAKey
 from paramiko.ssh_exception import NoValidConnectionsError, AuthenticationException
 from invoke.watchers import StreamWatcher
 from invoke.exceptions import UnexpectedExit, Failure
 
-from .base import RetryableNetworkException, SSHConnectTimeoutError
+from .base import RetryableNetworkException, SSHConnectTimeoutError, OutputTail, OutputTailWatcher
 from .remote_base import RemoteCmdRunnerBase
 
 
+class BoundedOutputRemote(Remote):
+    """Fabric runner which keeps only the tail of the output if `OutputTailWatcher' is in the watchers list.
+
+    Stock invoke runner stores every chunk of the output and joins the whole buffer on every chunk to feed watchers,
+    that is quadratic and unbounded for long running commands.  Here watchers get the output line by line instead.
+    """
+
+    def _handle_output(self, buffer_, hide, output, reader):
+        tail_watcher = OutputTailWatcher.find(self.watchers)
+        if tail_watcher is None:
+            super()._handle_output(buffer_, hide, output, reader)
+            return
+        tail = OutputTail(max_lines=tail_watcher.tail_lines)
+        for data in self.read_proc_output(reader):
+            if not hide:
+                self.write_our_output(stream=output, string=data)
+            self._submit_lines(tail.write(data))
+        self._submit_lines(tail.flush())
+        buffer_[:] = [tail.getvalue()]
+
+    def _submit_lines(self, lines):
+        for line in lines:
+            for watcher in self.watchers:
+                watcher.submit_line(line)
+
+
 class RemoteCmdRunner(RemoteCmdRunnerBase, ssh_transport='fabric', default=True):  # pylint: disable=too-many-instance-attributes
     connection: Connection
     ssh_config: Config = None
@@ -48,6 +75,7 @@ class RemoteCmdRunner(RemoteCmdRunnerBase, ssh_transport='fabric', default=True)
             'StrictHostKeyChecking': 'no',
             # NOTE: 'gateway' define explicitely to avoid errors reaching the 'gateway' config attr
             'gateway': None,
+            'runners': {'remote': BoundedOutputRemote},
         })
         self.start_ssh_up_thread()
         super()._prepare()
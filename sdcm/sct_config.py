@@ -18,10 +18,14 @@ Handling Scylla-cluster-test configuration loading
 # pylint: disable=too-many-lines
 import os
 import ast
+import json
+import time
 import logging
 import getpass
+import hashlib
 import pathlib
-from typing import List, Union, Set
+import tempfile
+from typing import List, Union, Set, Optional
 
 from distutils.util import strtobool
 
@@ -48,6 +52,9 @@ from sdcm.utils.version_utils import (
 from sdcm.sct_events.base import add_severity_limit_rules, print_critical_events
 
 
+LOGGER = logging.getLogger(__name__)
+
+
 def str_or_list(value: Union[str, List[str]]) -> List[str]:
     """Convert an environment variable into a Python's list."""
 
@@ -95,6 +102,87 @@ def boolean(value):
         raise ValueError("{} isn't a boolean".format(type(value)))
 
 
+class SCTConfigurationCache:
+    """
+    Cache of merged SCT configurations, shared between processes of the user through a directory on disk
+
+    Entries are keyed by the content of all the configuration files which take part in the merge
+    (defaults, backend defaults and test yamls), by the SCT_* environment variables and by the source of
+    this module (which defines the options and their verification), so any change in one of those produces
+    a new entry.  Entries also remember if `verify_configuration()` already passed for them, so it can be
+    skipped next time, that's why the cache directory is private to the user and entries of other users
+    are ignored.
+    """
+
+    CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "sct-config-cache")
+    CACHE_TTL = 60 * 60  # entries can contain resolved AMIs/repos, so don't keep them forever
+
+    _memory_cache = {}
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: int = CACHE_TTL):
+        self.cache_dir = pathlib.Path(cache_dir or self.CACHE_DIR)
+        self.ttl = ttl
+
+    @staticmethod
+    def cache_key(config_files: List[str], env: dict) -> str:
+        digest = hashlib.sha256()
+        for config_file in config_files:
+            digest.update(config_file.encode())
+            digest.update(pathlib.Path(config_file).read_bytes())
+        for key in sorted(env):
+            if key.startswith("SCT_"):
+                digest.update(f"{key}={env[key]}".encode())
+        digest.update(getpass.getuser().encode())
+        digest.update(pathlib.Path(__file__).read_bytes())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.cache_dir / f"{key}.json"
+
+    def load(self, key: str) -> Optional[dict]:
+        entry = self._memory_cache.get(key)
+        if entry is None:
+            entry_path = self._entry_path(key)
+            try:
+                if entry_path.stat().st_uid != os.getuid():
+                    LOGGER.warning("Ignore configuration cache entry %s: it's owned by another user", entry_path)
+                    return None
+                entry = json.loads(entry_path.read_text())
+            except (OSError, ValueError):
+                return None
+        if time.time() - entry["created"] > self.ttl:
+            self._memory_cache.pop(key, None)
+            return None
+        self._memory_cache[key] = entry
+        return entry
+
+    def store(self, key: str, config: dict, verified: bool = False) -> None:
+        entry = {"created": time.time(), "verified": verified, "config": dict(config)}
+        try:
+            data = json.dumps(entry)
+        except (TypeError, ValueError):
+            LOGGER.debug("Configuration can't be serialized, not caching it")
+            return
+        self._memory_cache[key] = entry
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # write to a temporary file first, so other processes never read a partial entry
+            with tempfile.NamedTemporaryFile("w", dir=self.cache_dir, delete=False, suffix=".tmp") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_file.name, self._entry_path(key))
+        except OSError as exc:
+            LOGGER.debug("Failed to write configuration cache entry %s: %s", key, exc)
+
+    def mark_verified(self, key: str) -> None:
+        if entry := self.load(key):
+            self.store(key, entry["config"], verified=True)
+
+    def clear(self) -> None:
+        self._memory_cache.clear()
+        for entry_path in self.cache_dir.glob("*.json"):
+            entry_path.unlink(missing_ok=True)
+
+
 class SCTConfiguration(dict):
     """
     Class the hold the SCT configuration
@@ -802,7 +890,10 @@ class SCTConfiguration(dict):
         dict(name="stress_multiplier", env="SCT_STRESS_MULTIPLIER", type=int,
              help=""),
         dict(name="run_fullscan", env="SCT_RUN_FULLSCAN", type=str,
-             help=""),
+             help="Comma separated ks.cf (or random), interval in minutes and optional parallelism, "
+                  "e.g. 'keyspace1.standard1, 5, 16'. With parallelism the table is scanned by token ranges concurrently"),
+        dict(name="run_fullscan_verify_counts", env="SCT_RUN_FULLSCAN_VERIFY_COUNTS", type=boolean,
+             help="Compare the row count of every token range with the previous parallel full scan of the same table"),
         dict(name="keyspace_num", env="SCT_KEYSPACE_NUM", type=int,
              help=""),
         dict(name="round_robin", env="SCT_ROUND_ROBIN", type=boolean,
@@ -1334,15 +1425,12 @@ class SCTConfiguration(dict):
         # pylint: disable=too-many-locals,too-many-branches,too-many-statements
         super().__init__()
         self.log = logging.getLogger(__name__)
+        self.verified = False
+        self.cache = None
+        self.cache_key = None
         env = self._load_environment_variables()
-        config_files = env.get('config_files', [])
-        config_files = [sct_abs_path(f) for f in config_files]
-
-        # prepend to the config list the defaults the config files
-        backend = env.get('cluster_backend')
-        backend_config_files = [sct_abs_path('defaults/test_default.yaml')]
-        if backend:
-            backend_config_files += self.defaults_config_files[str(backend)]
+        config_files = self._get_config_files(env)
+        backend_config_files = self._get_backend_config_files(env)
 
         # 1) load the default backend config files
         files = anyconfig.load(list(backend_config_files))
@@ -1512,9 +1600,65 @@ class SCTConfiguration(dict):
 
         self._update_environment_variables()
 
+    @classmethod
+    def load_cached(cls, cache: Optional[SCTConfigurationCache] = None) -> "SCTConfiguration":
+        """
+        Same as `SCTConfiguration()`, but reuse a result merged by this or another process if all inputs are the same
+
+        Use `verify_configuration_cached()` on the returned object to skip the verification as well.
+        """
+        cache = cache or SCTConfigurationCache()
+        env = cls._load_environment_variables()
+        try:
+            key = cache.cache_key(
+                config_files=cls._get_backend_config_files(env) + cls._get_config_files(env),
+                env=os.environ,
+            )
+        except OSError:
+            # let the regular flow to fail with a proper error on missing files
+            return cls()
+
+        if entry := cache.load(key):
+            config = cls.__new__(cls)
+            dict.__init__(config, entry["config"])
+            config.log = logging.getLogger(__name__)
+            config.verified = entry["verified"]
+            add_severity_limit_rules(config.get("max_events_severities"))
+            config._update_environment_variables()  # pylint: disable=protected-access
+        else:
+            config = cls()
+            cache.store(key, config)
+        config.cache = cache
+        config.cache_key = key
+        return config
+
+    def verify_configuration_cached(self):
+        """
+        Run `verify_configuration()` only if it wasn't passed already for the same inputs
+        """
+        if self.verified:
+            return
+        self.verify_configuration()
+        self.verified = True
+        if self.cache:
+            self.cache.mark_verified(self.cache_key)
+
     def log_config(self):
         self.log.info(self.dump_config())
 
+    @staticmethod
+    def _get_config_files(env: dict) -> List[str]:
+        return [sct_abs_path(f) for f in env.get('config_files', [])]
+
+    @classmethod
+    def _get_backend_config_files(cls, env: dict) -> List[str]:
+        # prepend to the config list the defaults the config files
+        backend = env.get('cluster_backend')
+        backend_config_files = [sct_abs_path('defaults/test_default.yaml')]
+        if backend:
+            backend_config_files += cls.defaults_config_files[str(backend)]
+        return backend_config_files
+
     @property
     def region_names(self) -> List[str]:
         region_names = self._env.get('region_name')
@@ -1546,9 +1690,10 @@ class SCTConfiguration(dict):
 
         return anyconfig.load(list(default_config_files)).get(key, None)
 
-    def _load_environment_variables(self):
+    @classmethod
+    def _load_environment_variables(cls):
         environment_vars = {}
-        for opt in self.config_options:
+        for opt in cls.config_options:
             if opt['env'] in os.environ:
                 try:
                     environment_vars[opt['name']] = opt['type'](os.environ[opt['env']])
@@ -13,10 +13,12 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 import traceback
 import uuid
-from typing import Optional, List, Union, Type, Any
+from collections import defaultdict, deque
+from typing import Optional, List, Union, Type, Any, Dict, Deque
 
 from dateutil.relativedelta import relativedelta
 
@@ -26,29 +28,62 @@ from sdcm.utils.metaclasses import Singleton
 
 LOGGER = logging.getLogger(__name__)
 
+MAX_ENDED_CONTINUOUS_EVENTS = 10_000
+NOT_SET = object()
+
 
 class ContinuousEventRegistryException(BaseException):
     pass
 
 
 class ContinuousEventsRegistry(metaclass=Singleton):
+    """Registry of all continuous events created in the process.
+
+    Events are stored in a dict by event id, and begun events are also indexed by their class and node, so the
+    lookups done for every matching line of the DB logs (i.e., find a begun event for a node to end it) don't need
+    to scan all events.  To keep the memory bounded in long runs only last `max_ended_events' ended events are kept.
+    """
+
+    max_ended_events = MAX_ENDED_CONTINUOUS_EVENTS
+
     def __init__(self):
-        self._continuous_events: List[ContinuousEvent] = []
+        self._events: Dict[str, ContinuousEvent] = {}
+        self._begun_events: Dict[Type[ContinuousEvent], Dict[Any, Dict[str, ContinuousEvent]]] = \
+            defaultdict(lambda: defaultdict(dict))
+        self._ended_events_ids: Deque[str] = deque()
+        self._lock = threading.RLock()
 
     @property
-    def continuous_events(self):
-        return self._continuous_events
+    def continuous_events(self) -> List[ContinuousEvent]:
+        with self._lock:
+            return list(self._events.values())
 
     def add_event(self, event: ContinuousEvent):
         if not issubclass(type(event), ContinuousEvent):
             msg = f"Event: {event} is not a ContinuousEvent"
             raise ContinuousEventRegistryException(msg)
 
-        if self._find_event_by_id(event.event_id):
-            msg = f"Event with id: {event.event_id} is already present. Event ids in the registry must be unique."
-            raise ContinuousEventRegistryException(msg)
+        with self._lock:
+            if self._find_event_by_id(event.event_id):
+                msg = f"Event with id: {event.event_id} is already present. Event ids in the registry must be unique."
+                raise ContinuousEventRegistryException(msg)
+
+            self._events[event.event_id] = event
 
-        self.continuous_events.append(event)
+    def event_begun(self, event: ContinuousEvent) -> None:
+        with self._lock:
+            self._begun_events[type(event)][getattr(event, "node", None)][event.event_id] = event
+
+    def event_ended(self, event: ContinuousEvent) -> None:
+        with self._lock:
+            self._begun_events[type(event)][getattr(event, "node", None)].pop(event.event_id, None)
+            if self._events.get(event.event_id) is not event:
+                return
+            self._ended_events_ids.append(event.event_id)
+            while len(self._ended_events_ids) > self.max_ended_events:
+                event_id = self._ended_events_ids.popleft()
+                if (ended_event := self._events.get(event_id)) and ended_event.period_type == EventPeriod.END.value:
+                    del self._events[event_id]
 
     def get_event_by_id(self, event_id: Union[uuid.UUID, str]) -> Optional[ContinuousEvent]:
         found_events = self._find_event_by_id(event_id)
@@ -74,10 +109,13 @@ class ContinuousEventsRegistry(metaclass=Singleton):
 
     def get_events_by_period(self,
                              period_type: EventPeriod) -> List[ContinuousEvent]:
-        event_filter = self.get_registry_filter()
-        found_events = event_filter \
-            .filter_by_period(period_type=period_type.value) \
-            .get_filtered()
+        if period_type is EventPeriod.BEGIN:
+            found_events = self.get_begun_events()
+        else:
+            event_filter = self.get_registry_filter()
+            found_events = event_filter \
+                .filter_by_period(period_type=period_type.value) \
+                .get_filtered()
 
         if not found_events:
             LOGGER.warning("No continuous events with period type: {period_type} found in registry."
@@ -97,16 +135,38 @@ class ContinuousEventsRegistry(metaclass=Singleton):
 
         return found_events
 
+    def get_begun_events(self,
+                         event_type: Type[ContinuousEvent] = None,
+                         node: Any = NOT_SET) -> List[ContinuousEvent]:
+        """Return begun (and not ended yet) events using the index, the most recently begun is the last one."""
+
+        event_type = event_type or ContinuousEvent
+        found_events = []
+        with self._lock:
+            for event_class, events_by_node in self._begun_events.items():
+                if not issubclass(event_class, event_type):
+                    continue
+                for events in (events_by_node.values() if node is NOT_SET else [events_by_node.get(node, {})]):
+                    for event_id, event in list(events.items()):
+                        # period_type can be changed directly, not only using begin_event()/end_event()
+                        if event.period_type != EventPeriod.BEGIN.value:
+                            del events[event_id]
+                            continue
+                        found_events.append(event)
+        found_events.sort(key=lambda event: event.begin_timestamp or 0)
+        return found_events
+
     def get_registry_filter(self) -> ContinuousRegistryFilter:
         registry_filter = ContinuousRegistryFilter(registry=self.continuous_events)
 
         return registry_filter
 
     def _find_event_by_id(self, event_id: Union[uuid.UUID, str]) -> List[ContinuousEvent]:
-        event_filter = self.get_registry_filter()
-        found_events = event_filter.filter_by_id(event_id).get_filtered()
-
-        return found_events
+        # The index is updated on every registration and cleanup, so a miss means there is no such event.
+        with self._lock:
+            if (event := self._events.get(str(event_id))) is not None:
+                return [event]
+        return []
 
 
 # pylint: disable=too-many-instance-attributes
@@ -199,6 +259,7 @@ class ContinuousEvent(SctEvent, abstract=True):
         self.begin_timestamp = self.event_timestamp = time.time()
         self.period_type = EventPeriod.BEGIN.value
         self.severity = Severity.NORMAL
+        ContinuousEventsRegistry().event_begun(self)
         if self.publish_event:
             self._ready_to_publish = True
             self.publish()
@@ -208,6 +269,7 @@ class ContinuousEvent(SctEvent, abstract=True):
     def end_event(self) -> None:
         self.end_timestamp = self.event_timestamp = time.time()
         self.period_type = EventPeriod.END.value
+        ContinuousEventsRegistry().event_ended(self)
         if self.publish_event:
             self._ready_to_publish = True
             self.publish()
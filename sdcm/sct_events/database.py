@@ -301,16 +301,10 @@ def get_pattern_to_event_to_func_mapping(node: str) \
 
     def _end_event(event_type: Type[ScyllaDatabaseContinuousEvent], match: Match):
         shard = int(match.groupdict()["shard"]) if "shard" in match.groupdict().keys() else None
-        event_filter = event_registry.get_registry_filter()
-        event_filter \
-            .filter_by_node(node=node) \
-            .filter_by_type(event_type=event_type) \
-            .filter_by_period(period_type=EventPeriod.BEGIN.value)
+        begun_events = event_registry.get_begun_events(event_type=event_type, node=node)
 
         if shard is not None:
-            event_filter.filter_by_shard(shard)
-
-        begun_events = event_filter.get_filtered()
+            begun_events = [event for event in begun_events if event.shard == shard]
 
         if not begun_events:
             raise ContinuousEventRegistryException("Did not find any events of type {event_type}"
@@ -19,10 +19,9 @@ import ctypes
 import pickle
 import logging
 import multiprocessing
-from typing import Optional, Generator, Any, Tuple, Callable, cast, Dict
+from typing import Optional, Generator, Any, Tuple, Callable, cast
 from pathlib import Path
 from functools import cached_property, partial
-from uuid import UUID
 
 import zmq
 
@@ -147,36 +146,34 @@ class EventsDevice(multiprocessing.Process):
                         events_counter: multiprocessing.Value) -> Generator[Tuple[str, Any], None, None]:
         from sdcm.sct_events.base import max_severity
         from sdcm.sct_events.system import SystemEvent
-        from sdcm.sct_events.filters import BaseFilter
+        from sdcm.sct_events.filters import BaseFilter, FiltersChain
 
-        filters: Dict[UUID, BaseFilter] = {}
+        filters = FiltersChain()
         filters_gc_next_hit = time.perf_counter() + FILTERS_GC_PERIOD
 
         with suppress_interrupt():
             for events_counter.value, obj in enumerate(self.inbound_events(stop_event=stop_event), start=1):
                 if filters_gc_next_hit < time.perf_counter():
                     # Run filter GC once in FILTERS_GC_PERIOD seconds
-                    for filter_key, filter_obj in list(filters.items()):
-                        if filter_obj.is_deceased():
-                            del filters[filter_key]
+                    filters.remove_deceased_filters()
                     filters_gc_next_hit = time.perf_counter() + FILTERS_GC_PERIOD
 
                 if isinstance(obj, BaseFilter):
                     if obj.clear_filter and not obj.expire_time:
                         LOGGER.debug("%s: delete filter with uuid=%s", self, obj.uuid)
-                        filters.pop(obj.uuid, None)
+                        filters.remove_filter(obj.uuid)
                     elif obj.clear_filter and obj.expire_time and obj.uuid in filters:
                         LOGGER.debug("%s: set expire_time to %s for filter with uuid=%s",
                                      self, obj.expire_time, obj.uuid)
-                        filters[obj.uuid].expire_time = obj.expire_time
+                        filters.set_expire_time(obj.uuid, obj.expire_time)
                     else:
                         LOGGER.debug("%s: add filter %s with uuid=%s", self, obj, obj.uuid)
-                        filters[obj.uuid] = obj
+                        filters.add_filter(obj)
 
                 if isinstance(obj, SystemEvent):
                     continue
 
-                obj_filtered = any(f.eval_filter(obj) for f in filters.values())
+                obj_filtered = filters.eval_filters(obj)
 
                 if obj_filtered:
                     continue
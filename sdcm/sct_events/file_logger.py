@@ -16,7 +16,7 @@ import json
 import logging
 import collections
 import multiprocessing
-from typing import Tuple, Optional, Callable, Any, Dict, List, cast
+from typing import Tuple, Optional, Callable, Any, Dict, Iterator, List, cast
 from pathlib import Path
 from functools import partial
 from itertools import chain
@@ -100,22 +100,38 @@ class EventsFileLogger(BaseEventsProcess[Tuple[str, Any], None], multiprocessing
             with self.events_summary_log.open("wb", buffering=0) as fobj:
                 fobj.write(json.dumps(dict(self.events_summary), indent=4).encode("utf-8"))
 
-    def get_events_by_category(self, limit: Optional[int] = None) -> Dict[str, List[str]]:
+    def iter_events(self, severity: Severity) -> Iterator[str]:
+        """Stream events of the severity from its log file, a multiline event is yielded as one string."""
+        event = []
+        with self.events_logs_by_severity[severity].open() as fobj:
+            for line in fobj:
+                if line := line.strip():
+                    if LINE_START_RE.match(line):
+                        if event:
+                            yield "\n".join(event)
+                        event.clear()
+                    event.append(line)
+        if event:
+            yield "\n".join(event)
+
+    def get_events_by_category(self, limit: Optional[int] = None,
+                               size_limit: Optional[int] = None) -> Dict[str, List[str]]:
+        """Return the last `limit' events of every severity which fit `size_limit' characters.
+
+        Events are read in one pass and older events are dropped as soon as they don't fit, so memory is bounded by
+        the limits and not by the size of the log files.  The last event is kept even if it's over `size_limit'.
+        """
         output = {}
         for severity, log_file in self.events_logs_by_severity.items():
-            events_bucket = deque(maxlen=limit)
-            event = []
+            events_bucket = deque()
+            bucket_size = 0
             try:
-                with log_file.open() as fobj:
-                    for line in fobj:
-                        if line := line.strip():
-                            if LINE_START_RE.match(line):
-                                if event:
-                                    events_bucket.append("\n".join(event))
-                                event.clear()
-                            event.append(line)
-                if event:
-                    events_bucket.append("\n".join(event))
+                for event in self.iter_events(severity):
+                    events_bucket.append(event)
+                    bucket_size += len(event)
+                    while len(events_bucket) > 1 and (limit is not None and len(events_bucket) > limit or
+                                                      size_limit is not None and bucket_size > size_limit):
+                        bucket_size -= len(events_bucket.popleft())
             except Exception as exc:  # pylint: disable=broad-except
                 error_msg = f"{self}: failed to read {log_file}: {exc}"
                 LOGGER.info(error_msg)
@@ -130,8 +146,9 @@ get_events_logger = cast(Callable[..., EventsFileLogger], partial(get_events_pro
 
 
 def get_events_grouped_by_category(limit: Optional[int] = None,
-                                   _registry: Optional[EventsProcessesRegistry] = None) -> Dict[str, List[str]]:
-    return get_events_logger(_registry=_registry).get_events_by_category(limit=limit)
+                                   _registry: Optional[EventsProcessesRegistry] = None,
+                                   size_limit: Optional[int] = None) -> Dict[str, List[str]]:
+    return get_events_logger(_registry=_registry).get_events_by_category(limit=limit, size_limit=size_limit)
 
 
 def get_logger_event_summary(_registry: Optional[EventsProcessesRegistry] = None) -> dict:
@@ -13,13 +13,18 @@
 
 import re
 import time
-from typing import Optional, Type, Union
+from typing import Optional, Type, Union, Dict, List
 from functools import cached_property
+from collections import defaultdict
 
 from sdcm.sct_events import Severity
 from sdcm.sct_events.base import SctEvent, SctEventProtocol, BaseFilter, LogEventProtocol
 
 
+# Regexps with back references or global inline flags can't be safely merged into one alternation.
+NOT_COMBINABLE_REGEX_RE = re.compile(r"\\\d|\(\?P=|^\(\?[aiLmsux]+\)")
+
+
 class DbEventsFilter(BaseFilter):
     def __init__(self,
                  db_event: Union[LogEventProtocol, Type[LogEventProtocol]],
@@ -35,6 +40,11 @@ class DbEventsFilter(BaseFilter):
         if not isinstance(event, LogEventProtocol):
             return False
 
+        return self.eval_log_event_filter(event)
+
+    def eval_log_event_filter(self, event: LogEventProtocol) -> bool:
+        """Same as `eval_filter()', but without (a quite expensive) check that the event is a LogEventProtocol."""
+
         if self.expire_time and event.timestamp and self.expire_time < event.timestamp:
             return False
 
@@ -94,11 +104,14 @@ class EventsFilter(BaseFilter):
             self.expire_time = time.time() + self.extra_time_to_expiration
         super().cancel_filter()
 
+    def is_applicable_to(self, event_class: Type[SctEventProtocol]) -> bool:
+        return not self.event_class or (event_class.__name__ + ".").startswith(self.event_class)
+
     def eval_filter(self, event: SctEventProtocol) -> bool:
         if self.expire_time and event.timestamp and self.expire_time < event.timestamp:
             return False
 
-        result = not self.event_class or (type(event).__name__ + ".").startswith(self.event_class)
+        result = self.is_applicable_to(type(event))
 
         if self._regex:
             result &= self._regex.match(str(event)) is not None
@@ -129,3 +142,123 @@ class EventsSeverityChangerFilter(EventsFilter):
         if super().eval_filter(event) and self.new_severity:
             event.severity = self.new_severity
         return False
+
+
+class CompiledFilters:  # pylint: disable=too-few-public-methods
+    """EventsFilter-s which are applicable to one event class, prepared for a fast evaluation."""
+
+    def __init__(self, filters: List[EventsFilter]):
+        self.severity_changers = []
+        self.single_filters = []
+        self.always_matched = False
+        regexes_by_flags = defaultdict(list)
+
+        for filter_obj in filters:
+            if isinstance(filter_obj, EventsSeverityChangerFilter):
+                self.severity_changers.append(filter_obj)
+            elif filter_obj.expire_time:
+                self.single_filters.append(filter_obj)
+            elif not filter_obj.regex:
+                self.always_matched = True
+            elif NOT_COMBINABLE_REGEX_RE.search(filter_obj.regex):
+                self.single_filters.append(filter_obj)
+            else:
+                regexes_by_flags[filter_obj.regex_flags].append(filter_obj)
+
+        self.combined_regexes = []
+        for flags, regex_filters in regexes_by_flags.items():
+            try:
+                self.combined_regexes.append(
+                    re.compile("|".join(f"(?:{filter_obj.regex})" for filter_obj in regex_filters), flags))
+            except re.error:
+                self.single_filters.extend(regex_filters)
+
+
+class FiltersChain:
+    """Active events filters compiled into a dispatch table by event class.
+
+    For every event class the applicable EventsFilter-s are found once (by the class name prefix) and their regexps
+    are merged into one regexp per flags.  DbEventsFilter-s are dispatched by the event type.  When a filter added,
+    removed or expired only dispatch table entries of the classes it's applicable to are dropped, and they are
+    recompiled on the next event of that class.
+
+    Result of `eval_filters()' is the same as of `any(f.eval_filter(event) for f in filters)', except of the case
+    when a regexp of a filter depends on the severity changed by a EventsSeverityChangerFilter added after it:
+    severity changers are always applied first.
+    """
+
+    def __init__(self):
+        self._filters: Dict[str, BaseFilter] = {}
+        self._db_filters: Dict[str, Dict[str, DbEventsFilter]] = defaultdict(dict)
+        self._other_filters: Dict[str, BaseFilter] = {}
+        self._dispatch_table: Dict[Type[SctEventProtocol], CompiledFilters] = {}
+
+    def __len__(self) -> int:
+        return len(self._filters)
+
+    def __contains__(self, filter_uuid: str) -> bool:
+        return filter_uuid in self._filters
+
+    def __getitem__(self, filter_uuid: str) -> BaseFilter:
+        return self._filters[filter_uuid]
+
+    def _invalidate(self, filter_obj: BaseFilter) -> None:
+        if isinstance(filter_obj, EventsFilter):
+            for event_class in [cls for cls in self._dispatch_table if filter_obj.is_applicable_to(cls)]:
+                del self._dispatch_table[event_class]
+
+    def add_filter(self, filter_obj: BaseFilter) -> None:
+        self.remove_filter(filter_obj.uuid)
+        self._filters[filter_obj.uuid] = filter_obj
+        if isinstance(filter_obj, DbEventsFilter):
+            if filter_obj.filter_type:
+                self._db_filters[filter_obj.filter_type][filter_obj.uuid] = filter_obj
+        elif not isinstance(filter_obj, EventsFilter):
+            self._other_filters[filter_obj.uuid] = filter_obj
+        self._invalidate(filter_obj)
+
+    def remove_filter(self, filter_uuid: str) -> None:
+        if (filter_obj := self._filters.pop(filter_uuid, None)) is None:
+            return
+        if isinstance(filter_obj, DbEventsFilter):
+            self._db_filters.get(filter_obj.filter_type, {}).pop(filter_uuid, None)
+        self._other_filters.pop(filter_uuid, None)
+        self._invalidate(filter_obj)
+
+    def set_expire_time(self, filter_uuid: str, expire_time: float) -> None:
+        filter_obj = self._filters[filter_uuid]
+        filter_obj.expire_time = expire_time
+        self._invalidate(filter_obj)
+
+    def remove_deceased_filters(self) -> None:
+        for filter_uuid, filter_obj in list(self._filters.items()):
+            if filter_obj.is_deceased():
+                self.remove_filter(filter_uuid)
+
+    def _compile(self, event_class: Type[SctEventProtocol]) -> CompiledFilters:
+        if (compiled := self._dispatch_table.get(event_class)) is None:
+            compiled = self._dispatch_table[event_class] = CompiledFilters(filters=[
+                filter_obj for filter_obj in self._filters.values()
+                if isinstance(filter_obj, EventsFilter) and filter_obj.is_applicable_to(event_class)
+            ])
+        return compiled
+
+    def eval_filters(self, event: SctEventProtocol) -> bool:
+        """Apply severity changers to the event and return True if the event should be filtered out."""
+
+        compiled = self._compile(type(event))
+        for severity_changer in compiled.severity_changers:
+            severity_changer.eval_filter(event)
+        if compiled.always_matched:
+            return True
+        if any(filter_obj.eval_filter(event) for filter_obj in compiled.single_filters):
+            return True
+        if (db_filters := self._db_filters.get(getattr(event, "type", None))) \
+                and isinstance(event, LogEventProtocol) \
+                and any(filter_obj.eval_log_event_filter(event) for filter_obj in db_filters.values()):
+            return True
+        if compiled.combined_regexes:
+            event_text = str(event)
+            if any(regex.match(event_text) for regex in compiled.combined_regexes):
+                return True
+        return any(filter_obj.eval_filter(event) for filter_obj in self._other_filters.values())
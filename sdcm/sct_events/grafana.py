@@ -12,6 +12,7 @@
 # Copyright (c) 2020 ScyllaDB
 
 import time
+import queue
 import logging
 import threading
 from typing import NewType, Dict, Any, Tuple, Optional, Callable, cast
@@ -31,6 +32,14 @@ GRAFANA_EVENT_AGGREGATOR_MAX_DUPLICATES: int = 5
 GRAFANA_EVENT_AGGREGATOR_QUEUE_WAIT_TIMEOUT: float = 1  # seconds
 GRAFANA_ANNOTATIONS_API_ENDPOINT: str = "/api/annotations"
 GRAFANA_ANNOTATIONS_API_AUTH: Tuple[str, str] = ("admin", "admin", )
+GRAFANA_POSTMAN_WORKERS: int = 4
+GRAFANA_POSTMAN_QUEUE_SIZE: int = 1000
+GRAFANA_POSTMAN_COALESCE_THRESHOLD: int = 200  # start to coalesce annotations when the backlog is larger than this
+GRAFANA_POSTMAN_MAX_COALESCED_KEYS: int = 1000
+GRAFANA_POSTMAN_RATE_LIMIT: float = 20  # requests per second
+GRAFANA_POSTMAN_RATE_LIMIT_BURST: int = 40
+GRAFANA_POSTMAN_REQUEST_TIMEOUT: float = 10  # seconds
+GRAFANA_POSTMAN_FLUSH_TIMEOUT: float = 30  # seconds to post what's left in the backlog on shutdown
 
 LOGGER = logging.getLogger(__name__)
 
@@ -93,14 +102,65 @@ class GrafanaEventAggregator(EventsProcessPipe[Annotation, Annotation]):
         return AnnotationKey(tuple(annotation["tags"]))
 
 
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.perf_counter()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, stop_event: Optional[threading.Event] = None) -> bool:
+        """Wait for a token.  Return False if stop_event was set during the wait."""
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self.rate
+            if stop_event is None:
+                time.sleep(wait_time)
+            elif stop_event.wait(wait_time):
+                return False
+
+
 class GrafanaEventPostman(BaseEventsProcess[Annotation, None], threading.Thread):
+    """Post annotations to Grafana using a pool of workers which share one HTTP session.
+
+    Annotations go through a bounded queue.  When the backlog is larger than `coalesce_threshold' (i.e., Grafana
+    is slower than the events rate), annotations with the same unique key are merged into one range annotation
+    instead, and if there are too many different keys to track, new annotations are dropped.
+    """
+
     inbound_events_process = EVENTS_GRAFANA_AGGREGATOR_ID
     api_endpoint = GRAFANA_ANNOTATIONS_API_ENDPOINT
     api_auth = GRAFANA_ANNOTATIONS_API_AUTH
+    workers = GRAFANA_POSTMAN_WORKERS
+    queue_size = GRAFANA_POSTMAN_QUEUE_SIZE
+    coalesce_threshold = GRAFANA_POSTMAN_COALESCE_THRESHOLD
+    max_coalesced_keys = GRAFANA_POSTMAN_MAX_COALESCED_KEYS
+    rate_limit = GRAFANA_POSTMAN_RATE_LIMIT
+    rate_limit_burst = GRAFANA_POSTMAN_RATE_LIMIT_BURST
+    request_timeout = GRAFANA_POSTMAN_REQUEST_TIMEOUT
+    flush_timeout = GRAFANA_POSTMAN_FLUSH_TIMEOUT
 
     def __init__(self, _registry: EventsProcessesRegistry):
         self.url_set = threading.Event()
         self._grafana_post_url = ""
+        self._annotations_queue = queue.Queue(maxsize=self.queue_size)
+        self._coalesced: Dict[AnnotationKey, Annotation] = {}
+        self._coalesced_lock = threading.Lock()
+        self.stats: Dict[str, int] = defaultdict(int)
+        self._stats_lock = threading.Lock()
 
         super().__init__(_registry=_registry)
 
@@ -108,9 +168,99 @@ class GrafanaEventPostman(BaseEventsProcess[Annotation, None], threading.Thread)
         # Waiting until the monitor URL is set, and we can start using the API.
         self.url_set.wait()
 
-        for annotation in self.inbound_events():  # events from GrafanaAggregator
-            with verbose_suppress("GrafanaEventPostman failed to post an annotation %s", annotation):
-                requests.post(self._grafana_post_url, json=annotation, auth=self.api_auth).raise_for_status()
+        rate_limiter = TokenBucket(rate=self.rate_limit, burst=self.rate_limit_burst)
+        with requests.Session() as session:
+            session.auth = self.api_auth
+            workers = [threading.Thread(target=self._post_annotations,
+                                        name=f"{type(self).__name__}-worker-{index}",
+                                        kwargs={"session": session, "rate_limiter": rate_limiter},
+                                        daemon=True) for index in range(self.workers)]
+            for worker in workers:
+                worker.start()
+
+            for annotation in self.inbound_events():  # events from GrafanaAggregator
+                with verbose_suppress("GrafanaEventPostman failed to queue an annotation %s", annotation):
+                    self._queue_annotation(annotation)
+
+            for worker in workers:
+                worker.join()
+            self._flush(session)
+        LOGGER.info("GrafanaEventPostman stats: %s", dict(self.stats))
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _queue_annotation(self, annotation: Annotation) -> None:
+        if self._annotations_queue.qsize() < self.coalesce_threshold:
+            try:
+                self._annotations_queue.put_nowait(annotation)
+                return
+            except queue.Full:
+                pass
+        self._coalesce(annotation)
+
+    def _coalesce(self, annotation: Annotation) -> None:
+        annotation_key = GrafanaEventAggregator.unique_key(annotation)
+        with self._coalesced_lock:
+            if (coalesced := self._coalesced.get(annotation_key)) is None:
+                if len(self._coalesced) >= self.max_coalesced_keys:
+                    self._count("dropped")
+                    return
+                self._coalesced[annotation_key] = Annotation({**annotation, "count": 1})
+                return
+            coalesced["timeEnd"] = max(coalesced.get("timeEnd", coalesced["time"]), annotation["time"])
+            coalesced["time"] = min(coalesced["time"], annotation["time"])
+            coalesced["isRegion"] = True
+            coalesced["count"] += 1
+        self._count("coalesced")
+
+    def _pop_coalesced(self) -> Optional[Annotation]:
+        with self._coalesced_lock:
+            if not self._coalesced:
+                return None
+            annotation = self._coalesced.pop(next(iter(self._coalesced)))
+        if (count := annotation.pop("count")) > 1:
+            annotation["text"] = f"{annotation['text']}\n(and {count - 1} more similar events in this range)"
+        return annotation
+
+    def _get_annotation(self) -> Optional[Annotation]:
+        # Coalesced annotations are posted when the backlog is drained, to keep them on the right part of the graphs.
+        try:
+            return self._annotations_queue.get(timeout=GRAFANA_EVENT_AGGREGATOR_QUEUE_WAIT_TIMEOUT)
+        except queue.Empty:
+            return self._pop_coalesced()
+
+    def _post_annotations(self, session: requests.Session, rate_limiter: TokenBucket) -> None:
+        while not self.stop_event.is_set():
+            if (annotation := self._get_annotation()) is None:
+                continue
+            if not rate_limiter.acquire(stop_event=self.stop_event):
+                self._queue_annotation(annotation)  # will be posted (or counted as lost) by _flush()
+                break
+            self._post_annotation(session, annotation)
+
+    def _post_annotation(self, session: requests.Session, annotation: Annotation) -> None:
+        with verbose_suppress("GrafanaEventPostman failed to post an annotation %s", annotation):
+            session.post(self._grafana_post_url, json=annotation, timeout=self.request_timeout).raise_for_status()
+            self._count("posted")
+
+    def _pop_annotation(self) -> Optional[Annotation]:
+        try:
+            return self._annotations_queue.get_nowait()
+        except queue.Empty:
+            return self._pop_coalesced()
+
+    def _flush(self, session: requests.Session) -> None:
+        """Post annotations left in the backlog on shutdown, those which can't be posted in time are counted as lost."""
+        deadline = time.perf_counter() + self.flush_timeout
+        while (annotation := self._pop_annotation()) is not None:
+            if self._grafana_post_url and time.perf_counter() < deadline:
+                self._post_annotation(session, annotation)
+            else:
+                self._count("lost_on_shutdown")
+        if lost := self.stats.get("lost_on_shutdown"):
+            LOGGER.warning("GrafanaEventPostman: %s annotations were not posted before shutdown", lost)
 
     def set_grafana_url(self, grafana_base_url: str) -> None:
         if not grafana_base_url:
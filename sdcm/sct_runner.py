@@ -1,23 +1,29 @@
+import os
+import shlex
 import logging
 import random
 import sys
+import hashlib
 import tempfile
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from functools import lru_cache, cached_property
 from math import ceil
 from textwrap import dedent
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 import pytz
 
 import boto3
+import docker
 from libcloud.common.google import ResourceNotFoundError
 
 from sdcm.keystore import KeyStore, SSHKey
 from sdcm.remote import RemoteCmdRunnerBase
 from sdcm.utils.aws_utils import ec2_instance_wait_public_ip, ec2_ami_get_root_device_name
+from sdcm.utils.common import get_sct_root_path
 from sdcm.utils.get_username import get_username
 from sdcm.utils.prepare_region import AwsRegion
 from sdcm.utils.gce_utils import get_gce_service
@@ -25,6 +31,25 @@ from sdcm.utils.gce_utils import get_gce_service
 
 LOGGER = logging.getLogger(__name__)
 
+# Files which go into the content hash of the runner image (relative to the SCT root dir), in addition to the
+# prerequisites stages: change any of them and the next `create-runner-image' builds a new image.
+RUNNER_IMAGE_INPUTS = ("install-prereqs.sh", "requirements.txt", "docker/env/version", )
+IMAGE_COPY_WORKERS = 8
+
+
+def parallel_steps_script(steps: Dict[str, str]) -> str:
+    """Compose a bash script which runs the steps in parallel and fails if any of them fails.
+
+    Output of every step goes to its own log file, logs of failed steps are printed at the end.
+    """
+    script = ["rc=0"]
+    for name, step in steps.items():
+        script.append(f"( set -xe\n{dedent(step).strip()}\n) > /tmp/sct-prereqs-{name}.log 2>&1 &\npid_{name}=$!")
+    for name in steps:
+        script.append(f"wait $pid_{name} || {{ rc=1; echo \"Step '{name}' failed:\"; cat /tmp/sct-prereqs-{name}.log; }}")
+    script.append("exit $rc")
+    return "\n".join(script)
+
 
 class ImageType(Enum):
     SOURCE = "source"
@@ -75,60 +100,113 @@ class SctRunner(ABC):
         return RemoteCmdRunnerBase.create_remoter(hostname=host, user=self.LOGIN_USER,
                                                   key_file=self._ssh_pkey_file.name, connect_timeout=connect_timeout)
 
+    def prereqs_stages(self) -> List[Dict[str, str]]:
+        """Steps of the runner image build: stages go one by one, steps of a stage run in parallel.
+
+        Only one step of a stage may use apt, because of the dpkg lock.
+        """
+        public_key = self.key_pair().public_key.decode()
+        return [
+            {
+                "system": f"""
+                    echo "fs.aio-max-nr = 65536" >> /etc/sysctl.conf
+                    echo "ubuntu soft nofile 4096" >> /etc/security/limits.conf
+                    echo "jenkins soft nofile 4096" >> /etc/security/limits.conf
+                    echo "root soft nofile 4096" >> /etc/security/limits.conf
+                    sudo -u ubuntu mkdir -p /home/ubuntu/.ssh || true
+                    echo "{public_key}" >> /home/ubuntu/.ssh/authorized_keys
+                    chmod 600 /home/ubuntu/.ssh/authorized_keys
+                    mkdir -p -m 777 /home/ubuntu/sct-results
+                    echo "cd ~/sct-results" >> /home/ubuntu/.bashrc
+                    chown -R ubuntu:ubuntu /home/ubuntu/
+                """,
+                "packages": """
+                    apt clean
+                    apt update
+                    apt install -y python3-pip htop screen tree openjdk-14-jre-headless
+                    apt-get install -y apt-transport-https ca-certificates curl gnupg-agent software-properties-common
+                """,
+                "jenkins": f"""
+                    adduser --disabled-password --gecos "" jenkins || true
+                    mkdir -p /home/jenkins/.ssh
+                    echo "{public_key}" >> /home/jenkins/.ssh/authorized_keys
+                    chmod 600 /home/jenkins/.ssh/authorized_keys
+                    chown -R jenkins:jenkins /home/jenkins
+                    echo "jenkins ALL=(ALL) NOPASSWD: ALL" > /etc/sudoers.d/jenkins
+                """,
+            },
+            {
+                "docker": """
+                    curl -fsSL https://download.docker.com/linux/ubuntu/gpg | sudo apt-key add -
+                    apt-key fingerprint 0EBFCD88
+                    add-apt-repository "deb [arch=amd64] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable"
+                    apt update
+                    apt install -y docker-ce docker-ce-cli containerd.io
+                """,
+                "awscli": """
+                    pip3 install awscli
+                """,
+                "kubectl": """
+                    cd /tmp
+                    curl -LO "https://dl.k8s.io/release/$(curl -L -s https://dl.k8s.io/release/stable.txt)/bin/linux/amd64/kubectl"
+                    install -o root -g root -m 0755 kubectl /usr/local/bin/kubectl
+                """,
+            },
+            {
+                "finalize": f"""
+                    usermod -aG docker {self.LOGIN_USER}
+                    usermod -aG docker ubuntu || true
+                    usermod -aG docker jenkins
+                    # Jenkins pipelines run /bin/sh for some reason
+                    unlink /bin/sh
+                    ln -s /bin/bash /bin/sh
+                """,
+            },
+        ]
+
+    @cached_property
+    def content_hash(self) -> str:
+        """Hash of everything the runner image is built from, used to skip the build of an existing image."""
+        digest = hashlib.sha256(str(self.VERSION).encode())
+        for steps in self.prereqs_stages():
+            for name, step in steps.items():
+                digest.update(name.encode())
+                digest.update(dedent(step).strip().encode())
+        for path in RUNNER_IMAGE_INPUTS:
+            with open(os.path.join(get_sct_root_path(), path), "rb") as input_file:
+                digest.update(input_file.read())
+        return digest.hexdigest()[:12]
+
+    @property
+    def hashed_image_name(self) -> str:
+        return f"{self.image_name}-{self.content_hash}"
+
+    def run_prereqs_stages(self, run: Callable[[str], Tuple[int, str]]) -> None:
+        """Run the stages by `run' callable, which takes a script and returns its exit status and output."""
+        stages = self.prereqs_stages()
+        for idx, steps in enumerate(stages, 1):
+            LOGGER.info("Installing required packages, stage %s/%s: %s...", idx, len(stages), ", ".join(steps))
+            exit_status, output = run(parallel_steps_script(steps))
+            if exit_status != 0:
+                raise Exception("Unable to install required packages:\n%s" % output)
+        LOGGER.info("All packages successfully installed.")
+
     def install_prereqs(self, public_ip: str, connect_timeout: Optional[int] = None) -> None:
-        prereqs_script = dedent(f"""
-            echo "fs.aio-max-nr = 65536" >> /etc/sysctl.conf
-            echo "ubuntu soft nofile 4096" >> /etc/security/limits.conf
-            echo "jenkins soft nofile 4096" >> /etc/security/limits.conf
-            echo "root soft nofile 4096" >> /etc/security/limits.conf
-            sudo -u ubuntu mkdir -p /home/ubuntu/.ssh || true
-            echo "{self.key_pair().public_key.decode()}" >> /home/ubuntu/.ssh/authorized_keys
-            chmod 600 /home/ubuntu/.ssh/authorized_keys
-            mkdir -p -m 777 /home/ubuntu/sct-results
-            echo "cd ~/sct-results" >> /home/ubuntu/.bashrc
-            chown -R ubuntu:ubuntu /home/ubuntu/
-            apt clean
-            apt update
-            apt install -y python3-pip htop screen tree
-            pip3 install awscli
-            # docker
-            apt-get install -y apt-transport-https ca-certificates curl gnupg-agent software-properties-common
-            curl -fsSL https://download.docker.com/linux/ubuntu/gpg | sudo apt-key add -
-            apt-key fingerprint 0EBFCD88
-            add-apt-repository "deb [arch=amd64] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable"
-            apt update
-            apt install -y docker-ce docker-ce-cli containerd.io
-            usermod -aG docker {self.LOGIN_USER}
-            # add kubectl
-            curl -LO "https://dl.k8s.io/release/$(curl -L -s https://dl.k8s.io/release/stable.txt)/bin/linux/amd64/kubectl"
-            sudo install -o root -g root -m 0755 kubectl /usr/local/bin/kubectl
-            usermod -aG docker ubuntu || true
-            # configure Jenkins user
-            apt install -y openjdk-14-jre-headless
-            adduser --disabled-password --gecos "" jenkins || true
-            usermod -aG docker jenkins
-            mkdir -p /home/jenkins/.ssh
-            echo "{self.key_pair().public_key.decode()}" >> /home/jenkins/.ssh/authorized_keys
-            chmod 600 /home/jenkins/.ssh/authorized_keys
-            chown -R jenkins:jenkins /home/jenkins
-            echo "jenkins ALL=(ALL) NOPASSWD: ALL" > /etc/sudoers.d/jenkins
-            # Jenkins pipelines run /bin/sh for some reason
-            unlink /bin/sh
-            ln -s /bin/bash /bin/sh
-        """)
         LOGGER.info("Connecting instance...")
         remoter = self.get_remoter(host=public_ip, connect_timeout=connect_timeout)
-        LOGGER.info("Installing required packages...")
-        result = remoter.run(f"sudo bash -cxe '{prereqs_script}'", ignore_status=True)
 
-        remoter.stop()
-        if result.exit_status == 0:
-            LOGGER.info("All packages successfully installed.")
-        else:
-            raise Exception("Unable to install required packages:\n%s" % (result.stdout + result.stderr))
+        def run(script):
+            result = remoter.run(f"sudo bash -c {shlex.quote(script)}", ignore_status=True)
+            return result.exit_status, result.stdout + result.stderr
+
+        try:
+            self.run_prereqs_stages(run)
+        finally:
+            remoter.stop()
 
     @abstractmethod
-    def _image(self, image_type=ImageType.SOURCE):
+    def _image(self, image_type=ImageType.SOURCE, content_hash: Optional[str] = None):
+        """Return the image of the current version (the latest one), or the one built from the given content."""
         ...
 
     @property
@@ -145,9 +223,24 @@ class SctRunner(ABC):
         ...
 
     @abstractmethod
-    def create_image(self) -> None:
+    def build_source_image(self) -> None:
+        """Build the image in the source region, unless an image with the same content hash exists there."""
         ...
 
+    @abstractmethod
+    def copy_image(self) -> None:
+        """Copy the source image to the region of the runner, unless it's there already."""
+        ...
+
+    def create_image(self) -> None:
+        """
+            Create an Image for SCT Runner in specified region. If the Image exists in SOURCE_REGION
+            it will be copied to the destination region.
+            Use SctRunnerImagePipeline to create images in a few regions at once.
+        """
+        self.build_source_image()
+        self.copy_image()
+
     @abstractmethod
     def _get_base_image(self, image=None):
         ...
@@ -211,24 +304,24 @@ class AwsSctRunner(SctRunner):
         ks = KeyStore()
         return ks.get_ec2_ssh_key_pair()
 
-    def _image(self, image_type=ImageType.SOURCE):
+    def _image(self, image_type=ImageType.SOURCE, content_hash: Optional[str] = None):
         if image_type == ImageType.SOURCE:
-            client = self.ec2_client_source
+            client, ec2_resource = self.ec2_client_source, self.ec2_resource_source
         elif image_type == ImageType.GENERAL:
-            client = self.ec2_client
+            client, ec2_resource = self.ec2_client, self.ec2_resource
         else:
             raise ValueError("Unknown Image type")
-        amis = client.describe_images(Owners=["self"],
-                                      Filters=[{"Name": "tag:Name", "Values": [self.image_name]},
-                                               {"Name": "tag:Version", "Values": [str(self.VERSION)]}])
+        filters = [{"Name": "tag:Name", "Values": [self.image_name]},
+                   {"Name": "tag:Version", "Values": [str(self.VERSION)]}]
+        if content_hash:
+            filters.append({"Name": "tag:ContentHash", "Values": [content_hash]})
+        amis = client.describe_images(Owners=["self"], Filters=filters)
         LOGGER.debug("Found SCT Runner AMIs: %s", amis)
         existing_amis = amis.get("Images", [])
         if len(existing_amis) == 0:
             return None
-        assert len(existing_amis) == 1, \
-            f"More than 1 SCT Runner AMI with {self.image_name}:{self.VERSION} " \
-            f"found in {self.region_name}: {existing_amis}"
-        return self.ec2_resource.Image(existing_amis[0]["ImageId"])  # pylint: disable=no-member
+        latest_ami = max(existing_amis, key=lambda ami: ami["CreationDate"])
+        return ec2_resource.Image(latest_ami["ImageId"])  # pylint: disable=no-member
 
     # pylint: disable=too-many-arguments
     def _create_instance(self, instance_type, base_image, tags_list, instance_name=None, region_az="", test_duration=None):
@@ -278,6 +371,7 @@ class AwsSctRunner(SctRunner):
         image_tags = [
             {"Key": "Name", "Value": self.image_name},
             {"Key": "Version", "Value": str(self.VERSION)},
+            {"Key": "ContentHash", "Value": self.content_hash},
         ]
         runer_image = ec2_resource.Image(image_id)
         runer_image.wait_until_exists()
@@ -286,26 +380,25 @@ class AwsSctRunner(SctRunner):
         LOGGER.info("Tagging completed.")
         LOGGER.info("SCT Runner image created in '%s'. Id [%s].", self.region_name, image_id)
 
-    def create_image(self) -> None:
-        """
-            Create an Image for SCT Runner in specified region. If the Image exists in SOURCE_REGION
-            it will be copied to the destination region.
-            Warning: this can't run in parallel!
-        """
-        LOGGER.info("Looking for source SCT Runner Image in '%s'...", self.SOURCE_IMAGE_REGION)
-        source_image = self.source_image
-        if not source_image:
-            LOGGER.info("Source SCT Runner Image not found. Creating...")
-            instance = self._create_instance(
-                instance_type="t3.small",
-                base_image=self.BASE_IMAGE,
-                tags_list=[{"Key": "Name", "Value": "sct-image-builder"},
-                           {"Key": "keep", "Value": "1"},
-                           {"Key": "keep_action", "Value": "terminate"},
-                           {"Key": "Version", "Value": str(self.VERSION)},
-                           ],
-                region_az=self.SOURCE_IMAGE_REGION + self.availability_zone  # pylint: disable=no-member
-            )
+    def build_source_image(self) -> None:
+        LOGGER.info("Looking for source SCT Runner Image %s in '%s'...", self.hashed_image_name, self.SOURCE_IMAGE_REGION)
+        source_image = self._image(image_type=ImageType.SOURCE, content_hash=self.content_hash)
+        if source_image:
+            LOGGER.info("SCT Runner image exists in the source region '%s'! "
+                        "ID: %s", self.SOURCE_IMAGE_REGION, source_image.image_id)
+            return
+        LOGGER.info("Source SCT Runner Image not found. Creating...")
+        instance = self._create_instance(
+            instance_type="t3.small",
+            base_image=self.BASE_IMAGE,
+            tags_list=[{"Key": "Name", "Value": "sct-image-builder"},
+                       {"Key": "keep", "Value": "1"},
+                       {"Key": "keep_action", "Value": "terminate"},
+                       {"Key": "Version", "Value": str(self.VERSION)},
+                       ],
+            region_az=self.SOURCE_IMAGE_REGION + self.availability_zone  # pylint: disable=no-member
+        )
+        try:
             self.install_prereqs(public_ip=instance.public_ip_address)
             LOGGER.info("Stopping the SCT Image Builder instance...")
             instance.stop()
@@ -314,10 +407,11 @@ class AwsSctRunner(SctRunner):
             result = self.ec2_client_source.create_image(
                 Description=self.IMAGE_DESCRIPTION,
                 InstanceId=instance.instance_id,
-                Name=self.image_name,
+                Name=self.hashed_image_name,
                 NoReboot=False
             )
             self.tag_image(image_id=result["ImageId"], image_type=ImageType.SOURCE)
+        finally:
             try:
                 LOGGER.info("Terminating image builder instance '%s'...", instance.instance_id)
                 instance.terminate()
@@ -325,24 +419,23 @@ class AwsSctRunner(SctRunner):
                 LOGGER.warning("Was not able to terminate '%s': %s\n"
                                "Please terminate manually!!!", instance.instance_id, ex)
 
-        else:
-            LOGGER.info("SCT Runner image exists in the source region '%s'! "
-                        "ID: %s", self.SOURCE_IMAGE_REGION, source_image.image_id)
-
-        if self.region_name != self.SOURCE_IMAGE_REGION and self.image is None:
-            LOGGER.info("Copying %s to %s...\nNote: It can take 5-15 minutes.",
-                        self.image_name, self.region_name)
-            result = self.ec2_client.copy_image(  # pylint: disable=no-member
-                Description=self.IMAGE_DESCRIPTION,
-                Name=self.image_name,
-                SourceImageId=self.source_image.image_id,
-                SourceRegion=self.SOURCE_IMAGE_REGION
-            )
-            LOGGER.info("Image copied, id: '%s'.", result["ImageId"])
-            self.tag_image(image_id=result["ImageId"], image_type=ImageType.GENERAL)
-            LOGGER.info("Done.")
-        else:
+    def copy_image(self) -> None:
+        if self.region_name == self.SOURCE_IMAGE_REGION or \
+                self._image(image_type=ImageType.GENERAL, content_hash=self.content_hash) is not None:
             LOGGER.info("No need to copy SCT Runner image since it already exists in '%s'.", self.region_name)
+            return
+        source_image = self._image(image_type=ImageType.SOURCE, content_hash=self.content_hash)
+        assert source_image, f"No source SCT Runner image {self.hashed_image_name} in '{self.SOURCE_IMAGE_REGION}'"
+        LOGGER.info("Copying %s to %s...\nNote: It can take 5-15 minutes.", self.hashed_image_name, self.region_name)
+        result = self.ec2_client.copy_image(  # pylint: disable=no-member
+            Description=self.IMAGE_DESCRIPTION,
+            Name=self.hashed_image_name,
+            SourceImageId=source_image.image_id,
+            SourceRegion=self.SOURCE_IMAGE_REGION
+        )
+        LOGGER.info("Image copied, id: '%s'.", result["ImageId"])
+        self.tag_image(image_id=result["ImageId"], image_type=ImageType.GENERAL)
+        LOGGER.info("Done.")
 
     def _get_base_image(self, image=None):
         if image is None:
@@ -384,35 +477,34 @@ class GceSctRunner(SctRunner):
         ks = KeyStore()
         return ks.get_gce_ssh_key_pair()  # scylla-test
 
-    def create_image(self) -> None:
-        """
-             Create an Image for SCT Runner in specified region. If the Image exists in SOURCE_REGION
-             it will be copied to the destination region.
-             Warning: this can't run in parallel!
-         """
-        LOGGER.info("Looking for source SCT Runner Image in %s ...", self.SOURCE_IMAGE_REGION)
-        source_image = self.source_image
-        if not source_image:
-            # GCE doesn't allow repeat name in multiple datacenter
-            instance_name = f"{self.image_name}-builder-{self.SOURCE_IMAGE_REGION}"
-            LOGGER.info("Source SCT Runner Image not found. Creating...")
-            if self.availability_zone != "":
-                region_az = f"{self.SOURCE_IMAGE_REGION}-{self.availability_zone}"
-            else:
-                region_az = self.SOURCE_IMAGE_REGION
-            lt_datetime = datetime.datetime.now(tz=pytz.utc)
-            instance = self._create_instance(
-                instance_type="e2-standard-2",
-                base_image=self.BASE_IMAGE,
-                tags_list=[{"Key": "Name", "Value": "sct-image-builder"},
-                           {"Key": "keep", "Value": "1"},
-                           {"Key": "keep_action", "Value": "terminate"},
-                           {"Key": "Version", "Value": str(self.VERSION)},
-                           {"Key": "launch_time", "Value": lt_datetime.strftime("%B %d, %Y, %H:%M:%S")},
-                           ],
-                instance_name=instance_name,
-                region_az=region_az
-            )
+    def build_source_image(self) -> None:
+        LOGGER.info("Looking for source SCT Runner Image %s in %s ...", self.hashed_image_name, self.SOURCE_IMAGE_REGION)
+        source_image = self._image(image_type=ImageType.SOURCE, content_hash=self.content_hash)
+        if source_image:
+            LOGGER.info("SCT Runner image exists in the source region '%s'! "
+                        "ID: %s", self.SOURCE_IMAGE_REGION, source_image.id)
+            return
+        # GCE doesn't allow repeat name in multiple datacenter
+        instance_name = f"{self.image_name}-builder-{self.SOURCE_IMAGE_REGION}"
+        LOGGER.info("Source SCT Runner Image not found. Creating...")
+        if self.availability_zone != "":
+            region_az = f"{self.SOURCE_IMAGE_REGION}-{self.availability_zone}"
+        else:
+            region_az = self.SOURCE_IMAGE_REGION
+        lt_datetime = datetime.datetime.now(tz=pytz.utc)
+        instance = self._create_instance(
+            instance_type="e2-standard-2",
+            base_image=self.BASE_IMAGE,
+            tags_list=[{"Key": "Name", "Value": "sct-image-builder"},
+                       {"Key": "keep", "Value": "1"},
+                       {"Key": "keep_action", "Value": "terminate"},
+                       {"Key": "Version", "Value": str(self.VERSION)},
+                       {"Key": "launch_time", "Value": lt_datetime.strftime("%B %d, %Y, %H:%M:%S")},
+                       ],
+            instance_name=instance_name,
+            region_az=region_az
+        )
+        try:
             time.sleep(30)  # wait until the public ips are available.
             self.install_prereqs(public_ip=instance.public_ips[0], connect_timeout=120)
 
@@ -420,12 +512,14 @@ class GceSctRunner(SctRunner):
             self.gce_service_source.ex_stop_node(instance)
             LOGGER.info("SCT Image Builder instance stopped.\nCreating image...")
             source_volume = self.gce_service_source.ex_get_volume(f"{instance_name}-root-pd-ssd")
-            new_image = self.gce_service_source.ex_create_image(self.image_name,
-                                                                source_volume,
-                                                                description=self.IMAGE_DESCRIPTION,
-                                                                family=self.FAMILY,
-                                                                ex_labels={"name": self.image_name,
-                                                                           "version": str(self.VERSION).replace('.', '_')})
+            self.gce_service_source.ex_create_image(self.hashed_image_name,
+                                                    source_volume,
+                                                    description=self.IMAGE_DESCRIPTION,
+                                                    family=self.FAMILY,
+                                                    ex_labels={"name": self.image_name,
+                                                               "version": str(self.VERSION).replace('.', '_'),
+                                                               "content_hash": self.content_hash})
+        finally:
             try:
                 LOGGER.info("Terminating image builder instance '%s'...", instance.id)
                 self.gce_service_source.destroy_node(instance)
@@ -433,22 +527,22 @@ class GceSctRunner(SctRunner):
                 LOGGER.warning("Was not able to terminate '%s': %s\n"
                                "Please terminate manually!!!", instance.id, str(ex))
 
-        else:
-            LOGGER.info("SCT Runner image exists in the source region '%s'! "
-                        "ID: %s", self.SOURCE_IMAGE_REGION, source_image.id)
-
-        if self.region_name != self.SOURCE_IMAGE_REGION and self.image is None:
-            LOGGER.info("Copying %s to %s ...\nNote: It can take 5-15 minutes.", self.image_name, self.region_name)
-            new_image = self.gce_service.ex_copy_image(  # pylint: disable=no-member
-                self.image_name,
-                self._get_image_url(self.source_image.id),
-                description=self.IMAGE_DESCRIPTION,
-                family=self.FAMILY
-            )
-            LOGGER.info("Image copied, id: '%s'.", new_image.id)
-            LOGGER.info("Done.")
-        else:
+    def copy_image(self) -> None:
+        if self.region_name == self.SOURCE_IMAGE_REGION or \
+                self._image(image_type=ImageType.GENERAL, content_hash=self.content_hash) is not None:
             LOGGER.info("No need to copy SCT Runner image since it's available for '%s'.", self.region_name)
+            return
+        source_image = self._image(image_type=ImageType.SOURCE, content_hash=self.content_hash)
+        assert source_image, f"No source SCT Runner image {self.hashed_image_name} in '{self.SOURCE_IMAGE_REGION}'"
+        LOGGER.info("Copying %s to %s ...\nNote: It can take 5-15 minutes.", self.hashed_image_name, self.region_name)
+        new_image = self.gce_service.ex_copy_image(  # pylint: disable=no-member
+            self.hashed_image_name,
+            self._get_image_url(source_image.id),
+            description=self.IMAGE_DESCRIPTION,
+            family=self.FAMILY
+        )
+        LOGGER.info("Image copied, id: '%s'.", new_image.id)
+        LOGGER.info("Done.")
 
     def _get_base_image(self, image=None):
         """
@@ -487,7 +581,7 @@ class GceSctRunner(SctRunner):
                                                    ex_labels=labels,
                                                    ex_metadata=metadata)
 
-    def _image(self, image_type=ImageType.SOURCE):
+    def _image(self, image_type=ImageType.SOURCE, content_hash: Optional[str] = None):
         if image_type == ImageType.SOURCE:
             driver = self.gce_service_source
         elif image_type == ImageType.GENERAL:
@@ -495,12 +589,149 @@ class GceSctRunner(SctRunner):
         else:
             raise ValueError("Unknown Image type")
 
+        if not content_hash:
+            try:
+                image = driver.ex_get_image_from_family(self.FAMILY)
+            except ResourceNotFoundError:
+                image = None
+            if image is not None and image.extra.get("labels", {}).get("version") == str(self.VERSION).replace('.', '_'):
+                return image
+        # without the content hash, look for an image built before images got content hashes
+        image_name = f"{self.image_name}-{content_hash}" if content_hash else self.image_name
         try:
-            return driver.ex_get_image(self.image_name)
-        except ResourceNotFoundError as ex:  # pylint: disable=unused-variable
+            return driver.ex_get_image(image_name)
+        except ResourceNotFoundError:
             return None
 
 
+class DockerSctRunner(SctRunner):
+    """Local stand-in of a cloud backend: images are Docker images and regions are image repositories.
+
+    Used to test the image build pipeline without a cloud account, the stages can be replaced by lighter ones.
+
+    Usage:
+        >>> runner = DockerSctRunner(region_name="local-2", stages=[{"hello": "echo hello > /hello"}])
+        >>> SctRunnerImagePipeline([runner]).run()  # build `sct-runner-1.4-local:<content hash>' and tag it for local-2
+    """
+    BASE_IMAGE = "ubuntu:20.04"
+    SOURCE_IMAGE_REGION = "local"
+    LOGIN_USER = "root"
+
+    def __init__(self, region_name: str = SOURCE_IMAGE_REGION, stages: Optional[List[Dict[str, str]]] = None,
+                 docker_client=None, cloud_provider: str = "docker"):
+        super().__init__(cloud_provider=cloud_provider, region_name=region_name)
+        self._stages = stages
+        self._docker_client = docker_client
+
+    @cached_property
+    def docker_client(self):
+        return self._docker_client or docker.from_env()
+
+    @cached_property
+    def image_name(self) -> str:
+        return f"sct-runner-{self.VERSION}"
+
+    @staticmethod
+    def instance_type(test_duration) -> str:
+        return ""
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def key_pair() -> SSHKey:
+        ks = KeyStore()
+        return ks.get_ec2_ssh_key_pair()
+
+    def prereqs_stages(self) -> List[Dict[str, str]]:
+        if self._stages is not None:
+            return self._stages
+        return super().prereqs_stages()
+
+    def repository(self, region_name: str) -> str:
+        return f"{self.image_name}-{region_name}"
+
+    @property
+    def image_labels(self) -> Dict[str, str]:
+        return {"sct-runner-version": str(self.VERSION), "sct-runner-content-hash": self.content_hash}
+
+    def _image(self, image_type=ImageType.SOURCE, content_hash: Optional[str] = None):
+        if image_type == ImageType.SOURCE:
+            region_name = self.SOURCE_IMAGE_REGION
+        elif image_type == ImageType.GENERAL:
+            region_name = self.region_name
+        else:
+            raise ValueError("Unknown Image type")
+        labels = [f"sct-runner-version={self.VERSION}"]
+        if content_hash:
+            labels.append(f"sct-runner-content-hash={content_hash}")
+        images = self.docker_client.images.list(name=self.repository(region_name), filters={"label": labels})
+        return max(images, key=lambda image: image.attrs["Created"], default=None)
+
+    # pylint: disable=too-many-arguments
+    def _create_instance(self, instance_type, base_image, tags_list, instance_name=None, region_az="", test_duration=None):
+        return self.docker_client.containers.run(base_image, command="sleep infinity", detach=True, name=instance_name,
+                                                 labels={tag["Key"]: str(tag["Value"]) for tag in tags_list})
+
+    def _get_base_image(self, image=None):
+        if image is None:
+            image = self.image
+        return image.id
+
+    def build_source_image(self) -> None:
+        LOGGER.info("Looking for source SCT Runner Image %s...", self.hashed_image_name)
+        source_image = self._image(image_type=ImageType.SOURCE, content_hash=self.content_hash)
+        if source_image:
+            LOGGER.info("SCT Runner image exists in the source region '%s'! "
+                        "ID: %s", self.SOURCE_IMAGE_REGION, source_image.id)
+            return
+        LOGGER.info("Source SCT Runner Image not found. Creating...")
+        container = self._create_instance(instance_type=self.instance_type(test_duration=None),
+                                          base_image=self.BASE_IMAGE,
+                                          tags_list=[{"Key": "Name", "Value": "sct-image-builder"},
+                                                     {"Key": "Version", "Value": str(self.VERSION)}])
+        try:
+            def run(script):
+                result = container.exec_run(["bash", "-c", script])
+                return result.exit_code, result.output.decode(errors="replace")
+
+            self.run_prereqs_stages(run)
+            container.commit(repository=self.repository(self.SOURCE_IMAGE_REGION), tag=self.content_hash,
+                             conf={"Labels": self.image_labels})
+        finally:
+            container.remove(force=True)
+
+    def copy_image(self) -> None:
+        if self.region_name == self.SOURCE_IMAGE_REGION or \
+                self._image(image_type=ImageType.GENERAL, content_hash=self.content_hash) is not None:
+            LOGGER.info("No need to copy SCT Runner image since it already exists in '%s'.", self.region_name)
+            return
+        source_image = self._image(image_type=ImageType.SOURCE, content_hash=self.content_hash)
+        assert source_image, f"No source SCT Runner image {self.hashed_image_name} in '{self.SOURCE_IMAGE_REGION}'"
+        source_image.tag(self.repository(self.region_name), tag=self.content_hash)
+
+
+class SctRunnerImagePipeline:
+    """Build the runner image once in the source region and copy it to the regions of all runners concurrently.
+
+    Nothing is built or copied if an image with the same content hash exists already.
+
+    Usage:
+        >>> runners = [AwsSctRunner(region_name=region, availability_zone="a") for region in ("eu-west-2", "us-east-1")]
+        >>> SctRunnerImagePipeline(runners).run()
+    """
+
+    def __init__(self, runners: List[SctRunner], workers: int = IMAGE_COPY_WORKERS):
+        assert runners, "At least one SCT runner is required"
+        self.runners = runners
+        self.workers = workers
+
+    def run(self) -> None:
+        self.runners[0].build_source_image()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="SctRunnerImageCopy") as executor:
+            futures = [executor.submit(runner.copy_image) for runner in self.runners]
+            for future in futures:
+                future.result()
+
+
 if __name__ == "__main__":
     TEST_REGION = "eu-west-2"
     TEST_ZONE = "a"
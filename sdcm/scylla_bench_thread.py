@@ -20,6 +20,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from sdcm.loader import ScyllaBenchStressExporter
 from sdcm.prometheus import nemesis_metrics_obj
+from sdcm.remote.base import OutputTailWatcher
 from sdcm.sct_events import Severity
 from sdcm.sct_events.loaders import ScyllaBenchEvent, SCYLLA_BENCH_ERROR_EVENTS_PATTERNS
 from sdcm.utils.common import FileFollowerThread, generate_random_string, convert_metric_to_ms
@@ -161,7 +162,8 @@ class ScyllaBenchThread:  # pylint: disable=too-many-instance-attributes
                 result = node.remoter.run(
                     cmd="/$HOME/go/bin/{name} -nodes {ips}".format(name=stress_cmd.strip(), ips=ips),
                     timeout=self.timeout,
-                    log_file=log_file_name)
+                    log_file=log_file_name,
+                    watchers=[OutputTailWatcher()])
             except Exception as exc:  # pylint: disable=broad-except
                 errors_str = format_stress_cmd_error(exc)
                 if "truncate: seastar::rpc::timeout_error" in errors_str:
@@ -17,7 +17,11 @@ import subprocess
 import logging
 import tempfile
 import json
-from typing import Optional, Sequence, Tuple
+import gzip
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -30,6 +34,12 @@ from sdcm.utils.common import list_instances_gce, list_instances_aws, list_resou
 
 LOGGER = logging.getLogger(__name__)
 
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_templates')
+ATTACHMENT_COMPRESSION_THRESHOLD = 1048576  # 1Mb, bigger attachments are gzipped
+MORE_EVENTS_MESSAGE = 'There are more events. See log file.'
+NO_EVENTS_MESSAGE = 'No events with this severity'
+LAST_EVENTS_SIZE_LIMIT = 3000000  # the biggest per-severity budget of reports, no need to keep more in the email data
+
 
 class AttachementSizeExceeded(Exception):
     def __init__(self, current_size, limit):
@@ -122,6 +132,90 @@ class Email():
         self.conn.quit()
 
 
+class LastEventsAccumulator:
+    """Keep the last events of every severity which fit the per-severity and the total size budgets.
+
+    Events are added in chronological order and older events are dropped as soon as they don't fit the budget of
+    their severity, so memory is bounded by the budgets and not by the number of events.  The total budget is applied
+    by `result()', severities go in the order of `severities' and take the newest events first.
+
+    Usage:
+        >>> accumulator = LastEventsAccumulator(category_size_limit=35000, total_size_limit=70000,
+        ...                                     events_in_category_limit=100, severities=["CRITICAL", "ERROR"])
+        >>> accumulator.add_events("ERROR", events_logger.iter_events(Severity.ERROR))
+        >>> accumulator.result()  # {"ERROR": [..., "There are more events. See log file."]}
+    """
+
+    def __init__(self, category_size_limit: int, total_size_limit: int, events_in_category_limit: int,
+                 severities: Iterable[str]):
+        self.category_size_limit = category_size_limit
+        self.total_size_limit = total_size_limit
+        self.events_in_category_limit = events_in_category_limit
+        self.severities = list(severities)
+        self._events: Dict[str, deque] = {}
+        self._sizes: Dict[str, int] = {}
+        self._dropped: Dict[str, bool] = {}
+
+    def add_events(self, severity: str, events: Iterable[str]) -> None:
+        if severity not in self.severities:
+            return
+        bucket = self._events.setdefault(severity, deque())
+        self._sizes.setdefault(severity, 0)
+        self._dropped.setdefault(severity, False)
+        for event in events:
+            bucket.append(event)
+            self._sizes[severity] += len(event)
+            while len(bucket) > 1 and (self._sizes[severity] >= self.category_size_limit or
+                                       len(bucket) > self.events_in_category_limit):
+                self._sizes[severity] -= len(bucket.popleft())
+                self._dropped[severity] = True
+
+    @property
+    def over_the_limit(self) -> bool:
+        """True if some events don't fit the budgets."""
+        total_size = 0
+        for severity, bucket in self._events.items():
+            total_size += self._sizes[severity]
+            if self._dropped[severity] or self._sizes[severity] >= self.category_size_limit:
+                return True
+        return total_size > self.total_size_limit
+
+    def result(self) -> Dict[str, List[str]]:
+        output = {}
+        total_size = 0
+        for severity in self.severities:
+            if severity not in self._events:
+                continue
+            bucket = self._events[severity]
+            if not bucket:
+                output[severity] = [NO_EVENTS_MESSAGE]
+                continue
+            severity_events = []
+            for event in reversed(bucket):
+                if len(event) >= self.category_size_limit or total_size + len(event) > self.total_size_limit:
+                    break
+                severity_events.append(event)
+                total_size += len(event)
+            severity_events.reverse()
+            if not severity_events:
+                severity_events.append(bucket[-1][:self.category_size_limit])
+            if self._dropped[severity] or len(severity_events) < len(bucket) or \
+                    len(bucket[-1]) >= self.category_size_limit:
+                severity_events.append(MORE_EVENTS_MESSAGE)
+            output[severity] = severity_events
+        return output
+
+
+def compress_attachment(path: str, threshold: int = ATTACHMENT_COMPRESSION_THRESHOLD) -> str:
+    """Gzip the file if it's bigger than `threshold' bytes and return the path of the file to attach."""
+    if os.path.getsize(path) <= threshold:
+        return path
+    compressed_path = path + ".gz"
+    with open(path, "rb") as src, gzip.open(compressed_path, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    return compressed_path
+
+
 class BaseEmailReporter:
     COMMON_EMAIL_FIELDS = (
         "backend",
@@ -171,6 +265,13 @@ class BaseEmailReporter:
     def build_data_for_attachments(self, results):
         return {key: results.get(key, "N/A") for key in self.fields}
 
+    @cached_property
+    def jinja_env(self) -> jinja2.Environment:
+        # shared by all renderings, so every template is compiled once
+        return jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+                                  autoescape=True,
+                                  extensions=['jinja2.ext.loopcontrols'])
+
     def render_to_html(self, results, template_str=None, template_file=None):
         """
         Render analysis results to html template_init_es
@@ -186,12 +287,10 @@ class BaseEmailReporter:
             current_template = self.email_template_fp
 
         self.log.info("Rendering results to html using '%s' template...", current_template)
-        loader = jinja2.FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_templates'))
-        env = jinja2.Environment(loader=loader, autoescape=True, extensions=['jinja2.ext.loopcontrols'])
         if template_str is None:
-            template = env.get_template(current_template)
+            template = self.jinja_env.get_template(current_template)
         else:
-            template = env.from_string(template_str)
+            template = self.jinja_env.from_string(template_str)
         html = template.render(results)
         self.log.info("Results has been rendered to html")
         return html
@@ -227,13 +326,15 @@ class BaseEmailReporter:
         email = None
         for _ in range(4):
             try:
-                report = self._generate_report(report_data)
-                attachments = self._generate_report_attachments(attachments_data)
-                email = smtp.prepare_email(
-                    subject=report_data['subject'],
-                    recipients=self.email_recipients,
-                    content=report,
-                    files=attachments)
+                # budgets of the last events are applied before rendering, so the loop is a safety net only
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix="EmailReport") as executor:
+                    report = executor.submit(self._generate_report, report_data)
+                    attachments = executor.submit(self._generate_report_attachments, attachments_data)
+                    email = smtp.prepare_email(
+                        subject=report_data['subject'],
+                        recipients=self.email_recipients,
+                        content=report.result(),
+                        files=attachments.result())
                 break
             except (AttachementSizeExceeded, BodySizeExceeded) as exc:
                 report_data, attachments_data = self.cut_report_data(report_data, attachments_data, reason=exc)
@@ -265,14 +366,13 @@ class BaseEmailReporter:
 
     def build_report(self, report_data):
         self.log.info("Prepare result to send in email")
-        report_data['last_events'] = self._get_last_events(
+        return self.render_to_html(dict(report_data, last_events=self._get_last_events(
             report_data,
             self.last_events_body_limit_per_severity,
             self.last_events_body_limit_total,
             self.last_events_limit,
             self.last_events_severities
-        )
-        return self.render_to_html(report_data)
+        )))
 
     @staticmethod
     def build_report_attachments(attachments_data, template_str=None):  # pylint: disable=unused-argument
@@ -285,48 +385,29 @@ class BaseEmailReporter:
         return None, None
 
     @staticmethod
-    def _get_last_events(report_data, category_size_limit, total_size_limit, events_in_category_limit, severities):
-        output = {}
-        total_size = 0
-        last_events = report_data.get('last_events')
-        if last_events and isinstance(last_events, dict):
-            for severity, events in last_events.items():
-                if severity not in severities:
-                    continue
-                severity_events_length = 0
-                if not events:
-                    output[severity] = ['No events with this severity']
-                    continue
-                output[severity] = severity_events = []
-                for event in reversed(events):
-                    if len(event) >= category_size_limit - severity_events_length or \
-                            len(severity_events) >= events_in_category_limit or \
-                            total_size + len(event) > total_size_limit:
-                        severity_events.append('There are more events. See log file.')
-                        break
-                    severity_events.insert(0, event)
-                    severity_events_length += len(event)
-                    total_size += len(event)
-                if len(severity_events) == 0 and len(events) >= 1:
-                    severity_events.append(events[-1][category_size_limit])
-                    severity_events.append('There are more events. See log file.')
-        return output
-
-    @staticmethod
-    def _check_if_last_events_over_the_limit(report_data, category_size_limit, total_size_limit, events_in_category_limit):
-        total_size = 0
+    def _accumulate_last_events(report_data, category_size_limit, total_size_limit, events_in_category_limit,
+                                severities=None) -> LastEventsAccumulator:
         last_events = report_data.get('last_events')
-        if last_events and isinstance(last_events, dict):
-            for events in last_events.values():
-                severity_events_length = 0
-                for event in reversed(events):
-                    if len(event) >= category_size_limit - severity_events_length or \
-                            severity_events_length >= events_in_category_limit or \
-                            total_size + len(event) > total_size_limit:
-                        return True
-                    severity_events_length += len(event)
-                    total_size += len(event)
-        return False
+        if not last_events or not isinstance(last_events, dict):
+            last_events = {}
+        accumulator = LastEventsAccumulator(category_size_limit=category_size_limit,
+                                            total_size_limit=total_size_limit,
+                                            events_in_category_limit=events_in_category_limit,
+                                            severities=list(last_events) if severities is None else severities)
+        for severity, events in last_events.items():
+            accumulator.add_events(severity, events or ())
+        return accumulator
+
+    @classmethod
+    def _get_last_events(cls, report_data, category_size_limit, total_size_limit, events_in_category_limit, severities):
+        return cls._accumulate_last_events(
+            report_data, category_size_limit, total_size_limit, events_in_category_limit, severities).result()
+
+    @classmethod
+    def _check_if_last_events_over_the_limit(cls, report_data, category_size_limit, total_size_limit,
+                                             events_in_category_limit):
+        return cls._accumulate_last_events(
+            report_data, category_size_limit, total_size_limit, events_in_category_limit).over_the_limit
 
 
 class ManagerUpgradeEmailReporter(BaseEmailReporter):
@@ -356,7 +437,7 @@ class LongevityEmailReporter(BaseEmailReporter):
         "scylla_ami_id",
     )
     email_template_file = "results_longevity.html"
-    last_events_body_limit_per_severity_in_attachment = 3000000
+    last_events_body_limit_per_severity_in_attachment = LAST_EVENTS_SIZE_LIMIT
     last_events_body_limit_total_in_attachment = 10000000
     last_events_limit_in_attachment = 10000000  # This limit won't be reached, to be relay only on body limits
     last_events_severities_in_attachment = BaseEmailReporter.last_events_severities + ['NORMAL']
@@ -395,26 +476,26 @@ class LongevityEmailReporter(BaseEmailReporter):
         return super().build_report(report_data)
 
     def build_report_attachments(self, attachments_data, template_str=None):
-        attachments = (self.build_email_report(attachments_data, template_str),
-                       self.build_issue_template(attachments_data))
-        return attachments
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="EmailAttachment") as executor:
+            attachments = (executor.submit(self.build_email_report, attachments_data, template_str),
+                           executor.submit(self.build_issue_template, attachments_data))
+            return tuple(compress_attachment(attachment.result()) for attachment in attachments)
 
     def build_email_report(self, attachments_data, template_str=None):
         report_file = os.path.join(self.logdir, 'email_report.html')
-        attachments_data['last_events'] = self._get_last_events(
+        self.save_html_to_file(dict(attachments_data, last_events=self._get_last_events(
             attachments_data,
             self.last_events_body_limit_per_severity_in_attachment,
             self.last_events_body_limit_total_in_attachment,
             self.last_events_limit_in_attachment,
-            self.last_events_severities_in_attachment)
-        self.save_html_to_file(attachments_data, report_file, template_str=template_str)
+            self.last_events_severities_in_attachment)), report_file, template_str=template_str)
         return report_file
 
     def build_issue_template(self, attachments_data):
         report_file = os.path.join(self.logdir, 'issue_template.html')
         template_file = 'results_issue_template.html'
-        attachments_data["config_files_link"] = self.get_config_file_link(attachments_data)
-        self.save_html_to_file(attachments_data, report_file, template_file=template_file)
+        self.save_html_to_file(dict(attachments_data, config_files_link=self.get_config_file_link(attachments_data)),
+                               report_file, template_file=template_file)
         return report_file
 
     @staticmethod
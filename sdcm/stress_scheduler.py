@@ -0,0 +1,119 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Start stress commands as soon as they can be started, instead of sleeping for a fixed time between them.
+
+`StressLaunchScheduler' starts a stress command and waits till its readiness condition holds (e.g., c-s reports ops,
+what means that the schema is created), so the next command starts right after it.  When `max_in_flight' is set, it also keeps
+a sliding window of running stress commands: a new command is started once any of the running ones finishes.
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from sdcm import wait
+
+LOGGER = logging.getLogger(__name__)
+
+STRESS_READY_TIMEOUT = 300  # seconds
+STRESS_CHECK_STEP = 1  # seconds
+
+
+def is_stress_done(stress) -> bool:
+    futures = getattr(stress, "results_futures", None) or getattr(stress, "futures", None)
+    return bool(futures) and all(future.done() for future in futures)
+
+
+def is_stress_ready(stress) -> bool:
+    """Default readiness condition: c-s reports ops (other stress tools are ready once started) or it has finished."""
+    is_reporting_ops = getattr(stress, "is_reporting_ops", None)
+    return is_reporting_ops is None or is_reporting_ops() or is_stress_done(stress)
+
+
+@dataclass
+class StressLaunch:
+    name: str
+    requested: float
+    started: Optional[float] = None
+    ready: Optional[float] = None
+    finished: Optional[float] = None
+    stress: Any = None
+
+    @property
+    def slot_wait(self) -> Optional[float]:
+        return None if self.started is None else self.started - self.requested
+
+    @property
+    def ready_delay(self) -> Optional[float]:
+        return None if self.ready is None else self.ready - self.started
+
+
+class StressLaunchScheduler:
+    """Launch stress commands one after another as soon as the previous one is ready.
+
+    Usage:
+        >>> scheduler = StressLaunchScheduler(max_in_flight=10, on_finish=verify_stress)
+        >>> for cmd in stress_cmds:
+        ...     scheduler.launch(name=cmd, start=partial(run_stress_thread, stress_cmd=cmd))
+        >>> scheduler.wait_all()
+
+    `max_in_flight' is the size of the sliding window of running stress commands, loaders are selected by the stress
+    threads as usual.  `on_finish' is called with every finished stress object.
+    """
+
+    def __init__(self, max_in_flight: Optional[int] = None, ready_timeout: float = STRESS_READY_TIMEOUT,
+                 step: float = STRESS_CHECK_STEP, on_finish: Optional[Callable[[Any], None]] = None):
+        self.max_in_flight = max_in_flight
+        self.ready_timeout = ready_timeout
+        self.step = step
+        self.on_finish = on_finish
+        self.timeline: List[StressLaunch] = []
+        self._in_flight: List[StressLaunch] = []
+
+    def _reap_finished(self) -> int:
+        for launch in self._in_flight[:]:
+            if is_stress_done(launch.stress):
+                launch.finished = time.time()
+                self._in_flight.remove(launch)
+                if self.on_finish:
+                    self.on_finish(launch.stress)
+        return len(self._in_flight)
+
+    def launch(self, name: str, start: Callable[[], Any], ready: Callable[[Any], bool] = is_stress_ready) -> Any:
+        launch = StressLaunch(name=name, requested=time.time())
+        self.timeline.append(launch)
+        if self.max_in_flight:
+            while self._reap_finished() >= self.max_in_flight:
+                time.sleep(self.step)
+        launch.started = time.time()
+        launch.stress = start()
+        self._in_flight.append(launch)
+        if ready is not None:
+            wait.wait_for(func=ready, step=self.step, text=f"Waiting for `{name}' to be ready",
+                          timeout=self.ready_timeout, throw_exc=False, stress=launch.stress)
+        launch.ready = time.time()
+        LOGGER.debug("`%s' started after %.1fs waiting for a slot, ready in %.1fs",
+                     name, launch.slot_wait, launch.ready_delay)
+        return launch.stress
+
+    def wait_all(self) -> None:
+        while self._reap_finished():
+            time.sleep(self.step)
+
+    def log_timeline(self) -> None:
+        for launch in self.timeline:
+            LOGGER.info("%s: waited for a slot %.1fs, ready in %.1fs",
+                        launch.name, launch.slot_wait or 0, launch.ready_delay or 0)
@@ -17,19 +17,29 @@ import time
 import uuid
 import random
 import logging
+import threading
 import concurrent.futures
-from typing import Any
+from typing import Any, List
 
+from sdcm import wait
 from sdcm.loader import CassandraStressExporter
 from sdcm.cluster import BaseLoaderSet
 from sdcm.prometheus import nemesis_metrics_obj
+from sdcm.remote.base import OutputTailWatcher, FailuresWatcher
 from sdcm.sct_events import Severity
 from sdcm.utils.common import FileFollowerThread, generate_random_string, get_profile_content
+from sdcm.utils.docker_remote import get_docker_pool
 from sdcm.sct_events.loaders import CassandraStressEvent, CS_ERROR_EVENTS_PATTERNS
 
 
 LOGGER = logging.getLogger(__name__)
 
+# Lines which are needed from the whole c-s output, the summary is taken from the tail of the output.
+CS_OUTPUT_PATTERNS = (r"^TAG: ", r"^\s*Username:", r"java\.io\.IOException", )
+# c-s prints the header of the ops report ("type  total ops,  op/s, ...") after the schema is created.
+CS_REPORTING_OPS_PATTERN = r"total ops,"
+CS_SCHEMA_CREATION_TIMEOUT = 300  # seconds
+
 
 def format_stress_cmd_error(exc: Exception) -> str:
     """Format nicely the exception from a stress command failure."""
@@ -89,6 +99,11 @@ class CassandraStressThread:  # pylint: disable=too-many-instance-attributes
         self.shell_marker = generate_random_string(20)
         #  This marker is used to mark shell commands, in order to be able to kill them later
         self.max_workers = 0
+        self._reporting_ops = threading.Event()
+
+    def is_reporting_ops(self) -> bool:
+        """True if any of c-s processes reports ops already."""
+        return self._reporting_ops.is_set()
 
     def create_stress_cmd(self, node, loader_idx, keyspace_idx):
         stress_cmd = self.stress_cmd
@@ -183,6 +198,7 @@ class CassandraStressThread:  # pylint: disable=too-many-instance-attributes
         node_cmd = f'echo {tag}; {node_cmd}'
 
         result = None
+        output_tail = OutputTailWatcher(patterns=CS_OUTPUT_PATTERNS)
 
         with CassandraStressExporter(instance_name=node.ip_address,
                                      metrics=nemesis_metrics_obj(),
@@ -194,7 +210,12 @@ class CassandraStressThread:  # pylint: disable=too-many-instance-attributes
                                      log_file_name=log_file_name) as cs_stress_event:
             publisher.event_id = cs_stress_event.event_id
             try:
-                result = node.remoter.run(cmd=node_cmd, timeout=self.timeout, log_file=log_file_name)
+                reporting_ops = FailuresWatcher(CS_REPORTING_OPS_PATTERN,
+                                                callback=lambda *_: self._reporting_ops.set(),
+                                                raise_exception=False)
+                result = node.remoter.run(cmd=node_cmd, timeout=self.timeout, log_file=log_file_name,
+                                          watchers=[output_tail, reporting_ops])
+                result.matched_lines = list(output_tail.matches)
             except Exception as exc:  # pylint: disable=broad-except
                 cs_stress_event.severity = Severity.CRITICAL if self.stop_test_on_failure else Severity.ERROR
                 cs_stress_event.add_error(errors=[format_stress_cmd_error(exc)])
@@ -222,7 +243,9 @@ class CassandraStressThread:  # pylint: disable=too-many-instance-attributes
                                                                   *(loader, loader_idx, cpu_idx, ks_idx))]
                     if loader_idx == 0 and cpu_idx == 0 and self.max_workers > 1:
                         # Wait for first stress thread to create the schema, before spawning new stress threads
-                        time.sleep(30)
+                        wait.wait_for(func=lambda: self.is_reporting_ops() or self.results_futures[0].done(),
+                                      text="Waiting for the first c-s to create the schema",
+                                      timeout=CS_SCHEMA_CREATION_TIMEOUT, throw_exc=False)
 
         return self
 
@@ -237,6 +260,11 @@ class CassandraStressThread:  # pylint: disable=too-many-instance-attributes
                                timeout=self.timeout,
                                ignore_status=True)
 
+    @staticmethod
+    def _get_output_lines(result):
+        """Matched lines (the TAG line is at the beginning of the output) followed by the tail of the output."""
+        return result.matched_lines + (result.stdout + result.stderr).splitlines()
+
     def get_results(self):
         ret = []
         results = []
@@ -249,9 +277,8 @@ class CassandraStressThread:  # pylint: disable=too-many-instance-attributes
             if not result:
                 # Silently skip if stress command threw error, since it was already reported in _run_stress
                 continue
-            output = result.stdout + result.stderr
             try:
-                lines = output.splitlines()
+                lines = self._get_output_lines(result)
                 node_cs_res = BaseLoaderSet._parse_cs_summary(lines)  # pylint: disable=protected-access
                 if node_cs_res:
                     ret.append(node_cs_res)
@@ -275,12 +302,10 @@ class CassandraStressThread:  # pylint: disable=too-many-instance-attributes
             if not result:
                 # Silently skip if stress command threw error, since it was already reported in _run_stress
                 continue
-            output = result.stdout + result.stderr
-            lines = output.splitlines()
-            node_cs_res = BaseLoaderSet._parse_cs_summary(lines)  # pylint: disable=protected-access
+            node_cs_res = BaseLoaderSet._parse_cs_summary(self._get_output_lines(result))  # pylint: disable=protected-access
             if node_cs_res:
                 cs_summary.append(node_cs_res)
-            for line in lines:
+            for line in result.matched_lines:
                 if 'java.io.IOException' in line:
                     errors += ['%s: %s' % (node, line.strip())]
 
@@ -315,6 +340,7 @@ class DockerBasedStressThread:
         else:
             loaders = self.loader_set.nodes
         self.loaders = loaders
+        self.pull_docker_images()
 
         self.max_workers = len(loaders) * self.stress_num
         LOGGER.debug("Starting %d %s Worker threads", self.max_workers, self.__class__.__name__)
@@ -327,6 +353,16 @@ class DockerBasedStressThread:
 
         return self
 
+    def docker_images(self) -> List[str]:
+        """Images used by the stress tool, they're pulled on all loaders at once before the stress starts."""
+        return []
+
+    def pull_docker_images(self) -> None:
+        if not (images := self.docker_images()) or not self.loaders:
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.loaders)) as executor:
+            list(executor.map(lambda loader: get_docker_pool(loader).pull_images(images), self.loaders))
+
     def _run_stress(self, loader, loader_idx, cpu_idx):
         raise NotImplementedError()
 
@@ -351,6 +387,7 @@ class DockerBasedStressThread:
 
     def kill(self):
         for loader in self.loaders:
+            get_docker_pool(loader).kill(owner=self.shell_marker)
             loader.remoter.run(cmd=f"docker rm -f `docker ps -a -q --filter label=shell_marker={self.shell_marker}`",
                                timeout=60,
                                ignore_status=True)
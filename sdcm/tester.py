@@ -14,6 +14,7 @@
 from collections import defaultdict
 from dataclasses import asdict
 
+import json
 import logging
 import os
 import re
@@ -46,6 +47,7 @@ from sdcm.cluster_aws import MonitorSetAWS
 from sdcm.cluster_k8s import mini_k8s, gke, eks, LOADER_CLUSTER_CONFIG
 from sdcm.cluster_k8s.eks import MonitorSetEKS
 from sdcm.full_scan_thread import FullScanThread
+from sdcm.nemesis_timeline import NemesisTimeline
 from sdcm.nosql_thread import NoSQLBenchStressThread
 from sdcm.scylla_bench_thread import ScyllaBenchThread
 from sdcm.utils.aws_utils import init_monitoring_info_from_params, get_ec2_network_configuration, get_ec2_services, \
@@ -78,7 +80,7 @@ from sdcm.cdclog_reader_thread import CDCLogReaderThread
 from sdcm.logcollector import SCTLogCollector, ScyllaLogCollector, MonitorLogCollector, LoaderLogCollector, \
     KubernetesLogCollector
 from sdcm.send_email import build_reporter, read_email_data_from_file, get_running_instances_for_email_report, \
-    save_email_data_to_file
+    save_email_data_to_file, LAST_EVENTS_SIZE_LIMIT
 from sdcm.utils import alternator
 from sdcm.utils.profiler import ProfilerFactory
 from sdcm.remote import RemoteCmdRunnerBase
@@ -409,6 +411,10 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
     def helm_config_path(self):
         return os.path.join(os.path.expanduser(self.logdir), '.helm')
 
+    @cached_property
+    def nemesis_timeline(self):
+        return NemesisTimeline(path=os.path.join(self.logdir, 'nemesis_timeline.jsonl'))
+
     def _init_params(self):
         self.params = init_and_verify_sct_config()
 
@@ -519,6 +525,7 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
         self.k8s_cluster = None
         self.connections = []
         make_threads_be_daemonic_by_default()
+        KeyStore().prefetch()
         self.update_certificates()
 
         # download rpms for update_db_packages
@@ -568,6 +575,8 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
         self.test_config.reuse_cluster(False)
         if self.monitors and self.monitors.nodes:
             self.prometheus_db = PrometheusDBStats(host=self.monitors.nodes[0].public_ip_address)
+            if self.db_cluster:
+                self.db_cluster.capacity_sampler.prometheus_db = self.prometheus_db
         self.start_time = time.time()
         self.timeout_thread = self._init_test_timeout_thread()
 
@@ -1635,7 +1644,8 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
                          'errors': stats['errors']})
         return stats
 
-    def run_fullscan_thread(self, ks_cf='random', interval=1, duration=None):
+    def run_fullscan_thread(self, ks_cf='random', interval=1, duration=None, parallelism=0,  # pylint: disable=too-many-arguments
+                            verify_counts=False):
         """Run thread of cql command select *
 
         Calculate test duration and timeout interval between
@@ -1646,6 +1656,8 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
         Keyword Arguments:
             timeout {number} -- interval between request in min (default: {1})
             duration {int} -- duration of running thread in min (default: {None})
+            parallelism {int} -- number of token ranges scanned concurrently, 0 for one query (default: {0})
+            verify_counts {bool} -- compare row counts of token ranges with the previous scan (default: {False})
         """
         FullScanThread(
             db_cluster=self.db_cluster,
@@ -1653,6 +1665,8 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
             duration=self.get_duration(duration),
             interval=interval * 60,
             termination_event=self.db_cluster.nemesis_termination_event,
+            parallelism=parallelism,
+            verify_counts=verify_counts,
         ).start()
 
     @staticmethod
@@ -1680,23 +1694,12 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
         {"dc_name1": 4, "dc_name2": 6, "<dc_name>": <int>...}
         """
 
-        query = 'CREATE KEYSPACE IF NOT EXISTS %s WITH replication={%s}'
         execution_node, validation_node = self.db_cluster.nodes[0], self.db_cluster.nodes[-1]
         with self.db_cluster.cql_connection_patient(execution_node) as session:
-            if isinstance(replication_factor, int):
-                execution_result = session.execute(
-                    query % (keyspace_name, "'class':'{}', 'replication_factor':{}".format(
-                        replication_strategy if replication_strategy else "SimpleStrategy",
-                        replication_factor)))
-
-            else:
-                assert replication_factor, "At least one datacenter/replication_factor pair is needed"
-                options = ', '.join(["'{}':{}".format(dc_name, dc_specific_replication_factor) for
-                                     dc_name, dc_specific_replication_factor in replication_factor.items()])
-                execution_result = session.execute(
-                    query % (keyspace_name, "'class':'{}', {}".format(
-                        replication_strategy if replication_strategy else "NetworkTopologyStrategy",
-                        options)))
+            execution_result = session.execute(self.create_keyspace_query(
+                keyspace_name=keyspace_name,
+                replication_factor=replication_factor,
+                replication_strategy=replication_strategy))
 
         if execution_result:
             self.log.debug("keyspace creation result: {}".format(execution_result.response_future))
@@ -1705,11 +1708,41 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
             does_keyspace_exist = self.wait_validate_keyspace_existence(session, keyspace_name)
         return does_keyspace_exist
 
-    def create_table(self, name, key_type="varchar",  # pylint: disable=too-many-arguments,too-many-branches
+    @staticmethod
+    def create_keyspace_query(keyspace_name, replication_factor, replication_strategy=None):
+        query = 'CREATE KEYSPACE IF NOT EXISTS %s WITH replication={%s}'
+        if isinstance(replication_factor, int):
+            return query % (keyspace_name, "'class':'{}', 'replication_factor':{}".format(
+                replication_strategy if replication_strategy else "SimpleStrategy",
+                replication_factor))
+
+        assert replication_factor, "At least one datacenter/replication_factor pair is needed"
+        options = ', '.join(["'{}':{}".format(dc_name, dc_specific_replication_factor) for
+                             dc_name, dc_specific_replication_factor in replication_factor.items()])
+        return query % (keyspace_name, "'class':'{}', {}".format(
+            replication_strategy if replication_strategy else "NetworkTopologyStrategy",
+            options))
+
+    def create_table(self, name, key_type="varchar",  # pylint: disable=too-many-arguments
                      speculative_retry=None, read_repair=None, compression=None,
                      gc_grace=None, columns=None, compaction=None,
                      compact_storage=False, in_memory=False, scylla_encryption_options=None, keyspace_name=None,
                      sstable_size=None):
+        query = self.create_table_query(
+            name=name, key_type=key_type, speculative_retry=speculative_retry, read_repair=read_repair,
+            compression=compression, gc_grace=gc_grace, columns=columns, compaction=compaction,
+            compact_storage=compact_storage, in_memory=in_memory, scylla_encryption_options=scylla_encryption_options,
+            sstable_size=sstable_size)
+        self.log.debug('CQL query to execute: {}'.format(query))
+        with self.db_cluster.cql_connection_patient(node=self.db_cluster.nodes[0], keyspace=keyspace_name) as session:
+            session.execute(query)
+        time.sleep(0.2)
+
+    def create_table_query(self, name, key_type="varchar",  # pylint: disable=too-many-arguments,too-many-branches
+                           speculative_retry=None, read_repair=None, compression=None,
+                           gc_grace=None, columns=None, compaction=None,
+                           compact_storage=False, in_memory=False, scylla_encryption_options=None,
+                           sstable_size=None):
 
         # pylint: disable=too-many-locals
         additional_columns = ""
@@ -1756,10 +1789,7 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
             query = '%s AND scylla_encryption_options=%s' % (query, scylla_encryption_options)
         if compact_storage:
             query += ' AND COMPACT STORAGE'
-        self.log.debug('CQL query to execute: {}'.format(query))
-        with self.db_cluster.cql_connection_patient(node=self.db_cluster.nodes[0], keyspace=keyspace_name) as session:
-            session.execute(query)
-        time.sleep(0.2)
+        return query
 
     def truncate_cf(self, ks_name, table_name, session):
         try:
@@ -2286,6 +2316,7 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
         self.stop_event_analyzer()
         self.stop_resources()
         self.get_test_failures()
+        self.report_wait_stats()
 
         # NOTE: running on K8S we need to gather logs otherwise a lot of
         # debugging info is lost
@@ -2310,6 +2341,12 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
         self._check_alive_routines_and_report_them()
         self.remove_python_exit_hooks()
 
+    @silence()
+    def report_wait_stats(self):
+        self.log.info("Time spent in waits (top by total time):\n%s", wait.WAIT_STATS.summary())
+        with open(os.path.join(self.logdir, "wait_stats.json"), "w") as wait_stats_file:
+            json.dump(wait.WAIT_STATS.get(), wait_stats_file, indent=2)
+
     @silence()
     def remove_python_exit_hooks(self):  # pylint: disable=no-self-use
         clear_out_all_exit_hooks()
@@ -2738,8 +2775,7 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
             c_node.start_scylla_server(verify_up=False)
             time.sleep(10)
         self.log.debug("Wait DB is up after all nodes were started")
-        for c_node in self.db_cluster.nodes:
-            c_node.wait_db_up()
+        self.db_cluster.wait_for_db_up()
 
     def start_all_nodes_except_for(self, node):
         self.log.debug("Starting all nodes except for: {}".format(node.name))
@@ -2756,57 +2792,18 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
 
         node.wait_db_up()
 
-    def get_used_capacity(self, node) -> float:  # pylint: disable=too-many-locals
-        # node_filesystem_size_bytes{
-        #     mountpoint="/var/lib/scylla", instance=~".*?10.0.79.46.*?"}-node_filesystem_avail_bytes{
-        #         mountpoint="/var/lib/scylla", instance=~".*?10.0.79.46.*?"}
-        fs_size_metric = 'node_filesystem_size_bytes'
-        fs_size_metric_old = 'node_filesystem_size'
-        avail_size_metric = 'node_filesystem_avail_bytes'
-        avail_size_metric_old = 'node_filesystem_avail'
-
-        instance_filter = f'instance=~".*?{node.private_ip_address}.*?"'
-
-        capacity_query_postfix = f'{{mountpoint="{self.scylla_dir}", {instance_filter}}}'
-        filesystem_capacity_query = f'{fs_size_metric}{capacity_query_postfix}'
-
-        used_capacity_query = f'{filesystem_capacity_query}-{avail_size_metric}{capacity_query_postfix}'
-
-        self.log.debug("filesystem_capacity_query: %s", filesystem_capacity_query)
-
-        fs_size_res = self.prometheus_db.query(query=filesystem_capacity_query,
-                                               start=int(time.time()) - 5, end=int(time.time()))
-        assert fs_size_res, "No results from Prometheus"
-        if not fs_size_res[0]:  # if no returned values - try the old metric names.
-            filesystem_capacity_query = f'{fs_size_metric_old}{capacity_query_postfix}'
-            used_capacity_query = f'{filesystem_capacity_query}-{avail_size_metric_old}{capacity_query_postfix}'
-            self.log.debug("filesystem_capacity_query: %s", filesystem_capacity_query)
-            fs_size_res = self.prometheus_db.query(query=filesystem_capacity_query, start=int(time.time()) - 5,
-                                                   end=int(time.time()))
-
-        assert fs_size_res[0], "Could not resolve capacity query result."
-        kb_size = 2 ** 10
-        mb_size = kb_size * 1024
-        self.log.debug("fs_size_res: {}".format(fs_size_res))
-        self.log.debug("used_capacity_query: {}".format(used_capacity_query))
-
-        used_cap_res = self.prometheus_db.query(
-            query=used_capacity_query, start=int(time.time()) - 5, end=int(time.time()))
-        self.log.debug("used_cap_res: {}".format(used_cap_res))
-
-        assert used_cap_res, "No results from Prometheus"
-        used_size_mb = float(used_cap_res[0]["values"][0][1]) / float(mb_size)
-        used_size_gb = float(used_size_mb / 1024)
-        self.log.debug(
-            "The used filesystem capacity on node {} is: {} MB/ {} GB".format(node.public_ip_address, used_size_mb,
-                                                                              used_size_gb))
+    def get_used_capacity(self, node) -> float:
+        """Return used capacity of the Scylla filesystem of the node in MB, sampled for all nodes at once."""
+        used_size_mb = self.db_cluster.capacity_sampler.used_capacity()[node] / float(2 ** 20)
+        self.log.debug("The used filesystem capacity on node {} is: {} MB/ {} GB".format(
+            node.public_ip_address, used_size_mb, used_size_mb / 1024))
         return used_size_mb
 
     def print_nodes_used_capacity(self):
+        used_capacity = self.db_cluster.capacity_sampler.used_capacity()
         for node in self.db_cluster.nodes:
-            used_capacity = self.get_used_capacity(node=node)
-            self.log.debug(
-                "Node {} ({}) used capacity is: {}".format(node.name, node.private_ip_address, used_capacity))
+            self.log.debug("Node {} ({}) used capacity is: {}".format(
+                node.name, node.private_ip_address, used_capacity[node] / float(2 ** 20)))
 
     def get_nemesises_stats(self):
         nemesis_stats = {}
@@ -2940,7 +2937,8 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
                 "job_url": os.environ.get("BUILD_URL"),
                 "end_time": format_timestamp(time.time()),
                 "events_summary": self.get_event_summary(),
-                "last_events": get_events_grouped_by_category(limit=100, _registry=self.events_processes_registry),
+                "last_events": get_events_grouped_by_category(limit=100, size_limit=LAST_EVENTS_SIZE_LIMIT,
+                                                              _registry=self.events_processes_registry),
                 "nodes": [],
                 "number_of_db_nodes": self.params.get('n_db_nodes'),
                 "region_name": region_name,
@@ -1,8 +1,12 @@
+import json
+import queue
+import hashlib
 import logging
+import threading
+from decimal import Decimal
 from concurrent.futures.thread import ThreadPoolExecutor
-from itertools import chain
 from pprint import pformat
-from typing import NamedTuple
+from typing import NamedTuple, Iterator, List, Optional, Set
 
 import boto3
 from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
@@ -13,6 +17,47 @@ from sdcm.utils.common import normalize_ipv6_url
 
 LOGGER = logging.getLogger(__name__)
 
+MAX_LOGGED_ITEMS = 100
+COMPARE_BUCKETS_NUM = 1024
+SCAN_QUEUE_PAGES_PER_SEGMENT = 2
+DIGEST_MODULO = 2 ** 128
+
+
+def format_items(items: list, limit: int = MAX_LOGGED_ITEMS) -> str:
+    """pformat() of the first `limit' items only, to keep debug log lines of big tables reasonable."""
+    if len(items) <= limit:
+        return pformat(items)
+    return f"{pformat(items[:limit])}\n... and {len(items) - limit} more items"
+
+
+def _canonical(value):
+    """Representation of an item which doesn't depend on the order of keys and on the type of numbers."""
+    if isinstance(value, dict):
+        return {str(key): _canonical(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(val) for val in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(json.dumps(_canonical(val), sort_keys=True) for val in value)
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        return {"N": str(Decimal(str(value)).normalize())}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": value.hex()}
+    if hasattr(value, "value"):  # boto3.dynamodb.types.Binary
+        return _canonical(value.value)
+    return value
+
+
+def item_digest(item: dict) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(json.dumps(_canonical(item), sort_keys=True).encode(), digest_size=16).digest(), "big")
+
+
+def _digest_and_bucket(item: dict, buckets_num: int):
+    digest = item_digest(item)
+    return digest, digest % buckets_num
+
 
 class AlternatorApi(NamedTuple):
     resource: DynamoDBServiceResource
@@ -73,32 +118,76 @@ class Alternator:
         LOGGER.debug("Table's schema and configuration are: {}".format(response))
         return table
 
-    def scan_table(self, node, table_name=consts.TABLE_NAME, threads_num=None, **kwargs):
-        is_parallel_scan = threads_num and threads_num > 0
+    def iter_scan_pages(self, node, table_name=consts.TABLE_NAME,  # pylint: disable=too-many-arguments
+                        segment: Optional[int] = None, total_segments: Optional[int] = None,
+                        **kwargs) -> Iterator[List[dict]]:
+        """Yield pages of a scan of the table, or of one segment of it if `segment' and `total_segments' are set."""
         dynamodb_api = self.get_dynamodb_api(node=node)
         table = dynamodb_api.resource.Table(name=table_name)
+        scan_params = dict(kwargs)
+        if total_segments:
+            scan_params.update(TotalSegments=total_segments, Segment=segment)
+            LOGGER.debug("Starting parallel scan part '%s' on table '%s'", segment + 1, table_name)
+        else:
+            LOGGER.debug("Starting full scan on table '%s'", table_name)
+        while True:
+            response = table.scan(**scan_params)
+            yield response["Items"]
+            if "LastEvaluatedKey" not in response:
+                break
+            scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def iter_scan(self, node, table_name=consts.TABLE_NAME, threads_num=None, **kwargs) -> Iterator[dict]:
+        """Yield items of the table, scanned by `threads_num' parallel segments if it's set.
 
-        def _scan_table(part_scan_idx=None):
-            parallel_params, result, still_running_while = {}, [], True
-            if is_parallel_scan:
-                parallel_params = {"TotalSegments": threads_num, "Segment": part_scan_idx}
-                LOGGER.debug("Starting parallel scan part '{}' on table '{}'".format(part_scan_idx + 1, table_name))
-            else:
-                LOGGER.debug("Starting full scan on table '{}'".format(table_name))
-            while still_running_while:
-                response = table.scan(**parallel_params, **kwargs)
-                result.extend(response["Items"])
-                still_running_while = 'LastEvaluatedKey' in response
-
-            LOGGER.debug("Founding the following items:\n{}".format(pformat(result)))
-            return result
-
-        if is_parallel_scan:
-            with ThreadPoolExecutor(max_workers=threads_num) as executor:
-                threads = [executor.submit(_scan_table, part_idx) for part_idx in range(threads_num)]
-                scan_result = [thread.result() for thread in threads]
-            return list(chain(*scan_result)) if len(scan_result) > 1 else scan_result
-        return _scan_table()
+        Memory is bounded by a few pages per segment: segment scanners are blocked until pages are consumed.
+        """
+        if not threads_num or threads_num <= 0:
+            for page in self.iter_scan_pages(node=node, table_name=table_name, **kwargs):
+                yield from page
+            return
+
+        pages = queue.Queue(maxsize=threads_num * SCAN_QUEUE_PAGES_PER_SEGMENT)
+        stop_event = threading.Event()
+        done = object()
+
+        def _put(page):
+            while not stop_event.is_set():
+                try:
+                    pages.put(page, timeout=1)
+                    return
+                except queue.Full:
+                    pass
+
+        def _scan_segment(segment):
+            try:
+                for page in self.iter_scan_pages(node=node, table_name=table_name,
+                                                 segment=segment, total_segments=threads_num, **kwargs):
+                    if stop_event.is_set():
+                        break
+                    _put(page)
+            finally:
+                _put(done)
+
+        with ThreadPoolExecutor(max_workers=threads_num) as executor:
+            futures = [executor.submit(_scan_segment, segment) for segment in range(threads_num)]
+            try:
+                finished_segments = 0
+                while finished_segments < threads_num:
+                    page = pages.get()
+                    if page is done:
+                        finished_segments += 1
+                    else:
+                        yield from page
+            finally:
+                stop_event.set()
+        for future in futures:
+            future.result()  # raise an exception if any of segments failed
+
+    def scan_table(self, node, table_name=consts.TABLE_NAME, threads_num=None, **kwargs):
+        result = list(self.iter_scan(node=node, table_name=table_name, threads_num=threads_num, **kwargs))
+        LOGGER.debug("Founding %s items:\n%s", len(result), format_items(result))
+        return result
 
     def batch_write_actions(self, node,  # pylint:disable=too-many-arguments,dangerous-default-value
                             table_name=consts.TABLE_NAME, new_items=None, delete_items=None,
@@ -108,10 +197,10 @@ class Alternator:
         new_items, delete_items = new_items or [], delete_items or []
         if new_items:
             LOGGER.debug("Adding new {} items to table '{}'.\n{}..".format(
-                len(new_items), table_name, pformat(new_items)))
+                len(new_items), table_name, format_items(new_items)))
         if delete_items:
             LOGGER.debug("Deleting %s items from table '%s'.\nDeleted: %s..",
-                         len(delete_items), table_name, pformat(delete_items))
+                         len(delete_items), table_name, format_items(delete_items))
 
         table = dynamodb_api.resource.Table(name=table_name)
         with table.batch_writer() as batch:
@@ -123,9 +212,46 @@ class Alternator:
                     batch.delete_item({key: item[key] for key in table_keys})
         return table
 
-    def compare_table_data(self, node, table_data, table_name=consts.TABLE_NAME) -> set:
-        data = self.scan_table(node=node, table_name=table_name)
-        return set(str(line) for line in table_data) - set(str(line) for line in data)
+    def compare_table_data(self, node, table_data, table_name=consts.TABLE_NAME,  # pylint: disable=too-many-arguments
+                           threads_num=None, buckets_num=COMPARE_BUCKETS_NUM) -> Set[str]:
+        """Return `str()' of items from `table_data' which are missing in the table.
+
+        `table_data' is a list of items or a callable which returns an iterator over them (e.g., a scan of another
+        table), it's iterated twice.  Both sides are spread into buckets by the item digests and only a digest sum
+        per bucket is kept during the first pass.  Digests of items are collected only for the buckets which don't
+        match, during the second (drill-down) pass.
+        """
+        def _iter_expected():
+            return table_data() if callable(table_data) else iter(table_data)
+
+        def _iter_actual():
+            return self.iter_scan(node=node, table_name=table_name, threads_num=threads_num)
+
+        def _bucket_sums(items):
+            sums, counts = [0] * buckets_num, [0] * buckets_num
+            for item in items:
+                digest, bucket = _digest_and_bucket(item, buckets_num)
+                sums[bucket] = (sums[bucket] + digest) % DIGEST_MODULO
+                counts[bucket] += 1
+            return list(zip(sums, counts))
+
+        expected_sums, actual_sums = _bucket_sums(_iter_expected()), _bucket_sums(_iter_actual())
+        mismatched = {bucket for bucket in range(buckets_num) if expected_sums[bucket] != actual_sums[bucket]}
+        LOGGER.debug("%s of %s buckets of table '%s' don't match", len(mismatched), buckets_num, table_name)
+        if not mismatched:
+            return set()
+
+        actual = set()
+        for item in _iter_actual():
+            digest, bucket = _digest_and_bucket(item, buckets_num)
+            if bucket in mismatched:
+                actual.add(digest)
+        missing = set()
+        for item in _iter_expected():
+            digest, bucket = _digest_and_bucket(item, buckets_num)
+            if bucket in mismatched and digest not in actual:
+                missing.add(str(item))
+        return missing
 
     def is_table_exists(self, node, table_name: consts.TABLE_NAME):
         dynamodb_api = self.get_dynamodb_api(node=node)
@@ -0,0 +1,160 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Decode backtraces in batches
+
+Reactor stalls come in storms of thousands of backtraces which share most of their addresses.  `BacktraceDecoder'
+deduplicates raw backtraces, resolves only the addresses which are not in the address-to-symbol cache of the build,
+and runs one `addr2line' per chunk of addresses on a pool of workers.  The cache is kept per build id on disk, so it's
+shared by all nodes running the same build and by the following runs.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import pathlib
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+DECODE_WORKERS = 4
+ADDRESSES_PER_CALL = 500
+INLINED_BY_PREFIX = " (inlined by) "
+
+
+class SymbolCache:
+    """Address-to-symbol maps of builds, shared between processes through a directory on disk."""
+
+    CACHE_DIR = os.path.join(tempfile.gettempdir(), "sct-addr2line-cache")
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = pathlib.Path(cache_dir or self.CACHE_DIR)
+        self._symbols: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def _entry_path(self, build_id: str) -> pathlib.Path:
+        return self.cache_dir / f"{hashlib.sha256(build_id.encode()).hexdigest()}.json"
+
+    def get(self, build_id: str) -> Dict[str, str]:
+        with self._lock:
+            if build_id not in self._symbols:
+                try:
+                    self._symbols[build_id] = json.loads(self._entry_path(build_id).read_text())
+                except (OSError, ValueError):
+                    self._symbols[build_id] = {}
+            return self._symbols[build_id]
+
+    def update(self, build_id: str, symbols: Dict[str, str]) -> None:
+        if not symbols:
+            return
+        build_symbols = self.get(build_id)
+        with self._lock:
+            build_symbols.update(symbols)
+            data = json.dumps(build_symbols)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first, so other processes never read a partial entry
+            with tempfile.NamedTemporaryFile("w", dir=self.cache_dir, delete=False, suffix=".tmp") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_file.name, self._entry_path(build_id))
+        except OSError as exc:
+            LOGGER.debug("Failed to write symbols cache of %s: %s", build_id, exc)
+
+
+def split_addr2line_output(addresses: List[str], output: str) -> Optional[Dict[str, str]]:
+    """Map addresses to their `addr2line -Cpife' output, which is one line per address plus the inlined frames."""
+    blocks = []
+    for line in output.splitlines():
+        if line.startswith(INLINED_BY_PREFIX) and blocks:
+            blocks[-1] += "\n" + line
+        elif line:
+            blocks.append(line)
+    if len(blocks) != len(addresses):
+        return None
+    return dict(zip(addresses, blocks))
+
+
+class BacktraceDecoder:
+    """Decode backtraces of events queued by DB nodes.
+
+    `copy_debug_file(node, debug_file)' makes the debug file available to `addr2line(debug_file, addresses)',
+    which returns `addr2line -Cpife' output for the space-separated addresses.
+    """
+
+    def __init__(self, copy_debug_file: Callable, addr2line: Callable[[str, str], str],  # pylint: disable=too-many-arguments
+                 workers: int = DECODE_WORKERS, addresses_per_call: int = ADDRESSES_PER_CALL,
+                 symbol_cache: Optional[SymbolCache] = None):
+        self.copy_debug_file = copy_debug_file
+        self.addr2line = addr2line
+        self.addresses_per_call = addresses_per_call
+        self.symbol_cache = symbol_cache or SymbolCache()
+        self.stats = defaultdict(int)
+        self._debug_files: Dict[str, str] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BacktraceDecoder")
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+    def decode(self, items: Iterable[dict]) -> None:
+        """Set `backtrace' of events of the queued items: dicts with `node', `debug_file', `build_id' and `event'.
+
+        Symbols are cached (on disk too) only for known build ids: the path of the debug file is the same for
+        different builds of scylla, e.g., after an upgrade.
+        """
+        builds = defaultdict(list)
+        for item in items:
+            builds[item.get("build_id") or (item["node"], item["debug_file"])].append(item)
+        for build_items in builds.values():
+            node, debug_file, build_id = (build_items[0][key] for key in ("node", "debug_file", "build_id", ))
+            if not build_id:
+                debug_file = self.copy_debug_file(node, debug_file)
+            else:
+                if build_id not in self._debug_files:
+                    self._debug_files[build_id] = self.copy_debug_file(node, debug_file)
+                debug_file = self._debug_files[build_id]
+            self._decode_build(build_id, debug_file, [item["event"] for item in build_items])
+
+    def _decode_build(self, build_id: Optional[str], debug_file: str, events: list) -> None:
+        raw_backtraces = {event.raw_backtrace for event in events}
+        symbols = self.symbol_cache.get(build_id) if build_id else {}
+        addresses = sorted({address for raw in raw_backtraces for address in raw.split()} - set(symbols))
+        self.stats["backtraces"] += len(events)
+        self.stats["unique_backtraces"] += len(raw_backtraces)
+        self.stats["resolved_addresses"] += len(addresses)
+
+        chunks = [addresses[idx:idx + self.addresses_per_call]
+                  for idx in range(0, len(addresses), self.addresses_per_call)]
+        for chunk, output in zip(chunks, self._executor.map(lambda chunk: self.addr2line(debug_file, " ".join(chunk)),
+                                                            chunks)):
+            if (resolved := split_addr2line_output(chunk, output)) is None:
+                LOGGER.debug("Unable to split addr2line output by addresses, decode backtraces one by one")
+                break
+            if build_id:
+                self.symbol_cache.update(build_id, resolved)
+            else:
+                symbols.update(resolved)
+
+        decoded = {}
+        for raw in raw_backtraces:
+            try:
+                decoded[raw] = "\n".join(symbols[address] for address in raw.split())
+            except KeyError:
+                decoded[raw] = self.addr2line(debug_file, " ".join(raw.split()))
+        for event in events:
+            event.backtrace = decoded[event.raw_backtrace]
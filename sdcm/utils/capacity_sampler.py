@@ -0,0 +1,151 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Cluster-wide sampler of the disk usage
+
+Values for all nodes are gathered by one Prometheus query (per metric), nodes missing in Prometheus results are
+sampled over SSH concurrently.  Samples are cached for `ttl' seconds and shared by all callers, concurrent callers
+wait for the sweep which is in progress instead of starting their own.
+"""
+
+import re
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sdcm import wait
+
+LOGGER = logging.getLogger(__name__)
+
+SAMPLE_TTL = 10  # seconds
+FS_USED_QUERY = '{size}{{mountpoint="{mountpoint}"}}-{avail}{{mountpoint="{mountpoint}"}}'
+FS_METRICS = (("node_filesystem_size_bytes", "node_filesystem_avail_bytes"),
+              ("node_filesystem_size", "node_filesystem_avail"), )  # the old names go last
+SPACE_USED_QUERY = 'sum by (instance) (scylla_column_family_total_disk_space{{{selector}}})'
+CFSTATS_SPACE_USED = "Space used (total)"
+
+
+def instance_of(node_ip: str) -> re.Pattern:
+    """Match Prometheus `instance' label of the node, e.g., `10.0.0.1:9100' but not `10.0.0.11:9100'."""
+    return re.compile(rf"(^|[^\d.]){re.escape(node_ip)}([^\d.]|$)")
+
+
+class CapacitySampler:
+    """Sample used disk space of all nodes of the cluster at once.
+
+    Usage:
+        >>> sampler = CapacitySampler(cluster=db_cluster, scylla_dir="/var/lib/scylla", prometheus_db=prometheus_db)
+        >>> sampler.used_capacity()  # bytes used on the Scylla filesystem per node
+        >>> sampler.space_used(["keyspace1"])  # bytes used by sstables of the keyspaces per node
+        >>> sampler.wait_for(sample=partial(sampler.space_used, ["keyspace1"]),
+        ...                  condition=lambda values: values[db_cluster.nodes[0]] > threshold, timeout=300)
+    """
+
+    def __init__(self, cluster, scylla_dir: str, prometheus_db=None, ttl: float = SAMPLE_TTL):
+        self.cluster = cluster
+        self.scylla_dir = scylla_dir
+        self.prometheus_db = prometheus_db
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._sweep_locks: Dict[Hashable, threading.Lock] = {}
+        self._samples: Dict[Hashable, Tuple[float, Dict[Any, float]]] = {}
+
+    def _cached(self, key: Hashable, sweep: Callable[[], Dict[Any, float]]) -> Dict[Any, float]:
+        with self._lock:
+            sweep_lock = self._sweep_locks.setdefault(key, threading.Lock())
+        with sweep_lock:
+            timestamp, values = self._samples.get(key, (0, None))
+            if values is None or time.time() - timestamp > self.ttl:
+                values = sweep()
+                self._samples[key] = (time.time(), values)
+            return values
+
+    def invalidate(self) -> None:
+        self._samples.clear()
+
+    def _query_prometheus(self, query: str, nodes: Iterable) -> Dict[Any, float]:
+        if self.prometheus_db is None:
+            return {}
+        now = int(time.time())
+        try:
+            results = self.prometheus_db.query(query=query, start=now - 5, end=now) or []
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to query Prometheus: %s", exc)
+            return {}
+        values = {}
+        for node in nodes:
+            instance_re = instance_of(node.private_ip_address)
+            for result in results:
+                if instance_re.search(result["metric"].get("instance", "")) and result["values"]:
+                    values[node] = float(result["values"][-1][1])
+                    break
+        return values
+
+    @staticmethod
+    def _sample_concurrently(nodes: list, func: Callable[[Any], float]) -> Dict[Any, float]:
+        if not nodes:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+            return dict(zip(nodes, executor.map(func, nodes)))
+
+    def used_capacity(self, nodes: Optional[list] = None) -> Dict[Any, float]:
+        """Return used space on the Scylla filesystem in bytes."""
+        nodes = tuple(nodes or self.cluster.nodes)
+        return self._cached(("used_capacity", nodes), lambda: self._sweep_used_capacity(nodes))
+
+    def _sweep_used_capacity(self, nodes: tuple) -> Dict[Any, float]:
+        values = {}
+        for size, avail in FS_METRICS:
+            values = self._query_prometheus(FS_USED_QUERY.format(size=size, avail=avail, mountpoint=self.scylla_dir),
+                                            nodes=nodes)
+            if values:
+                break
+        missing = [node for node in nodes if node not in values]
+        if missing:
+            LOGGER.debug("Sample used capacity over SSH on %s", [node.name for node in missing])
+            values.update(self._sample_concurrently(missing, self._df_used))
+        return values
+
+    def _df_used(self, node) -> float:
+        result = node.remoter.run(f"df -B1 --output=used {self.scylla_dir}", verbose=False)
+        return float(result.stdout.splitlines()[-1])
+
+    def space_used(self, keyspaces: Iterable[str], nodes: Optional[list] = None) -> Dict[Any, float]:
+        """Return space used by keyspaces (or tables in `ks.cf' format) in bytes, same as `Space used (total)'."""
+        keyspaces = tuple(keyspaces)
+        nodes = tuple(nodes or self.cluster.nodes)
+        return self._cached(("space_used", keyspaces, nodes), lambda: self._sweep_space_used(keyspaces, nodes))
+
+    def _sweep_space_used(self, keyspaces: tuple, nodes: tuple) -> Dict[Any, float]:
+        values = dict.fromkeys(nodes, 0.0)
+        for keyspace in keyspaces:
+            ks_name, _, cf_name = keyspace.partition(".")
+            selector = f'ks="{ks_name}", cf="{cf_name}"' if cf_name else f'ks="{ks_name}"'
+            sample = self._query_prometheus(SPACE_USED_QUERY.format(selector=selector), nodes=nodes)
+            missing = [node for node in nodes if node not in sample]
+            if missing:
+                LOGGER.debug("Sample space used by %s over SSH on %s", keyspace, [node.name for node in missing])
+                sample.update(self._sample_concurrently(
+                    missing, lambda node, ks=keyspace: node.get_cfstats(ks)[CFSTATS_SPACE_USED]))
+            for node, value in sample.items():
+                values[node] += value
+        return values
+
+    def wait_for(self, sample: Callable[[], Dict[Any, float]], condition: Callable[[Dict[Any, float]], bool],
+                 text: str, timeout: float, throw_exc: bool = False):
+        """Wait until `condition' holds for the samples, checked once per sample TTL."""
+        return wait.wait_for(func=lambda: condition(sample()), step=self.ttl, text=text, timeout=timeout,
+                             throw_exc=throw_exc)
@@ -5,6 +5,7 @@ from sdcm.send_email import Email
 from sdcm.utils.cloud_monitor.resources.instances import CloudInstances
 from sdcm.utils.cloud_monitor.report import GeneralReport, DetailedReport, QAonlyTimeDistributionReport
 from sdcm.utils.cloud_monitor.resources.static_ips import StaticIPs
+from sdcm.utils.cloud_monitor.usage import CloudUsage
 
 LOGGER = getLogger(__name__)
 
@@ -37,8 +38,9 @@ def notify_qa_by_email(general_report: GeneralReport, detailed_report: DetailedR
 def cloud_report(mail_to):
     cloud_instances = CloudInstances()
     static_ips = StaticIPs(cloud_instances)
-    notify_by_email(general_report=GeneralReport(cloud_instances=cloud_instances, static_ips=static_ips),
-                    detailed_report=DetailedReport(cloud_instances=cloud_instances, static_ips=static_ips),
+    usage = CloudUsage(cloud_instances=cloud_instances, static_ips=static_ips)
+    notify_by_email(general_report=GeneralReport(cloud_instances=cloud_instances, static_ips=static_ips, usage=usage),
+                    detailed_report=DetailedReport(cloud_instances=cloud_instances, static_ips=static_ips, usage=usage),
                     recipients=mail_to)
 
 
@@ -1,37 +1,35 @@
 import os
 import tempfile
 
-from datetime import datetime, timedelta
 from collections import defaultdict
-from copy import deepcopy
 
 import jinja2
-import pytz
 
-from sdcm.keystore import KeyStore
 from sdcm.utils.cloud_monitor.resources import CLOUD_PROVIDERS
 from sdcm.utils.cloud_monitor.resources.instances import CloudInstances
 from sdcm.utils.cloud_monitor.resources.static_ips import StaticIPs
+from sdcm.utils.cloud_monitor.usage import CloudUsage
 
 
 class BaseReport:
 
-    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, html_template: str):
+    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, html_template: str,
+                 usage: CloudUsage = None):
         self.cloud_instances = cloud_instances
         self.static_ips = static_ips
         self.html_template = html_template
+        self.usage = usage or CloudUsage(cloud_instances=cloud_instances, static_ips=static_ips)
 
     @property
     def templates_dir(self):
         cur_path = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(cur_path, "templates")
 
-    def _jinja_render_template(self, **kwargs):
+    def _jinja_render_template(self, template=None, **kwargs):
         loader = jinja2.FileSystemLoader(self.templates_dir)
         env = jinja2.Environment(loader=loader, autoescape=True, extensions=['jinja2.ext.loopcontrols'],
                                  finalize=lambda x: x if x != 0 else "")
-        template = env.get_template(self.html_template)
-        html = template.render(**kwargs)
+        html = env.get_template(template or self.html_template).render(**kwargs)
         return html
 
     def render_template(self):
@@ -48,67 +46,34 @@ class BaseReport:
 
 
 class CloudResourcesReport(BaseReport):
-    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs):
-        super().__init__(cloud_instances, static_ips, html_template="cloud_resources.html")
-        stats = dict(num_running_instances=0,
-                     num_stopped_instances=0,
-                     unused_static_ips=0,
-                     num_used_static_ips=0,
-                     )
-        self.report = {cloud_provider: deepcopy(stats) for cloud_provider in CLOUD_PROVIDERS}
+    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, usage: CloudUsage = None):
+        super().__init__(cloud_instances, static_ips, html_template="cloud_resources.html", usage=usage)
+        self.report = {}
 
     def to_html(self):
-        for cloud_provider in CLOUD_PROVIDERS:
-            num_running_instances = len([i for i in self.cloud_instances[cloud_provider] if i.state == "running"])
-            num_stopped_instances = len([i for i in self.cloud_instances[cloud_provider] if i.state == "stopped"])
-            num_unused_static_ips = len([i for i in self.static_ips[cloud_provider] if not i.is_used])
-            self.report[cloud_provider]["num_running_instances"] = num_running_instances
-            self.report[cloud_provider]["num_stopped_instances"] = num_stopped_instances
-            self.report[cloud_provider]["num_unused_static_ips"] = num_unused_static_ips
-            self.report[cloud_provider]["num_used_static_ips"] = len(self.static_ips[cloud_provider])
+        self.report = {cloud_provider: dict(self.usage.per_cloud[cloud_provider]) for cloud_provider in CLOUD_PROVIDERS}
         return self.render_template()
 
 
 class PerUserSummaryReport(BaseReport):
-    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs):
-        super().__init__(cloud_instances, static_ips, html_template="per_user_summary.html")
+    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, usage: CloudUsage = None):
+        super().__init__(cloud_instances, static_ips, html_template="per_user_summary.html", usage=usage)
         self.report = {"results": {"qa": {}, "others": {}}, "cloud_providers": CLOUD_PROVIDERS}
-        self.qa_users = KeyStore().get_qa_users()
-
-    def user_type(self, user_name: str):
-        return "qa" if user_name in self.qa_users else "others"
 
     def to_html(self):
-        for cloud_provider in CLOUD_PROVIDERS:
-            for instance in self.cloud_instances[cloud_provider]:
-                user_type = self.user_type(instance.owner)
-                results = self.report["results"]
-                if instance.owner not in results[user_type]:
-                    stats = dict(num_running_instances_spot=0, num_running_instances_on_demand=0,
-                                 num_stopped_instances=0)
-                    results[user_type][instance.owner] = {cp: deepcopy(stats) for cp in self.report["cloud_providers"]}
-                    results[user_type][instance.owner]["num_instances_keep_alive"] = 0
-                    results[user_type][instance.owner]["total_cost"] = 0
-                    results[user_type][instance.owner]["projected_daily_cost"] = 0
-                if instance.state == "running":
-                    if instance.lifecycle == "spot":
-                        results[user_type][instance.owner][cloud_provider]["num_running_instances_spot"] += 1
-                    else:
-                        results[user_type][instance.owner][cloud_provider]["num_running_instances_on_demand"] += 1
-                    results[user_type][instance.owner]["total_cost"] += instance.total_cost
-                    results[user_type][instance.owner]["projected_daily_cost"] += instance.projected_daily_cost
-                if instance.state == "stopped":
-                    results[user_type][instance.owner][cloud_provider]["num_stopped_instances"] += 1
-                if instance.keep:
-                    results[user_type][instance.owner]["num_instances_keep_alive"] += 1
+        results = {"qa": {}, "others": {}}
+        for owner, stats in self.usage.per_user.items():
+            results[self.usage.user_type(owner)][owner] = stats
+        self.report["results"] = results
         return self.render_template()
 
 
 class GeneralReport(BaseReport):
-    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs):
-        super().__init__(cloud_instances, static_ips, html_template="base.html")
-        self.cloud_resources_report = CloudResourcesReport(cloud_instances=cloud_instances, static_ips=static_ips)
-        self.per_user_report = PerUserSummaryReport(cloud_instances, static_ips)
+    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, usage: CloudUsage = None):
+        super().__init__(cloud_instances, static_ips, html_template="base.html", usage=usage)
+        self.cloud_resources_report = CloudResourcesReport(cloud_instances=cloud_instances, static_ips=static_ips,
+                                                           usage=self.usage)
+        self.per_user_report = PerUserSummaryReport(cloud_instances, static_ips, usage=self.usage)
 
     def to_html(self):
         cloud_resources_html = self.cloud_resources_report.to_html()
@@ -119,65 +84,36 @@ class GeneralReport(BaseReport):
 class DetailedReport(BaseReport):
     """Attached as HTML file"""
 
-    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, user=None):
-        super().__init__(cloud_instances, static_ips, html_template="per_user.html")
+    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, user=None, usage: CloudUsage = None):
+        super().__init__(cloud_instances, static_ips, html_template="per_user.html", usage=usage)
         self.user = user
         self.report = defaultdict(list)
 
     def to_html(self):
-        for instance in self.cloud_instances.all:
-            self.report[instance.owner].append(instance)
         if self.user:
-            self.report = {self.user: self.report.get(self.user)}
-        resources_html = self.render_template()
-        self.html_template = "base.html"
-        return self._jinja_render_template(body=resources_html)
+            self.report = {self.user: self.usage.by_owner.get(self.user)}
+        else:
+            self.report = self.usage.by_owner
+        resources_html = self._jinja_render_template(**vars(self))
+        return self._jinja_render_template(template="base.html", body=resources_html)
 
 
 class QAonlyTimeDistributionReport(BaseReport):
-    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, user=None):
-        super().__init__(cloud_instances, static_ips, html_template="per_qa_user.html")
+    def __init__(self, cloud_instances: CloudInstances, static_ips: StaticIPs, user=None, usage: CloudUsage = None):
+        super().__init__(cloud_instances, static_ips, html_template="per_qa_user.html", usage=usage)
         self.user = user
-        self.report = {7: defaultdict(list), 5: defaultdict(list), 3: defaultdict(list)}
-        self.qa_users = KeyStore().get_qa_users()
+        self.report = {}
+
+    def _is_user_be_skipped(self, owner):
+        return owner == "qa" or owner not in self.usage.qa_users
 
     def to_html(self):
-        for instance in self.cloud_instances.all:
-            if self._is_user_be_skipped(instance) or self._is_instance_be_skipped(instance):
-                continue
-            if self._is_older_than_3days(instance.create_time):
-                self.report[3][instance.owner].append(instance)
-            elif self._is_older_than_5days(instance.create_time):
-                self.report[5][instance.owner].append(instance)
-            elif self._is_older_than_7days(instance.create_time):
-                self.report[7][instance.owner].append(instance)
-            else:
-                continue
+        self.report = {days: {owner: instances for owner, instances in by_owner.items()
+                              if not self._is_user_be_skipped(owner)}
+                       for days, by_owner in self.usage.running_by_age.items()}
         if self.user:
             for key in self.report:
                 self.report[key] = {self.user: self.report[key].get(self.user, list())}
 
-        resources_html = self.render_template()
-        self.html_template = "base.html"
-        return self._jinja_render_template(body=resources_html)
-
-    @staticmethod
-    def _is_older_than_3days(create_time):
-        return pytz.utc.localize(datetime.utcnow() - timedelta(days=3)) > create_time > pytz.utc.localize(
-            datetime.utcnow() - timedelta(days=5))
-
-    @staticmethod
-    def _is_older_than_5days(create_time):
-        return pytz.utc.localize(datetime.utcnow() - timedelta(days=5)) > create_time > pytz.utc.localize(
-            datetime.utcnow() - timedelta(days=7))
-
-    @staticmethod
-    def _is_older_than_7days(create_time):
-        return create_time < pytz.utc.localize(datetime.utcnow() - timedelta(days=7))
-
-    def _is_user_be_skipped(self, instance):
-        return instance.owner == "qa" or instance.owner not in self.qa_users
-
-    @staticmethod
-    def _is_instance_be_skipped(instance):
-        return instance.state != "running"
+        resources_html = self._jinja_render_template(**vars(self))
+        return self._jinja_render_template(template="base.html", body=resources_html)
@@ -1,7 +1,10 @@
 from datetime import datetime
 from math import ceil
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
 
 CLOUD_PROVIDERS = ("aws", "gce")
+INVENTORY_WORKERS = 16
 
 
 class CloudInstance:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
@@ -18,8 +21,15 @@ class CloudInstance:  # pylint: disable=too-few-public-methods,too-many-instance
         self.owner = owner.lower()
         self.create_time = create_time
         self.keep = keep  # keep alive
-        self.price = self.pricing.get_instance_price(region=self.region, instance_type=self.instance_type,
-                                                     state=self.state, lifecycle=self.lifecycle)
+
+    @property
+    def price_key(self):
+        return self.region, self.instance_type, self.state, self.lifecycle
+
+    @cached_property
+    def price(self):
+        return self.pricing.get_instance_price(region=self.region, instance_type=self.instance_type,
+                                               state=self.state, lifecycle=self.lifecycle)
 
     @property
     def region(self):
@@ -56,3 +66,27 @@ class CloudResources:
     def get_all(self):
         """Should fill self.all and self._grouped_by_cloud_provider"""
         raise NotImplementedError
+
+    def get_all_concurrently(self, getters):
+        """Run getters of all cloud providers at once, each getter fills the list of its cloud provider."""
+        with ThreadPoolExecutor(max_workers=len(getters), thread_name_prefix=type(self).__name__) as executor:
+            for future in [executor.submit(getter) for getter in getters]:
+                future.result()
+        for cloud_provider in CLOUD_PROVIDERS:  # keep the order of `self.all' independent of the timing
+            self.all.extend(self[cloud_provider])
+
+
+def prefetch_prices(instances):
+    """Get the price of every (region, instance type, state, lifecycle) once and concurrently."""
+    price_keys = {}
+    for instance in instances:
+        price_keys.setdefault(instance.price_key, []).append(instance)
+    if not price_keys:
+        return
+    # fill the pricing catalog by a few bulk requests, so the pool below hits the API for misses only
+    instances[0].pricing.prefetch_instance_prices(price_keys)
+    with ThreadPoolExecutor(max_workers=INVENTORY_WORKERS, thread_name_prefix="CloudPricing") as executor:
+        prices = executor.map(lambda same_price: same_price[0].price, price_keys.values())
+        for same_price, price in zip(price_keys.values(), prices):
+            for instance in same_price:
+                instance.__dict__["price"] = price  # set the cached property
@@ -1,8 +1,9 @@
 from logging import getLogger
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from boto3 import client as boto3_client
 from sdcm.utils.cloud_monitor.common import InstanceLifecycle, NA
-from sdcm.utils.cloud_monitor.resources import CloudInstance, CloudResources
+from sdcm.utils.cloud_monitor.resources import CloudInstance, CloudResources, INVENTORY_WORKERS, prefetch_prices
 from sdcm.utils.common import aws_tags_to_dict, gce_meta_to_dict, list_instances_aws, list_instances_gce
 from sdcm.utils.pricing import AWSPricing, GCEPricing
 
@@ -97,15 +98,16 @@ class CloudInstances(CloudResources):
 
     def get_aws_instances(self):
         aws_instances = list_instances_aws(verbose=True)
-        self["aws"] = [AWSInstance(instance) for instance in aws_instances]
-        self.all.extend(self["aws"])
+        # owners of instances without tags are looked up in CloudTrail, one request per instance
+        with ThreadPoolExecutor(max_workers=INVENTORY_WORKERS, thread_name_prefix="AWSInstance") as executor:
+            self["aws"] = list(executor.map(AWSInstance, aws_instances))
+        prefetch_prices(self["aws"])
 
     def get_gce_instances(self):
         gce_instances = list_instances_gce(verbose=True)
         self["gce"] = [GCEInstance(instance) for instance in gce_instances]
-        self.all.extend(self["gce"])
+        prefetch_prices(self["gce"])
 
     def get_all(self):
         LOGGER.info("Getting all cloud instances...")
-        self.get_aws_instances()
-        self.get_gce_instances()
+        self.get_all_concurrently((self.get_aws_instances, self.get_gce_instances, ))
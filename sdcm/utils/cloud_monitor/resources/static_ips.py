@@ -73,7 +73,6 @@ class StaticIPs(CloudResources):
                 if eip.name == NA:
                     # display the used instance name if ip's name is empty
                     eip.name = f"{NA} ({cloud_instances_by_id[eip.used_by].name})"
-        self.all.extend(self["aws"])
 
     def get_gce_static_ips(self):
         static_ips = list_static_ips_gce(verbose=True)
@@ -82,8 +81,6 @@ class StaticIPs(CloudResources):
         for eip in self["gce"]:
             if eip.owner == NA and eip.used_by != NA and cloud_instances_by_name.get(eip.used_by):
                 eip.owner = cloud_instances_by_name[eip.used_by].owner
-        self.all.extend(self["gce"])
 
     def get_all(self):
-        self.get_aws_elastic_ips()
-        self.get_gce_static_ips()
+        self.get_all_concurrently((self.get_aws_elastic_ips, self.get_gce_static_ips, ))
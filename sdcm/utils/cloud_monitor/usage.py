@@ -0,0 +1,107 @@
+"""
+Aggregates of cloud resources usage
+
+All instances and static IPs are walked once and counted per cloud provider, per region and per user, and running
+instances are bucketed by their age.  Reports are views over these aggregates, so rendering a few reports of a big
+account doesn't walk the inventories (and compute costs of every instance) again and again.
+"""
+
+from datetime import datetime, timedelta
+from collections import defaultdict
+from functools import cached_property
+from logging import getLogger
+
+import pytz
+
+from sdcm.keystore import KeyStore
+from sdcm.utils.cloud_monitor.common import InstanceLifecycle
+from sdcm.utils.cloud_monitor.resources import CLOUD_PROVIDERS
+
+
+LOGGER = getLogger(__name__)
+
+AGE_BUCKETS = (3, 5, 7, )  # days, the last bucket is open-ended
+
+
+def age_bucket(age: timedelta):
+    """Return the biggest bucket (in days) the age is strictly above, if it's not above the next one."""
+    for days, next_days in zip(AGE_BUCKETS, AGE_BUCKETS[1:] + (None, )):
+        if timedelta(days=days) < age and (next_days is None or age < timedelta(days=next_days)):
+            return days
+    return None
+
+
+def new_user_stats():
+    stats = {cloud_provider: dict(num_running_instances_spot=0,
+                                  num_running_instances_on_demand=0,
+                                  num_stopped_instances=0) for cloud_provider in CLOUD_PROVIDERS}
+    stats.update(num_instances_keep_alive=0, total_cost=0, projected_daily_cost=0)
+    return stats
+
+
+class CloudUsage:  # pylint: disable=too-many-instance-attributes
+    """Usage of cloud resources aggregated in one pass over instances and static IPs.
+
+    Usage:
+        >>> cloud_instances = CloudInstances()
+        >>> usage = CloudUsage(cloud_instances=cloud_instances, static_ips=StaticIPs(cloud_instances))
+        >>> usage.per_cloud["aws"]["num_running_instances"]
+        >>> usage.per_user["alice"]["projected_daily_cost"]
+        >>> usage.per_region[("aws", "us-east-1")]["num_running_instances"]
+        >>> usage.running_by_age[3]["alice"]  # running instances created 3 to 5 days ago
+    """
+
+    def __init__(self, cloud_instances, static_ips=None, now=None):
+        self.cloud_instances = cloud_instances
+        self.static_ips = static_ips
+        self.now = now or datetime.now(pytz.utc)
+        self.per_cloud = {cloud_provider: dict(num_running_instances=0,
+                                               num_stopped_instances=0,
+                                               num_unused_static_ips=0,
+                                               num_used_static_ips=0) for cloud_provider in CLOUD_PROVIDERS}
+        self.per_region = defaultdict(lambda: dict(num_running_instances=0,
+                                                   num_stopped_instances=0,
+                                                   projected_daily_cost=0))
+        self.per_user = defaultdict(new_user_stats)
+        self.by_owner = defaultdict(list)
+        self.running_by_age = {days: defaultdict(list) for days in AGE_BUCKETS}
+        self._aggregate()
+
+    def _aggregate(self):
+        for instance in self.cloud_instances.all:
+            cloud_stats = self.per_cloud[instance.cloud]
+            region_stats = self.per_region[(instance.cloud, instance.region)]
+            user_stats = self.per_user[instance.owner]
+            self.by_owner[instance.owner].append(instance)
+            if instance.state == "running":
+                cloud_stats["num_running_instances"] += 1
+                region_stats["num_running_instances"] += 1
+                if instance.lifecycle == InstanceLifecycle.SPOT:
+                    user_stats[instance.cloud]["num_running_instances_spot"] += 1
+                else:
+                    user_stats[instance.cloud]["num_running_instances_on_demand"] += 1
+                user_stats["total_cost"] += instance.total_cost
+                projected_daily_cost = instance.projected_daily_cost
+                user_stats["projected_daily_cost"] += projected_daily_cost
+                region_stats["projected_daily_cost"] += projected_daily_cost
+                if (days := age_bucket(self.now - instance.create_time)) is not None:
+                    self.running_by_age[days][instance.owner].append(instance)
+            elif instance.state == "stopped":
+                cloud_stats["num_stopped_instances"] += 1
+                region_stats["num_stopped_instances"] += 1
+                user_stats[instance.cloud]["num_stopped_instances"] += 1
+            if instance.keep:
+                user_stats["num_instances_keep_alive"] += 1
+        if self.static_ips is not None:
+            for static_ip in self.static_ips.all:
+                self.per_cloud[static_ip.cloud]["num_used_static_ips"] += 1  # i.e., all allocated
+                if not static_ip.is_used:
+                    self.per_cloud[static_ip.cloud]["num_unused_static_ips"] += 1
+        LOGGER.info("Aggregated %s instances of %s users", len(self.cloud_instances.all), len(self.per_user))
+
+    @cached_property
+    def qa_users(self):
+        return KeyStore().get_qa_users()
+
+    def user_type(self, user_name: str):
+        return "qa" if user_name in self.qa_users else "others"
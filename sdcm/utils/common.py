@@ -252,14 +252,17 @@ class S3Storage():
         grants.append(grantees)
         acl_obj.put(ACL='', AccessControlPolicy={'Grants': grants, 'Owner': acl_obj.owner})
 
-    def download_file(self, link, dst_dir):
-        key_name = link.replace("https://{0.bucket_name}.s3.amazonaws.com/".format(self), "")
+    def get_key_name(self, link):
+        return link.replace("https://{0.bucket_name}.s3.amazonaws.com/".format(self), "")
+
+    def download_file(self, link, dst_dir, transfer_config=None):
+        key_name = self.get_key_name(link)
         file_name = os.path.basename(key_name)
         try:
             LOGGER.info("Downloading {0} from {1}".format(key_name, self.bucket_name))
             self._bucket.download_file(Key=key_name,
                                        Filename=os.path.join(dst_dir, file_name),
-                                       Config=self.transfer_config)
+                                       Config=transfer_config or self.transfer_config)
             LOGGER.info("Downloaded finished")
             return os.path.join(os.path.abspath(dst_dir), file_name)
 
@@ -267,6 +270,12 @@ class S3Storage():
             LOGGER.warning("File {} is not downloaded by reason: {}".format(key_name, details))
             return ""
 
+    def open_stream(self, link):
+        """Return a file-like object to read the file as it downloads, e.g., to extract a tar archive on the fly."""
+        key_name = self.get_key_name(link)
+        LOGGER.info("Streaming {0} from {1}".format(key_name, self.bucket_name))
+        return self._bucket.Object(key_name).get()["Body"]
+
 
 def get_latest_gemini_version():
     bucket_name = 'downloads.scylladb.com'
@@ -0,0 +1,180 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Reuse driver clusters and sessions between `cql_connection*()' calls
+
+Every `cql_connection*()' call used to build a new driver cluster (control connection, metadata refresh, a connection
+pool per host) and shut it down on exit.  `CQLSessionPool' keeps driver clusters keyed by (node filter, credentials,
+connection profile) and reference counts them by leased sessions.  A session is leased exclusively: the same session
+is never used by two holders at once, so changes of its defaults (consistency level, fetch size, keyspace, etc.) don't
+leak to other threads and are reverted when the session is returned to the pool.
+
+Pooled driver clusters are dropped when the topology (IPs of the cluster nodes) changes, or when a health check
+finds no live host.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from collections import defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional
+
+from cassandra.cluster import NoHostAvailable  # pylint: disable=no-name-in-module
+from cassandra.connection import ConnectionException
+
+from sdcm.utils.common import ScyllaCQLSession
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_IDLE_SESSIONS = 4  # per driver cluster and keyspace
+SESSION_DEFAULTS = ("default_timeout", "default_consistency_level", "default_serial_consistency_level",
+                    "default_fetch_size", "row_factory", )
+BROKEN_SESSION_EXCEPTIONS = (NoHostAvailable, ConnectionException, )
+
+
+@dataclass
+class PoolEntry:
+    cluster: Any
+    created: float = field(default_factory=time.time)
+    idle: Dict[Optional[str], List[Any]] = field(default_factory=lambda: defaultdict(list))
+    leased: int = 0
+    valid: bool = True
+
+    def is_healthy(self) -> bool:
+        return self.valid and not self.cluster.is_shutdown and \
+            any(host.is_up for host in self.cluster.metadata.all_hosts())
+
+    def close(self) -> None:
+        self.valid = False
+        self.idle.clear()
+        self.cluster.shutdown()
+
+
+class PooledCQLSession(ScyllaCQLSession):
+    """Same as `ScyllaCQLSession', but returns the session to the pool on exit instead of the cluster shutdown."""
+
+    def __init__(self, pool: "CQLSessionPool", entry: PoolEntry, session, verbose=True):
+        super().__init__(session=session, cluster=entry.cluster, verbose=verbose)
+        self.pool = pool
+        self.entry = entry
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.session.__dict__.pop("execute", None)  # drop the verbose wrapper set by __enter__()
+        broken = exc_type is not None and issubclass(exc_type, BROKEN_SESSION_EXCEPTIONS)
+        self.pool.release(self, discard=broken)
+
+
+class CQLSessionPool:
+    """Pool of driver clusters with sessions leased one holder at a time.
+
+    Usage:
+        >>> pool = CQLSessionPool()
+        >>> with pool.acquire(key=(node_ips, credentials), topology=frozenset(all_ips),
+        ...                   create_cluster=create_cluster_driver, setup_session=setup, keyspace="ks") as session:
+        ...     session.execute(query)
+
+    `create_cluster' creates a new driver cluster for the `key', `setup_session' is called once for every new
+    session and values of the session defaults after it are restored on every lease.
+    """
+
+    def __init__(self, max_idle_sessions: int = MAX_IDLE_SESSIONS):
+        self.max_idle_sessions = max_idle_sessions
+        self.stats = defaultdict(int)
+        self._lock = threading.RLock()
+        self._entries: Dict[Hashable, PoolEntry] = {}
+        self._defaults: Dict[int, Dict[str, Any]] = {}
+        self._topology: Optional[FrozenSet[str]] = None
+
+    def acquire(self, key: Hashable, topology: FrozenSet[str],  # pylint: disable=too-many-arguments
+                create_cluster: Callable[[], Any], setup_session: Callable[[Any], None],
+                keyspace: Optional[str] = None, verbose: bool = True) -> PooledCQLSession:
+        with self._lock:
+            if topology != self._topology:
+                if self._topology is not None:
+                    LOGGER.debug("Topology changed, drop pooled CQL connections")
+                    self.invalidate()
+                self._topology = topology
+            entry = self._entries.get(key)
+            if entry is not None and not entry.is_healthy():
+                LOGGER.debug("Pooled CQL connection %s is not healthy, drop it", key)
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                entry.leased += 1
+                session = entry.idle[keyspace].pop() if entry.idle[keyspace] else None
+                self.stats["session_hits" if session else "cluster_hits"] += 1
+
+        if entry is None:
+            entry = PoolEntry(cluster=create_cluster())
+            entry.leased += 1
+            session = None
+            self.stats["misses"] += 1
+            with self._lock:
+                if key in self._entries:
+                    LOGGER.debug("Concurrent CQL connection %s has been created, use it as a non-pooled one", key)
+                    entry.valid = False
+                else:
+                    self._entries[key] = entry
+
+        try:
+            if session is None:
+                session = entry.cluster.connect()
+                setup_session(session)
+                self._defaults[id(session)] = {attr: getattr(session, attr) for attr in SESSION_DEFAULTS}
+                if keyspace is not None:
+                    session.set_keyspace(keyspace)
+            else:
+                for attr, value in self._defaults[id(session)].items():
+                    setattr(session, attr, value)
+        except Exception:
+            self._release_entry(entry)
+            raise
+        return PooledCQLSession(pool=self, entry=entry, session=session, verbose=verbose)
+
+    def release(self, pooled_session: PooledCQLSession, discard: bool = False) -> None:
+        session, entry = pooled_session.session, pooled_session.entry
+        with self._lock:
+            idle = entry.idle[session.keyspace]
+            if discard or not entry.valid or len(idle) >= self.max_idle_sessions:
+                self._defaults.pop(id(session), None)
+                if not entry.cluster.is_shutdown:
+                    session.shutdown()
+            else:
+                idle.append(session)
+            self._release_entry(entry)
+
+    def _release_entry(self, entry: PoolEntry) -> None:
+        with self._lock:
+            entry.leased -= 1
+            if not entry.valid and not entry.leased:
+                entry.close()
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for sessions in entry.idle.values():
+            for session in sessions:
+                self._defaults.pop(id(session), None)
+        entry.valid = False
+        if not entry.leased:
+            entry.close()
+
+    def invalidate(self) -> None:
+        """Drop all pooled driver clusters, the leased ones are shut down when the last of their sessions returns."""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+            self.stats["invalidations"] += 1
+
+    close = invalidate
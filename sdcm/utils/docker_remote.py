@@ -1,8 +1,22 @@
 import logging
+import weakref
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
 from sdcm.cluster import BaseNode
 
 LOGGER = logging.getLogger(__name__)
 
+IDLE_CONTAINERS_PER_KIND = 4  # per (image, docker options, command line) on a node
+POOL_LABEL = "sct_docker_pool"
+PULL_TIMEOUT = 1200  # seconds
+
+_POOLS = weakref.WeakKeyDictionary()
+_POOLS_LOCK = threading.Lock()
+
 
 class RemoteDocker(BaseNode):
     def __init__(self, node, image_name, ports=None, command_line="tail -f /dev/null", extra_docker_opts=""):  # pylint: disable=too-many-arguments
@@ -14,6 +28,7 @@ class RemoteDocker(BaseNode):
             f'docker run {extra_docker_opts} -d {ports} {image_name} {command_line}', verbose=True)
         self.docker_id = res.stdout.strip()
         self.image_name = image_name
+        self.setup_key = None  # what the container was set up for, if it's recycled by RemoteDockerPool
         super().__init__(name=image_name, parent_cluster=node.parent_cluster)
 
     @property
@@ -101,3 +116,112 @@ class RemoteDocker(BaseNode):
 
     def __str__(self):
         return f'RemoteDocker [{self.image_name}] on [{self.node}]'
+
+
+def get_docker_pool(node) -> "RemoteDockerPool":
+    """Return the pool of containers shared by all stress threads of the node."""
+    with _POOLS_LOCK:
+        if node not in _POOLS:
+            _POOLS[node] = RemoteDockerPool(node=node)
+        return _POOLS[node]
+
+
+class RemoteDockerPool:
+    """Warm containers of stress tools on a node, recycled between stress runs.
+
+    Every image is pulled once per node.  A container runs an idle command and stress commands go to it
+    by `docker exec', so a container which finished a run is kept for the next run with the same image and
+    docker options.  The setup of a container (e.g., config files or a JVM warmup) is done again only if the
+    setup key changes.  A container is removed if a run fails, or if there are enough idle ones already.
+
+    Usage:
+        >>> pool = get_docker_pool(loader)
+        >>> pool.pull_images(["scylladb/hydra-loaders:ycsb-jdk8-20200326"])
+        >>> with pool.container("scylladb/hydra-loaders:ycsb-jdk8-20200326", owner=shell_marker,
+        ...                     setup=copy_template, setup_key=template) as docker:
+        ...     docker.run(cmd="cd /YCSB && bin/ycsb run ...")
+        >>> pool.kill(owner=shell_marker)  # remove containers leased by the owner, i.e., stop its stress commands
+    """
+
+    def __init__(self, node, max_idle: int = IDLE_CONTAINERS_PER_KIND):
+        self.node = node
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._pull_locks: Dict[str, threading.Lock] = {}
+        self._pulled: Set[str] = set()
+        self._idle: Dict[Tuple[str, str, str], List[RemoteDocker]] = defaultdict(list)
+        self._leased: Dict[str, Tuple[RemoteDocker, Optional[str]]] = {}  # docker id -> (container, owner)
+
+    def pull_image(self, image_name: str) -> None:
+        with self._lock:
+            pull_lock = self._pull_locks.setdefault(image_name, threading.Lock())
+        with pull_lock:
+            if image_name not in self._pulled:
+                LOGGER.debug("Pull %s on %s", image_name, self.node)
+                self.node.remoter.run(f"docker pull -q {image_name}", timeout=PULL_TIMEOUT, verbose=False)
+                self._pulled.add(image_name)
+
+    def pull_images(self, image_names: Iterable[str]) -> None:
+        image_names = list(dict.fromkeys(image_names))
+        if not image_names:
+            return
+        with ThreadPoolExecutor(max_workers=len(image_names), thread_name_prefix="DockerPull") as executor:
+            list(executor.map(self.pull_image, image_names))
+
+    @contextmanager
+    def container(self, image_name: str, extra_docker_opts: str = "",  # pylint: disable=too-many-arguments
+                  command_line: str = "tail -f /dev/null", owner: Optional[str] = None,
+                  setup: Optional[Callable[[RemoteDocker], None]] = None, setup_key=None):
+        kind = (image_name, extra_docker_opts, command_line)
+        with self._lock:
+            docker = self._idle[kind].pop() if self._idle[kind] else None
+        if docker is None:
+            self.pull_image(image_name)
+            docker = RemoteDocker(self.node, image_name, command_line=command_line,
+                                  extra_docker_opts=f"{extra_docker_opts} --label {POOL_LABEL}=1")
+        with self._lock:
+            self._leased[docker.docker_id] = (docker, owner)
+        try:
+            if setup is not None and docker.setup_key != setup_key:
+                docker.setup_key = None
+                setup(docker)
+                docker.setup_key = setup_key
+            yield docker
+        except BaseException:
+            self._release(kind, docker, reuse=False)
+            raise
+        self._release(kind, docker, reuse=True)
+
+    def _release(self, kind: Tuple[str, str, str], docker: RemoteDocker, reuse: bool) -> None:
+        with self._lock:
+            leased = self._leased.pop(docker.docker_id, None)
+            if leased is None:  # killed by its owner already
+                return
+            if reuse and len(self._idle[kind]) < self.max_idle:
+                self._idle[kind].append(docker)
+                return
+        docker.kill()
+
+    def discard(self, docker: RemoteDocker) -> None:
+        """Remove a leased container instead of recycling it, e.g., if a stress command might still run there."""
+        with self._lock:
+            self._leased.pop(docker.docker_id, None)
+        docker.kill()
+
+    def kill(self, owner: str) -> None:
+        """Remove containers leased by the owner."""
+        with self._lock:
+            containers = [docker for docker, leased_by in self._leased.values() if leased_by == owner]
+            for docker in containers:
+                del self._leased[docker.docker_id]
+        for docker in containers:
+            docker.kill()
+
+    def clear(self) -> None:
+        """Forget all containers and remove idle ones, e.g., after all containers on the node were removed."""
+        with self._lock:
+            idle = [docker for containers in self._idle.values() for docker in containers]
+            self._idle.clear()
+            self._leased.clear()
+        for docker in idle:
+            docker.kill()
@@ -0,0 +1,232 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Filtered, resumable tail of events.log which runs on the host where the log is
+
+This module uses only the standard library (and no python3.8+ syntax) on purpose: it's copied as is to the builder
+and executed there with python3, so only the matching events are sent back over SSH, compressed and in bounded chunks.
+
+Each run reads the file starting from a byte offset (the cursor) and prints a header line followed by the payload:
+
+    #SCT-EVENTS cursor=<offset> more=<0|1> compressed=<0|1>
+    <matched events, or base64 of zlib compressed matched events>
+
+`more=1` means that the output was cut by `--max-bytes` and the caller should ask again from the new cursor.
+"""
+
+import os
+import re
+import sys
+import time
+import zlib
+import shlex
+import base64
+import argparse
+import logging
+from collections import deque
+from typing import Iterator, Optional, Tuple, List, NamedTuple
+
+LOGGER = logging.getLogger(__name__)
+
+HEADER_PREFIX = "#SCT-EVENTS"
+REMOTE_SCRIPT_PATH = "/tmp/sct_events_log_tail.py"
+SEVERITIES = ("DEBUG", "UNKNOWN", "NORMAL", "WARNING", "ERROR", "CRITICAL", )
+
+EVENT_START_RE = re.compile(
+    r"^(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:\.\d+)?(?: <[^>]*>)?: "
+    r"\((?P<base>\w+) Severity\.(?P<severity>\w+)\)")
+EVENT_TYPE_RE = re.compile(r" type=(?P<type>\S+)")
+EVENT_NODE_RE = re.compile(r" node=(?P<node>\S+)")
+
+
+class EventsFilter(NamedTuple):
+    min_severity: Optional[str] = None
+    event_types: Tuple[str, ...] = ()
+    node: Optional[str] = None
+    since: Optional[str] = None  # "YYYY-MM-DD HH:MM:SS", compared as strings
+    until: Optional[str] = None
+
+    def match(self, event: str) -> bool:
+        header = EVENT_START_RE.match(event)
+        if not header:
+            return False
+        if self.min_severity and header.group("severity") in SEVERITIES \
+                and SEVERITIES.index(header.group("severity")) < SEVERITIES.index(self.min_severity):
+            return False
+        if self.since and header.group("timestamp") < self.since:
+            return False
+        if self.until and header.group("timestamp") > self.until:
+            return False
+        first_line = event.split("\n", 1)[0]
+        if self.event_types:
+            names = {header.group("base")}
+            event_type = EVENT_TYPE_RE.search(first_line)
+            if event_type:
+                names.add(f"{header.group('base')}.{event_type.group('type')}")
+            if not names.intersection(self.event_types):
+                return False
+        if self.node:
+            node = EVENT_NODE_RE.search(first_line)
+            if not node or self.node not in node.group("node"):
+                return False
+        return True
+
+
+def iter_events(fobj, offset: int) -> Iterator[Tuple[str, int]]:
+    """Yield (event, end offset) for every complete event in the file opened in binary mode, starting at offset.
+
+    An event is complete when the next event starts or when the file ends with a newline, since the events
+    file logger writes every event with a single write() call.
+    """
+    fobj.seek(offset)
+    event, event_end = [], offset
+    for line in fobj:
+        if not line.endswith(b"\n"):
+            break  # partially written line, don't move the cursor past it
+        decoded = line.decode("utf-8", errors="replace")
+        if EVENT_START_RE.match(decoded) and event:
+            yield "".join(event), event_end
+            event = []
+        event.append(decoded)
+        event_end += len(line)
+    if event:
+        yield "".join(event), event_end
+
+
+def filter_events_log(path: str, events_filter: EventsFilter, offset: int = 0, last_n: Optional[int] = None,
+                      max_bytes: Optional[int] = None) -> Tuple[List[str], int, bool]:
+    """Return matched events, cursor to continue from and if there are more events to read.
+
+    With `last_n' only the last N matched events are returned, and the cursor points to the end of the file.
+    """
+    matched = deque(maxlen=last_n) if last_n else []
+    cursor, size, more = offset, 0, False
+    with open(path, "rb") as fobj:
+        for event, event_end in iter_events(fobj, offset):
+            if events_filter.match(event):
+                if max_bytes and not last_n and matched and size + len(event) > max_bytes:
+                    more = True
+                    break
+                matched.append(event)
+                size += len(event)
+            cursor = event_end
+    return list(matched), cursor, more
+
+
+def format_output(events: List[str], cursor: int, more: bool, compress: bool) -> str:
+    payload = "".join(events)
+    if compress:
+        payload = base64.b64encode(zlib.compress(payload.encode("utf-8"), 9)).decode("ascii") + "\n"
+    return f"{HEADER_PREFIX} cursor={cursor} more={int(more)} compressed={int(compress)}\n{payload}"
+
+
+def parse_output(output: str) -> Tuple[str, int, bool]:
+    """Return (events text, cursor, more) from the output of the remote script."""
+    header, _, payload = output.partition("\n")
+    if not header.startswith(HEADER_PREFIX):
+        raise ValueError(f"Unexpected output from events log filter: {header[:200]}")
+    fields = dict(field.split("=", 1) for field in header.split()[1:])
+    if fields["compressed"] == "1":
+        payload = zlib.decompress(base64.b64decode(payload.strip())).decode("utf-8")
+    return payload, int(fields["cursor"]), fields["more"] == "1"
+
+
+class EventsLogTail:  # pylint: disable=too-few-public-methods
+    """Read events.log of a running job on a remote host, filtered on the remote side.
+
+    Usage:
+        >>> tail = EventsLogTail(remoter, "/path/to/events_log/events.log", EventsFilter(min_severity="CRITICAL"))
+        >>> for chunk in tail.follow():
+        ...     print(chunk, end="")
+
+    The cursor is kept by the object, so reconnecting (or calling `fetch()` again) sends only new events.
+    """
+
+    def __init__(self, remoter, path: str, events_filter: EventsFilter = EventsFilter(),  # pylint: disable=too-many-arguments
+                 cursor: int = 0, compress: bool = True, max_bytes: int = 4 * 1024 * 1024):
+        self.remoter = remoter
+        self.path = path
+        self.events_filter = events_filter
+        self.cursor = cursor
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self._script_installed = False
+
+    def _install_script(self) -> None:
+        if not self._script_installed:
+            self.remoter.send_files(src=os.path.abspath(__file__), dst=REMOTE_SCRIPT_PATH)
+            self._script_installed = True
+
+    def _build_cmd(self, last_n: Optional[int] = None) -> str:
+        cmd = [f"python3 {REMOTE_SCRIPT_PATH} {shlex.quote(self.path)} --offset {self.cursor} --max-bytes {self.max_bytes}"]
+        if self.compress:
+            cmd.append("--compress")
+        if last_n:
+            cmd.append(f"--last-n {last_n}")
+        if self.events_filter.min_severity:
+            cmd.append(f"--severity {shlex.quote(self.events_filter.min_severity)}")
+        for event_type in self.events_filter.event_types:
+            cmd.append(f"--event-type {shlex.quote(event_type)}")
+        if self.events_filter.node:
+            cmd.append(f"--node {shlex.quote(self.events_filter.node)}")
+        if self.events_filter.since:
+            cmd.append(f"--since {shlex.quote(self.events_filter.since)}")
+        if self.events_filter.until:
+            cmd.append(f"--until {shlex.quote(self.events_filter.until)}")
+        return " ".join(cmd)
+
+    def fetch(self, last_n: Optional[int] = None) -> Iterator[str]:
+        """Yield chunks of matched events from the current cursor to the end of the file."""
+        self._install_script()
+        more = True
+        while more:
+            result = self.remoter.run(self._build_cmd(last_n=last_n), verbose=False)
+            events, self.cursor, more = parse_output(result.stdout)
+            if events:
+                yield events
+
+    def follow(self, last_n: Optional[int] = None, interval: float = 5) -> Iterator[str]:
+        """Yield new matched events forever, similar to `tail -f'."""
+        yield from self.fetch(last_n=last_n)
+        while True:
+            time.sleep(interval)
+            try:
+                yield from self.fetch()
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to read %s, will retry from offset %s: %s", self.path, self.cursor, exc)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--max-bytes", type=int, default=None)
+    parser.add_argument("--last-n", type=int, default=None)
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--severity", choices=SEVERITIES, default=None)
+    parser.add_argument("--event-type", action="append", default=[])
+    parser.add_argument("--node", default=None)
+    parser.add_argument("--since", default=None)
+    parser.add_argument("--until", default=None)
+    args = parser.parse_args(argv)
+
+    events_filter = EventsFilter(min_severity=args.severity, event_types=tuple(args.event_type), node=args.node,
+                                 since=args.since, until=args.until)
+    events, cursor, more = filter_events_log(path=args.path, events_filter=events_filter, offset=args.offset,
+                                             last_n=args.last_n, max_bytes=args.max_bytes)
+    sys.stdout.write(format_output(events=events, cursor=cursor, more=more, compress=args.compress))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,264 @@
+"""
+Prices of cloud instances
+
+AWS prices are kept in a catalog shared by the whole process and persisted to `~/.sct/pricing-catalog.json',
+so the next run (or a run without access to the pricing API) doesn't ask AWS for every instance type again.
+A report over many instances fills the catalog by one paginated request per region and lifecycle.
+"""
+
+import os
 import json
+import time
+import tempfile
+import threading
+from collections import defaultdict
 from datetime import datetime, timedelta
-from functools import lru_cache
+from functools import cached_property
 from logging import getLogger
+from typing import Dict, Iterable, Optional, Tuple
 import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 from mypy_boto3_pricing import PricingClient
 from sdcm.utils.cloud_monitor.common import InstanceLifecycle
 
 
 LOGGER = getLogger(__name__)
 
+PRICING_CATALOG_PATH = os.path.expanduser("~/.sct/pricing-catalog.json")
+PRICING_CATALOG_VERSION = 1  # bump it when the format of the file or the way prices are calculated change
+ON_DEMAND_PRICE_TTL = 7 * 24 * 3600  # seconds
+SPOT_PRICE_TTL = 3 * 3600  # seconds
+
+AWS_REGIONS_NAMES = {
+    'us-east-2': 'US East (Ohio)',
+    'us-east-1': 'US East (N. Virginia)',
+    'us-west-1': 'US West (N. California)',
+    'us-west-2': 'US West (Oregon)',
+    'ap-south-1': 'Asia Pacific (Mumbai)',
+    'ap-northeast-3': 'Asia Pacific (Osaka-Local)',
+    'ap-northeast-2': 'Asia Pacific (Seoul)',
+    'ap-southeast-1': 'Asia Pacific (Singapore)',
+    'ap-southeast-2': 'Asia Pacific (Sydney)',
+    'ap-northeast-1': 'Asia Pacific (Tokyo)',
+    'ca-central-1': 'Canada (Central)',
+    'eu-central-1': 'EU (Frankfurt)',
+    'eu-west-1': 'EU (Ireland)',
+    'eu-west-2': 'EU (London)',
+    'eu-west-3': 'EU (Paris)',
+    'eu-north-1': 'EU (Stockholm)',
+    'sa-east-1': 'South America (Sao Paulo)'
+}
+PRICING_API_ERRORS = (BotoCoreError, ClientError, AssertionError, )
+
+
+class PricingCatalog:
+    """Price points shared by all users of the process and persisted to a versioned file.
+
+    Every price point expires after its TTL, but an expired one is still returned by `get(..., allow_expired=True)',
+    e.g., when the pricing API is throttling or there are no credentials at all.
+
+    Usage:
+        >>> catalog = PricingCatalog()
+        >>> catalog.get(("aws", "on-demand", "us-east-1", "m5.large"), ttl=ON_DEMAND_PRICE_TTL)  # None if not there
+        >>> catalog.update({("aws", "on-demand", "us-east-1", "m5.large"): 0.096})
+    """
+
+    def __init__(self, path: Optional[str] = PRICING_CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._prices: Dict[str, Tuple[float, float]] = {}  # key -> (price, timestamp)
+        self._load()
+
+    @staticmethod
+    def _key(key: Iterable[str]) -> str:
+        return "/".join(key)
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as catalog_file:
+                catalog = json.load(catalog_file)
+        except (OSError, ValueError):
+            return
+        if catalog.get("version") != PRICING_CATALOG_VERSION:
+            LOGGER.debug("Ignore pricing catalog %s of version %s", self.path, catalog.get("version"))
+            return
+        self._prices = {key: tuple(value) for key, value in catalog.get("prices", {}).items()}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # write to a temporary file first, so other processes never read a partial catalog
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self.path), delete=False,
+                                             suffix=".tmp") as tmp_file:
+                json.dump({"version": PRICING_CATALOG_VERSION, "prices": self._prices}, tmp_file)
+            os.replace(tmp_file.name, self.path)
+        except OSError as exc:
+            LOGGER.debug("Failed to write pricing catalog %s: %s", self.path, exc)
+
+    def get(self, key: Iterable[str], ttl: float, allow_expired: bool = False) -> Optional[float]:
+        with self._lock:
+            price, timestamp = self._prices.get(self._key(key), (None, 0))
+        if price is None or (not allow_expired and time.time() - timestamp > ttl):
+            return None
+        return price
+
+    def update(self, prices: Dict[Tuple[str, ...], float]) -> None:
+        if not prices:
+            return
+        now = time.time()
+        with self._lock:
+            self._prices.update({self._key(key): (price, now) for key, price in prices.items()})
+            self._save()
+
+
+_DEFAULT_CATALOG = None
+_DEFAULT_CATALOG_LOCK = threading.Lock()
+
+
+def get_pricing_catalog() -> PricingCatalog:
+    global _DEFAULT_CATALOG  # pylint: disable=global-statement
+    with _DEFAULT_CATALOG_LOCK:
+        if _DEFAULT_CATALOG is None:
+            _DEFAULT_CATALOG = PricingCatalog()
+        return _DEFAULT_CATALOG
+
+
+def _on_demand_price(price_item: str) -> Tuple[str, float]:
+    price = json.loads(price_item)
+    price_dimensions = next(iter(price['terms']['OnDemand'].values()))['priceDimensions']
+    return price['product']['attributes']['instanceType'], float(next(iter(price_dimensions.values()))['pricePerUnit']['USD'])
+
 
-# TODO: get all prices in __init__
 class AWSPricing:
+    """Prices of AWS instances from the pricing catalog, missing and expired ones are fetched from AWS APIs.
+
+    Usage:
+        >>> pricing = AWSPricing()
+        >>> pricing.prefetch_instance_prices([("us-east-1", "m5.large", "running", InstanceLifecycle.SPOT), ...])
+        >>> pricing.get_instance_price(region="us-east-1", instance_type="m5.large", state="running",
+        ...                            lifecycle=InstanceLifecycle.SPOT)  # from the catalog, no API calls
+    """
+
+    def __init__(self, catalog: Optional[PricingCatalog] = None):
+        self._catalog = catalog
+        self._ec2_clients = {}
+        self._lock = threading.Lock()
+
+    @cached_property
+    def catalog(self) -> PricingCatalog:
+        return self._catalog or get_pricing_catalog()
 
-    def __init__(self):
-        self.pricing_client: PricingClient = boto3.client('pricing', region_name='us-east-1')
+    @cached_property
+    def pricing_client(self) -> PricingClient:
+        return boto3.client('pricing', region_name='us-east-1')
+
+    def ec2_client(self, region_name):
+        with self._lock:
+            if region_name not in self._ec2_clients:
+                self._ec2_clients[region_name] = boto3.client('ec2', region_name=region_name)
+            return self._ec2_clients[region_name]
+
+    @staticmethod
+    def _products_filters(region_name, instance_type=None):
+        filters = [
+            {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
+            {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
+            {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
+            {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'},
+            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': AWS_REGIONS_NAMES[region_name]}
+        ]
+        if instance_type:
+            filters.append({'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type})
+        return filters
+
+    def _cached_price(self, lifecycle, region_name, instance_type, fetch):
+        key = ("aws", lifecycle.value, region_name, instance_type)
+        ttl = SPOT_PRICE_TTL if lifecycle == InstanceLifecycle.SPOT else ON_DEMAND_PRICE_TTL
+        if (price := self.catalog.get(key, ttl=ttl)) is not None:
+            return price
+        try:
+            price = fetch()
+        except PRICING_API_ERRORS as exc:
+            if (price := self.catalog.get(key, ttl=ttl, allow_expired=True)) is None:
+                raise
+            LOGGER.warning("Failed to get price for '%s' in '%s', use the expired one: %s", instance_type, region_name, exc)
+            return price
+        self.catalog.update({key: price})
+        return price
 
-    @lru_cache(maxsize=None)
     def get_on_demand_instance_price(self, region_name, instance_type):
-        regions_names_map = {
-            'us-east-2': 'US East (Ohio)',
-            'us-east-1': 'US East (N. Virginia)',
-            'us-west-1': 'US West (N. California)',
-            'us-west-2': 'US West (Oregon)',
-            'ap-south-1': 'Asia Pacific (Mumbai)',
-            'ap-northeast-3': 'Asia Pacific (Osaka-Local)',
-            'ap-northeast-2': 'Asia Pacific (Seoul)',
-            'ap-southeast-1': 'Asia Pacific (Singapore)',
-            'ap-southeast-2': 'Asia Pacific (Sydney)',
-            'ap-northeast-1': 'Asia Pacific (Tokyo)',
-            'ca-central-1': 'Canada (Central)',
-            'eu-central-1': 'EU (Frankfurt)',
-            'eu-west-1': 'EU (Ireland)',
-            'eu-west-2': 'EU (London)',
-            'eu-west-3': 'EU (Paris)',
-            'eu-north-1': 'EU (Stockholm)',
-            'sa-east-1': 'South America (Sao Paulo)'
-        }
+        return self._cached_price(InstanceLifecycle.ON_DEMAND, region_name, instance_type,
+                                  lambda: self._fetch_on_demand_instance_price(region_name, instance_type))
 
+    def _fetch_on_demand_instance_price(self, region_name, instance_type):
         response = self.pricing_client.get_products(
             ServiceCode='AmazonEC2',
-            Filters=[
-                {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
-                {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
-                {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
-                {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
-                {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'},
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': regions_names_map[region_name]}
-            ],
+            Filters=self._products_filters(region_name, instance_type),
             MaxResults=10
         )
         assert response['PriceList'], "failed to get price for {instance_type} in {region_name}".format(
             region_name=region_name, instance_type=instance_type)
-        price = response['PriceList'][0]
-        price_dimensions = next(iter(json.loads(price)['terms']['OnDemand'].values()))['priceDimensions']
-        instance_price = next(iter(price_dimensions.values()))['pricePerUnit']['USD']
-        return float(instance_price)
+        return _on_demand_price(response['PriceList'][0])[1]
 
-    @staticmethod
-    @lru_cache(maxsize=None)
-    def get_spot_instance_price(region_name, instance_type):
+    def _fetch_on_demand_region_prices(self, region_name):
+        """Get prices of all instance types of the region by one paginated request."""
+        prices = {}
+        paginator = self.pricing_client.get_paginator('get_products')
+        for page in paginator.paginate(ServiceCode='AmazonEC2', Filters=self._products_filters(region_name)):
+            for price_item in page['PriceList']:
+                instance_type, price = _on_demand_price(price_item)
+                prices.setdefault(instance_type, price)
+        return prices
+
+    def get_spot_instance_price(self, region_name, instance_type):
         """currently doesn't take AZ into consideration"""
-        client = boto3.client('ec2', region_name=region_name)
-        result = client.describe_spot_price_history(InstanceTypes=[instance_type],
-                                                    ProductDescriptions=['Linux/UNIX (Amazon VPC)', 'Linux/UNIX'],
-                                                    StartTime=datetime.now() - timedelta(hours=3),
-                                                    EndTime=datetime.now())
-        prices = result['SpotPriceHistory']
-        if prices:
-            # average between different AZs
-            all_prices = [float(p['SpotPrice']) for p in prices]
-            return sum(all_prices) / len(all_prices)
-        else:
-            LOGGER.warning("Spot price not found for '%s' in '%s':\n%s", instance_type, region_name, result)
-            return 0
+        return self._cached_price(InstanceLifecycle.SPOT, region_name, instance_type,
+                                  lambda: self._fetch_spot_prices(region_name, [instance_type]).get(instance_type, 0))
+
+    def _fetch_spot_prices(self, region_name, instance_types):
+        """Get average prices (between different AZs) of the instance types by one paginated request."""
+        paginator = self.ec2_client(region_name).get_paginator('describe_spot_price_history')
+        all_prices = defaultdict(list)
+        for page in paginator.paginate(InstanceTypes=list(instance_types),
+                                       ProductDescriptions=['Linux/UNIX (Amazon VPC)', 'Linux/UNIX'],
+                                       StartTime=datetime.now() - timedelta(hours=3),
+                                       EndTime=datetime.now()):
+            for spot_price in page['SpotPriceHistory']:
+                all_prices[spot_price['InstanceType']].append(float(spot_price['SpotPrice']))
+        for instance_type in set(instance_types) - set(all_prices):
+            LOGGER.warning("Spot price not found for '%s' in '%s'", instance_type, region_name)
+        return {instance_type: sum(all_prices[instance_type]) / len(all_prices[instance_type])
+                if all_prices[instance_type] else 0 for instance_type in instance_types}
+
+    def prefetch_instance_prices(self, price_keys):
+        """Load prices of many instances into the catalog: one request per region and lifecycle.
+
+        `price_keys' are (region, instance type, state, lifecycle) tuples, only running instances have a price.
+        """
+        missing = defaultdict(set)
+        for region_name, instance_type, state, lifecycle in price_keys:
+            ttl = SPOT_PRICE_TTL if lifecycle == InstanceLifecycle.SPOT else ON_DEMAND_PRICE_TTL
+            if state == "running" and self.catalog.get(("aws", lifecycle.value, region_name, instance_type),
+                                                       ttl=ttl) is None:
+                missing[(region_name, lifecycle)].add(instance_type)
+        for (region_name, lifecycle), instance_types in missing.items():
+            LOGGER.info("Fetch %s prices of %s instance types in '%s'", lifecycle.value, len(instance_types), region_name)
+            try:
+                if lifecycle == InstanceLifecycle.SPOT:
+                    prices = self._fetch_spot_prices(region_name, sorted(instance_types))
+                elif len(instance_types) > 1:
+                    prices = self._fetch_on_demand_region_prices(region_name)
+                else:
+                    continue  # a single price is fetched on demand
+            except PRICING_API_ERRORS as exc:
+                LOGGER.warning("Failed to fetch %s prices in '%s': %s", lifecycle.value, region_name, exc)
+                continue
+            self.catalog.update({("aws", lifecycle.value, region_name, instance_type): price
+                                 for instance_type, price in prices.items()})
 
     def get_instance_price(self, region, instance_type, state, lifecycle):
         if state == "running":
@@ -240,6 +425,9 @@ class GCEPricing:  # pylint: disable=too-few-public-methods
         },
     }
 
+    def prefetch_instance_prices(self, price_keys):
+        """All prices are static."""
+
     def get_instance_price(self, region, instance_type, state, lifecycle):  # pylint: disable=unused-argument
         """Using us-east1 to estimate"""
         if state == "running":
@@ -0,0 +1,222 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Create a lot of schema objects fast
+
+Every DDL statement executed by the driver waits for schema agreement, so creating thousands of tables one by one
+takes hours.  `SchemaProvisioner' runs DDL statements in waves with a controlled concurrency and waits for schema
+agreement only once per wave.  Statements are ordered by the kind of objects they create (keyspaces, types, tables,
+indexes and views, everything else), objects which already exist are skipped by reading `system_schema' once, and
+statements failed inside of a wave are retried one by one.
+"""
+
+import re
+import time
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from cassandra import AlreadyExists, InvalidRequest
+
+LOGGER = logging.getLogger(__name__)
+
+NAME = r'(?:"[^"]+"|\w+)'
+CREATE_STATEMENT_RE = re.compile(
+    r"^\s*CREATE\s+(?P<kind>KEYSPACE|TABLE|COLUMNFAMILY|TYPE|(?:CUSTOM\s+)?INDEX|MATERIALIZED\s+VIEW)\s+"
+    rf"(?:IF\s+NOT\s+EXISTS\s+)?(?:(?P<keyspace>(?!ON\s){NAME})\.)?(?P<name>(?!ON\s){NAME})?", re.IGNORECASE)
+INDEX_KEYSPACE_RE = re.compile(rf"\sON\s+(?P<keyspace>{NAME})\.", re.IGNORECASE)
+
+# Order in which statements are executed, objects of the next stage can depend on objects of the previous ones.
+STAGES = ("keyspace", "type", "table", "index", "view", "other", )
+KINDS = {
+    "KEYSPACE": "keyspace",
+    "TYPE": "type",
+    "TABLE": "table",
+    "COLUMNFAMILY": "table",
+    "INDEX": "index",
+    "CUSTOM INDEX": "index",
+    "MATERIALIZED VIEW": "view",
+}
+SYSTEM_SCHEMA_QUERIES = {
+    "keyspace": "SELECT keyspace_name FROM system_schema.keyspaces",
+    "type": "SELECT keyspace_name, type_name FROM system_schema.types",
+    "table": "SELECT keyspace_name, table_name FROM system_schema.tables",
+    "index": "SELECT keyspace_name, index_name FROM system_schema.indexes",
+    "view": "SELECT keyspace_name, view_name FROM system_schema.views",
+}
+
+
+class SchemaProvisioningError(Exception):
+    pass
+
+
+class SchemaObject(NamedTuple):
+    kind: str
+    keyspace: Optional[str] = None
+    name: Optional[str] = None
+
+
+def _unquote(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    return name[1:-1] if name.startswith('"') else name.lower()
+
+
+def parse_ddl(query: str, default_keyspace: Optional[str] = None) -> SchemaObject:
+    """Return the kind and the name of the object created by the DDL statement.
+
+    Name is None for statements which don't create named objects (`ALTER ...', `CREATE INDEX ON ...' etc.)
+    """
+    match = CREATE_STATEMENT_RE.match(query)
+    if not match:
+        return SchemaObject(kind="other")
+    kind = KINDS[" ".join(match.group("kind").upper().split())]
+    name = _unquote(match.group("name"))
+    if kind == "keyspace":
+        return SchemaObject(kind=kind, name=name)
+    if kind == "index":
+        match = INDEX_KEYSPACE_RE.search(query)
+    keyspace = _unquote(match.group("keyspace")) if match and match.group("keyspace") else default_keyspace
+    return SchemaObject(kind=kind, keyspace=keyspace, name=name if keyspace else None)
+
+
+@dataclass
+class ProvisioningStats:
+    created: int = 0
+    skipped: int = 0
+    retried: int = 0
+    waves: int = 0
+    duration: float = 0
+    failed: List[Tuple[str, Exception]] = field(default_factory=list)
+
+    @property
+    def per_minute(self) -> float:
+        return self.created * 60 / self.duration if self.duration else 0
+
+
+class SchemaProvisioner:  # pylint: disable=too-few-public-methods
+    """Execute a lot of DDL statements using one session.
+
+    Usage:
+        >>> with cluster.cql_connection_patient(node, pooled=False) as session:
+        ...     stats = SchemaProvisioner(session, concurrency=16).provision(statements)
+
+    The session should belong to a dedicated (not pooled) cluster object, because the schema agreement wait of
+    the driver is disabled for it while statements are executed.
+    """
+
+    def __init__(self, session, concurrency: int = 16, wave_size: int = 100,  # pylint: disable=too-many-arguments
+                 retries: int = 3, agreement_timeout: float = 120):
+        self.session = session
+        self.concurrency = concurrency
+        self.wave_size = wave_size
+        self.retries = retries
+        self.agreement_timeout = agreement_timeout
+
+    def get_existing_objects(self) -> Set[SchemaObject]:
+        existing = set()
+        for kind, query in SYSTEM_SCHEMA_QUERIES.items():
+            for row in self.session.execute(query):
+                if kind == "keyspace":
+                    existing.add(SchemaObject(kind=kind, name=row[0]))
+                else:
+                    existing.add(SchemaObject(kind=kind, keyspace=row[0], name=row[1]))
+        return existing
+
+    def provision(self, statements: Iterable[str]) -> ProvisioningStats:
+        stats = ProvisioningStats()
+        start_time = time.perf_counter()
+        existing = self.get_existing_objects()
+        stages = defaultdict(list)
+        for query in statements:
+            schema_object = parse_ddl(query, default_keyspace=self.session.keyspace)
+            if schema_object.name and schema_object in existing:
+                stats.skipped += 1
+                continue
+            stages[schema_object.kind].append(query)
+        LOGGER.debug("Provisioning schema: %s statements to execute, %s objects already exist",
+                     sum(len(queries) for queries in stages.values()), stats.skipped)
+
+        with self._without_agreement_wait(), ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for stage in STAGES:
+                queries = stages.get(stage, [])
+                for idx in range(0, len(queries), self.wave_size):
+                    failed = self._run_wave(executor, queries[idx:idx + self.wave_size], stats)
+                    for query in failed:
+                        self._retry(query, stats)
+        stats.duration = time.perf_counter() - start_time
+        LOGGER.info("Schema provisioned: %s created, %s skipped, %s retried, %s failed in %s waves, %.1f per minute",
+                    stats.created, stats.skipped, stats.retried, len(stats.failed), stats.waves, stats.per_minute)
+        if stats.failed:
+            query, exc = stats.failed[0]
+            raise SchemaProvisioningError(f"Failed to execute {len(stats.failed)} statements, first is {query!r}") \
+                from exc
+        return stats
+
+    @contextmanager
+    def _without_agreement_wait(self):
+        cluster = self.session.cluster
+        max_schema_agreement_wait, cluster.max_schema_agreement_wait = cluster.max_schema_agreement_wait, 0
+        try:
+            yield
+        finally:
+            cluster.max_schema_agreement_wait = max_schema_agreement_wait
+
+    def _wait_for_schema_agreement(self) -> None:
+        if not self.session.cluster.control_connection.wait_for_schema_agreement(wait_time=self.agreement_timeout):
+            LOGGER.warning("Schema agreement was not reached in %ss", self.agreement_timeout)
+
+    @staticmethod
+    def _is_ignored_error(query: str, exc: Exception) -> bool:
+        # `CREATE INDEX' of an existing index and alike raise InvalidRequest instead of AlreadyExists.
+        return isinstance(exc, AlreadyExists) or \
+            isinstance(exc, InvalidRequest) and parse_ddl(query).kind not in ("keyspace", "type", "table", )
+
+    def _run_wave(self, executor: ThreadPoolExecutor, queries: List[str], stats: ProvisioningStats) -> List[str]:
+        futures = [(query, executor.submit(self.session.execute, query)) for query in queries]
+        failed = []
+        for query, future in futures:
+            exc = future.exception()
+            if exc is None:
+                stats.created += 1
+            elif self._is_ignored_error(query, exc):
+                LOGGER.debug("Skip %r: %s", query, exc)
+                stats.skipped += 1
+            else:
+                LOGGER.debug("Failed to execute %r, will retry: %s", query, exc)
+                failed.append(query)
+        self._wait_for_schema_agreement()
+        stats.waves += 1
+        return failed
+
+    def _retry(self, query: str, stats: ProvisioningStats) -> None:
+        for attempt in range(1, self.retries + 1):
+            stats.retried += 1
+            try:
+                self.session.execute(query)
+            except Exception as exc:  # pylint: disable=broad-except
+                if self._is_ignored_error(query, exc):
+                    stats.skipped += 1
+                    break
+                LOGGER.warning("Attempt #%s to execute %r failed: %s", attempt, query, exc)
+                if attempt == self.retries:
+                    stats.failed.append((query, exc))
+            else:
+                stats.created += 1
+                break
+            finally:
+                self._wait_for_schema_agreement()
@@ -1,15 +1,28 @@
-import random
 import re
+import time
+import shlex
+import random
 from collections import namedtuple
-from typing import Any, List, Iterable
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Iterable
 
 from sdcm.keystore import KeyStore
-from sdcm.utils.common import remote_get_file, LOGGER
+from sdcm.utils.common import LOGGER
 from sdcm.utils.decorators import timeout as timeout_decor
 from sdcm.utils.sstable.load_inventory import (TestDataInventory, BIG_SSTABLE_COLUMN_1_DATA, COLUMN_1_DATA,
                                                MULTI_NODE_DATA, BIG_SSTABLE_MULTI_COLUMNS_DATA, MULTI_COLUMNS_DATA)
 
 
+@dataclass
+class SstableLoadTiming:
+    node: str
+    sstable_file: str
+    transfer: float = 0  # download and extraction of the tarball into the upload dir
+    wait: float = 0  # time the pipeline waited for the transfer after the previous load finished
+    load: float = 0  # refresh or load-and-stream including its validation
+
+
 class SstableLoadUtils:
     LOAD_AND_STREAM_RUN_EXPR = r'storage_service - load_and_stream:'
     LOAD_AND_STREAM_DONE_EXPR = r'storage_service - Done loading new SSTables for keyspace={}, table={}, ' \
@@ -48,26 +61,71 @@ class SstableLoadUtils:
         return map_files_to_node
 
     @staticmethod
-    def upload_sstables(node, test_data: TestDataInventory, keyspace_name: str = 'keyspace1'):
-        key_store = KeyStore()
-        creds = key_store.get_scylladb_upload_credentials()
-        # Download the sstable files from S3
-        remote_get_file(node.remoter, test_data.sstable_url, test_data.sstable_file,
-                        hash_expected=test_data.sstable_md5, retries=2,
-                        user_agent=creds['user_agent'])
+    def get_upload_dir(node, keyspace_name: str = 'keyspace1') -> str:
         result = node.remoter.sudo(f"ls -t /var/lib/scylla/data/{keyspace_name}/")
-        upload_dir = result.stdout.split()[0]
-        if node.is_docker():
-            node.remoter.run(f'tar xvfz {test_data.sstable_file} -C /'
-                             f'var/lib/scylla/data/{keyspace_name}/{upload_dir}/upload/')
-        else:
-            node.remoter.sudo(
-                f'tar xvfz {test_data.sstable_file} -C /var/lib/scylla/data/{keyspace_name}/{upload_dir}/upload/',
-                user='scylla')
-
-        # Scylla Enterprise 2019.1 doesn't support to load schema.cql and manifest.json, let's remove them
-        node.remoter.sudo(f'rm -f /var/lib/scylla/data/{keyspace_name}/{upload_dir}/upload/schema.cql')
-        node.remoter.sudo(f'rm -f /var/lib/scylla/data/{keyspace_name}/{upload_dir}/upload/manifest.json')
+        return f"/var/lib/scylla/data/{keyspace_name}/{result.stdout.split()[0]}/upload"
+
+    @staticmethod
+    def stream_sstables(node, test_data: TestDataInventory, keyspace_name: str = 'keyspace1', retries: int = 2):
+        """
+        Download the sstables tarball from S3 and extract it into the upload dir on the fly.
+
+        The tarball is never written to the node's disk and there is no separate extraction step.  Integrity of the
+        data is checked by gzip (CRC32 of the whole stream) instead of md5 of the tarball.
+        """
+        user_agent = KeyStore().get_scylladb_upload_credentials()['user_agent']
+        upload_dir = SstableLoadUtils.get_upload_dir(node, keyspace_name)
+        tar_cmd = "tar" if node.is_docker() else "sudo -u scylla tar"
+        # Scylla Enterprise 2019.1 doesn't support to load schema.cql and manifest.json, so don't extract them
+        cmd = f"curl -sSfL --user-agent {user_agent} {test_data.sstable_url} | " \
+              f"{tar_cmd} xzf - -C {upload_dir}/ --exclude=schema.cql --exclude=manifest.json"
+        for attempt in range(retries + 1):
+            result = node.remoter.run(f"bash -o pipefail -c {shlex.quote(cmd)}", ignore_status=attempt < retries)
+            if result.ok:
+                break
+            LOGGER.warning("Attempt #%s to stream %s to %s failed: %s",
+                           attempt + 1, test_data.sstable_url, node.name, result.stderr)
+
+    @classmethod
+    def upload_and_load_sstables(cls, map_files_to_node: List, load: Callable[[Any, TestDataInventory], None],
+                                 keyspace_name: str = 'keyspace1') -> List[SstableLoadTiming]:
+        """
+        Upload sstables to nodes and load them by `load' (refresh, load-and-stream) in the order of `map_files_to_node'.
+
+        Transfers to all nodes run in parallel, so loading on one node overlaps with transfers to the next ones.
+        Transfers to the same node are serialized with loads: the next tarball is streamed into the upload dir of the
+        node only after the previous one was loaded from it.
+        """
+        timings = [SstableLoadTiming(node=node.name, sstable_file=data.sstable_file) for data, node in map_files_to_node]
+        next_on_node: Dict[int, int] = {}
+        first_on_node: Dict[str, int] = {}
+        for idx, (_, node) in reversed(list(enumerate(map_files_to_node))):
+            if node.name in first_on_node:
+                next_on_node[idx] = first_on_node[node.name]
+            first_on_node[node.name] = idx
+
+        def _transfer(idx):
+            data, node = map_files_to_node[idx]
+            start_time = time.perf_counter()
+            cls.stream_sstables(node, data, keyspace_name=keyspace_name)
+            timings[idx].transfer = time.perf_counter() - start_time
+
+        with ThreadPoolExecutor(max_workers=max(len(first_on_node), 1)) as executor:
+            transfers = {idx: executor.submit(_transfer, idx) for idx in first_on_node.values()}
+            for idx, (data, node) in enumerate(map_files_to_node):
+                start_time = time.perf_counter()
+                transfers[idx].result()
+                timings[idx].wait = time.perf_counter() - start_time
+                start_time = time.perf_counter()
+                load(node, data)
+                timings[idx].load = time.perf_counter() - start_time
+                if idx in next_on_node:
+                    transfers[next_on_node[idx]] = executor.submit(_transfer, next_on_node[idx])
+
+        for timing in timings:
+            LOGGER.info("%s on %s: transfer %.1fs, waited for transfer %.1fs, load %.1fs",
+                        timing.sstable_file, timing.node, timing.transfer, timing.wait, timing.load)
+        return timings
 
     @classmethod
     def run_load_and_stream(cls, node, keyspace_name: str = 'keyspace1', table_name: str = 'standard1'):
@@ -0,0 +1,228 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""
+Full scan of a table by token ranges
+
+The token ring is split by the tokens of the vnodes and every vnode range is split further into a number of
+sub-ranges (the number of shards by default), so every shard of the owner gets its part of the work.  Sub-ranges are
+scanned concurrently, each one by its own paged `SELECT ... WHERE token(pk) > ? AND token(pk) <= ?' sent to one of
+the replicas of the range, i.e., the work is spread over all nodes of the cluster as coordinators, as analytics jobs do.
+"""
+
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from cassandra import ConsistencyLevel
+from cassandra.metadata import Murmur3Token, protect_name
+
+LOGGER = logging.getLogger(__name__)
+
+MIN_TOKEN = -2 ** 63
+MAX_TOKEN = 2 ** 63 - 1
+DEFAULT_PAGE_SIZE = 5000
+FIXED_SIZE_VALUE_BYTES = 8  # rough size of the non-blob values for the bytes estimate
+
+
+class TokenRange(NamedTuple):
+    start: int  # exclusive
+    end: int  # inclusive
+
+
+def split_token_ring(ring_tokens: Iterable[int], splits: int = 1) -> List[TokenRange]:
+    """Split the whole token ring into ranges between `ring_tokens' and every such range into `splits' parts."""
+    tokens = sorted(set(ring_tokens))
+    boundaries = [MIN_TOKEN] + [token for token in tokens if MIN_TOKEN < token < MAX_TOKEN] + [MAX_TOKEN]
+    ranges = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        step = max((end - start) // splits, 1)
+        points = list(range(start, end, step))[:splits] + [end]
+        ranges.extend(TokenRange(*pair) for pair in zip(points, points[1:]))
+    return ranges
+
+
+def estimate_row_size(row) -> int:
+    return sum(len(value) if isinstance(value, (str, bytes, bytearray)) else FIXED_SIZE_VALUE_BYTES
+               for value in row if value is not None)
+
+
+@dataclass
+class RangeScanResult:
+    token_range: TokenRange
+    rows: int = 0
+    bytes: int = 0
+    duration: float = 0
+    host: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+@dataclass
+class ScanStats:  # pylint: disable=too-many-instance-attributes
+    ks_cf: str
+    rows: int = 0
+    bytes: int = 0
+    duration: float = 0
+    ranges: int = 0
+    terminated: bool = False
+    latencies: List[float] = field(default_factory=list)
+    failed: List[RangeScanResult] = field(default_factory=list)
+    count_mismatches: List[Tuple[TokenRange, int, int]] = field(default_factory=list)
+
+    def add(self, result: RangeScanResult) -> None:
+        self.ranges += 1
+        if result.error:
+            self.failed.append(result)
+            return
+        self.rows += result.rows
+        self.bytes += result.bytes
+        self.latencies.append(result.duration)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.duration if self.duration else 0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.duration if self.duration else 0
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self.latencies:
+            return 0
+        latencies = sorted(self.latencies)
+        return latencies[min(int(len(latencies) * percentile / 100), len(latencies) - 1)]
+
+    def latency_histogram(self) -> Dict[str, int]:
+        """Number of ranges per power-of-two latency bucket (in milliseconds)."""
+        buckets = Counter(2 ** max(math.ceil(math.log2(latency * 1000)), 0) if latency > 0 else 1
+                          for latency in self.latencies)
+        return {f"<={bucket}ms": buckets[bucket] for bucket in sorted(buckets)}
+
+    def summary(self) -> str:
+        summary = f"scanned {self.rows} rows (~{self.bytes} bytes) of {self.ks_cf} in {self.ranges} ranges " \
+                  f"for {self.duration:.1f}s: {self.rows_per_second:.0f} rows/s, {self.bytes_per_second:.0f} bytes/s, " \
+                  f"range latency p50={self.latency_percentile(50):.3f}s p99={self.latency_percentile(99):.3f}s " \
+                  f"max={self.latency_percentile(100):.3f}s"
+        if self.failed:
+            summary += f", {len(self.failed)} ranges failed"
+        if self.count_mismatches:
+            summary += f", row counts of {len(self.count_mismatches)} ranges differ from the previous pass"
+        return summary
+
+
+class TokenRangeScanner:
+    """Scan tables by token ranges concurrently.
+
+    Usage:
+        >>> scanner = TokenRangeScanner(parallelism=16, page_size=5000)
+        >>> stats = scanner.scan(session, "keyspace1.standard1", splits=node.scylla_shards)
+        >>> LOGGER.info(stats.summary())
+
+    If `verify_counts' is set, the row count of every range is compared with the count of the same range on
+    the previous scan of the same table (useful for tables which don't change during the test.)
+    """
+
+    def __init__(self, parallelism: int = 8, page_size: int = DEFAULT_PAGE_SIZE,  # pylint: disable=too-many-arguments
+                 consistency_level: ConsistencyLevel = ConsistencyLevel.ONE, bypass_cache: bool = False,
+                 verify_counts: bool = False):
+        self.parallelism = parallelism
+        self.page_size = page_size
+        self.consistency_level = consistency_level
+        self.bypass_cache = bypass_cache
+        self.verify_counts = verify_counts
+        self._previous_counts: Dict[str, Dict[TokenRange, int]] = {}
+
+    @staticmethod
+    def get_ranges(session, keyspace: str, splits: int = 1) -> List[Tuple[TokenRange, list]]:
+        """Return token ranges with replicas of each one."""
+        token_map = session.cluster.metadata.token_map
+        if token_map is None:
+            return [(token_range, []) for token_range in split_token_ring((), splits=splits)]
+        ranges = split_token_ring((token.value for token in token_map.ring), splits=splits)
+        return [(token_range, [host for host in token_map.get_replicas(keyspace, Murmur3Token(token_range.end))
+                               if host.is_up])
+                for token_range in ranges]
+
+    def build_query(self, session, keyspace: str, table: str) -> str:
+        table_metadata = session.cluster.metadata.keyspaces[keyspace].tables[table]
+        partition_key = ", ".join(protect_name(column.name) for column in table_metadata.partition_key)
+        query = f"SELECT * FROM {protect_name(keyspace)}.{protect_name(table)} " \
+                f"WHERE token({partition_key}) > ? AND token({partition_key}) <= ?"
+        if self.bypass_cache:
+            query += " BYPASS CACHE"
+        return query
+
+    def scan(self, session, ks_cf: str, splits: int = 1,
+             stop_event: Optional[threading.Event] = None) -> ScanStats:
+        keyspace, table = ks_cf.split(".", 1)
+        statement = session.prepare(self.build_query(session, keyspace, table))
+        statement.fetch_size = self.page_size
+        statement.consistency_level = self.consistency_level
+        stop_event = stop_event or threading.Event()
+        ranges = self.get_ranges(session, keyspace, splits=splits)
+        LOGGER.debug("Scan %s by %s token ranges with parallelism of %s", ks_cf, len(ranges), self.parallelism)
+
+        stats = ScanStats(ks_cf=ks_cf)
+        counts = {}
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            futures = [executor.submit(self._scan_range, session, statement, token_range,
+                                       replicas[idx % len(replicas)] if replicas else None, stop_event)
+                       for idx, (token_range, replicas) in enumerate(ranges)]
+            for future in futures:
+                result = future.result()
+                if result is None:
+                    stats.terminated = True
+                    continue
+                stats.add(result)
+                if result.error is None:
+                    counts[result.token_range] = result.rows
+        stats.duration = time.perf_counter() - start_time
+
+        if self.verify_counts and not stats.terminated:
+            previous_counts = self._previous_counts.get(ks_cf, {})
+            stats.count_mismatches = [(token_range, previous_counts[token_range], rows)
+                                      for token_range, rows in counts.items()
+                                      if token_range in previous_counts and previous_counts[token_range] != rows]
+            self._previous_counts[ks_cf] = counts
+        LOGGER.info("%s, latency histogram: %s", stats.summary(), stats.latency_histogram())
+        return stats
+
+    @staticmethod
+    def _scan_range(session, statement, token_range: TokenRange,  # pylint: disable=too-many-arguments
+                    host, stop_event: threading.Event) -> Optional[RangeScanResult]:
+        if stop_event.is_set():
+            return None
+        result = RangeScanResult(token_range=token_range, host=host.address if host else None)
+        start_time = time.perf_counter()
+        try:
+            response = session.execute(statement.bind(token_range), host=host)
+            while True:
+                for row in response.current_rows:
+                    result.rows += 1
+                    result.bytes += estimate_row_size(row)
+                if not response.has_more_pages:
+                    break
+                if stop_event.is_set():
+                    return None
+                response.fetch_next_page()
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.debug("Failed to scan token range %s on %s: %s", token_range, result.host, exc)
+            result.error = exc
+        result.duration = time.perf_counter() - start_time
+        return result
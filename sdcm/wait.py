@@ -13,9 +13,17 @@
 
 """
 Wait functions appropriate for tests that have high timing variance.
+
+Waits can back off exponentially (from `step' up to `max_step' seconds, with a jitter), can be woken up before
+the next attempt by an event (e.g., set when an expected log line is found), and `wait_for_all' waits for a number
+of conditions (e.g., one per node) in one loop.  Time to satisfy of every wait is recorded to `WAIT_STATS'.
 """
 import time
+import random
 import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
 
 import tenacity
 from tenacity.retry import retry_if_result, retry_if_exception_type
@@ -23,8 +31,74 @@ from tenacity import RetryError
 
 LOGGER = logging.getLogger('sdcm.wait')
 
+BACKOFF_FACTOR = 2
+BACKOFF_JITTER = 0.1  # a fraction of the step
+
+
+class WaitStats:
+    """Time to satisfy of waits aggregated by name (a name of the function or the text of the wait.)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"count": 0, "attempts": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+
+    def record(self, name: str, duration: float, attempts: int, satisfied: bool) -> None:
+        with self._lock:
+            stats = self._stats[name]
+            stats["count"] += 1
+            stats["attempts"] += attempts
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            stats["timeouts"] += not satisfied
+
+    def get(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def summary(self, top: int = 20) -> str:
+        items = sorted(self.get().items(), key=lambda item: item[1]["total"], reverse=True)[:top]
+        return "\n".join(f"{stats['total']:10.1f}s total, {stats['max']:8.1f}s max, {stats['count']:5} waits, "
+                         f"{stats['attempts']:6} attempts, {stats['timeouts']:3} timeouts: {name}"
+                         for name, stats in items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+WAIT_STATS = WaitStats()
+
+
+def _wait_name(func: Callable, text: Optional[str]) -> str:
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", None)
+    if not name or "<lambda>" in name:
+        return text or repr(func)
+    return name
+
+
+def backoff_steps(step: float, max_step: Optional[float] = None,
+                  factor: float = BACKOFF_FACTOR, jitter: float = BACKOFF_JITTER) -> Iterator[float]:
+    """Generate delays between attempts: from `step' up to `max_step' exponentially, with a random jitter."""
+    delay = step
+    while True:
+        yield delay * (1 + random.uniform(-jitter, jitter)) if jitter else delay
+        if max_step is not None:
+            delay = min(delay * factor, max_step)
 
-def wait_for(func, step=1, text=None, timeout=None, throw_exc=True, **kwargs):
+
+def _make_sleep(wake_event: Optional[threading.Event]) -> Callable[[float], None]:
+    if wake_event is None:
+        return time.sleep
+
+    def sleep(seconds: float) -> None:
+        if wake_event.wait(timeout=seconds):
+            LOGGER.debug("wait_for: woken up by an event")
+            wake_event.clear()
+    return sleep
+
+
+def wait_for(func, step=1, text=None, timeout=None, throw_exc=True,  # pylint: disable=too-many-arguments
+             max_step=None, wake_event=None, **kwargs):
     """
     Wrapper function to wait with timeout option.
 
@@ -33,6 +107,8 @@ def wait_for(func, step=1, text=None, timeout=None, throw_exc=True, **kwargs):
     :param text: Text to print while waiting, for debug purposes
     :param timeout: Timeout in seconds
     :param throw_exc: Raise exception if timeout expired, but func result is not True
+    :param max_step: If set, time between attempts grows exponentially from `step' up to `max_step' seconds
+    :param wake_event: `threading.Event' which starts the next attempt immediately when set
     :param kwargs: Keyword arguments to func
     :return: Return value of func.
     """
@@ -40,6 +116,7 @@ def wait_for(func, step=1, text=None, timeout=None, throw_exc=True, **kwargs):
         return forever_wait_for(func, step, text, **kwargs)
 
     res = None
+    start_time = time.perf_counter()
 
     def retry_logger(retry_state):
         # pylint: disable=protected-access
@@ -50,17 +127,27 @@ def wait_for(func, step=1, text=None, timeout=None, throw_exc=True, **kwargs):
             str(retry_state.outcome._exception) if retry_state.outcome._exception else retry_state.outcome._result
         )
 
+    if max_step is None:
+        wait_strategy = tenacity.wait_fixed(step)
+    else:
+        wait_strategy = tenacity.wait_exponential(multiplier=step, min=step, max=max_step,
+                                                  exp_base=BACKOFF_FACTOR) + tenacity.wait_random(0, step * BACKOFF_JITTER)
+    retry = tenacity.Retrying(
+        reraise=throw_exc,
+        stop=tenacity.stop_after_delay(timeout),
+        wait=wait_strategy,
+        sleep=_make_sleep(wake_event),
+        before_sleep=retry_logger,
+        retry=(retry_if_result(lambda value: not value) | retry_if_exception_type())
+    )
     try:
-        retry = tenacity.Retrying(
-            reraise=throw_exc,
-            stop=tenacity.stop_after_delay(timeout),
-            wait=tenacity.wait_fixed(step),
-            before_sleep=retry_logger,
-            retry=(retry_if_result(lambda value: not value) | retry_if_exception_type())
-        )
         res = retry.call(func, **kwargs)
+        WAIT_STATS.record(_wait_name(func, text), duration=time.perf_counter() - start_time,
+                          attempts=retry.statistics.get("attempt_number", 1), satisfied=True)
 
     except Exception as ex:  # pylint: disable=broad-except
+        WAIT_STATS.record(_wait_name(func, text), duration=time.perf_counter() - start_time,
+                          attempts=retry.statistics.get("attempt_number", 1), satisfied=False)
         err = 'Wait for: {}: timeout - {} seconds - expired'.format(text if text else func.__name__, timeout)
         LOGGER.error(err)
         if hasattr(ex, 'last_attempt') and ex.last_attempt.exception() is not None:  # pylint: disable=no-member
@@ -97,3 +184,63 @@ def forever_wait_for(func, step=1, text=None, **kwargs):
         if text is not None:
             LOGGER.debug('%s (%s s)', text, time_elapsed)
     return ok
+
+
+def wait_for_all(conditions: Dict[Hashable, Callable[[], Any]],  # pylint: disable=too-many-arguments,too-many-locals
+                 step: float = 1, text: Optional[str] = None, timeout: Optional[float] = None, throw_exc: bool = True,
+                 max_step: Optional[float] = None, wake_event: Optional[threading.Event] = None) -> Dict[Hashable, Any]:
+    """
+    Wait until all conditions evaluate to True in one loop (instead of a thread per condition.)
+
+    Every round evaluates the conditions which are not satisfied yet, an exception counts as not satisfied.
+
+    :param conditions: Functions to evaluate by keys, e.g., by nodes
+    :param step: Time to sleep between rounds in seconds
+    :param text: Text to print while waiting, for debug purposes
+    :param timeout: Timeout in seconds (None is forever)
+    :param throw_exc: Raise exception if timeout expired, but some of the conditions are not satisfied
+    :param max_step: If set, time between rounds grows exponentially from `step' up to `max_step' seconds
+    :param wake_event: `threading.Event' which starts the next round immediately when set
+    :return: Return values of the satisfied conditions by keys.
+    """
+    text = text or "wait_for_all"
+    sleep = _make_sleep(wake_event)
+    pending = dict(conditions)
+    results, last_errors, attempts = {}, {}, defaultdict(int)
+    start_time = time.perf_counter()
+    deadline = None if timeout is None else start_time + timeout
+    for delay in backoff_steps(step, max_step):
+        for key, func in list(pending.items()):
+            attempts[key] += 1
+            try:
+                result = func()
+            except Exception as exc:  # pylint: disable=broad-except
+                last_errors[key] = exc
+                continue
+            if result:
+                results[key] = result
+                del pending[key]
+                WAIT_STATS.record(f"{text}: {_wait_name(func, None)}", duration=time.perf_counter() - start_time,
+                                  attempts=attempts[key], satisfied=True)
+        if not pending:
+            LOGGER.debug("%s: all %s conditions are satisfied in %.1fs", text, len(conditions),
+                         time.perf_counter() - start_time)
+            return results
+        now = time.perf_counter()
+        if deadline is not None and now >= deadline:
+            break
+        LOGGER.debug("%s: %s of %s conditions are not satisfied yet: %s", text, len(pending), len(conditions),
+                     list(pending))
+        sleep(delay if deadline is None else min(delay, deadline - now))
+
+    for key, func in pending.items():
+        WAIT_STATS.record(f"{text}: {_wait_name(func, None)}", duration=time.perf_counter() - start_time,
+                          attempts=attempts[key], satisfied=False)
+    err = f"Wait for: {text}: timeout - {timeout} seconds - expired, not satisfied: {list(pending)}"
+    LOGGER.error(err)
+    for key in pending:
+        if key in last_errors:
+            LOGGER.error("last error of %s: %r", key, last_errors[key])
+    if throw_exc:
+        raise RetryError(err)
+    return results
@@ -17,6 +17,7 @@ import time
 import uuid
 import tempfile
 import logging
+from contextlib import ExitStack
 from textwrap import dedent
 
 from sdcm.prometheus import nemesis_metrics_obj
@@ -24,7 +25,7 @@ from sdcm.sct_events.loaders import YcsbStressEvent
 from sdcm.remote import FailuresWatcher
 from sdcm.utils import alternator
 from sdcm.utils.common import FileFollowerThread
-from sdcm.utils.docker_remote import RemoteDocker
+from sdcm.utils.docker_remote import get_docker_pool
 from sdcm.utils.common import generate_random_string
 from sdcm.stress_thread import format_stress_cmd_error, DockerBasedStressThread
 
@@ -114,7 +115,19 @@ class YcsbStatsPublisher(FileFollowerThread):
 
 class YcsbStressThread(DockerBasedStressThread):  # pylint: disable=too-many-instance-attributes
 
-    def copy_template(self, docker):
+    DOCKER_IMAGE = "scylladb/hydra-loaders:ycsb-jdk8-20200326"
+    DNS_DOCKER_IMAGE = "scylladb/hydra-loaders:alternator-dns-0.2"
+
+    def docker_images(self):
+        if self.params.get('alternator_use_dns_routing'):
+            return [self.DOCKER_IMAGE, self.DNS_DOCKER_IMAGE]
+        return [self.DOCKER_IMAGE]
+
+    def build_templates(self):
+        """Return content of config files by their path in the container."""
+        if 'dynamodb' not in self.stress_cmd:
+            return {}
+
         if self.params.get('alternator_use_dns_routing'):
             target_address = 'alternator'
         else:
@@ -123,47 +136,47 @@ class YcsbStressThread(DockerBasedStressThread):  # pylint: disable=too-many-ins
             else:
                 target_address = self.node_list[0].ip_address
 
-        if 'dynamodb' in self.stress_cmd:
-            dynamodb_teample = dedent('''
-                measurementtype=hdrhistogram
-                dynamodb.awsCredentialsFile = /tmp/aws_empty_file
-                dynamodb.endpoint = http://{0}:{1}
-                dynamodb.connectMax = 200
-                requestdistribution = uniform
-                dynamodb.consistentReads = true
-            '''.format(target_address,
-                       self.params.get('alternator_port')))
-
-            dynamodb_primarykey_type = self.params.get('dynamodb_primarykey_type')
-            if isinstance(dynamodb_primarykey_type, alternator.enums.YCSBSchemaTypes):
-                dynamodb_primarykey_type = dynamodb_primarykey_type.value
-
-            if dynamodb_primarykey_type == alternator.enums.YCSBSchemaTypes.HASH_AND_RANGE.value:
-                dynamodb_teample += dedent(f'''
-                    dynamodb.primaryKey = {alternator.consts.HASH_KEY_NAME}
-                    dynamodb.hashKeyName = {alternator.consts.RANGE_KEY_NAME}
-                    dynamodb.primaryKeyType = {alternator.enums.YCSBSchemaTypes.HASH_AND_RANGE.value}
-                ''')
-            elif dynamodb_primarykey_type == alternator.enums.YCSBSchemaTypes.HASH_SCHEMA.value:
-                dynamodb_teample += dedent(f'''
-                    dynamodb.primaryKey = {alternator.consts.HASH_KEY_NAME}
-                    dynamodb.primaryKeyType = {alternator.enums.YCSBSchemaTypes.HASH_SCHEMA.value}
-                ''')
-
-            aws_empty_file = dedent(f""""
-                accessKey = {self.params.get('alternator_access_key_id')}
-                secretKey = {self.params.get('alternator_secret_access_key')}
-            """)
-
-            with tempfile.NamedTemporaryFile(mode='w+', encoding='utf-8') as tmp_file:
-                tmp_file.write(dynamodb_teample)
-                tmp_file.flush()
-                docker.send_files(tmp_file.name, os.path.join('/tmp', 'dynamodb.properties'))
+        dynamodb_teample = dedent('''
+            measurementtype=hdrhistogram
+            dynamodb.awsCredentialsFile = /tmp/aws_empty_file
+            dynamodb.endpoint = http://{0}:{1}
+            dynamodb.connectMax = 200
+            requestdistribution = uniform
+            dynamodb.consistentReads = true
+        '''.format(target_address,
+                   self.params.get('alternator_port')))
+
+        dynamodb_primarykey_type = self.params.get('dynamodb_primarykey_type')
+        if isinstance(dynamodb_primarykey_type, alternator.enums.YCSBSchemaTypes):
+            dynamodb_primarykey_type = dynamodb_primarykey_type.value
+
+        if dynamodb_primarykey_type == alternator.enums.YCSBSchemaTypes.HASH_AND_RANGE.value:
+            dynamodb_teample += dedent(f'''
+                dynamodb.primaryKey = {alternator.consts.HASH_KEY_NAME}
+                dynamodb.hashKeyName = {alternator.consts.RANGE_KEY_NAME}
+                dynamodb.primaryKeyType = {alternator.enums.YCSBSchemaTypes.HASH_AND_RANGE.value}
+            ''')
+        elif dynamodb_primarykey_type == alternator.enums.YCSBSchemaTypes.HASH_SCHEMA.value:
+            dynamodb_teample += dedent(f'''
+                dynamodb.primaryKey = {alternator.consts.HASH_KEY_NAME}
+                dynamodb.primaryKeyType = {alternator.enums.YCSBSchemaTypes.HASH_SCHEMA.value}
+            ''')
+
+        aws_empty_file = dedent(f""""
+            accessKey = {self.params.get('alternator_access_key_id')}
+            secretKey = {self.params.get('alternator_secret_access_key')}
+        """)
+
+        return {os.path.join('/tmp', 'dynamodb.properties'): dynamodb_teample,
+                os.path.join('/tmp', 'aws_empty_file'): aws_empty_file}
 
+    @staticmethod
+    def copy_templates(docker, templates):
+        for path, content in templates.items():
             with tempfile.NamedTemporaryFile(mode='w+', encoding='utf-8') as tmp_file:
-                tmp_file.write(aws_empty_file)
+                tmp_file.write(content)
                 tmp_file.flush()
-                docker.send_files(tmp_file.name, os.path.join('/tmp', 'aws_empty_file'))
+                docker.send_files(tmp_file.name, path)
 
     def build_stress_cmd(self):
         stress_cmd = f'{self.stress_cmd} -s '
@@ -212,21 +225,31 @@ class YcsbStressThread(DockerBasedStressThread):  # pylint: disable=too-many-ins
         return output
 
     def _run_stress(self, loader, loader_idx, cpu_idx):
-        dns_options = ""
-        cpu_options = ""
-        if self.params.get('alternator_use_dns_routing'):
-            dns = RemoteDocker(loader, "scylladb/hydra-loaders:alternator-dns-0.2",
-                               command_line=f'python3 /dns_server.py {self.db_node_to_query(loader)} '
-                                            f'{self.params.get("alternator_port")}',
-                               extra_docker_opts=f'--label shell_marker={self.shell_marker}')
-            dns_options += f'--dns {dns.internal_ip_address} --dns-option use-vc'
-
-        if self.stress_num > 1:
-            cpu_options = '--cpuset-cpus="{cpu_idx}"'
-
-        docker = RemoteDocker(loader, "scylladb/hydra-loaders:ycsb-jdk8-20200326",
-                              extra_docker_opts=f'{dns_options} {cpu_options} --label shell_marker={self.shell_marker}')
-        self.copy_template(docker)
+        pool = get_docker_pool(loader)
+        with ExitStack() as stack:
+            dns_options = ""
+            cpu_options = ""
+            if self.params.get('alternator_use_dns_routing'):
+                dns = stack.enter_context(pool.container(
+                    self.DNS_DOCKER_IMAGE,
+                    command_line=f'python3 /dns_server.py {self.db_node_to_query(loader)} '
+                                 f'{self.params.get("alternator_port")}',
+                    owner=self.shell_marker))
+                dns_options += f'--dns {dns.internal_ip_address} --dns-option use-vc'
+
+            if self.stress_num > 1:
+                cpu_options = f'--cpuset-cpus="{cpu_idx}"'
+
+            templates = self.build_templates()
+            docker = stack.enter_context(pool.container(
+                self.DOCKER_IMAGE,
+                extra_docker_opts=f'{dns_options} {cpu_options}',
+                owner=self.shell_marker,
+                setup=lambda container: self.copy_templates(container, templates),
+                setup_key=sorted(templates.items())))
+            return self._run_stress_in_container(docker, loader, loader_idx, cpu_idx)
+
+    def _run_stress_in_container(self, docker, loader, loader_idx, cpu_idx):
         stress_cmd = self.build_stress_cmd()
 
         if not os.path.exists(loader.logdir):
@@ -58,7 +58,7 @@ class SlaPerUserTest(LongevityTest):
     def prepare_schema(self):
         self.prometheus_stats = PrometheusDBStats(host=self.monitors.nodes[0].public_ip_address)
         self.connection_cql = self.db_cluster.cql_connection_patient(
-            node=self.db_cluster.nodes[0], user=self.DEFAULT_USER, password=self.DEFAULT_USER_PASSWORD)
+            node=self.db_cluster.nodes[0], user=self.DEFAULT_USER, password=self.DEFAULT_USER_PASSWORD, pooled=False)
         session = self.connection_cql.session
         return session
 
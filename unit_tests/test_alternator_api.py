@@ -0,0 +1,70 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sdcm.utils.alternator.api import Alternator, format_items, item_digest
+
+
+class FakeTable:  # pylint: disable=too-few-public-methods
+    page_size = 7
+
+    def __init__(self, items):
+        self.items = items
+        self.scans = 0
+
+    def scan(self, Segment=0, TotalSegments=1, ExclusiveStartKey=0):  # pylint: disable=invalid-name
+        self.scans += 1
+        items = self.items[Segment::TotalSegments]
+        response = {"Items": items[ExclusiveStartKey:ExclusiveStartKey + self.page_size]}
+        if ExclusiveStartKey + self.page_size < len(items):
+            response["LastEvaluatedKey"] = ExclusiveStartKey + self.page_size
+        return response
+
+
+class FakeAlternator(Alternator):
+    def __init__(self, items):
+        super().__init__(sct_params={})
+        self.table = FakeTable(items)
+
+    def get_dynamodb_api(self, node):
+        return SimpleNamespace(resource=SimpleNamespace(Table=lambda name: self.table))
+
+
+class TestAlternatorApi(unittest.TestCase):
+    items = [{"p": f"key{idx}", "c": idx, "v": {"a": [1, 2]}} for idx in range(100)]
+
+    def test_scan(self):
+        alternator = FakeAlternator(self.items)
+        self.assertEqual(alternator.scan_table(node=None), self.items)
+        self.assertEqual(alternator.table.scans, 15)
+        self.assertCountEqual(alternator.scan_table(node=None, threads_num=3), self.items)
+
+    def test_item_digest(self):
+        self.assertEqual(item_digest({"p": "key", "c": 1, "s": {"b", "a"}}),
+                         item_digest({"s": {"a", "b"}, "c": Decimal("1.0"), "p": "key"}))
+        self.assertNotEqual(item_digest({"p": "key", "c": 1}), item_digest({"p": "key", "c": "1"}))
+
+    def test_compare_table_data(self):
+        alternator = FakeAlternator([dict(item, c=Decimal(item["c"])) for item in self.items[:95]])
+        self.assertEqual(alternator.compare_table_data(node=None, table_data=self.items[:90], buckets_num=16), set())
+        self.assertEqual(alternator.compare_table_data(node=None, table_data=lambda: iter(self.items), threads_num=2),
+                         {str(item) for item in self.items[95:]})
+
+    def test_format_items(self):
+        self.assertEqual(format_items(self.items[:3]).count("key"), 3)
+        formatted = format_items(self.items, limit=10)
+        self.assertEqual(formatted.count("key"), 10)
+        self.assertTrue(formatted.endswith("... and 90 more items"))
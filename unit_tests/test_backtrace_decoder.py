@@ -0,0 +1,81 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from sdcm.utils.backtrace_decoder import BacktraceDecoder, SymbolCache, split_addr2line_output
+
+
+def addr2line(debug_file, addresses):
+    addr2line.calls.append(addresses)
+    return "".join(f"func_{address} at {debug_file}:1\n (inlined by) caller_{address} at {debug_file}:2\n"
+                   for address in addresses.split())
+
+
+class TestBacktraceDecoder(unittest.TestCase):
+    def setUp(self):
+        addr2line.calls = []
+        self.copied = []
+        self.cache_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.decoder = BacktraceDecoder(copy_debug_file=lambda node, debug_file: self.copied.append(debug_file) or
+                                        f"/tmp/{debug_file}", addr2line=addr2line, addresses_per_call=2,
+                                        symbol_cache=SymbolCache(cache_dir=self.cache_dir.name))
+
+    def tearDown(self):
+        self.decoder.shutdown()
+        self.cache_dir.cleanup()
+
+    @staticmethod
+    def items(raw_backtraces, build_id="build1"):
+        return [{"node": None, "debug_file": f"{build_id}.debug", "build_id": build_id,
+                 "event": SimpleNamespace(raw_backtrace=raw, backtrace=None)} for raw in raw_backtraces]
+
+    def test_split_addr2line_output(self):
+        self.assertEqual(split_addr2line_output(["0x1", "0x2"], "f1 at a.cc:1\n (inlined by) g at b.cc:2\nf2 at ??:0\n"),
+                         {"0x1": "f1 at a.cc:1\n (inlined by) g at b.cc:2", "0x2": "f2 at ??:0"})
+        self.assertIsNone(split_addr2line_output(["0x1", "0x2"], "addr2line -Cpife file 0x1 0x2"))
+
+    def test_decode(self):
+        items = self.items(["0x1\n0x2\n0x3", "0x1\n0x2\n0x3", "0x3\n0x4"] * 100)
+        self.decoder.decode(items)
+        self.assertEqual(self.copied, ["build1.debug"])
+        self.assertEqual(sorted(addr2line.calls), ["0x1 0x2", "0x3 0x4"])
+        self.assertEqual(items[2]["event"].backtrace,
+                         "func_0x3 at /tmp/build1.debug:1\n (inlined by) caller_0x3 at /tmp/build1.debug:2\n"
+                         "func_0x4 at /tmp/build1.debug:1\n (inlined by) caller_0x4 at /tmp/build1.debug:2")
+        self.assertEqual(dict(self.decoder.stats), {"backtraces": 300, "unique_backtraces": 2, "resolved_addresses": 4})
+
+        # the cache on disk is shared by the following decoders
+        decoder = BacktraceDecoder(copy_debug_file=lambda node, debug_file: debug_file, addr2line=addr2line,
+                                   symbol_cache=SymbolCache(cache_dir=self.cache_dir.name))
+        decoder.decode(self.items(["0x4\n0x1", "0x5"]))
+        decoder.shutdown()
+        self.assertEqual(addr2line.calls[2:], ["0x5"])
+
+    def test_fallback(self):
+        items = self.items(["0x1\n0x2", "0x3"])
+        decoder = BacktraceDecoder(copy_debug_file=lambda node, debug_file: debug_file,
+                                   addr2line=lambda debug_file, addresses: f"addr2line {addresses}",
+                                   symbol_cache=SymbolCache(cache_dir=self.cache_dir.name))
+        decoder.decode(items)
+        decoder.shutdown()
+        self.assertEqual([item["event"].backtrace for item in items], ["addr2line 0x1 0x2", "addr2line 0x3"])
+
+    def test_unknown_build_id_not_cached(self):
+        self.decoder.decode(self.items(["0x1"], build_id=None))
+        self.decoder.decode(self.items(["0x1"], build_id=None))
+        self.assertEqual(addr2line.calls, ["0x1", "0x1"])
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
@@ -0,0 +1,79 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+from sdcm.utils.capacity_sampler import CapacitySampler
+
+
+class FakePrometheus:  # pylint: disable=too-few-public-methods
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def query(self, query, start, end):  # pylint: disable=unused-argument
+        self.queries.append(query)
+        for metric, results in self.results.items():
+            if metric in query:
+                return results
+        return []
+
+
+class FakeNode:
+    def __init__(self, idx):
+        self.name = f"node{idx}"
+        self.private_ip_address = f"10.0.0.{idx}"
+        self.ssh_calls = 0
+        self.remoter = SimpleNamespace(run=self.run)
+
+    def run(self, cmd, verbose=True):  # pylint: disable=unused-argument
+        self.ssh_calls += 1
+        return SimpleNamespace(stdout="    Used\n1000\n")
+
+    def get_cfstats(self, keyspace):
+        self.ssh_calls += 1
+        return {"Space used (total)": 10 if "." in keyspace else 100}
+
+
+def series(instance, value):
+    return {"metric": {"instance": instance}, "values": [[0, "0"], [1, str(value)]]}
+
+
+class TestCapacitySampler(unittest.TestCase):
+    def setUp(self):
+        self.nodes = [FakeNode(1), FakeNode(11)]
+        self.cluster = SimpleNamespace(nodes=self.nodes)
+
+    def test_used_capacity(self):
+        prometheus = FakePrometheus({"node_filesystem_size{": [series("10.0.0.11:9100", 5)]})
+        sampler = CapacitySampler(cluster=self.cluster, scylla_dir="/var/lib/scylla", prometheus_db=prometheus)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            samples = list(executor.map(lambda _: sampler.used_capacity(), range(10)))
+        self.assertTrue(all(sample == {self.nodes[0]: 1000, self.nodes[1]: 5} for sample in samples))
+        self.assertEqual(len(prometheus.queries), 2)  # the new and the old metric names
+        self.assertEqual([node.ssh_calls for node in self.nodes], [1, 0])
+
+        sampler.ttl = 0
+        sampler.used_capacity()
+        self.assertEqual(len(prometheus.queries), 4)
+
+    def test_space_used(self):
+        prometheus = FakePrometheus({'ks="keyspace1"}': [series("10.0.0.1:9180", 300), series("10.0.0.11:9180", 400)]})
+        sampler = CapacitySampler(cluster=self.cluster, scylla_dir="/var/lib/scylla", prometheus_db=prometheus)
+        self.assertEqual(sampler.space_used(["keyspace1", "keyspace2", "keyspace3.standard1"]),
+                         {self.nodes[0]: 410, self.nodes[1]: 510})
+        self.assertEqual(sampler.space_used(["keyspace1"], nodes=self.nodes[:1]), {self.nodes[0]: 300})
+        self.assertTrue(sampler.wait_for(sample=lambda: sampler.space_used(["keyspace1"]),
+                                         condition=lambda values: values[self.nodes[1]] == 400, text="", timeout=1))
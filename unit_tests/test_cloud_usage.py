@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytz
+
+from sdcm.utils.cloud_monitor.common import InstanceLifecycle
+from sdcm.utils.cloud_monitor.usage import CloudUsage, age_bucket
+
+NOW = datetime(2021, 6, 1, tzinfo=pytz.utc)
+
+
+def instance(cloud, owner, state="running", lifecycle=InstanceLifecycle.ON_DEMAND, days=1, keep=""):  # pylint: disable=too-many-arguments
+    return SimpleNamespace(cloud=cloud, owner=owner, state=state, lifecycle=lifecycle, keep=keep,
+                           region="us-east-1", create_time=NOW - timedelta(days=days),
+                           total_cost=10.0, projected_daily_cost=2.5)
+
+
+class TestCloudUsage(unittest.TestCase):
+    def test_age_bucket(self):
+        self.assertIsNone(age_bucket(timedelta(days=2)))
+        self.assertEqual(age_bucket(timedelta(days=4)), 3)
+        self.assertEqual(age_bucket(timedelta(days=6)), 5)
+        self.assertEqual(age_bucket(timedelta(days=30)), 7)
+
+    def test_aggregates(self):
+        instances = [
+            instance("aws", "alice", days=4),
+            instance("aws", "alice", lifecycle=InstanceLifecycle.SPOT, days=8, keep="alive"),
+            instance("gce", "alice", state="stopped", days=10),
+            instance("gce", "bob", days=6),
+        ]
+        static_ips = [SimpleNamespace(cloud="aws", is_used=True), SimpleNamespace(cloud="aws", is_used=False)]
+        usage = CloudUsage(cloud_instances=SimpleNamespace(all=instances), static_ips=SimpleNamespace(all=static_ips),
+                           now=NOW)
+
+        self.assertEqual(usage.per_cloud["aws"], dict(num_running_instances=2, num_stopped_instances=0,
+                                                      num_unused_static_ips=1, num_used_static_ips=2))
+        self.assertEqual(usage.per_cloud["gce"]["num_stopped_instances"], 1)
+        self.assertEqual(usage.per_region[("aws", "us-east-1")]["projected_daily_cost"], 5.0)
+
+        alice = usage.per_user["alice"]
+        self.assertEqual(alice["aws"], dict(num_running_instances_spot=1, num_running_instances_on_demand=1,
+                                            num_stopped_instances=0))
+        self.assertEqual(alice["gce"]["num_stopped_instances"], 1)
+        self.assertEqual((alice["num_instances_keep_alive"], alice["total_cost"], alice["projected_daily_cost"]),
+                         (1, 20.0, 5.0))
+
+        self.assertEqual(usage.running_by_age[3]["alice"], instances[:1])
+        self.assertEqual(usage.running_by_age[5]["bob"], instances[3:])
+        self.assertEqual(usage.running_by_age[7]["alice"], instances[1:2])
+        self.assertEqual(usage.by_owner["alice"], instances[:3])
@@ -14,7 +14,9 @@
 import os
 import logging
 import itertools
+import tempfile
 import unittest
+import unittest.mock
 
 from sdcm import sct_config
 
@@ -426,6 +428,39 @@ class ConfigurationTests(unittest.TestCase):  # pylint: disable=too-many-public-
 
         self.assertIn("'oracle_scylla_version' and 'ami_id_db_oracle' can't used together", str(context.exception))
 
+    def test_17_load_cached(self):
+        os.environ['SCT_CLUSTER_BACKEND'] = 'docker'
+        os.environ['SCT_SCYLLA_VERSION'] = '3.0.3'
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = sct_config.SCTConfigurationCache(cache_dir=cache_dir)
+            conf = sct_config.SCTConfiguration.load_cached(cache=cache)
+            self.assertFalse(conf.verified)
+            conf.verify_configuration_cached()
+
+            # emulate another process, which have only the on disk cache
+            cache._memory_cache.clear()  # pylint: disable=protected-access
+            for key in list(os.environ):
+                if key.startswith('SCT_'):
+                    del os.environ[key]
+            os.environ['SCT_CONFIG_FILES'] = 'internal_test_data/minimal_test_case.yaml'
+            os.environ['SCT_CLUSTER_BACKEND'] = 'docker'
+            os.environ['SCT_SCYLLA_VERSION'] = '3.0.3'
+
+            cached_conf = sct_config.SCTConfiguration.load_cached(cache=cache)
+            self.assertTrue(cached_conf.verified)
+            self.assertEqual(dict(cached_conf), dict(conf))
+            self.assertEqual(cached_conf.get('docker_image'), 'scylladb/scylla')
+
+    def test_18_cache_ignores_entries_of_other_users(self):  # pylint: disable=invalid-name
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = sct_config.SCTConfigurationCache(cache_dir=cache_dir)
+            cache.store("key", {"cluster_backend": "docker"}, verified=True)
+            cache._memory_cache.clear()  # pylint: disable=protected-access
+            with unittest.mock.patch("os.getuid", return_value=os.getuid() + 1):
+                self.assertIsNone(cache.load("key"))
+            self.assertEqual(cache.load("key")["config"], {"cluster_backend": "docker"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,110 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from types import SimpleNamespace
+
+from cassandra import ConsistencyLevel
+from cassandra.cluster import NoHostAvailable  # pylint: disable=no-name-in-module
+
+from sdcm.utils.cql_session_pool import CQLSessionPool
+
+
+class FakeSession:  # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.keyspace = None
+        self.default_timeout = 10
+        self.default_consistency_level = ConsistencyLevel.LOCAL_QUORUM
+        self.default_serial_consistency_level = None
+        self.default_fetch_size = 5000
+        self.row_factory = tuple
+        self.is_shutdown = False
+
+    def set_keyspace(self, keyspace):
+        self.keyspace = keyspace
+
+    def execute(self, query):
+        return query
+
+    def shutdown(self):
+        self.is_shutdown = True
+
+
+class FakeCluster:
+    def __init__(self):
+        self.is_shutdown = False
+        self.hosts = [SimpleNamespace(is_up=True)]
+        self.metadata = SimpleNamespace(all_hosts=lambda: self.hosts)
+        self.sessions = []
+
+    def connect(self):
+        self.sessions.append(FakeSession())
+        return self.sessions[-1]
+
+    def shutdown(self):
+        self.is_shutdown = True
+
+
+def setup_session(session):
+    session.default_consistency_level = ConsistencyLevel.ONE
+
+
+class TestCQLSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = CQLSessionPool(max_idle_sessions=1)
+        self.clusters = []
+
+    def acquire(self, key="key", topology=frozenset(["10.0.0.1"]), keyspace=None):
+        def create_cluster():
+            self.clusters.append(FakeCluster())
+            return self.clusters[-1]
+        return self.pool.acquire(key=key, topology=topology, create_cluster=create_cluster,
+                                 setup_session=setup_session, keyspace=keyspace)
+
+    def test_reuse(self):
+        with self.acquire() as session:
+            self.assertEqual(session.execute("SELECT"), "SELECT")
+            self.assertEqual(session.default_consistency_level, ConsistencyLevel.ONE)
+            session.default_fetch_size = 0
+            with self.acquire() as other_session:
+                self.assertIsNot(other_session, session)
+        with self.acquire() as session:
+            self.assertEqual(session.default_fetch_size, 5000)
+        self.assertNotIn("execute", session.__dict__)  # the verbose wrapper is removed on exit
+        with self.acquire(keyspace="ks") as session:
+            self.assertEqual(session.keyspace, "ks")
+        self.assertEqual(len(self.clusters), 1)
+        self.assertEqual(len(self.clusters[0].sessions), 3)
+        self.assertTrue(self.clusters[0].sessions[0].is_shutdown)  # there is room for one idle session only
+        self.assertFalse(self.clusters[0].is_shutdown)
+
+    def test_invalidation(self):
+        with self.acquire() as session:
+            with self.acquire(topology=frozenset(["10.0.0.1", "10.0.0.2"])):
+                self.assertEqual(len(self.clusters), 2)
+            self.assertFalse(self.clusters[0].is_shutdown)
+        self.assertTrue(self.clusters[0].is_shutdown)
+
+        self.clusters[1].hosts[0].is_up = False
+        with self.acquire(topology=frozenset(["10.0.0.1", "10.0.0.2"])):
+            self.assertEqual(len(self.clusters), 3)
+        self.assertTrue(self.clusters[1].is_shutdown)
+
+        with self.assertRaises(NoHostAvailable):
+            with self.acquire(topology=frozenset(["10.0.0.1", "10.0.0.2"])) as session:
+                raise NoHostAvailable("no host", {})
+        self.assertTrue(session.is_shutdown)
+        self.assertFalse(self.clusters[2].is_shutdown)
+
+        self.pool.close()
+        self.assertTrue(self.clusters[2].is_shutdown)
@@ -31,6 +31,9 @@ class DecodeDummyNode(DummyNode):  # pylint: disable=abstract-method
     def get_scylla_debuginfo_file(self):
         return "scylla_debug_info_file"
 
+    def get_scylla_build_id(self):
+        return None
+
 
 class TestDecodeBactraces(unittest.TestCase, EventsUtilsMixin):
     @classmethod
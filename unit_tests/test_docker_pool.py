@@ -0,0 +1,91 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import itertools
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sdcm.utils.docker_remote import RemoteDockerPool
+
+IMAGE = "scylladb/hydra-loaders:ycsb-jdk8-20200326"
+
+
+class FakeRemoteDocker:  # pylint: disable=too-few-public-methods
+    ids = itertools.count()
+
+    def __init__(self, node, image_name, command_line, extra_docker_opts):
+        self.node, self.image_name, self.command_line, self.extra_docker_opts = \
+            node, image_name, command_line, extra_docker_opts
+        self.docker_id = f"container-{next(self.ids)}"
+        self.setup_key = None
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+
+class TestRemoteDockerPool(unittest.TestCase):
+    def setUp(self):
+        self.commands = []
+        self.node = SimpleNamespace(remoter=SimpleNamespace(run=lambda cmd, **_: self.commands.append(cmd)))
+        self.pool = RemoteDockerPool(node=self.node, max_idle=1)
+        self.setups = []
+        patcher = patch("sdcm.utils.docker_remote.RemoteDocker", FakeRemoteDocker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def container(self, **kwargs):
+        return self.pool.container(IMAGE, owner="stress-1", setup=self.setups.append, **kwargs)
+
+    def test_recycle(self):
+        with self.container(setup_key="a") as first:
+            pass
+        with self.container(setup_key="a") as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.setups, [first])
+        self.assertEqual(self.commands, [f"docker pull -q {IMAGE}"])
+
+        with self.container(setup_key="b") as third:
+            with self.container(setup_key="b") as fourth:
+                pass
+        self.assertIs(third, first)
+        self.assertEqual(self.setups, [first, third, fourth])
+        self.assertTrue(fourth.killed or third.killed, "more containers than max_idle are kept")
+
+        with self.container(setup_key="b", extra_docker_opts="--network=host") as other:
+            self.assertIsNot(other, first)
+
+    def test_failed_run_not_recycled(self):
+        with self.assertRaises(RuntimeError):
+            with self.container() as first:
+                raise RuntimeError("stress failed")
+        self.assertTrue(first.killed)
+        with self.container() as second:
+            self.assertIsNot(second, first)
+
+    def test_kill_owner(self):
+        with self.container() as first:
+            self.pool.kill(owner="stress-2")
+            self.assertFalse(first.killed)
+            self.pool.kill(owner="stress-1")
+            self.assertTrue(first.killed)
+        with self.container() as second:
+            self.assertIsNot(second, first)
+
+    def test_pull_images_once(self):
+        self.pool.pull_images([IMAGE, IMAGE, "scylladb/hydra-loaders:alternator-dns-0.2"])
+        self.pool.pull_images([IMAGE])
+        self.assertEqual(sorted(self.commands), ["docker pull -q scylladb/hydra-loaders:alternator-dns-0.2",
+                                                 f"docker pull -q {IMAGE}"])
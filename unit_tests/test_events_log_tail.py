@@ -0,0 +1,90 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import shlex
+import tempfile
+import unittest
+
+from sdcm.utils.events_log_tail import EventsFilter, EventsLogTail, filter_events_log, format_output, parse_output
+
+
+EVENTS = [
+    "2021-05-10 10:00:00.000: (InfoEvent Severity.NORMAL) period_type=not-set event_id=1: message=start\n",
+    "2021-05-10 10:00:01.000: (DatabaseLogEvent Severity.ERROR) period_type=one-time event_id=2: "
+    "type=BACKTRACE regex=backtrace line_number=10 node=db-node-1\nBacktrace:\n  0x1\n  0x2\n",
+    "2021-05-10 10:00:02.000 <2021-05-10 10:00:01.500>: (DatabaseLogEvent Severity.CRITICAL) period_type=one-time "
+    "event_id=3: type=CORRUPTED_SSTABLE regex=x line_number=11 node=db-node-2\nsome line\n",
+    "2021-05-10 10:00:03.000: (CoreDumpEvent Severity.CRITICAL) period_type=one-time event_id=4: node=db-node-1\n",
+]
+
+
+class TestEventsLogTail(unittest.TestCase):
+    def setUp(self):
+        self.events_log = tempfile.NamedTemporaryFile(mode="w", suffix=".log")  # pylint: disable=consider-using-with
+        self.events_log.write("".join(EVENTS))
+        self.events_log.flush()
+
+    def tearDown(self):
+        self.events_log.close()
+
+    def filter(self, **kwargs):
+        return filter_events_log(path=self.events_log.name, **kwargs)
+
+    def test_no_filter(self):
+        events, cursor, more = self.filter(events_filter=EventsFilter())
+        self.assertEqual(events, EVENTS)
+        self.assertEqual(cursor, len("".join(EVENTS)))
+        self.assertFalse(more)
+
+    def test_filters(self):
+        self.assertEqual(self.filter(events_filter=EventsFilter(min_severity="CRITICAL"))[0], EVENTS[2:])
+        self.assertEqual(self.filter(events_filter=EventsFilter(node="db-node-1"))[0], [EVENTS[1], EVENTS[3]])
+        self.assertEqual(self.filter(events_filter=EventsFilter(event_types=("DatabaseLogEvent.BACKTRACE", )))[0],
+                         [EVENTS[1]])
+        self.assertEqual(self.filter(events_filter=EventsFilter(event_types=("DatabaseLogEvent", )))[0], EVENTS[1:3])
+        self.assertEqual(self.filter(events_filter=EventsFilter(since="2021-05-10 10:00:02",
+                                                                until="2021-05-10 10:00:02"))[0], [EVENTS[2]])
+
+    def test_last_n(self):
+        events, cursor, _ = self.filter(events_filter=EventsFilter(min_severity="ERROR"), last_n=1)
+        self.assertEqual(events, [EVENTS[3]])
+        self.assertEqual(cursor, len("".join(EVENTS)))
+
+    def test_resume_from_cursor(self):
+        events, cursor, more = self.filter(events_filter=EventsFilter(), max_bytes=len(EVENTS[0]) + 1)
+        self.assertEqual(events, EVENTS[:1])
+        self.assertTrue(more)
+        events, cursor, more = self.filter(events_filter=EventsFilter(), offset=cursor)
+        self.assertEqual(events, EVENTS[1:])
+        self.assertFalse(more)
+
+        new_event = "2021-05-10 10:00:04.000: (InfoEvent Severity.NORMAL) period_type=not-set event_id=5: message=end\n"
+        self.events_log.write(new_event)
+        self.events_log.write("2021-05-10 10:00:05.000: (InfoEvent Severity.NORMAL) partial")
+        self.events_log.flush()
+        events, _, _ = self.filter(events_filter=EventsFilter(), offset=cursor)
+        self.assertEqual(events, [new_event])
+
+    def test_output_roundtrip(self):
+        for compress in (False, True):
+            output = format_output(events=EVENTS, cursor=42, more=True, compress=compress)
+            self.assertEqual(parse_output(output), ("".join(EVENTS), 42, True))
+
+    def test_build_cmd_quotes_arguments(self):
+        events_filter = EventsFilter(event_types=("DatabaseLogEvent", ), node="db-node-1'; rm -rf /tmp/x; '",
+                                     since="2021-05-10 10:00:02", until="it's later")
+        # pylint: disable=protected-access
+        args = shlex.split(EventsLogTail(remoter=None, path="/tmp/events log", events_filter=events_filter)._build_cmd())
+        self.assertEqual(args[2], "/tmp/events log")
+        self.assertEqual(args[-8:], ["--event-type", "DatabaseLogEvent", "--node", events_filter.node,
+                                     "--since", "2021-05-10 10:00:02", "--until", "it's later"])
@@ -0,0 +1,79 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import io
+import json
+import tempfile
+import threading
+import unittest
+
+from botocore.exceptions import EndpointConnectionError
+from cryptography.fernet import Fernet
+
+from sdcm.keystore import KeyStore, EncryptedDiskCache
+
+
+class FakeS3Client:
+    def __init__(self, files):
+        self.files = files
+        self.calls = []
+        self.offline = False
+        self.lock = threading.Lock()
+
+    def get_object(self, Bucket, Key):  # pylint: disable=invalid-name,unused-argument
+        with self.lock:
+            self.calls.append(Key)
+        if self.offline:
+            raise EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+        return {"Body": io.BytesIO(self.files[Key])}
+
+
+class TestKeyStore(unittest.TestCase):
+    def setUp(self):
+        self.s3_client = FakeS3Client({"es.json": json.dumps({"es_url": "http://es"}).encode(),
+                                       "email_config.json": b'{"user": "qa"}'})
+        KeyStore._s3_client = self.s3_client  # pylint: disable=protected-access
+        KeyStore.clear_cache()
+
+    def tearDown(self):
+        KeyStore._s3_client = None  # pylint: disable=protected-access
+        KeyStore.clear_cache()
+
+    def test_memory_cache(self):
+        KeyStore().prefetch()
+        self.assertEqual(sorted(self.s3_client.calls), ["email_config.json", "es.json"])
+        for _ in range(5):
+            self.assertEqual(KeyStore().get_elasticsearch_credentials(), {"es_url": "http://es"})
+        self.assertEqual(len(self.s3_client.calls), 2)
+
+        KeyStore.cache_ttl = 0
+        try:
+            KeyStore().get_email_credentials()
+        finally:
+            KeyStore.cache_ttl = 3600
+        self.assertEqual(len(self.s3_client.calls), 3)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            keystore = KeyStore()
+            keystore.disk_cache = EncryptedDiskCache(key=Fernet.generate_key(), cache_dir=cache_dir)
+            keystore.get_file_contents("es.json")
+
+            KeyStore.clear_cache()
+            self.s3_client.offline = True
+            self.assertEqual(keystore.get_elasticsearch_credentials(), {"es_url": "http://es"})
+
+            keystore.disk_cache = EncryptedDiskCache(key=Fernet.generate_key(), cache_dir=cache_dir)  # a wrong key
+            KeyStore.clear_cache()
+            with self.assertRaises(EndpointConnectionError):
+                keystore.get_elasticsearch_credentials()
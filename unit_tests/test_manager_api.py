@@ -0,0 +1,72 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import json
+import unittest
+from types import SimpleNamespace
+
+from sdcm.mgmt.api import get_manager_api_client
+from sdcm.mgmt.cli import ManagerTask
+from sdcm.mgmt.common import TaskStatus
+
+CLUSTER_ID = "c1"
+TASKS = [
+    {"id": "r1", "type": "repair", "status": "RUNNING", "failures": 0, "next_activation": "2021-03-26T19:40:21.123Z"},
+    {"id": "r2", "type": "repair", "status": "ERROR", "failures": 4, "schedule": {"num_retries": 3}},
+    {"id": "r3", "type": "repair", "status": "ERROR", "failures": 1, "schedule": {"num_retries": 3}},
+    {"id": "b1", "type": "backup", "status": "NEW", "next_activation": None},
+]
+RESPONSES = {
+    f"cluster/{CLUSTER_ID}/tasks?all=true": TASKS,
+    f"cluster/{CLUSTER_ID}/task/repair/r1/latest": {"progress": {"token_ranges": 1536, "success": 2}},
+    f"cluster/{CLUSTER_ID}/task/repair/r1/history?limit=1": [{"id": "run2"}],
+}
+
+
+class FakeManagerNode:  # pylint: disable=too-few-public-methods
+    ssh_login_info = None
+
+    def __init__(self):
+        self.requests = []
+        self.remoter = SimpleNamespace(run=self.run)
+
+    def run(self, cmd, **_):
+        if "/ping" in cmd:
+            return SimpleNamespace(stdout="204\n")
+        path = cmd.split("/api/v1/", 1)[1].rstrip("'")
+        self.requests.append(path)
+        return SimpleNamespace(stdout=json.dumps(RESPONSES[path]))
+
+
+class TestManagerApi(unittest.TestCase):
+    def setUp(self):
+        self.manager_node = FakeManagerNode()
+        self.tasks = {task_id: ManagerTask(task_id=task_id, cluster_id=CLUSTER_ID, manager_node=self.manager_node)
+                      for task_id in ("repair/r1", "r2", "r3", "backup/b1")}
+
+    def test_shared_snapshot(self):
+        self.assertEqual([task.status for task in self.tasks.values()],
+                         [TaskStatus.RUNNING, TaskStatus.ERROR_FINAL, TaskStatus.ERROR, TaskStatus.NEW])
+        self.assertEqual(self.tasks["repair/r1"].next_run, "26 Mar 21 19:40:21 UTC")
+        self.assertEqual(self.tasks["backup/b1"].next_run, "")
+        self.assertEqual(self.manager_node.requests, [f"cluster/{CLUSTER_ID}/tasks?all=true"])
+
+        get_manager_api_client(self.manager_node).snapshot_ttl = 0
+        self.assertEqual(self.tasks["r2"].status, TaskStatus.ERROR_FINAL)
+        self.assertEqual(len(self.manager_node.requests), 2)
+
+    def test_progress(self):
+        self.assertEqual(self.tasks["repair/r1"].progress, " 0.13%")
+        self.assertTrue(self.tasks["repair/r1"].has_progress_reached_percentage(0.1))
+        self.assertEqual(self.tasks["backup/b1"].progress, " 0%")
+        self.assertEqual(self.tasks["repair/r1"].latest_run_id, "run2")
@@ -8,8 +8,9 @@ import tempfile
 import json
 import zipfile
 import hashlib
+import unittest.mock
 
-from sdcm.microbenchmarking import MicroBenchmarkingResultsAnalyzer, LargeNumberOfDatasetsException, EmptyResultFolder
+from sdcm.microbenchmarking import MicroBenchmarkingResultsAnalyzer, EmptyResultFolder
 
 
 LOGGER = logging.getLogger("microbenchmarking-tests")
@@ -28,6 +29,10 @@ class MicroBenchmarkingResultsAnalyzerMock(MicroBenchmarkingResultsAnalyzer):
     def _get_prior_tests(self, filter_path, additional_filter=''):
         return self._mock_function('_get_prior_tests', filter_path, additional_filter)
 
+    def _get_prior_tests_by_type(self, current_results, filter_path, additional_filter=''):
+        grouped = self.group_prior_tests(self._get_prior_tests(filter_path, additional_filter)['hits']['hits'])
+        return {test_type: grouped.get(test_type, []) for test_type in current_results}
+
     def _mock_function(self, target_fn, *args, **kwargs):
         output = self._load_mock_return('_get_prior_tests', args=args, kwargs=kwargs)
         if output is None:
@@ -111,10 +116,31 @@ class TestMBM(unittest.TestCase):  # pylint: disable=too-many-public-methods
 
     def test_get_result_with_2_datasets(self):
         result_path = os.path.join(os.path.dirname(__file__), 'test_data/test_microbenchmarking/PFF_2_datasets')
-        self.assertRaises(LargeNumberOfDatasetsException,
-                          self.mbra.get_results,
-                          results_path=result_path,
-                          update_db=False)
+        results = self.mbra.get_results(results_path=result_path, update_db=False)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(results['large-partition-forwarding_large-part-ds2_no.1']['dataset_name'], 'large-part-ds2')
+        self.assertEqual(results['small-partition-slicing_small-part-1_0-256.1']['dataset_name'], 'small-part-1')
+
+    def test_get_prior_tests_by_type_in_one_multi_search(self):
+        # pylint: disable=protected-access
+        result_path = os.path.join(os.path.dirname(__file__), 'test_data/test_microbenchmarking/PFF_with_AVGAIO')
+        result_obj = self.get_result_obj(result_path)
+        docs = self.mbra._get_prior_tests(self.mbra.prior_tests_filter_path,
+                                          self.mbra.prior_tests_additional_filter)['hits']['hits']
+        grouped = self.mbra.group_prior_tests(docs)
+        searches = []
+
+        def msearch(body, filter_path):  # pylint: disable=unused-argument
+            searches.append(body)
+            return {"responses": [{"status": 200, "hits": {"hits": docs}} for _ in body[::2]]}
+
+        self.mbra._es = unittest.mock.Mock(msearch=msearch)
+        self.mbra.db_version = result_obj[list(result_obj.keys())[0]]['versions']['scylla-server']['version']
+        prior_results = MicroBenchmarkingResultsAnalyzer._get_prior_tests_by_type(
+            self.mbra, result_obj, self.mbra.prior_tests_filter_path, self.mbra.prior_tests_additional_filter)
+        self.assertEqual(len(searches), 1)
+        self.assertEqual(len(searches[0]), 2 * len(result_obj))
+        self.assertEqual(prior_results, {test_type: grouped[test_type] for test_type in result_obj})
 
     def test_get_result_for_empty_base_folder(self):
         result_path = os.path.join(os.path.dirname(__file__), 'test_data/test_microbenchmarking/PFF_empty_folder')
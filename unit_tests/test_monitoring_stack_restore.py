@@ -0,0 +1,81 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import io
+import os
+import time
+import tarfile
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sdcm.monitorstack import MonitoringStackCache, MonitoringStackRestorePipeline
+
+
+def make_tar(files, mode="w:gz"):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as tar_file:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar_file.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class TestMonitoringStackRestore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.cache = MonitoringStackCache(cache_dir=self.temp_dir.name, size=2)
+        self.arch = {"file_path": "monitor-set-123.tar.gz", "link": "https://bucket/monitor-set-123.tar.gz"}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_tar_stream(self):
+        stack = make_tar({"scylla-monitoring-branch-3.8/monitor_version": b"branch-3.8:4.5"})
+        data = make_tar({"1234/prometheus_snapshot/meta.json": b"{}"})
+        outer = make_tar({"monitoring_data_stack_branch-3.8.tar.gz": stack, "sct-prometheus_data_1234.tar.gz": data},
+                         mode="w")
+        pipeline = MonitoringStackRestorePipeline(test_id="test-1", arch=self.arch, cache=self.cache)
+        with patch("sdcm.monitorstack.S3Storage") as s3_storage, patch("sdcm.monitorstack.LocalCmdRunner"):
+            s3_storage.return_value.open_stream.return_value = io.BytesIO(outer)
+            pipeline.start()
+            monitoring_stack_dir = pipeline.monitoring_stack_dir.result(timeout=10)
+            monitoring_data_dir = pipeline.monitoring_data_dir.result(timeout=10)
+        self.assertTrue(os.path.isfile(os.path.join(monitoring_stack_dir, "monitor_version")))
+        self.assertTrue(os.path.isfile(os.path.join(monitoring_data_dir, "prometheus_snapshot", "meta.json")))
+        self.assertIsNone(self.cache.get("test-1", self.arch))
+
+        self.cache.put("test-1", self.arch, monitoring_stack_dir, monitoring_data_dir)
+        cached = MonitoringStackRestorePipeline(test_id="test-1", arch=self.arch, cache=self.cache)
+        cached.start()
+        self.assertEqual(cached.monitoring_stack_dir.result(timeout=0), monitoring_stack_dir)
+
+    def test_missing_inner_archive(self):
+        outer = make_tar({"sct-prometheus_data_1234.tar.gz": make_tar({"1234/meta.json": b"{}"})}, mode="w")
+        pipeline = MonitoringStackRestorePipeline(test_id="test-1", arch=self.arch, cache=self.cache)
+        with patch("sdcm.monitorstack.S3Storage") as s3_storage, patch("sdcm.monitorstack.LocalCmdRunner"):
+            s3_storage.return_value.open_stream.return_value = io.BytesIO(outer)
+            pipeline.start()
+            self.assertFalse(pipeline.monitoring_stack_dir.result(timeout=10))
+            self.assertTrue(pipeline.monitoring_data_dir.result(timeout=10))
+
+    def test_cache_eviction(self):
+        for idx in range(3):
+            base_dir = self.cache.prepare(f"test-{idx}", self.arch)
+            os.makedirs(os.path.join(base_dir, "stack"))
+            os.makedirs(os.path.join(base_dir, "data"))
+            self.cache.put(f"test-{idx}", self.arch, os.path.join(base_dir, "stack"), os.path.join(base_dir, "data"))
+            time.sleep(0.01)
+        self.assertIsNone(self.cache.get("test-0", self.arch))
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ["test-1", "test-2"])
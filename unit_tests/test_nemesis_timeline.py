@@ -0,0 +1,96 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sdcm.nemesis_timeline import NemesisTimeline
+from sdcm.nemesis_publisher import NemesisElasticSearchPublisher
+
+
+class TestNemesisTimeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.temp_dir.name, "nemesis_timeline.jsonl")
+        self.timeline = NemesisTimeline(path=self.path)
+        self.timeline.append(owner="m1", operation="Op1", node="node-1", start=0, end=100)
+        self.timeline.append(owner="m2", operation="Op2", node="node-2", start=50, end=300,
+                             error="boom", full_traceback="Traceback...")
+        self.timeline.append(owner="m1", operation="Op3", node="node-1", start=150, end=200,
+                             subtype="skipped", skip_reason="unsupported")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_queries(self):
+        self.assertEqual(len(self.timeline), 3)
+        self.assertEqual([record["operation"] for record in self.timeline.records()], ["Op1", "Op3", "Op2"])
+        self.assertEqual(self.timeline.durations(owner="m1"), [100, 50])
+        self.assertEqual(self.timeline.durations(owner="m3"), [])
+        self.assertEqual([record["operation"] for record in self.timeline.overlapping(75)], ["Op1", "Op2"])
+        self.assertEqual([record["operation"] for record in self.timeline.overlapping(120, 160)], ["Op3", "Op2"])
+        self.assertEqual(self.timeline.overlapping(120, 160, owner="m2")[0]["error"], "boom")
+        self.assertEqual(self.timeline.overlapping(301), [])
+        self.assertNotIn("full_traceback", self.timeline.records(owner="m2")[0])
+        skipped = self.timeline.records(owner="m1")[1]
+        self.assertEqual((skipped["subtype"], skipped["outcome"], skipped["skip_reason"]),
+                         ("skipped", "skipped", "unsupported"))
+
+    def test_load(self):
+        loaded = NemesisTimeline.load(self.path)
+        self.assertEqual(loaded.records(), self.timeline.records())
+        with open(self.path, encoding="utf-8") as timeline_file:
+            self.assertIn("Traceback...", timeline_file.read())
+
+
+class FakeTester:  # pylint: disable=too-few-public-methods,no-self-use
+    def __init__(self):
+        self.updates = []
+
+    def update(self, data):
+        self.updates.append(data)
+
+    def get_scylla_versions(self):
+        return {"scylla-server": {"version": "4.5", "commit_id": "abc"}}
+
+    def get_test_details(self):
+        return {"test_id": "123", "job_name": "job"}
+
+    def id(self):  # pylint: disable=invalid-name
+        return "test_name"
+
+
+def test_publisher_sends_bulks():
+    sent = []
+    publisher = NemesisElasticSearchPublisher(FakeTester())
+    publisher.es = None
+    with patch("sdcm.nemesis_publisher.bulk", lambda es, actions, **_: sent.append(list(actions)) or (0, 0)):
+        for idx in range(7):
+            publisher.publish(disrupt_name=f"disrupt_{idx}", data={"duration": 1, "start": 0, "end": 1, "node": "n"})
+        publisher.stop()
+    assert sum(len(actions) for actions in sent) == 7
+    assert sent[0][0]["_index"] == "nemesis_data"
+    assert sent[0][0]["_source"]["nemesis_name"] == "disrupt_0"
+
+
+def test_publisher_updates_test_stats_once_per_bulk():
+    tester = FakeTester()
+    publisher = NemesisElasticSearchPublisher(tester)
+    publisher.es = None
+    with patch("sdcm.nemesis_publisher.bulk", lambda es, actions, **_: (0, 0)):
+        for idx in range(3):
+            publisher.update_test_stats(lambda idx=idx: {"nemesis": {"disrupt": {"cnt": idx + 1}}})
+        publisher.stop()
+    assert tester.updates == [{"nemesis": {"disrupt": {"cnt": 3}}}]
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from sdcm.utils.cloud_monitor.common import InstanceLifecycle
+from sdcm.utils.pricing import AWSPricing, PricingCatalog, PRICING_CATALOG_VERSION, ON_DEMAND_PRICE_TTL
+
+
+def price_item(instance_type, price):
+    return json.dumps({"product": {"attributes": {"instanceType": instance_type}},
+                       "terms": {"OnDemand": {"a": {"priceDimensions": {"b": {"pricePerUnit": {"USD": str(price)}}}}}}})
+
+
+class TestPricingCatalog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.temp_dir.name, "catalog.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_persist_and_expire(self):
+        key = ("aws", "on-demand", "us-east-1", "m5.large")
+        PricingCatalog(path=self.path).update({key: 0.096})
+        catalog = PricingCatalog(path=self.path)
+        self.assertEqual(catalog.get(key, ttl=ON_DEMAND_PRICE_TTL), 0.096)
+        with patch("sdcm.utils.pricing.time.time", return_value=time.time() + ON_DEMAND_PRICE_TTL + 1):
+            self.assertIsNone(catalog.get(key, ttl=ON_DEMAND_PRICE_TTL))
+            self.assertEqual(catalog.get(key, ttl=ON_DEMAND_PRICE_TTL, allow_expired=True), 0.096)
+
+    def test_other_version_ignored(self):
+        with open(self.path, "w", encoding="utf-8") as catalog_file:
+            json.dump({"version": PRICING_CATALOG_VERSION + 1, "prices": {"aws/on-demand/us-east-1/m5.large": [1, 0]}},
+                      catalog_file)
+        self.assertIsNone(PricingCatalog(path=self.path).get(("aws", "on-demand", "us-east-1", "m5.large"), ttl=0,
+                                                             allow_expired=True))
+
+    def test_prefetch_and_fallback(self):
+        pricing = AWSPricing(catalog=PricingCatalog(path=self.path))
+        pricing.__dict__["pricing_client"] = pricing_client = MagicMock()
+        pricing_client.get_paginator.return_value.paginate.return_value = [
+            {"PriceList": [price_item("m5.large", 0.096), price_item("i3.large", 0.156)]}]
+        ec2_client = MagicMock()
+        ec2_client.get_paginator.return_value.paginate.return_value = [
+            {"SpotPriceHistory": [{"InstanceType": "i3.large", "SpotPrice": "0.04"},
+                                  {"InstanceType": "i3.large", "SpotPrice": "0.06"}]}]
+        pricing._ec2_clients["us-east-1"] = ec2_client  # pylint: disable=protected-access
+        pricing.prefetch_instance_prices([("us-east-1", "m5.large", "running", InstanceLifecycle.ON_DEMAND),
+                                          ("us-east-1", "i3.large", "running", InstanceLifecycle.ON_DEMAND),
+                                          ("us-east-1", "i3.large", "running", InstanceLifecycle.SPOT),
+                                          ("us-east-1", "c5.large", "stopped", InstanceLifecycle.SPOT)])
+        self.assertEqual(pricing.get_instance_price("us-east-1", "i3.large", "running", InstanceLifecycle.ON_DEMAND),
+                         0.156)
+        self.assertAlmostEqual(pricing.get_instance_price("us-east-1", "i3.large", "running", InstanceLifecycle.SPOT),
+                               0.05)
+        pricing_client.get_products.assert_not_called()
+        self.assertEqual(ec2_client.get_paginator.return_value.paginate.call_count, 1)
+
+        pricing_client.get_products.side_effect = ClientError({"Error": {"Code": "ThrottlingException"}}, "GetProducts")
+        with patch("sdcm.utils.pricing.time.time", return_value=time.time() + ON_DEMAND_PRICE_TTL + 1):
+            self.assertEqual(pricing.get_on_demand_instance_price("us-east-1", "m5.large"), 0.096)
+            with self.assertRaises(ClientError):
+                pricing.get_on_demand_instance_price("us-east-1", "c5.large")
@@ -23,7 +23,7 @@ from logging import getLogger
 from sdcm.remote import RemoteLibSSH2CmdRunner, RemoteCmdRunner, LocalCmdRunner, RetryableNetworkException, \
     SSHConnectTimeoutError, shell_script_cmd
 from sdcm.remote.kubernetes_cmd_runner import KubernetesCmdRunner
-from sdcm.remote.base import CommandRunner, Result
+from sdcm.remote.base import CommandRunner, Result, OutputTail, OutputTailWatcher, OutputWatcher
 from sdcm.remote.remote_file import remote_file
 from sdcm.cluster_k8s import KubernetesCluster
 
@@ -405,6 +405,26 @@ class TestSudoAndRunShellScript(unittest.TestCase):
         self.assertEqual(shell_script_cmd("true"), 'bash -cxe "true"')
 
 
+class TestOutputTail(unittest.TestCase):
+    def test_output_tail(self):
+        tail = OutputTail(max_lines=2)
+        self.assertEqual(tail.write("line1\nli"), ["line1\n"])
+        self.assertEqual(tail.write("ne2\nline3\nline4"), ["line2\n", "line3\n"])
+        self.assertEqual(tail.getvalue(), "line2\nline3\nline4")
+        self.assertEqual(tail.flush(), ["line4"])
+        self.assertEqual(tail.getvalue(), "line3\nline4")
+
+    def test_output_tail_watcher(self):
+        watcher = OutputTailWatcher(patterns=(r"^TAG: ", "IOException", ), max_matches=2)
+        watcher.submit("TAG: 1\nsome output\njava.io.IOExcep")
+        watcher.submit("TAG: 1\nsome output\njava.io.IOException: 1\n")
+        for idx in range(2, 4):
+            watcher.submit_line(f"java.io.IOException: {idx}\n")
+        self.assertEqual(list(watcher.matches), ["java.io.IOException: 2", "java.io.IOException: 3"])
+        self.assertIs(OutputTailWatcher.find([OutputWatcher(getLogger()), watcher]), watcher)
+        self.assertIsNone(OutputTailWatcher.find(None))
+
+
 class TestRemoteFile(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -0,0 +1,126 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import time
+import logging
+import threading
+import unittest
+from types import SimpleNamespace
+
+import pytest
+from cassandra import AlreadyExists, InvalidRequest, OperationTimedOut
+from cassandra.cluster import Cluster  # pylint: disable=no-name-in-module
+
+from sdcm.utils.schema_provisioner import SchemaProvisioner, SchemaProvisioningError, SchemaObject, parse_ddl
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FakeSession:  # pylint: disable=too-few-public-methods
+    def __init__(self, existing=(), failures=None):
+        self.keyspace = None
+        self.executed = []
+        self.existing = list(existing)
+        self.failures = dict(failures or {})
+        self.agreement_waits = 0
+        self.lock = threading.Lock()
+        self.cluster = SimpleNamespace(
+            max_schema_agreement_wait=10,
+            control_connection=SimpleNamespace(wait_for_schema_agreement=self.wait_for_schema_agreement))
+
+    def wait_for_schema_agreement(self, wait_time=None):  # pylint: disable=unused-argument
+        assert self.cluster.max_schema_agreement_wait == 0
+        self.agreement_waits += 1
+        return True
+
+    def execute(self, query):
+        if query.startswith("SELECT"):
+            if "system_schema.keyspaces" in query:
+                return [(ks, ) for kind, ks, _ in self.existing if kind == "keyspace"]
+            if "system_schema.tables" in query:
+                return [(ks, name) for kind, ks, name in self.existing if kind == "table"]
+            return []
+        with self.lock:
+            self.executed.append(query)
+            failures = self.failures.get(query)
+            if failures:
+                self.failures[query] = failures[1:]
+                raise failures[0]
+        return []
+
+
+class TestSchemaProvisioner(unittest.TestCase):
+    def test_parse_ddl(self):
+        self.assertEqual(parse_ddl("CREATE KEYSPACE IF NOT EXISTS Ks1 WITH replication = {}"),
+                         SchemaObject(kind="keyspace", name="ks1"))
+        self.assertEqual(parse_ddl('CREATE TABLE ks."Table1" (pk int PRIMARY KEY)'),
+                         SchemaObject(kind="table", keyspace="ks", name="Table1"))
+        self.assertEqual(parse_ddl("CREATE INDEX idx ON ks.t (c)"), SchemaObject(kind="index", keyspace="ks", name="idx"))
+        self.assertEqual(parse_ddl("CREATE INDEX ON t (c)", default_keyspace="ks"),
+                         SchemaObject(kind="index", keyspace="ks"))
+        self.assertEqual(parse_ddl("CREATE TABLE t (pk int PRIMARY KEY)"), SchemaObject(kind="table"))
+        self.assertEqual(parse_ddl("ALTER TABLE ks.t WITH comment = ''"), SchemaObject(kind="other"))
+
+    def test_provision(self):
+        statements = [
+            "CREATE TABLE ks1.t0 (pk int PRIMARY KEY)",
+            "CREATE INDEX ON ks1.t0 (pk)",
+            "CREATE KEYSPACE ks1 WITH replication = {}",
+        ] + [f"CREATE TABLE ks1.t{idx} (pk int PRIMARY KEY)" for idx in range(1, 10)]
+        session = FakeSession(
+            existing=[("keyspace", "ks1", None), ("table", "ks1", "t1")],
+            failures={
+                "CREATE TABLE ks1.t2 (pk int PRIMARY KEY)": [OperationTimedOut()],
+                "CREATE TABLE ks1.t3 (pk int PRIMARY KEY)": [AlreadyExists(keyspace="ks1", table="t3")],
+                "CREATE INDEX ON ks1.t0 (pk)": [InvalidRequest("Index already exists")],
+            })
+        stats = SchemaProvisioner(session, concurrency=4, wave_size=3).provision(statements)
+
+        self.assertEqual(session.cluster.max_schema_agreement_wait, 10)
+        self.assertNotIn("CREATE KEYSPACE ks1 WITH replication = {}", session.executed)
+        self.assertEqual(session.executed.count("CREATE TABLE ks1.t2 (pk int PRIMARY KEY)"), 2)
+        self.assertEqual(session.executed[-1], "CREATE INDEX ON ks1.t0 (pk)")
+        self.assertEqual((stats.created, stats.skipped, stats.retried, stats.waves), (8, 4, 1, 4))
+        self.assertEqual(session.agreement_waits, 5)
+
+    def test_provision_failure(self):
+        query = "CREATE TABLE ks1.t0 (pk int PRIMARY KEY)"
+        session = FakeSession(failures={query: [OperationTimedOut()] * 3})
+        with self.assertRaises(SchemaProvisioningError):
+            SchemaProvisioner(session, retries=2).provision([query])
+        self.assertEqual(session.executed, [query] * 3)
+
+
+@pytest.mark.skip(reason="integration test, needs a running DB")
+@pytest.mark.usefixtures("events")
+def test_provisioning_benchmark(docker_scylla):
+    tables_num = 200
+    statements = ["CREATE KEYSPACE IF NOT EXISTS provisioning_benchmark "
+                  "WITH replication = {'class': 'SimpleStrategy', 'replication_factor': 1}"]
+    statements += [f"CREATE TABLE provisioning_benchmark.sequential{idx} (pk int PRIMARY KEY, v text)"
+                   for idx in range(tables_num)]
+    cluster = Cluster([docker_scylla.ip_address])
+    try:
+        session = cluster.connect()
+        start_time = time.perf_counter()
+        for query in statements:
+            session.execute(query)
+        sequential_per_minute = tables_num * 60 / (time.perf_counter() - start_time)
+
+        stats = SchemaProvisioner(session).provision(query.replace("sequential", "provisioned")
+                                                     for query in statements)
+        LOGGER.info("Tables per minute: %.1f one by one, %.1f provisioned", sequential_per_minute, stats.per_minute)
+        assert stats.created == tables_num
+        assert stats.per_minute > sequential_per_minute
+    finally:
+        cluster.shutdown()
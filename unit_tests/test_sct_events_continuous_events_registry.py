@@ -102,3 +102,37 @@ class TestContinuousEventsRegistry:
 
         assert len(found_events.get_filtered()) == 1
         assert found_events.get_filtered()[0] == nodetool_event
+
+    def test_get_begun_events_by_type_and_node(self,
+                                               registry: ContinuousEventsRegistry):
+        first_event = GeminiStressEvent(node="node_for_begun_events", cmd="gemini cmd", publish_event=False)
+        second_event = GeminiStressEvent(node="node_for_begun_events", cmd="gemini cmd", publish_event=False)
+        other_node_event = GeminiStressEvent(node="other_node_for_begun_events", cmd="gemini cmd", publish_event=False)
+        for event in (first_event, second_event, other_node_event):
+            event.begin_event()
+
+        found_events = registry.get_begun_events(event_type=GeminiStressEvent, node="node_for_begun_events")
+        assert found_events == [first_event, second_event]
+
+        first_event.end_event()
+        second_event.period_type = EventPeriod.INFORMATIONAL.value
+        assert not registry.get_begun_events(event_type=GeminiStressEvent, node="node_for_begun_events")
+        assert other_node_event in registry.get_begun_events(event_type=GeminiStressEvent)
+        assert other_node_event not in registry.get_begun_events(event_type=NodetoolEvent)
+
+    def test_ended_events_are_evicted(self,
+                                      registry: ContinuousEventsRegistry):
+        max_ended_events = registry.max_ended_events
+        registry.max_ended_events = 5
+        try:
+            events = [NodetoolEvent(nodetool_command="mock cmd", publish_event=False) for _ in range(10)]
+            for event in events:
+                event.begin_event()
+                event.end_event()
+        finally:
+            registry.max_ended_events = max_ended_events
+
+        for event in events[:5]:
+            assert event not in registry.continuous_events
+        for event in events[5:]:
+            assert registry.get_event_by_id(event.event_id) is event
@@ -12,11 +12,13 @@
 # Copyright (c) 2020 ScyllaDB
 
 import re
+import time
 import pickle
+import logging
 import unittest
 
 from sdcm.sct_events import Severity
-from sdcm.sct_events.filters import DbEventsFilter, EventsFilter, EventsSeverityChangerFilter
+from sdcm.sct_events.filters import DbEventsFilter, EventsFilter, EventsSeverityChangerFilter, FiltersChain
 from sdcm.sct_events.database import DatabaseLogEvent
 
 
@@ -125,3 +127,89 @@ class TestEventsSeverityChangerFilter(unittest.TestCase):
         self.assertEqual(event.severity, Severity.ERROR)
         db_events_filter.eval_filter(event)
         self.assertEqual(event.severity, Severity.NORMAL)
+
+
+class TestFiltersChain(unittest.TestCase):
+    @staticmethod
+    def create_filters():
+        filters = [
+            DbEventsFilter(db_event=DatabaseLogEvent.BAD_ALLOC, node="node1"),
+            EventsFilter(event_class=DatabaseLogEvent.NO_SPACE_ERROR, regex=".*ignored_line.*"),
+            EventsFilter(regex=r".*(\w+)_line\1.*"),
+            EventsSeverityChangerFilter(new_severity=Severity.WARNING, event_class=DatabaseLogEvent.DATABASE_ERROR),
+        ]
+        for index in range(100):
+            filters.append(EventsFilter(event_class=DatabaseLogEvent.DATABASE_ERROR, regex=f".*filtered_{index}.*"))
+            filters.append(DbEventsFilter(db_event=DatabaseLogEvent.REACTOR_STALLED, line=f"filtered_{index}"))
+        return filters
+
+    @staticmethod
+    def create_events(count):
+        events = []
+        for index in range(count):
+            for event_class in (DatabaseLogEvent.BAD_ALLOC, DatabaseLogEvent.NO_SPACE_ERROR,
+                                DatabaseLogEvent.DATABASE_ERROR, DatabaseLogEvent.REACTOR_STALLED, ):
+                line = ("filtered_50", "ignored_line", "x_linex", "some_line", )[index % 4]
+                event = event_class().add_info(node=f"node{index % 2}", line=line, line_number=index)
+                event.dont_publish()
+                events.append(event)
+        return events
+
+    def test_same_result_as_eval_filter(self):
+        filters = self.create_filters()
+        filters_chain = FiltersChain()
+        for filter_obj in filters:
+            filters_chain.add_filter(filter_obj)
+        self.assertEqual(len(filters_chain), len(filters))
+
+        for event in self.create_events(count=8):
+            event_clone = event.clone()
+            event_clone.dont_publish()
+            expected = any(filter_obj.eval_filter(event_clone) for filter_obj in filters)
+            self.assertEqual(filters_chain.eval_filters(event), expected, str(event))
+
+    def test_update_filters(self):
+        filters_chain = FiltersChain()
+        event = DatabaseLogEvent.DATABASE_ERROR().add_info(node="node1", line="xyz", line_number=1)
+        self.assertFalse(filters_chain.eval_filters(event))
+
+        events_filter = EventsFilter(event_class=DatabaseLogEvent, regex=".*xyz.*")
+        filters_chain.add_filter(events_filter)
+        self.assertTrue(filters_chain.eval_filters(event))
+
+        filters_chain.set_expire_time(events_filter.uuid, event.timestamp - 1)
+        self.assertFalse(filters_chain.eval_filters(event))
+
+        filters_chain.set_expire_time(events_filter.uuid, event.timestamp + 1)
+        self.assertTrue(filters_chain.eval_filters(event))
+
+        filters_chain.remove_filter(events_filter.uuid)
+        self.assertFalse(filters_chain.eval_filters(event))
+
+    def test_severity_changer(self):
+        filters_chain = FiltersChain()
+        filters_chain.add_filter(EventsSeverityChangerFilter(new_severity=Severity.NORMAL, event_class=DatabaseLogEvent))
+        event = DatabaseLogEvent.BAD_ALLOC()
+        self.assertFalse(filters_chain.eval_filters(event))
+        self.assertEqual(event.severity, Severity.NORMAL)
+
+    def test_benchmark(self):
+        filters = self.create_filters()
+        filters_chain = FiltersChain()
+        for filter_obj in filters:
+            filters_chain.add_filter(filter_obj)
+        events = self.create_events(count=250)
+
+        start_time = time.perf_counter()
+        for event in events:
+            any(filter_obj.eval_filter(event) for filter_obj in filters)
+        eval_filter_rate = len(events) / (time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        for event in events:
+            filters_chain.eval_filters(event)
+        filters_chain_rate = len(events) / (time.perf_counter() - start_time)
+
+        logging.info("%d filters: eval_filter() %.0f events/s, FiltersChain %.0f events/s",
+                     len(filters), eval_filter_rate, filters_chain_rate)
+        self.assertGreater(filters_chain_rate, eval_filter_rate)
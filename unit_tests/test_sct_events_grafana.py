@@ -19,7 +19,7 @@ from sdcm.sct_events import Severity
 from sdcm.sct_events.health import ClusterHealthValidatorEvent
 from sdcm.sct_events.setup import EVENTS_SUBSCRIBERS_START_DELAY
 from sdcm.sct_events.grafana import \
-    GrafanaAnnotator, GrafanaEventAggregator, GrafanaEventPostman, \
+    GrafanaAnnotator, GrafanaEventAggregator, GrafanaEventPostman, TokenBucket, \
     start_grafana_pipeline, get_grafana_postman, set_grafana_url
 from sdcm.sct_events.events_processes import \
     EVENTS_GRAFANA_ANNOTATOR_ID, EVENTS_GRAFANA_AGGREGATOR_ID, get_events_process
@@ -66,7 +66,7 @@ class TestFileLogger(unittest.TestCase, EventsUtilsMixin):
 
             set_grafana_url("http://localhost", _registry=self.events_processes_registry)
 
-            with unittest.mock.patch("requests.post") as mock:
+            with unittest.mock.patch("requests.Session.post") as mock:
                 for runs in range(1, 4):
                     with self.wait_for_n_events(grafana_annotator, count=10, timeout=1):
                         for _ in range(10):
@@ -87,3 +87,29 @@ class TestFileLogger(unittest.TestCase, EventsUtilsMixin):
             grafana_annotator.stop(timeout=1)
             grafana_aggregator.stop(timeout=1)
             grafana_postman.stop(timeout=1)
+
+    def test_grafana_postman_coalesce(self):
+        grafana_postman = GrafanaEventPostman(_registry=self.events_processes_registry)
+        grafana_postman.coalesce_threshold = 0
+        grafana_postman.max_coalesced_keys = 1
+
+        for timestamp in (3000, 1000, 2000, ):
+            grafana_postman._queue_annotation({"time": timestamp, "tags": ["A"], "isRegion": False, "text": "a"})
+        grafana_postman._queue_annotation({"time": 1000, "tags": ["B"], "isRegion": False, "text": "b"})
+
+        self.assertEqual(grafana_postman.stats, {"coalesced": 2, "dropped": 1})
+        self.assertEqual(grafana_postman._get_annotation(), {
+            "time": 1000,
+            "timeEnd": 3000,
+            "tags": ["A"],
+            "isRegion": True,
+            "text": "a\n(and 2 more similar events in this range)",
+        })
+        self.assertIsNone(grafana_postman._pop_coalesced())
+
+    def test_token_bucket(self):
+        rate_limiter = TokenBucket(rate=10, burst=5)
+        start_time = time.perf_counter()
+        for _ in range(10):
+            self.assertTrue(rate_limiter.acquire())
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.4)
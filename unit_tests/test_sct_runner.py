@@ -0,0 +1,111 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import subprocess
+import unittest
+from types import SimpleNamespace
+
+from sdcm.sct_runner import DockerSctRunner, SctRunnerImagePipeline, parallel_steps_script
+
+
+class FakeImage:
+    def __init__(self, images, repository, tag, labels):
+        self.images, self.labels = images, labels
+        self.id = f"sha256:{len(images.all)}"
+        self.attrs = {"Created": len(images.all)}
+        self.tags = [f"{repository}:{tag}"]
+
+    def tag(self, repository, tag):
+        self.tags.append(f"{repository}:{tag}")
+
+
+class FakeImages:
+    def __init__(self):
+        self.all = []
+
+    def list(self, name, filters):
+        return [image for image in self.all
+                if any(tag.startswith(f"{name}:") for tag in image.tags) and
+                set(filters["label"]) <= {f"{key}={value}" for key, value in image.labels.items()}]
+
+
+class FakeContainer:
+    def __init__(self, images):
+        self.images = images
+        self.scripts = []
+        self.removed = False
+
+    def exec_run(self, cmd):
+        self.scripts.append(cmd[-1])
+        result = subprocess.run(cmd, capture_output=True, check=False)
+        return SimpleNamespace(exit_code=result.returncode, output=result.stdout + result.stderr)
+
+    def commit(self, repository, tag, conf):
+        self.images.all.append(FakeImage(self.images, repository, tag, conf["Labels"]))
+
+    def remove(self, force):
+        self.removed = force
+
+
+class FakeDockerClient:
+    def __init__(self):
+        self.images = FakeImages()
+        self.containers = SimpleNamespace(run=self.run)
+        self.started = []
+
+    def run(self, *_, **__):
+        self.started.append(FakeContainer(self.images))
+        return self.started[-1]
+
+
+class TestSctRunnerImagePipeline(unittest.TestCase):
+    def setUp(self):
+        self.docker_client = FakeDockerClient()
+
+    def runners(self, stages, regions=("local", "local-2", "local-3")):
+        return [DockerSctRunner(region_name=region, stages=stages, docker_client=self.docker_client)
+                for region in regions]
+
+    def test_parallel_steps_script(self):
+        script = parallel_steps_script({"ok": "true", "fail": "echo broken; false"})
+        result = subprocess.run(["bash", "-c", script], capture_output=True, check=False, text=True)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Step 'fail' failed", result.stdout)
+        self.assertIn("broken", result.stdout)
+        self.assertNotIn("Step 'ok' failed", result.stdout)
+
+    def test_build_once_and_copy(self):
+        stages = [{"one": "true", "two": "true"}, {"three": "true"}]
+        SctRunnerImagePipeline(self.runners(stages)).run()
+        self.assertEqual(len(self.docker_client.started), 1)
+        builder = self.docker_client.started[0]
+        self.assertEqual(len(builder.scripts), 2)
+        self.assertTrue(builder.removed)
+        content_hash = self.runners(stages)[0].content_hash
+        self.assertEqual(self.docker_client.images.all[0].tags, [f"sct-runner-1.4-local:{content_hash}",
+                                                                  f"sct-runner-1.4-local-2:{content_hash}",
+                                                                  f"sct-runner-1.4-local-3:{content_hash}"])
+
+        SctRunnerImagePipeline(self.runners(stages)).run()
+        self.assertEqual(len(self.docker_client.started), 1, "the image with the same content hash was rebuilt")
+
+        SctRunnerImagePipeline(self.runners([{"one": "true"}])).run()
+        self.assertEqual(len(self.docker_client.started), 2)
+        self.assertEqual(len(self.docker_client.images.all), 2)
+
+    def test_failed_stage(self):
+        with self.assertRaisesRegex(Exception, "Unable to install required packages"):
+            SctRunnerImagePipeline(self.runners([{"one": "false"}, {"two": "true"}])).run()
+        self.assertEqual(len(self.docker_client.started[0].scripts), 1)
+        self.assertTrue(self.docker_client.started[0].removed)
+        self.assertEqual(self.docker_client.images.all, [])
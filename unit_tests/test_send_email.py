@@ -4,7 +4,8 @@ import tempfile
 import shutil
 import zipfile
 
-from sdcm.send_email import LongevityEmailReporter, read_email_data_from_file
+from sdcm.send_email import LongevityEmailReporter, LastEventsAccumulator, BaseEmailReporter, \
+    MORE_EVENTS_MESSAGE, NO_EVENTS_MESSAGE, read_email_data_from_file, compress_attachment
 
 
 class LongevityEmailReporterTest(LongevityEmailReporter):
@@ -33,3 +34,41 @@ class EmailReporterTest(unittest.TestCase):
         self.assertTrue(test_results)
         reporter = LongevityEmailReporterTest(email_recipients='some@host.com', logdir=self.temp_dir)
         reporter.send_report(test_results)
+
+
+class LastEventsAccumulatorTest(unittest.TestCase):
+    def test_budgets(self):
+        accumulator = LastEventsAccumulator(category_size_limit=25, total_size_limit=30, events_in_category_limit=3,
+                                            severities=["CRITICAL", "ERROR", "WARNING"])
+        accumulator.add_events("CRITICAL", (f"critical{idx}" for idx in range(1000)))
+        accumulator.add_events("ERROR", ["error1", "error2"])
+        accumulator.add_events("WARNING", [])
+        accumulator.add_events("NORMAL", ["normal"])
+        self.assertTrue(accumulator.over_the_limit)
+        self.assertEqual(accumulator.result(), {
+            "CRITICAL": ["critical998", "critical999", MORE_EVENTS_MESSAGE],  # the third one is over the category limit
+            "ERROR": ["error2", MORE_EVENTS_MESSAGE],  # and this one is over the total limit
+            "WARNING": [NO_EVENTS_MESSAGE],
+        })
+
+    def test_huge_event(self):
+        accumulator = LastEventsAccumulator(category_size_limit=5, total_size_limit=10, events_in_category_limit=10,
+                                            severities=["ERROR"])
+        accumulator.add_events("ERROR", ["a" * 100])
+        self.assertEqual(accumulator.result(), {"ERROR": ["aaaaa", MORE_EVENTS_MESSAGE]})
+
+    def test_same_as_in_reporter(self):
+        report_data = {"last_events": {"CRITICAL": ["c1", "c2"], "ERROR": ["e1"]}}
+        self.assertEqual(BaseEmailReporter._get_last_events(report_data, 100, 100, 10, ["CRITICAL", "ERROR"]),
+                         report_data["last_events"])
+        self.assertFalse(BaseEmailReporter._check_if_last_events_over_the_limit(report_data, 100, 100, 10))
+        self.assertTrue(BaseEmailReporter._check_if_last_events_over_the_limit(report_data, 100, 100, 1))
+
+    def test_compress_attachment(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "report.html")
+            with open(path, "w", encoding="utf-8") as report_file:
+                report_file.write("<html></html>" * 1000)
+            self.assertEqual(compress_attachment(path), path)
+            self.assertEqual(compress_attachment(path, threshold=100), path + ".gz")
+            self.assertLess(os.path.getsize(path + ".gz"), 1000)
@@ -0,0 +1,61 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from sdcm.stress_scheduler import StressLaunchScheduler, is_stress_ready
+
+
+class FakeStress:  # pylint: disable=too-few-public-methods
+    def __init__(self, executor, duration, ready_after=None):
+        self.started = threading.Event()
+        self.ready_after = ready_after
+        self.start_time = time.time()
+        self.results_futures = [executor.submit(time.sleep, duration)]
+
+    def is_reporting_ops(self):
+        return self.ready_after is not None and time.time() - self.start_time > self.ready_after
+
+
+class TestStressLaunchScheduler(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=10)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_ready_condition(self):
+        scheduler = StressLaunchScheduler(step=0.05)
+        first = scheduler.launch(name="first", start=lambda: FakeStress(self.executor, duration=1, ready_after=0.2))
+        self.assertTrue(is_stress_ready(first))
+        scheduler.launch(name="second", start=lambda: FakeStress(self.executor, duration=0.1, ready_after=1))
+        first_launch, second_launch = scheduler.timeline
+        self.assertGreaterEqual(first_launch.ready_delay, 0.2)
+        self.assertLess(first_launch.ready_delay, 1)
+        self.assertLess(second_launch.ready_delay, 1)  # finished before it reported ops
+
+    def test_sliding_window(self):
+        finished = []
+        scheduler = StressLaunchScheduler(max_in_flight=2, step=0.05, on_finish=finished.append)
+        for duration in (0.2, 1, 0.2, 0.2):
+            scheduler.launch(name=f"stress {duration}", start=lambda d=duration: FakeStress(self.executor, d),
+                             ready=None)
+        # the third command takes the slot of the first one and the forth one takes the slot of the third one
+        self.assertEqual(len(finished), 2)
+        self.assertLess(scheduler.timeline[3].requested - scheduler.timeline[0].requested, 1)
+        scheduler.wait_all()
+        self.assertEqual(len(finished), 4)
+        self.assertTrue(all(launch.finished for launch in scheduler.timeline))
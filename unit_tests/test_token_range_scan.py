@@ -0,0 +1,96 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import threading
+import unittest
+from types import SimpleNamespace
+
+from cassandra import OperationTimedOut
+
+from sdcm.utils.token_range_scan import MIN_TOKEN, MAX_TOKEN, TokenRange, TokenRangeScanner, split_token_ring
+
+
+class FakeResponse:
+    def __init__(self, rows, page_size):
+        self.pages = [rows[idx:idx + page_size] for idx in range(0, len(rows), page_size)] or [[]]
+        self.current_rows = self.pages.pop(0)
+
+    @property
+    def has_more_pages(self):
+        return bool(self.pages)
+
+    def fetch_next_page(self):
+        self.current_rows = self.pages.pop(0)
+
+
+class FakeSession:
+    def __init__(self, tokens, ring, rows=None, fail_on=None):
+        self.rows = rows or [(token, f"value{token}") for token in tokens]
+        self.fail_on = fail_on
+        self.hosts = []
+        self.lock = threading.Lock()
+        hosts = [SimpleNamespace(address=f"10.0.0.{idx}", is_up=True) for idx in range(len(ring))]
+        token_map = SimpleNamespace(
+            ring=[SimpleNamespace(value=token) for token in ring],
+            get_replicas=lambda keyspace, token: [hosts[sum(1 for t in ring if t < token.value) % len(ring)]])
+        table = SimpleNamespace(partition_key=[SimpleNamespace(name="key")])
+        self.cluster = SimpleNamespace(metadata=SimpleNamespace(
+            token_map=token_map, keyspaces={"ks": SimpleNamespace(tables={"cf": table})}))
+
+    def prepare(self, query):
+        assert query == 'SELECT * FROM ks.cf WHERE token(key) > ? AND token(key) <= ?', query
+        return SimpleNamespace(bind=lambda token_range: token_range)
+
+    def execute(self, token_range, host=None):
+        with self.lock:
+            self.hosts.append(host.address)
+        if token_range == self.fail_on:
+            raise OperationTimedOut("timed out")
+        return FakeResponse([row for row in self.rows if token_range.start < row[0] <= token_range.end], page_size=3)
+
+
+class TestTokenRangeScan(unittest.TestCase):
+    def test_split_token_ring(self):
+        self.assertEqual(split_token_ring([]), [TokenRange(MIN_TOKEN, MAX_TOKEN)])
+        ranges = split_token_ring([10, -10], splits=2)
+        self.assertEqual(len(ranges), 6)
+        self.assertEqual(ranges[2:4], [TokenRange(-10, 0), TokenRange(0, 10)])
+        self.assertEqual(ranges[0].start, MIN_TOKEN)
+        self.assertEqual(ranges[-1].end, MAX_TOKEN)
+        self.assertTrue(all(prev.end == cur.start for prev, cur in zip(ranges, ranges[1:])))
+        self.assertEqual(split_token_ring([0, 1], splits=4)[4], TokenRange(0, 1))
+
+    def test_scan(self):
+        tokens = list(range(-100, 100, 3))
+        session = FakeSession(tokens=tokens, ring=[-50, 0, 50])
+        scanner = TokenRangeScanner(parallelism=4, verify_counts=True)
+        stats = scanner.scan(session, "ks.cf", splits=2)
+        self.assertEqual(stats.rows, len(tokens))
+        self.assertEqual(stats.ranges, 8)
+        self.assertFalse(stats.failed)
+        self.assertEqual(set(session.hosts), {"10.0.0.0", "10.0.0.1", "10.0.0.2"})
+        self.assertEqual(sum(stats.latency_histogram().values()), 8)
+        self.assertIn(f"scanned {len(tokens)} rows", stats.summary())
+
+        session.rows = session.rows[1:]
+        session.fail_on = TokenRange(0, 25)
+        stats = scanner.scan(session, "ks.cf", splits=2)
+        self.assertEqual(len(stats.failed), 1)
+        self.assertEqual(stats.count_mismatches, [(split_token_ring([-50, 0, 50], splits=2)[1], 17, 16)])
+
+    def test_terminated(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        stats = TokenRangeScanner().scan(FakeSession(tokens=[1], ring=[0]), "ks.cf", stop_event=stop_event)
+        self.assertTrue(stats.terminated)
+        self.assertEqual(stats.ranges, 0)
@@ -12,12 +12,14 @@
 # Copyright (c) 2020 ScyllaDB
 
 import os
+import time
 import hashlib
 import shutil
 import logging
 import unittest
 import unittest.mock
 from pathlib import Path
+from types import SimpleNamespace
 
 from sdcm.cluster import BaseNode
 from sdcm.utils.distro import Distro
@@ -205,3 +207,32 @@ class TestSstableLoadUtils(unittest.TestCase):
                     SstableLoadUtils.LOAD_AND_STREAM_RUN_EXPR]
         system_log_follower = self.node.follow_system_log(start_from_beginning=True, patterns=patterns)
         SstableLoadUtils.validate_load_and_stream_status(self.node, system_log_follower)
+
+    @staticmethod
+    def test_upload_and_load_sstables():
+        events = []
+
+        def stream_sstables(node, test_data, keyspace_name):  # pylint: disable=unused-argument
+            events.append(("transfer", node.name, test_data.sstable_file))
+            time.sleep(0.2)
+
+        def load(node, test_data):
+            events.append(("load", node.name, test_data.sstable_file))
+            time.sleep(0.1)
+
+        nodes = [SimpleNamespace(name=f"node{idx}") for idx in range(3)]
+        test_data = load_inventory.MULTI_NODE_DATA[:4]
+        map_files_to_node = SstableLoadUtils.distribute_test_files_to_cluster_nodes(nodes=nodes, test_data=test_data)
+        with unittest.mock.patch.object(SstableLoadUtils, "stream_sstables", side_effect=stream_sstables):
+            start_time = time.perf_counter()
+            timings = SstableLoadUtils.upload_and_load_sstables(map_files_to_node, load=load)
+            duration = time.perf_counter() - start_time
+
+        # 3 parallel transfers, then 4 loads, the 2nd tarball for the last node is transferred after the first load
+        assert duration < 0.2 * 2 + 0.1 * 4 + 0.1, f"Transfers are not parallel, took {duration}s"
+        loads = [(node.name, data.sstable_file) for data, node in map_files_to_node]
+        assert [event[1:] for event in events if event[0] == "load"] == loads
+        first_load = events.index(("load", ) + loads[0])
+        assert events.index(("transfer", ) + loads[3]) > first_load
+        assert [(timing.node, timing.sstable_file) for timing in timings] == loads
+        assert all(timing.transfer >= 0.2 and timing.load >= 0.1 for timing in timings)
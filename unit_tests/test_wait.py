@@ -1,8 +1,14 @@
 from __future__ import absolute_import
+import time
 import logging
+import threading
 import unittest
+from functools import partial
+from collections import defaultdict
 
-from sdcm.wait import wait_for
+from tenacity import RetryError
+
+from sdcm.wait import wait_for, wait_for_all, WAIT_STATS
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -59,3 +65,47 @@ class TestSdcmWait(unittest.TestCase):
 
         self.assertEqual(wait_for(callback, timeout=2, step=0.5, arg1=1, arg2=3, throw_exc=False), 'what ever')
         self.assertEqual(len(calls), 1)
+
+    def test_04_backoff(self):
+        calls = []
+
+        def callback():
+            calls.append(time.perf_counter())
+            return len(calls) == 4
+
+        self.assertTrue(wait_for(callback, timeout=5, step=0.1, max_step=0.4, throw_exc=True))
+        delays = [round(later - earlier, 1) for earlier, later in zip(calls, calls[1:])]
+        self.assertEqual(delays, [0.1, 0.2, 0.4])
+        self.assertEqual(WAIT_STATS.get()["TestSdcmWait.test_04_backoff.<locals>.callback"]["attempts"], 4)
+
+    def test_05_wake_event(self):
+        wake_event = threading.Event()
+        calls = []
+
+        def callback():
+            calls.append(1)
+            wake_event.set()
+            return len(calls) == 3
+
+        start_time = time.perf_counter()
+        wait_for(callback, timeout=60, step=30, wake_event=wake_event)
+        self.assertLess(time.perf_counter() - start_time, 5)
+
+    def test_06_wait_for_all(self):
+        calls = defaultdict(int)
+
+        def condition(key, attempts):
+            calls[key] += 1
+            if key == "error" and calls[key] < attempts:
+                raise Exception("error")
+            return calls[key] >= attempts
+
+        results = wait_for_all({key: partial(condition, key, attempts)
+                                for key, attempts in (("a", 1), ("b", 3), ("error", 2))}, step=0.1, timeout=5)
+        self.assertEqual(results, {"a": True, "b": True, "error": True})
+        self.assertEqual(dict(calls), {"a": 1, "b": 3, "error": 2})
+
+        results = wait_for_all({"a": lambda: True, "b": lambda: False}, step=0.1, timeout=0.3, throw_exc=False)
+        self.assertEqual(results, {"a": True})
+        self.assertRaisesRegex(RetryError, r"not satisfied: \['b'\]", wait_for_all,
+                               {"a": lambda: True, "b": lambda: False}, step=0.1, timeout=0.3)